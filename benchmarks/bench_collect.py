@@ -0,0 +1,44 @@
+"""데이터 수집 경로 벤치마크: 업종분류현황 응답 변환, krx_stock 일괄 삽입"""
+
+import pytest
+
+
+@pytest.fixture(scope='module')
+def sector_frame(generator):
+    """규모별 종목 수만큼의 업종분류현황 응답 (fake_services 합성 데이터와 같은 형식)"""
+    import pandas as pd
+    from fake_services import FakeKrxService
+    service = FakeKrxService(stocks_per_market={'STK': generator.listings}, seed=generator.seed)
+    return pd.DataFrame(service.synthetic_rows('20250630', 'STK'))
+
+
+def bench_transform_sector_data(benchmark, sector_frame):
+    from krx_service import KRXDataCollector
+    collector = KRXDataCollector()
+
+    rows = benchmark(collector.transform_sector_data, sector_frame, '20250630', 'STK')
+
+    assert len(rows) == len(sector_frame)
+    benchmark.extra_info['rows'] = len(rows)
+    benchmark.extra_info['rows_per_sec'] = int(len(rows) / benchmark.stats.stats.median)
+
+
+def bench_insert_stock_data(benchmark, market_db, generator):
+    from utils.db_manager import insert_stock_data
+    conn = market_db['conn']
+    next_date = market_db['next_date']
+
+    # 마지막 거래일 종목 전체를 데이터가 없는 날짜로 옮겨 매 회 새로 삽입
+    _, last_rows = list(generator.iter_days())[-1]
+    rows = [{**row, 'trade_date': next_date} for row in last_rows]
+
+    def clear_rows():
+        with conn.cursor() as cursor:
+            cursor.execute("DELETE FROM krx_stock WHERE trade_date = %s", (next_date,))
+        conn.commit()
+
+    benchmark.pedantic(insert_stock_data, args=(conn, rows), setup=clear_rows, rounds=5, iterations=1)
+    clear_rows()
+
+    benchmark.extra_info['rows'] = len(rows)
+    benchmark.extra_info['rows_per_sec'] = int(len(rows) / benchmark.stats.stats.median)
@@ -0,0 +1,22 @@
+"""대장주 추적 벤치마크: 대장주 갱신, 연속일수 전체 재계산"""
+
+
+def bench_update_sector_leaders(benchmark, market_db):
+    from krx_service import SectorLeaderTracker
+    tracker = SectorLeaderTracker()
+
+    updated = benchmark.pedantic(tracker.update_sector_leaders, args=(market_db['conn'], market_db['trade_date']),
+                                 rounds=3, iterations=1)
+
+    assert updated
+    benchmark.extra_info['records'] = updated
+
+
+def bench_recalculate_all_consecutive_days(benchmark, market_db):
+    from krx_service import SectorLeaderTracker
+    tracker = SectorLeaderTracker()
+
+    updated = benchmark.pedantic(tracker.recalculate_all_consecutive_days,
+                                 args=(market_db['conn'], market_db['trade_date']), rounds=3, iterations=1)
+
+    benchmark.extra_info['records'] = updated
@@ -0,0 +1,52 @@
+"""리포트 렌더링 벤치마크: save_df_as_image 페이지 렌더링 시간 (렌더링 캐시 미사용)"""
+
+import itertools
+import os
+import random
+
+import pytest
+
+
+@pytest.fixture(scope='module', params=['pillow', 'imgkit'])
+def table_generator(request, tmp_path_factory):
+    if request.param == 'imgkit' and not os.getenv('WKHTMLTOIMAGE_PATH'):
+        pytest.skip("WKHTMLTOIMAGE_PATH 미지정 - imgkit 렌더링 건너뜀")
+    from table_report_generator import TableReportGenerator
+    from utils.render_cache import RenderCache
+    generator = TableReportGenerator(renderer=request.param)
+    # 측정 중 생성한 이미지가 img/ 캐시에 쌓이지 않도록 임시 디렉토리 사용
+    generator.render_cache = RenderCache(str(tmp_path_factory.mktemp(f"render_{request.param}")))
+    return generator
+
+
+def _page_frame(table_generator, rows):
+    """리포트 한 페이지 분량의 섹터 테이블"""
+    rng = random.Random(rows)
+    sectors = [
+        {'industry': f"업종{i:03d}", 'market_type': 'KOSPI',
+         'rsi_d': rng.uniform(10, 90), 'rsi_w': rng.uniform(10, 90), 'rsi_m': rng.uniform(10, 90)}
+        for i in range(rows)
+    ]
+    leaders = {
+        sector['industry']: [
+            {'rank': rank, 'stock_name': f"종목{i:03d}{rank}", 'stock_code': f"{i:04d}{rank:02d}",
+             'market_cap': rng.randint(10 ** 10, 10 ** 14), 'consecutive_days': rng.randint(1, 60)}
+            for rank in (1, 2)
+        ]
+        for i, sector in enumerate(sectors)
+    }
+    return table_generator.create_sector_dataframe({'all_sectors': sectors}, leaders, 'KOSPI')
+
+
+@pytest.mark.parametrize('rows', [5, 10, 20])
+def bench_save_df_as_image(benchmark, table_generator, rows):
+    df = _page_frame(table_generator, rows)
+    counter = itertools.count()
+
+    def unique_title():
+        # 제목을 매번 바꿔 렌더링 캐시 적중 없이 실제 렌더링 시간을 측정
+        return (df, f"벤치마크 {next(counter)}", 'sector_table_bench.png'), {'page_num': 1, 'total_pages': 1}
+
+    path, _ = benchmark.pedantic(table_generator.save_df_as_image, setup=unique_title, rounds=5, iterations=1)
+
+    assert path and os.path.isfile(path)
@@ -0,0 +1,37 @@
+"""RSI 계산 벤치마크: 단일 종목 RSI, 업종별 RSI 일괄 계산"""
+
+import random
+
+import pytest
+
+
+@pytest.mark.parametrize('length', [30, 120, 250])
+def bench_calculate_rsi(benchmark, length):
+    from krx_service import RSICalculator
+    rng = random.Random(length)
+    prices = [10000.0]
+    for _ in range(length - 1):
+        prices.append(max(1.0, prices[-1] * (1 + rng.gauss(0, 0.02))))
+
+    rsi = benchmark(RSICalculator().calculate_rsi, prices, 14)
+
+    assert 0 <= rsi <= 100
+
+
+@pytest.mark.parametrize('warm', [True, False], ids=['snapshot', 'per_stock'])
+def bench_calculate_sector_rsi_batch(benchmark, market_db, warm):
+    """warm=True: 과거 종가 스냅샷을 한 번에 적재 후 계산, False: 종목별 개별 조회"""
+    from krx_service import RSICalculator
+    conn = market_db['conn']
+    trade_date = market_db['trade_date']
+
+    def run():
+        calculator = RSICalculator()
+        if warm:
+            calculator.warm_price_history(conn, trade_date, 'KOSPI')
+        return calculator.calculate_sector_rsi_batch(conn, trade_date, 'KOSPI')
+
+    results = benchmark.pedantic(run, rounds=3, iterations=1)
+
+    assert results
+    benchmark.extra_info['sectors'] = len(results)
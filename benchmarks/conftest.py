@@ -0,0 +1,109 @@
+"""pytest-benchmark 공용 설정과 fixture.
+
+데이터 규모(size)별로 synthetic_market 의 합성 데이터를 사용한다. DB 가 필요한
+벤치마크는 BENCH_DB_NAME 으로 지정한 벤치마크 전용 DB 에서만 실행하며, 지정하지
+않으면 건너뛴다 (규모별로 krx_stock/krx_sector_rsi/krx_sector_leaders 를 비우고 적재).
+
+    BENCH_DB_NAME=krx_bench BENCH_SIZES=small,medium python benchmarks/run_benchmarks.py
+"""
+
+import os
+import sys
+from datetime import timedelta
+
+import pytest
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT_DIR not in sys.path:
+    sys.path.insert(0, ROOT_DIR)
+
+from utils.env_util import load_env  # noqa: E402
+
+load_env()
+
+# 벤치마크 전용 DB 로 전환 (db_manager 가 import 되기 전에 DB_NAME 교체)
+BENCH_DB_NAME = os.getenv('BENCH_DB_NAME')
+if BENCH_DB_NAME:
+    if BENCH_DB_NAME == os.getenv('DB_NAME'):
+        raise pytest.UsageError("BENCH_DB_NAME 은 운영 DB(DB_NAME)와 다른 벤치마크 전용 DB 여야 합니다 (테이블을 비웁니다).")
+    os.environ['DB_NAME'] = BENCH_DB_NAME
+
+# 데이터 규모별 합성 데이터 설정 (종목 수, 업종 수, 기간(년))
+SIZES = {
+    'small': {'listings': 500, 'industries': 30, 'years': 0.6},
+    'medium': {'listings': 2500, 'industries': 60, 'years': 1.0},
+    'large': {'listings': 4000, 'industries': 200, 'years': 5.0},
+}
+
+# 기본 실행 규모 (BENCH_SIZES 로 변경, 예: small,medium,large)
+SELECTED_SIZES = [name.strip() for name in os.getenv('BENCH_SIZES', 'small,medium').split(',') if name.strip()]
+unknown_sizes = [name for name in SELECTED_SIZES if name not in SIZES]
+if unknown_sizes:
+    raise pytest.UsageError(f"알 수 없는 BENCH_SIZES: {', '.join(unknown_sizes)} (사용 가능: {', '.join(SIZES)})")
+
+# 합성 데이터 기준일 (실행 날짜와 무관하게 같은 데이터를 쓰도록 고정)
+BENCH_END_DATE = '2025-06-30'
+BENCH_SEED = 42
+
+
+def pytest_configure(config):
+    # 반복 실행되는 함수의 INFO 로그가 측정에 섞이지 않도록 경고 이상만 출력
+    import logging
+    from utils.logger_util import LoggerUtil
+    LoggerUtil().get_logger().setLevel(logging.WARNING)
+
+
+@pytest.fixture(scope='session', params=SELECTED_SIZES)
+def size(request):
+    """데이터 규모명"""
+    return request.param
+
+
+@pytest.fixture(scope='session')
+def generator(size):
+    from synthetic_market import SyntheticMarketGenerator
+    return SyntheticMarketGenerator(end_date=BENCH_END_DATE, seed=BENCH_SEED, **SIZES[size])
+
+
+@pytest.fixture(scope='session')
+def bench_conn():
+    """벤치마크 전용 DB 연결 (BENCH_DB_NAME 미지정/연결 실패 시 건너뜀)"""
+    if not BENCH_DB_NAME:
+        pytest.skip("BENCH_DB_NAME 미지정 - DB 벤치마크 건너뜀")
+    from utils.db_manager import get_db_connection, create_tables_if_not_exists
+    conn = get_db_connection()
+    if not conn:
+        pytest.skip(f"벤치마크 DB({BENCH_DB_NAME}) 연결 실패")
+    create_tables_if_not_exists(conn)
+    yield conn
+    conn.close()
+
+
+@pytest.fixture(scope='session')
+def market_db(bench_conn, generator):
+    """
+    규모별 합성 데이터를 적재한 DB
+
+    Returns:
+        dict: {'conn', 'trade_date' (마지막 거래일), 'next_date' (데이터가 없는 다음 날), 'summary'}
+    """
+    from krx_service import SectorLeaderTracker
+
+    with bench_conn.cursor() as cursor:
+        for table in ('krx_stock', 'krx_sector_rsi', 'krx_sector_leaders'):
+            cursor.execute(f"TRUNCATE TABLE {table}")
+    bench_conn.commit()
+
+    summary = generator.load(bench_conn, batch_size=10000)
+    last_day = generator.trading_days()[-1]
+    trade_date = last_day.strftime('%Y-%m-%d')
+
+    # 연속일수 재계산 벤치마크용 대장주 초기 데이터
+    SectorLeaderTracker().update_sector_leaders(bench_conn, trade_date)
+
+    return {
+        'conn': bench_conn,
+        'trade_date': trade_date,
+        'next_date': (last_day + timedelta(days=1)).strftime('%Y-%m-%d'),
+        'summary': summary,
+    }
@@ -0,0 +1,124 @@
+"""cold start import 시간 벤치마크 (python -X importtime).
+
+새 인터프리터에서 `python -X importtime -c "import <모듈>"` 을 여러 번 실행해 모듈의
+누적 import 시간 중앙값을 구하고 기준값(import_time_baseline.json)과 비교한다.
+pandas/pykrx 등 무거운 의존성이 import 시점에 로드되면 시간과 관계없이 실패로 처리한다.
+
+사용법:
+    python benchmarks/import_time.py                  # 기준값과 비교 (초과 시 종료 코드 1)
+    python benchmarks/import_time.py --update         # 현재 측정값을 기준값으로 저장
+    python benchmarks/import_time.py --module krx_service --runs 10 --top 15
+
+기준값은 측정한 장비에 따라 다르므로 같은 장비(CI 러너 등)에서 갱신/비교한다.
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'import_time_baseline.json')
+
+# import 시점에 로드되면 안 되는 무거운 의존성 (처음 사용할 때 import)
+HEAVY_MODULES = ('pandas', 'numpy', 'pykrx', 'imgkit', 'PIL', 'holidays', 'matplotlib')
+
+DEFAULT_MODULES = ('main', 'krx_service', 'table_report_generator')
+
+
+def measure_once(module):
+    """새 인터프리터에서 한 번 import 해 (누적 시간 ms, 모듈별 self 시간, 로드된 무거운 모듈) 반환"""
+    code = (
+        f"import sys, json; import {module}; "
+        f"print(json.dumps(sorted(m for m in {HEAVY_MODULES!r} if m in sys.modules)))"
+    )
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', code],
+        cwd=ROOT_DIR, capture_output=True, text=True, check=True
+    )
+
+    total_us = None
+    self_times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|')
+        name_stripped = name.strip()
+        self_times[name_stripped] = self_times.get(name_stripped, 0) + int(self_us)
+        # 들여쓰기 없는 최상위 항목이 측정 대상 모듈
+        if name.rstrip() == f' {module}':
+            total_us = int(cumulative_us)
+
+    heavy_loaded = json.loads(result.stdout.strip().splitlines()[-1])
+    return (total_us or 0) / 1000, self_times, heavy_loaded
+
+
+def measure(module, runs):
+    totals = []
+    self_times = {}
+    heavy_loaded = set()
+    for _ in range(runs):
+        total_ms, times, heavy = measure_once(module)
+        totals.append(total_ms)
+        heavy_loaded.update(heavy)
+        for name, us in times.items():
+            self_times.setdefault(name, []).append(us)
+    median_self = {name: statistics.median(values) / 1000 for name, values in self_times.items()}
+    return statistics.median(totals), median_self, sorted(heavy_loaded)
+
+
+def load_baseline():
+    if not os.path.exists(BASELINE_PATH):
+        return {}
+    with open(BASELINE_PATH, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="cold start import 시간 벤치마크")
+    parser.add_argument('--module', action='append', help=f"측정할 모듈 (여러 번 지정 가능, 기본: {', '.join(DEFAULT_MODULES)})")
+    parser.add_argument('--runs', type=int, default=7, help="모듈별 측정 횟수 (중앙값 사용, 기본 7)")
+    parser.add_argument('--tolerance', type=float, default=0.5, help="기준값 대비 허용 증가율 (기본 0.5 = 50%%, 측정 편차 고려)")
+    parser.add_argument('--top', type=int, default=10, help="self 시간이 큰 모듈 출력 개수")
+    parser.add_argument('--update', action='store_true', help="측정값을 기준값으로 저장")
+    args = parser.parse_args(argv)
+
+    modules = args.module or list(DEFAULT_MODULES)
+    baseline = load_baseline()
+    failed = False
+    results = {}
+
+    for module in modules:
+        median_ms, self_times, heavy_loaded = measure(module, args.runs)
+        results[module] = {'median_ms': round(median_ms, 1)}
+
+        print(f"\n[{module}] import 누적 시간 중앙값: {median_ms:.1f}ms ({args.runs}회)")
+        for name, ms in sorted(self_times.items(), key=lambda item: item[1], reverse=True)[:args.top]:
+            print(f"  {ms:8.1f}ms  {name}")
+
+        if heavy_loaded:
+            failed = True
+            print(f"  실패: import 시점에 무거운 의존성이 로드됨 - {', '.join(heavy_loaded)}")
+
+        base = baseline.get(module, {}).get('median_ms')
+        if base and not args.update:
+            limit = base * (1 + args.tolerance)
+            status = "통과" if median_ms <= limit else "실패"
+            failed = failed or median_ms > limit
+            print(f"  기준값 {base:.1f}ms, 허용 {limit:.1f}ms -> {status}")
+
+    if args.update:
+        baseline.update(results)
+        with open(BASELINE_PATH, 'w', encoding='utf-8') as f:
+            json.dump(baseline, f, indent=2, ensure_ascii=False)
+            f.write('\n')
+        print(f"\n기준값 저장: {BASELINE_PATH}")
+        return 0
+
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
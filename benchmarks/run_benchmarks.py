@@ -0,0 +1,73 @@
+"""pytest-benchmark 벤치마크 실행기 (기준값 저장/비교).
+
+benchmarks/bench_*.py 를 실행하고 benchmarks/.benchmarks 에 저장된 최근 기준값과
+비교해, 중앙값이 기준값보다 허용 비율 이상 느려진 벤치마크가 있으면 실패한다.
+DB 벤치마크는 BENCH_DB_NAME(벤치마크 전용 DB)을 지정해야 실행된다.
+
+사용법:
+    python benchmarks/run_benchmarks.py                       # 기준값과 비교 (25% 초과 시 종료 코드 1)
+    python benchmarks/run_benchmarks.py --update              # 현재 측정값을 기준값으로 저장
+    python benchmarks/run_benchmarks.py --threshold 10 -k rsi  # 허용 비율/대상 지정
+    BENCH_SIZES=small,medium,large python benchmarks/run_benchmarks.py
+    python benchmarks/run_benchmarks.py --require-baseline    # 기준값이 없으면 실행하지 않고 종료 코드 1 (CI)
+
+기준값은 장비별(OS/Python 버전) 디렉토리에 저장되므로 같은 장비에서 갱신/비교한다.
+CI 환경변수가 설정되어 있으면 --require-baseline 이 기본으로 켜져, 해당 장비의 기준값이
+없을 때 비교 없이 통과하지 않고 실패한다 (CI 장비에서 --update 로 기준값을 먼저 저장).
+"""
+
+import argparse
+import glob
+import os
+import sys
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+STORAGE_DIR = os.path.join(BENCH_DIR, '.benchmarks')
+
+
+def baseline_dir():
+    """현재 장비의 기준값 디렉토리 (pytest-benchmark 장비 ID 기준)"""
+    from pytest_benchmark.utils import get_machine_id
+    return os.path.join(STORAGE_DIR, get_machine_id())
+
+
+def has_baseline():
+    return bool(glob.glob(os.path.join(baseline_dir(), '*_baseline.json')))
+
+
+def _ci_enabled():
+    return os.getenv('CI', '').lower() in ('1', 'true', 'yes')
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="벤치마크 실행 및 기준값 비교")
+    parser.add_argument('--update', action='store_true', help="측정값을 기준값으로 저장")
+    parser.add_argument('--threshold', type=int, default=25, help="기준값 대비 허용 증가율(%%, 중앙값 기준, 기본 25)")
+    parser.add_argument('-k', dest='keyword', help="실행할 벤치마크 필터 (pytest -k)")
+    parser.add_argument('--require-baseline', action='store_true', default=_ci_enabled(),
+                        help="이 장비의 기준값이 없으면 실패 (CI 환경변수가 있으면 기본)")
+    args, pytest_args = parser.parse_known_args(argv)
+
+    import pytest
+
+    command = [BENCH_DIR, '-c', os.path.join(BENCH_DIR, 'pytest.ini'), '--rootdir', BENCH_DIR,
+               f"--benchmark-storage=file://{STORAGE_DIR}"]
+    if args.keyword:
+        command += ['-k', args.keyword]
+
+    if args.update:
+        command.append('--benchmark-save=baseline')
+    elif has_baseline():
+        command += ['--benchmark-compare', f"--benchmark-compare-fail=median:{args.threshold}%"]
+    elif args.require_baseline:
+        print(f"저장된 기준값이 없습니다: {baseline_dir()} - 이 장비에서 --update 로 기준값을 먼저 저장하세요.",
+              file=sys.stderr)
+        return 1
+    else:
+        print("저장된 기준값이 없어 비교 없이 실행합니다 (--update 로 기준값 저장).")
+
+    return pytest.main(command + pytest_args)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
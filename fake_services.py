@@ -0,0 +1,507 @@
+"""
+외부 서비스 로컬 대체 서버 모듈
+
+일일 작업이 의존하는 세 외부 서비스를 로컬 HTTP 서버로 대신합니다.
+- KRX (data.krx.co.kr): 로그인 + 업종분류현황(MDCSTAT03901) 응답 (녹화된 JSON 재생 또는 합성 데이터)
+- Telegram Bot API: sendMessage / sendPhoto / sendMediaGroup 수신
+- 게시판 API (BASE_URL/api/board-research): 게시글/이미지 업로드 수신 (Idempotency-Key 중복 제거)
+
+각 서버는 지연(latency)과 429/5xx 장애를 확률적으로 주입할 수 있어, 외부 네트워크
+없이 전체 파이프라인을 부하 테스트/벤치마크할 수 있습니다. 실행 후 출력되는 환경변수
+(KRX_BASE_URL, TELEGRAM_API_BASE, BASE_URL 등)를 지정하고 main.py 를 실행하면 됩니다.
+
+    python fake_services.py --latency 0.2 --rate-429 0.05 --rate-5xx 0.02
+"""
+
+# Standard library imports
+import abc
+import argparse
+import json
+import math
+import os
+import random
+import threading
+import time
+from datetime import datetime
+from email.parser import BytesParser
+from email.policy import HTTP
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+# 합성 업종분류현황 데이터의 시장별 업종
+SYNTHETIC_SECTORS = {
+    'STK': [
+        '전기전자', '화학', '의약품', '운수장비', '금융업', '서비스업', '철강금속', '유통업',
+        '건설업', '기계', '음식료품', '섬유의복', '통신업', '보험', '증권', '은행',
+        '운수창고업', '전기가스업', '비금속광물', '종이목재', '의료정밀', '기타제조업',
+    ],
+    'KSQ': [
+        'IT 하드웨어', 'IT 소프트웨어', '반도체', '제약', '의료·정밀기기', '기계·장비', '화학',
+        '금속', '유통', '오락·문화', '운송장비·부품', '음식료·담배', '건설', '통신장비',
+        '디지털컨텐츠', '인터넷', '방송서비스', '금융', '기타서비스', '섬유·의류',
+    ],
+}
+SYNTHETIC_MARKET_NAMES = {'STK': 'KOSPI', 'KSQ': 'KOSDAQ'}
+
+_KRX_DATA_PATH = '/comm/bldAttendant/getJsonData.cmd'
+_KRX_LOGIN_PATH = '/contents/MDC/COMS/client/MDCCOMS001D1.cmd'
+_KRX_SECTOR_BLD = 'dbms/MDC/STAT/standard/MDCSTAT03901'
+
+
+class FaultConfig:
+    """서버 응답 지연 및 장애 주입 설정"""
+
+    def __init__(self, latency=0.0, jitter=0.0, rate_429=0.0, rate_5xx=0.0, retry_after=1, seed=None):
+        """
+        Args:
+            latency: 모든 요청에 더할 지연(초)
+            jitter: 0~jitter 초의 추가 무작위 지연
+            rate_429: 429 응답 비율 (0~1)
+            rate_5xx: 503 응답 비율 (0~1)
+            retry_after: 429 응답의 retry_after(초)
+        """
+        self.latency = latency
+        self.jitter = jitter
+        self.rate_429 = rate_429
+        self.rate_5xx = rate_5xx
+        self.retry_after = retry_after
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def roll(self):
+        """이번 요청의 (지연 초, 장애 종류: None | 429 | 503)"""
+        with self._lock:
+            delay = self.latency + (self._random.uniform(0, self.jitter) if self.jitter else 0.0)
+            draw = self._random.random()
+        if draw < self.rate_429:
+            return delay, 429
+        if draw < self.rate_429 + self.rate_5xx:
+            return delay, 503
+        return delay, None
+
+
+class FakeService(abc.ABC):
+    """대체 서버 하나의 상태 (장애 설정, 요청 통계) - 서비스별로 handle() 을 구현"""
+
+    name = 'fake'
+
+    def __init__(self, faults=None):
+        self.faults = faults or FaultConfig()
+        self.stats = {'requests': 0, 'faults_429': 0, 'faults_5xx': 0, 'bytes_received': 0, 'endpoints': {}}
+        self._lock = threading.Lock()
+
+    def record(self, endpoint, size=0, fault=None):
+        with self._lock:
+            self.stats['requests'] += 1
+            self.stats['bytes_received'] += size
+            self.stats['endpoints'][endpoint] = self.stats['endpoints'].get(endpoint, 0) + 1
+            if fault == 429:
+                self.stats['faults_429'] += 1
+            elif fault:
+                self.stats['faults_5xx'] += 1
+
+    def fault_response(self, status):
+        """장애 주입 시 (상태 코드, 헤더, 본문)"""
+        if status == 429:
+            return 429, {'Retry-After': str(self.faults.retry_after)}, {'message': 'Too Many Requests'}
+        return status, {}, {'message': 'Service Unavailable'}
+
+    @abc.abstractmethod
+    def handle(self, handler, method, path, query, body):
+        """요청 처리 후 (상태 코드, 헤더, 본문 dict|str) 반환"""
+
+
+class FakeKrxService(FakeService):
+    """KRX 로그인 및 업종분류현황 응답 재생/합성"""
+
+    name = 'krx'
+
+    def __init__(self, faults=None, fixture_dir=None, synthetic=True, stocks_per_market=None, seed=0):
+        """
+        Args:
+            fixture_dir: 녹화된 응답 디렉토리 ({mktId}_{trdDd}.json)
+            synthetic: 녹화본이 없을 때 합성 데이터 생성 여부
+            stocks_per_market: 시장별 합성 종목 수 (기본 KOSPI 900, KOSDAQ 1600)
+        """
+        super().__init__(faults)
+        self.fixture_dir = fixture_dir
+        self.synthetic = synthetic
+        self.stocks_per_market = stocks_per_market or {'STK': 900, 'KSQ': 1600}
+        self.seed = seed
+        self._universe = {}
+
+    def _stock_universe(self, market):
+        """합성 종목 목록 (시장별로 한 번 생성)"""
+        if market not in self._universe:
+            rng = random.Random(f"{self.seed}:{market}")
+            sectors = SYNTHETIC_SECTORS.get(market, SYNTHETIC_SECTORS['STK'])
+            code_base = 100000 if market == 'STK' else 200000
+            stocks = []
+            for i in range(self.stocks_per_market.get(market, 500)):
+                stocks.append({
+                    'code': f"{code_base + i * 7:06d}",
+                    'name': f"{SYNTHETIC_MARKET_NAMES.get(market, market)}종목{i:04d}",
+                    'sector': sectors[i % len(sectors)],
+                    'base': rng.choice([1_000, 5_000, 10_000, 50_000, 100_000]) * rng.uniform(0.5, 2.0),
+                    'shares': int(rng.lognormvariate(16, 1.2)),
+                    'drift': rng.uniform(-0.0005, 0.0008),
+                    'amplitude': rng.uniform(0.03, 0.25),
+                    'period': rng.uniform(8, 60),
+                    'phase': rng.uniform(0, 2 * math.pi),
+                    'noise_seed': rng.random(),
+                })
+            self._universe[market] = stocks
+        return self._universe[market]
+
+    @staticmethod
+    def _price(stock, day):
+        """날짜(서수)별 결정적 종가 - 추세 + 주기 + 잡음 (같은 날짜는 항상 같은 값)"""
+        noise = random.Random(f"{stock['noise_seed']}:{day}").gauss(0, 0.01)
+        value = stock['base'] * math.exp(
+            stock['drift'] * (day - 738000)
+            + stock['amplitude'] * math.sin(day / stock['period'] + stock['phase'])
+            + noise
+        )
+        return max(1, int(round(value)))
+
+    def synthetic_rows(self, trade_date, market):
+        """업종분류현황 block1 형식의 합성 행"""
+        day = datetime.strptime(trade_date, '%Y%m%d').toordinal()
+        rows = []
+        for stock in self._stock_universe(market):
+            close = self._price(stock, day)
+            prev = self._price(stock, day - 1)
+            change = close - prev
+            rows.append({
+                'ISU_SRT_CD': stock['code'],
+                'ISU_ABBRV': stock['name'],
+                'MKT_TP_NM': SYNTHETIC_MARKET_NAMES.get(market, market),
+                'IDX_IND_NM': stock['sector'],
+                'TDD_CLSPRC': f"{close:,}",
+                'CMPPREVDD_PRC': f"{change:,}",
+                'FLUC_RT': f"{change / prev * 100:.2f}",
+                'MKTCAP': f"{close * stock['shares']:,}",
+                'FLUC_TP_CD': '1' if change > 0 else ('2' if change < 0 else '3'),
+            })
+        return rows
+
+    def sector_rows(self, trade_date, market):
+        """녹화본이 있으면 재생, 없으면 합성 데이터"""
+        if self.fixture_dir:
+            path = os.path.join(self.fixture_dir, f"{market}_{trade_date}.json")
+            if os.path.isfile(path):
+                with open(path, encoding='utf-8') as f:
+                    payload = json.load(f)
+                return payload.get('block1', []) if isinstance(payload, dict) else payload
+        if self.synthetic:
+            return self.synthetic_rows(trade_date, market)
+        return []
+
+    def handle(self, handler, method, path, query, body):
+        if method == 'GET':
+            # 로그인 페이지/iframe
+            return 200, {'Content-Type': 'text/html; charset=utf-8'}, '<html><body>fake krx</body></html>'
+
+        form = _parse_form(handler.headers.get('Content-Type', ''), body)
+        if path == _KRX_LOGIN_PATH:
+            headers = {'Set-Cookie': 'JSESSIONID=fake-krx-session; Path=/'}
+            return 200, headers, {'_error_code': 'CD001', '_error_message': '정상 로그인'}
+
+        if path == _KRX_DATA_PATH and form.get('bld') == _KRX_SECTOR_BLD:
+            return 200, {}, {'block1': self.sector_rows(form.get('trdDd', ''), form.get('mktId', 'STK'))}
+
+        return 200, {}, {'block1': [], 'output': []}
+
+
+class FakeTelegramService(FakeService):
+    """Telegram Bot API 수신 (메시지/사진/미디어 그룹)"""
+
+    name = 'telegram'
+
+    def __init__(self, faults=None):
+        super().__init__(faults)
+        self.messages = []
+        self._message_id = 0
+
+    def fault_response(self, status):
+        if status == 429:
+            retry_after = self.faults.retry_after
+            return 429, {'Retry-After': str(retry_after)}, {
+                'ok': False,
+                'error_code': 429,
+                'description': f"Too Many Requests: retry after {retry_after}",
+                'parameters': {'retry_after': retry_after},
+            }
+        return status, {}, {'ok': False, 'error_code': status, 'description': 'Internal Server Error'}
+
+    def _next_message(self, chat_id, kind):
+        with self._lock:
+            self._message_id += 1
+            message = {'message_id': self._message_id, 'chat': {'id': chat_id}, 'date': int(time.time()), 'kind': kind}
+            self.messages.append(message)
+        return message
+
+    def handle(self, handler, method, path, query, body):
+        parts = path.strip('/').split('/')
+        if len(parts) != 2 or not parts[0].startswith('bot'):
+            return 404, {}, {'ok': False, 'error_code': 404, 'description': 'Not Found'}
+        api_method = parts[1]
+
+        form = _parse_form(handler.headers.get('Content-Type', ''), body)
+        form.update({key: values[0] for key, values in parse_qs(query).items()})
+        chat_id = form.get('chat_id')
+        if not chat_id:
+            return 400, {}, {'ok': False, 'error_code': 400, 'description': 'Bad Request: chat_id is empty'}
+
+        if api_method == 'sendMediaGroup':
+            media = json.loads(form.get('media') or '[]')
+            if not 1 <= len(media) <= 10:
+                return 400, {}, {'ok': False, 'error_code': 400, 'description': 'Bad Request: wrong number of media'}
+            return 200, {}, {'ok': True, 'result': [self._next_message(chat_id, 'photo') for _ in media]}
+        if api_method in ('sendMessage', 'sendPhoto'):
+            kind = 'text' if api_method == 'sendMessage' else 'photo'
+            return 200, {}, {'ok': True, 'result': self._next_message(chat_id, kind)}
+        return 404, {}, {'ok': False, 'error_code': 404, 'description': 'Not Found: method not found'}
+
+
+class FakeBoardService(FakeService):
+    """게시판 API 수신 (Idempotency-Key 가 같으면 기존 게시글 반환)"""
+
+    name = 'board'
+
+    def __init__(self, faults=None):
+        super().__init__(faults)
+        self.posts = []
+        self._by_key = {}
+
+    def handle(self, handler, method, path, query, body):
+        if method != 'POST' or path.rstrip('/') != '/api/board-research':
+            return 404, {}, {'success': False, 'message': 'Not Found'}
+
+        content_type = handler.headers.get('Content-Type', '')
+        if content_type.startswith('application/json'):
+            form, files = json.loads(body or b'{}'), {}
+        else:
+            form, files = _parse_multipart(content_type, body)
+
+        key = handler.headers.get('Idempotency-Key')
+        with self._lock:
+            if key and key in self._by_key:
+                return 200, {}, {'success': True, 'data': self._by_key[key], 'duplicate': True}
+            post_id = len(self.posts) + 1
+            image_urls = [
+                f"/uploads/{post_id}/{file_name}"
+                for name, (file_name, size) in files.items() if name.startswith('image[')
+            ]
+            post = {'id': post_id, 'title': form.get('title'), 'image_urls': image_urls}
+            self.posts.append(post)
+            if key:
+                self._by_key[key] = post
+        return 200, {}, {'success': True, 'data': post}
+
+
+def _read_body(handler):
+    """Content-Length 또는 chunked 요청 본문 읽기"""
+    if handler.headers.get('Transfer-Encoding', '').lower() == 'chunked':
+        chunks = []
+        while True:
+            size = int(handler.rfile.readline().split(b';')[0].strip(), 16)
+            if size == 0:
+                handler.rfile.readline()
+                break
+            chunks.append(handler.rfile.read(size))
+            handler.rfile.readline()
+        return b''.join(chunks)
+    length = int(handler.headers.get('Content-Length') or 0)
+    return handler.rfile.read(length) if length else b''
+
+
+def _parse_multipart(content_type, body):
+    """multipart/form-data 본문 -> (필드 dict, {필드명: (파일명, 크기)})"""
+    message = BytesParser(policy=HTTP).parsebytes(
+        f"Content-Type: {content_type}\r\n\r\n".encode('utf-8') + body
+    )
+    fields, files = {}, {}
+    for part in message.iter_parts():
+        name = part.get_param('name', header='content-disposition')
+        payload = part.get_payload(decode=True) or b''
+        file_name = part.get_filename()
+        if file_name:
+            files[name] = (file_name, len(payload))
+        else:
+            fields[name] = payload.decode('utf-8', errors='replace')
+    return fields, files
+
+
+def _parse_form(content_type, body):
+    """urlencoded 또는 multipart 폼 필드 dict"""
+    if content_type.startswith('multipart/form-data'):
+        return _parse_multipart(content_type, body)[0]
+    return {key: values[0] for key, values in parse_qs(body.decode('utf-8', errors='replace')).items()}
+
+
+def _make_handler(service):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+
+        def _respond(self, status, headers, payload):
+            if isinstance(payload, (dict, list)):
+                data = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+                headers = {'Content-Type': 'application/json; charset=utf-8', **headers}
+            else:
+                data = str(payload).encode('utf-8')
+            self.send_response(status)
+            for key, value in headers.items():
+                self.send_header(key, value)
+            self.send_header('Content-Length', str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def _dispatch(self, method):
+            url = urlsplit(self.path)
+            body = _read_body(self) if method == 'POST' else b''
+
+            # 통계 조회는 장애 주입 대상에서 제외
+            if url.path == '/__stats':
+                return self._respond(200, {}, service.stats)
+
+            delay, fault = service.faults.roll()
+            if delay:
+                time.sleep(delay)
+            service.record(url.path, len(body), fault)
+            if fault:
+                return self._respond(*service.fault_response(fault))
+
+            try:
+                self._respond(*service.handle(self, method, url.path, url.query, body))
+            except Exception as e:
+                self._respond(500, {}, {'message': f"fake {service.name} error: {e}"})
+
+        def do_GET(self):
+            self._dispatch('GET')
+
+        def do_POST(self):
+            self._dispatch('POST')
+
+        def log_message(self, format, *args):
+            pass
+
+    return Handler
+
+
+class FakeServer:
+    """대체 서비스를 백그라운드 스레드에서 실행하는 HTTP 서버"""
+
+    def __init__(self, service, host='127.0.0.1', port=0):
+        self.service = service
+        self.httpd = ThreadingHTTPServer((host, port), _make_handler(service))
+        self.httpd.daemon_threads = True
+        self._thread = None
+
+    @property
+    def base_url(self):
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        self._thread = threading.Thread(target=self.httpd.serve_forever, name=f"fake-{self.service.name}", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+def start_fake_services(faults=None, fixture_dir=None, host='127.0.0.1', port_base=0, stocks_per_market=None):
+    """세 대체 서버를 띄우고 (서버 dict, 환경변수 dict) 반환
+
+    Args:
+        faults: FaultConfig 하나(전체 공통) 또는 {'krx'|'telegram'|'board': FaultConfig}
+        fixture_dir: KRX 녹화 응답 디렉토리
+        port_base: 0 이면 임의 포트, 아니면 port_base, +1, +2 사용
+    """
+    if not isinstance(faults, dict):
+        faults = {'krx': faults, 'telegram': faults, 'board': faults}
+
+    services = [
+        FakeKrxService(faults.get('krx'), fixture_dir=fixture_dir, stocks_per_market=stocks_per_market),
+        FakeTelegramService(faults.get('telegram')),
+        FakeBoardService(faults.get('board')),
+    ]
+    servers = {}
+    for offset, service in enumerate(services):
+        servers[service.name] = FakeServer(service, host, port_base + offset if port_base else 0).start()
+
+    env = {
+        'KRX_BASE_URL': servers['krx'].base_url,
+        'KRX_LOGIN_ID': os.getenv('KRX_LOGIN_ID') or 'fake',
+        'KRX_LOGIN_PASSWORD': os.getenv('KRX_LOGIN_PASSWORD') or 'fake',
+        'TELEGRAM_API_BASE': servers['telegram'].base_url,
+        'TELEGRAM_BOT_TOKEN': os.getenv('TELEGRAM_BOT_TOKEN') or 'fake-token',
+        'TELEGRAM_CHAT_ID': os.getenv('TELEGRAM_CHAT_ID') or '1000',
+        'TELEGRAM_CHAT_TEST_ID': os.getenv('TELEGRAM_CHAT_TEST_ID') or '1001',
+        'BASE_URL': servers['board'].base_url,
+    }
+    return servers, env
+
+
+def record_krx_fixtures(dates, markets=('STK', 'KSQ'), fixture_dir='fixtures/krx'):
+    """실제 KRX 업종분류현황 응답을 녹화 (install_krx_session 으로 로그인된 상태에서 실행)"""
+    from utils.krx_session_util import install_krx_session
+
+    # 로그인이 pykrx webio 를 자동 로그인 없이 먼저 import 해야 하므로 pykrx 는 그 뒤에 import
+    install_krx_session()
+    from pykrx.website.krx.market.core import 업종분류현황
+
+    os.makedirs(fixture_dir, exist_ok=True)
+    fetcher = 업종분류현황()
+    for trade_date in dates:
+        for market in markets:
+            payload = fetcher.read(trdDd=trade_date, mktId=market)
+            path = os.path.join(fixture_dir, f"{market}_{trade_date}.json")
+            with open(path, 'w', encoding='utf-8') as f:
+                json.dump(payload, f, ensure_ascii=False)
+            print(f"녹화 완료: {path} ({len(payload.get('block1', []))}개 종목)")
+
+
+def parse_args(argv=None):
+    """명령행 인자 파싱"""
+    parser = argparse.ArgumentParser(description="KRX/Telegram/게시판 API 로컬 대체 서버")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port-base", type=int, default=18080, help="KRX, Telegram, 게시판 순서로 사용할 시작 포트")
+    parser.add_argument("--latency", type=float, default=0.0, help="모든 응답에 더할 지연(초)")
+    parser.add_argument("--jitter", type=float, default=0.0, help="0~N초 추가 무작위 지연")
+    parser.add_argument("--rate-429", type=float, default=0.0, help="429 응답 비율 (0~1)")
+    parser.add_argument("--rate-5xx", type=float, default=0.0, help="503 응답 비율 (0~1)")
+    parser.add_argument("--retry-after", type=int, default=1, help="429 응답의 retry_after(초)")
+    parser.add_argument("--seed", type=int, default=None, help="장애 주입 난수 시드")
+    parser.add_argument("--krx-fixtures", default=None, help="녹화된 업종분류현황 응답 디렉토리 ({mktId}_{trdDd}.json)")
+    parser.add_argument("--record", nargs='+', metavar='YYYYMMDD', help="실제 KRX 응답을 --krx-fixtures 디렉토리에 녹화 후 종료")
+    return parser.parse_args(argv)
+
+
+def main():
+    args = parse_args()
+    if args.record:
+        record_krx_fixtures(args.record, fixture_dir=args.krx_fixtures or 'fixtures/krx')
+        return
+
+    faults = FaultConfig(args.latency, args.jitter, args.rate_429, args.rate_5xx, args.retry_after, args.seed)
+    servers, env = start_fake_services(faults, args.krx_fixtures, args.host, args.port_base)
+
+    print("로컬 대체 서버 실행 중 (Ctrl+C 로 종료). 다음 환경변수로 main.py 를 실행하세요:\n")
+    for key, value in env.items():
+        print(f"{key}={value}")
+    print("\n요청 통계: GET <서버 주소>/__stats")
+
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        for server in servers.values():
+            server.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,156 @@
+"""
+리포트 렌더링 폰트 번들 설치 모듈
+
+fonts/fonts.lock.json 에 고정된 URL 에서 폰트(또는 폰트가 든 배포 아카이브)를 받아
+SHA-256 체크섬을 확인한 뒤 fonts/ (또는 REPORT_FONT_DIR) 에 설치합니다. 아카이브는
+archive_sha256 을, 꺼낸 폰트 파일은 sha256 을 확인하며, 체크섬이 고정되어 있지 않거나
+다르면 설치하지 않고 실패하므로 모든 호스트가 같은 폰트로 렌더링합니다.
+
+    python fetch_fonts.py            # 없는 폰트만 받아 체크섬 확인 후 설치
+    python fetch_fonts.py --check    # 설치된 폰트 체크섬만 확인 (받지 않음)
+    python fetch_fonts.py --force    # 설치된 파일이 있어도 다시 받기
+"""
+
+# Standard library imports
+import argparse
+import hashlib
+import io
+import json
+import os
+import sys
+import tempfile
+import urllib.request
+import zipfile
+
+# Local imports
+from utils.render_assets import FONT_FILES, FONT_LOCK_FILE, get_font_dir
+
+DOWNLOAD_TIMEOUT = 60
+
+
+def _sha256(data):
+    return hashlib.sha256(data).hexdigest()
+
+
+def _read_lock(lock_file):
+    with open(lock_file, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def _download(url):
+    with urllib.request.urlopen(url, timeout=DOWNLOAD_TIMEOUT) as response:
+        return response.read()
+
+
+def _install(path, data):
+    """임시 파일에 쓴 뒤 교체 (중간에 실패해도 깨진 폰트가 남지 않음)"""
+    fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        os.replace(temp_path, path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+
+def _fetch_entry(entry, downloads):
+    """lock 항목의 폰트 바이트 (아카이브면 archive_sha256 확인 후 member 추출)
+
+    Raises:
+        ValueError: 아카이브 체크섬이 다르거나 고정되어 있지 않은 경우
+        OSError: 다운로드 실패
+    """
+    url = entry['url']
+    if url not in downloads:
+        print(f"[다운로드] {url}")
+        downloads[url] = _download(url)
+    data = downloads[url]
+
+    member = entry.get('member')
+    if not member:
+        return data
+
+    expected = entry.get('archive_sha256')
+    if not expected:
+        raise ValueError("fonts.lock.json 에 archive_sha256 이 고정되어 있지 않습니다")
+    actual = _sha256(data)
+    if actual != expected:
+        raise ValueError(f"받은 아카이브 체크섬 불일치 ({actual[:12]} != {expected[:12]})")
+    with zipfile.ZipFile(io.BytesIO(data)) as archive:
+        return archive.read(member)
+
+
+def fetch_fonts(font_dir=None, lock_file=FONT_LOCK_FILE, force=False, check_only=False):
+    """
+    폰트 번들 설치/확인
+
+    Returns:
+        list[str]: 문제 목록 (비어 있으면 성공)
+    """
+    font_dir = font_dir or get_font_dir()
+    os.makedirs(font_dir, exist_ok=True)
+    entries = _read_lock(lock_file).get('files', {})
+    problems = []
+    downloads = {}
+
+    for file_name in FONT_FILES.values():
+        entry = entries.get(file_name)
+        if not entry or not entry.get('url'):
+            problems.append(f"{file_name}: fonts.lock.json 에 출처 URL 이 없습니다")
+            continue
+        expected = entry.get('sha256')
+        if not expected:
+            problems.append(f"{file_name}: fonts.lock.json 에 sha256 이 고정되어 있지 않습니다")
+            continue
+
+        path = os.path.join(font_dir, file_name)
+        if os.path.isfile(path) and not force:
+            with open(path, 'rb') as f:
+                actual = _sha256(f.read())
+            if actual != expected:
+                problems.append(f"{file_name}: 설치된 파일 체크섬 불일치 ({actual[:12]} != {expected[:12]}) - --force 로 다시 받으세요")
+            else:
+                print(f"[확인] {file_name} ({actual[:12]})")
+            continue
+
+        if check_only:
+            problems.append(f"{file_name}: 설치되어 있지 않습니다 ({path})")
+            continue
+
+        try:
+            data = _fetch_entry(entry, downloads)
+        except (OSError, ValueError, KeyError, zipfile.BadZipFile) as e:
+            problems.append(f"{file_name}: 받기 실패 - {e}")
+            continue
+
+        actual = _sha256(data)
+        if actual != expected:
+            problems.append(f"{file_name}: 받은 파일 체크섬 불일치 ({actual[:12]} != {expected[:12]}) - 설치하지 않음")
+            continue
+
+        _install(path, data)
+        print(f"[설치] {path} ({len(data) / 1024:.0f}KB, {actual[:12]})")
+
+    return problems
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="리포트 렌더링 폰트 번들 설치 (체크섬 확인)")
+    parser.add_argument("--font-dir", help="설치 디렉토리 (기본값: REPORT_FONT_DIR 또는 fonts/)")
+    parser.add_argument("--force", action="store_true", help="설치된 파일이 있어도 다시 받기")
+    parser.add_argument("--check", action="store_true", help="받지 않고 설치된 파일 체크섬만 확인")
+    return parser.parse_args(argv)
+
+
+def main():
+    args = parse_args()
+    problems = fetch_fonts(args.font_dir, force=args.force, check_only=args.check)
+    for problem in problems:
+        print(f"[오류] {problem}", file=sys.stderr)
+    sys.exit(1 if problems else 0)
+
+
+if __name__ == "__main__":
+    main()
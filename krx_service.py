@@ -12,27 +12,34 @@ import os
 from datetime import datetime, timedelta
 from collections import defaultdict
 
-# Third-party imports
-import pandas as pd
-import numpy as np
-import holidays
-from dotenv import load_dotenv
-from pykrx.website.krx.market.core import 업종분류현황
+# pandas, numpy, holidays, pykrx 는 import 비용이 커서 처음 사용할 때 import
 
 # Local imports
+from utils.env_util import load_env
 from utils.logger_util import LoggerUtil
 from utils.db_manager import get_db_connection, insert_sector_leaders
 
 # 환경변수 로드 (한 번만)
-load_dotenv()
+load_env()
+
+# 종목 RSI 계산에 사용하는 최대 종가 수 (기준일 포함)
+RSI_HISTORY_LENGTH = 120
 
 
 class KRXDataCollector:
     """KRX API를 통한 주식 데이터 수집 클래스"""
 
     def __init__(self):
-        self.logger = LoggerUtil().get_logger()
-        self.kr_holidays = holidays.Korea()
+        self.logger = LoggerUtil().get_logger(__name__)
+        self._kr_holidays = None
+
+    @property
+    def kr_holidays(self):
+        """한국 공휴일 달력 (처음 사용할 때 생성)"""
+        if self._kr_holidays is None:
+            import holidays
+            self._kr_holidays = holidays.Korea()
+        return self._kr_holidays
 
     def is_trading_day(self, date):
         """거래일인지 확인 (평일이면서 한국 공휴일이 아닌 날)"""
@@ -79,7 +86,11 @@ class KRXDataCollector:
         try:
             self.logger.info(f"KRX 데이터 수집 시작 - 날짜: {date_str}, 시장: {market}")
 
-            # pykrx 업종분류현황 API 호출
+            # pykrx 업종분류현황 API 호출 (webio 를 자동 로그인 없이 먼저 import)
+            # (세션 만료 시 재로그인/재전송은 주입된 KRX 세션이 처리)
+            from utils.krx_session_util import load_pykrx_webio
+            load_pykrx_webio()
+            from pykrx.website.krx.market.core import 업종분류현황
             fetcher = 업종분류현황()
             raw_data = fetcher.fetch(date_str, market)
 
@@ -93,73 +104,88 @@ class KRXDataCollector:
                 self.logger.error(f"예상치 못한 데이터 타입: {type(raw_data)} - 날짜: {date_str}, 시장: {market}")
                 return []
 
-            # 데이터 변환
-            stock_data_list = []
-            market_type = 'KOSPI' if market == 'STK' else 'KOSDAQ'
-
-            # 컬럼명 매핑 (실제 API 응답에 따라 수정)
-            column_mapping = {
-                '종목코드': ['ISU_SRT_CD', '종목코드', 'ISU_CD', 'Code'],
-                '종목명': ['ISU_ABBRV', '종목명', 'ISU_NM', 'Name'],
-                '업종명': ['IDX_IND_NM', '업종명', 'SEC_NM', 'Sector'],
-                '종가': ['TDD_CLSPRC', '종가', 'Close'],
-                '대비': ['CMPPREVDD_PRC', '대비', 'Change'],
-                '등락률': ['FLUC_RT', '등락률', 'ChangeRate'],
-                '시가총액': ['MKTCAP', '시가총액', 'MarketCap']
-            }
+            stock_data_list = self.transform_sector_data(raw_data, date_str, market)
+            self.logger.info(f"데이터 수집 완료 - {len(stock_data_list)}개 종목 (날짜: {date_str}, 시장: {market})")
 
-            def get_column_value(row, key_variations):
-                """여러 가능한 컬럼명으로 값 찾기"""
-                for col_name in key_variations:
-                    if col_name in row.index:
-                        return row[col_name]
-                return None
 
-            processed_count = 0
-            for idx, row in raw_data.iterrows():
-                try:
-                    stock_code = get_column_value(row, column_mapping['종목코드'])
-                    stock_name = get_column_value(row, column_mapping['종목명'])
-                    industry = get_column_value(row, column_mapping['업종명'])
-                    close_price = get_column_value(row, column_mapping['종가'])
+            return stock_data_list
 
+        except Exception as e:
+            self.logger.error(f"KRX 데이터 수집 오류 - 날짜: {date_str}, 시장: {market}, 오류: {e}")
+            raise
 
-                    stock_data = {
-                        'stock_code': str(stock_code).strip() if stock_code else '',
-                        'stock_name': str(stock_name).strip() if stock_name else '',
-                        'market_type': market_type,
-                        'industry': str(industry).strip() if industry else '',
-                        'trade_date': datetime.strptime(date_str, '%Y%m%d').date(),
-                        'close_price': self._safe_float(close_price),
-                        'change_amount': self._safe_float(get_column_value(row, column_mapping['대비'])),
-                        'change_rate': self._safe_float(get_column_value(row, column_mapping['등락률'])),
-                        'market_cap': self._safe_int(get_column_value(row, column_mapping['시가총액']))
-                    }
+    def transform_sector_data(self, raw_data, date_str, market='STK'):
+        """
+        업종분류현황 응답(DataFrame)을 krx_stock 저장 형식으로 변환합니다.
 
-                    # 필수 데이터 검증
-                    if (stock_data['stock_code'] and
-                        stock_data['stock_name'] and
-                        stock_data['close_price'] is not None):
-                        stock_data_list.append(stock_data)
+        Args:
+            raw_data (DataFrame): 업종분류현황 응답
+            date_str (str): 조회 날짜 (YYYYMMDD 형식)
+            market (str): 시장 구분 ('STK' for KOSPI, 'KSQ' for KOSDAQ)
 
-                    processed_count += 1
+        Returns:
+            list: 주식 데이터 리스트 (필수 값이 없는 종목 제외)
+        """
+        stock_data_list = []
+        market_type = 'KOSPI' if market == 'STK' else 'KOSDAQ'
+
+        # 컬럼명 매핑 (실제 API 응답에 따라 수정)
+        column_mapping = {
+            '종목코드': ['ISU_SRT_CD', '종목코드', 'ISU_CD', 'Code'],
+            '종목명': ['ISU_ABBRV', '종목명', 'ISU_NM', 'Name'],
+            '업종명': ['IDX_IND_NM', '업종명', 'SEC_NM', 'Sector'],
+            '종가': ['TDD_CLSPRC', '종가', 'Close'],
+            '대비': ['CMPPREVDD_PRC', '대비', 'Change'],
+            '등락률': ['FLUC_RT', '등락률', 'ChangeRate'],
+            '시가총액': ['MKTCAP', '시가총액', 'MarketCap']
+        }
+
+        def get_column_value(row, key_variations):
+            """여러 가능한 컬럼명으로 값 찾기"""
+            for col_name in key_variations:
+                if col_name in row.index:
+                    return row[col_name]
+            return None
 
-                except Exception as e:
-                    self.logger.error(f"개별 종목 데이터 처리 오류: {e}, row: {dict(row)}")
-                    continue
+        processed_count = 0
+        for idx, row in raw_data.iterrows():
+            try:
+                stock_code = get_column_value(row, column_mapping['종목코드'])
+                stock_name = get_column_value(row, column_mapping['종목명'])
+                industry = get_column_value(row, column_mapping['업종명'])
+                close_price = get_column_value(row, column_mapping['종가'])
+
+
+                stock_data = {
+                    'stock_code': str(stock_code).strip() if stock_code else '',
+                    'stock_name': str(stock_name).strip() if stock_name else '',
+                    'market_type': market_type,
+                    'industry': str(industry).strip() if industry else '',
+                    'trade_date': datetime.strptime(date_str, '%Y%m%d').date(),
+                    'close_price': self._safe_float(close_price),
+                    'change_amount': self._safe_float(get_column_value(row, column_mapping['대비'])),
+                    'change_rate': self._safe_float(get_column_value(row, column_mapping['등락률'])),
+                    'market_cap': self._safe_int(get_column_value(row, column_mapping['시가총액']))
+                }
 
-            self.logger.info(f"데이터 수집 완료 - {len(stock_data_list)}개 종목 (날짜: {date_str}, 시장: {market})")
+                # 필수 데이터 검증
+                if (stock_data['stock_code'] and
+                    stock_data['stock_name'] and
+                    stock_data['close_price'] is not None):
+                    stock_data_list.append(stock_data)
 
+                processed_count += 1
 
-            return stock_data_list
+            except Exception as e:
+                self.logger.error(f"개별 종목 데이터 처리 오류: {e}, row: {dict(row)}")
+                continue
 
-        except Exception as e:
-            self.logger.error(f"KRX 데이터 수집 오류 - 날짜: {date_str}, 시장: {market}, 오류: {e}")
-            raise
+        return stock_data_list
 
 
     def _safe_float(self, value):
         """안전하게 float로 변환 (콤마 제거 포함)"""
+        import pandas as pd
         if value is None or value == '' or pd.isna(value):
             return None
         try:
@@ -172,6 +198,7 @@ class KRXDataCollector:
 
     def _safe_int(self, value):
         """안전하게 int로 변환 (콤마 제거 포함)"""
+        import pandas as pd
         if value is None or value == '' or pd.isna(value):
             return None
         try:
@@ -187,7 +214,9 @@ class RSICalculator:
     """RSI 계산 및 업종별 RSI 요약 클래스"""
 
     def __init__(self):
-        self.logger = LoggerUtil().get_logger()
+        self.logger = LoggerUtil().get_logger(__name__)
+        # 시장별 과거 종가 스냅샷 {'as_of': 마지막 거래일, 'prices': {종목코드: [종가]}}
+        self._history_snapshots = {}
 
     def calculate_rsi(self, prices, period=14):
         """
@@ -203,6 +232,8 @@ class RSICalculator:
         if len(prices) < period + 1:
             return None
 
+        import pandas as pd
+
         # pandas Series로 변환
         price_series = pd.Series(prices)
 
@@ -277,9 +308,9 @@ class RSICalculator:
                 WHERE stock_code = %s
                 AND trade_date <= %s
                 ORDER BY trade_date DESC
-                LIMIT 120
+                LIMIT %s
                 """
-                cursor.execute(sql, (stock_code, trade_date))
+                cursor.execute(sql, (stock_code, trade_date, RSI_HISTORY_LENGTH))
                 result = cursor.fetchall()
 
                 if not result:
@@ -288,24 +319,104 @@ class RSICalculator:
                 # 시간 순서대로 정렬 (과거 -> 현재)
                 prices = [row['close_price'] for row in reversed(result) if row['close_price'] is not None]
 
-                if len(prices) < max(rsi_periods.values()) + 1:
-                    return {'rsi_d': None, 'rsi_w': None, 'rsi_m': None}
-
-                # 각 기간별 RSI 계산
-                rsi_values = {}
-                for period_name, period_days in rsi_periods.items():
-                    if len(prices) >= period_days + 1:
-                        rsi_value = self.calculate_rsi(prices, period_days)
-                        rsi_values[f'rsi_{period_name}'] = rsi_value
-                    else:
-                        rsi_values[f'rsi_{period_name}'] = None
-
-                return rsi_values
+                return self._calculate_rsi_values(prices, rsi_periods)
 
         except Exception as e:
             self.logger.error(f"RSI 계산 오류 (종목: {stock_code}): {e}")
             return {'rsi_d': None, 'rsi_w': None, 'rsi_m': None}
 
+    def _calculate_rsi_values(self, prices, rsi_periods):
+        """종가 리스트(과거 -> 현재)로 기간별 RSI 계산"""
+        if len(prices) < max(rsi_periods.values()) + 1:
+            return {'rsi_d': None, 'rsi_w': None, 'rsi_m': None}
+
+        # 각 기간별 RSI 계산
+        rsi_values = {}
+        for period_name, period_days in rsi_periods.items():
+            if len(prices) >= period_days + 1:
+                rsi_value = self.calculate_rsi(prices, period_days)
+                rsi_values[f'rsi_{period_name}'] = rsi_value
+            else:
+                rsi_values[f'rsi_{period_name}'] = None
+
+        return rsi_values
+
+    def _get_latest_trade_date_before(self, conn, trade_date):
+        """기준일 이전 마지막 거래일 (YYYY-MM-DD, 데이터가 없으면 None)"""
+        with conn.cursor() as cursor:
+            sql = "SELECT MAX(trade_date) AS as_of FROM krx_stock WHERE trade_date < %s"
+            cursor.execute(sql, (trade_date,))
+            row = cursor.fetchone()
+        return row['as_of'].strftime('%Y-%m-%d') if row and row['as_of'] else None
+
+    def warm_price_history(self, conn, trade_date, market_type):
+        """RSI 계산용 종목별 과거 종가 스냅샷을 미리 메모리에 적재 (상주 모드에서 장 마감 전 예열)
+
+        기준일 이전 마지막 거래일까지의 종목별 최근 종가(RSI_HISTORY_LENGTH - 1 개)를 한 번에
+        조회해 두면, 기준일 RSI 계산 시 종목마다 과거 종가를 조회하지 않고 당일 종가만 붙여 계산한다.
+
+        Args:
+            conn: DB 연결 객체
+            trade_date (str): RSI 를 계산할 기준일 (YYYY-MM-DD)
+            market_type (str): 시장 구분 ('KOSPI' 또는 'KOSDAQ')
+
+        Returns:
+            int: 스냅샷에 적재된 종목 수
+        """
+        as_of = self._get_latest_trade_date_before(conn, trade_date)
+        if not as_of:
+            return 0
+
+        history_length = RSI_HISTORY_LENGTH - 1
+        with conn.cursor() as cursor:
+            # 최근 history_length 개 거래일 구간의 시작일
+            sql = """
+            SELECT DISTINCT trade_date FROM krx_stock
+            WHERE trade_date <= %s
+            ORDER BY trade_date DESC
+            LIMIT 1 OFFSET %s
+            """
+            cursor.execute(sql, (as_of, history_length - 1))
+            row = cursor.fetchone()
+            window_start = row['trade_date'] if row else '1900-01-01'
+
+            sql = """
+            SELECT h.stock_code, h.close_price
+            FROM krx_stock h
+            JOIN krx_stock m ON m.stock_code = h.stock_code AND m.trade_date = %s AND m.market_type = %s
+            WHERE h.trade_date >= %s AND h.trade_date <= %s
+            ORDER BY h.stock_code, h.trade_date
+            """
+            cursor.execute(sql, (as_of, market_type, window_start, as_of))
+            rows = cursor.fetchall()
+
+        prices = defaultdict(list)
+        for row in rows:
+            if row['close_price'] is not None:
+                prices[row['stock_code']].append(row['close_price'])
+
+        # 구간 안에 거래가 빠진 종목은 구간 밖 데이터가 필요할 수 있으므로 스냅샷에서 제외 (개별 조회)
+        complete = {code: closes for code, closes in prices.items() if len(closes) >= history_length}
+        self._history_snapshots[market_type] = {'as_of': as_of, 'prices': complete}
+        self.logger.info(f"{market_type} RSI 종가 스냅샷 적재 - 기준: {as_of}, {len(complete)}개 종목")
+        return len(complete)
+
+    def _get_history_snapshot(self, conn, trade_date, market_type):
+        """기준일에 사용할 수 있는 종가 스냅샷 (이전 마지막 거래일이 달라졌으면 None)"""
+        snapshot = self._history_snapshots.get(market_type)
+        if not snapshot or snapshot['as_of'] >= trade_date:
+            return None
+        if snapshot['as_of'] != self._get_latest_trade_date_before(conn, trade_date):
+            return None
+        return snapshot['prices']
+
+    def _get_close_prices(self, conn, trade_date, market_type):
+        """기준일 시장 전체 종가 {종목코드: 종가}"""
+        with conn.cursor() as cursor:
+            sql = "SELECT stock_code, close_price FROM krx_stock WHERE trade_date = %s AND market_type = %s"
+            cursor.execute(sql, (trade_date, market_type))
+            return {row['stock_code']: row['close_price'] for row in cursor.fetchall()}
+
     def calculate_sector_rsi_batch(self, conn, trade_date, market_type, rsi_periods=None):
         """
         특정 시장의 모든 업종의 RSI를 일괄 계산합니다.
@@ -346,6 +457,14 @@ class RSICalculator:
 
             self.logger.info(f"{market_type} 업종별 RSI 계산 시작 - {len(industry_stocks)}개 업종, 기준일: {trade_date}")
 
+            # 미리 적재한 종가 스냅샷이 있으면 당일 종가만 조회해 이어 붙임
+            history = self._get_history_snapshot(conn, trade_date, market_type) or {}
+            close_prices = self._get_close_prices(conn, trade_date, market_type) if history else {}
+            if history:
+                self.logger.info(f"{market_type} RSI 종가 스냅샷 사용 - {len(history)}개 종목")
+
+            import numpy as np
+
             sector_rsi_list = []
 
             for industry, stock_codes in industry_stocks.items():
@@ -361,7 +480,10 @@ class RSICalculator:
 
                     for stock_code in stock_codes:
                         try:
-                            stock_rsi = self.calculate_stock_rsi(conn, stock_code, trade_date, rsi_periods)
+                            if stock_code in history and close_prices.get(stock_code) is not None:
+                                stock_rsi = self._calculate_rsi_values(history[stock_code] + [close_prices[stock_code]], rsi_periods)
+                            else:
+                                stock_rsi = self.calculate_stock_rsi(conn, stock_code, trade_date, rsi_periods)
 
                             has_valid_rsi = False
                             for period_key in industry_rsi_values.keys():
@@ -546,7 +668,7 @@ class SectorLeaderTracker:
     """업종별 대장주 추적 및 연속일수 계산 클래스"""
 
     def __init__(self):
-        self.logger = LoggerUtil().get_logger()
+        self.logger = LoggerUtil().get_logger(__name__)
 
     def update_sector_leaders(self, conn, trade_date):
         """
@@ -666,7 +788,7 @@ class SectorLeaderTracker:
                     'stock_code': row['stock_code']
                 }
 
-            self.logger.debug(f"{market_type} 기존 대장주 조회 완료 - {len(existing_leaders)}개 레코드")
+            self.logger.debug("%s 기존 대장주 조회 완료 - %d개 레코드", market_type, len(existing_leaders))
             return existing_leaders
 
         except Exception as e:
@@ -697,11 +819,11 @@ class SectorLeaderTracker:
                         return new_consecutive_days
                     else:
                         # 다른 종목으로 변경된 경우 1일로 리셋
-                        self.logger.info(f"{industry} {rank_position}위 변경: {current_record['stock_code']} -> {stock_code}")
+                        self.logger.info("%s %s위 변경: %s -> %s", industry, rank_position, current_record['stock_code'], stock_code)
                         return 1
                 else:
                     # 새로운 업종/순위 조합인 경우
-                    self.logger.info(f"{industry} {rank_position}위 신규 등록: {stock_code}")
+                    self.logger.info("%s %s위 신규 등록: %s", industry, rank_position, stock_code)
                     return 1
 
         except Exception as e:
@@ -742,6 +864,33 @@ class SectorLeaderTracker:
             self.logger.error(f"{market_type} 업종별 대장주 조회 오류: {e}")
             return {}
 
+    def get_sector_leaders_as_of(self, conn, trade_date, market_type):
+        """
+        krx_stock 데이터만으로 특정 날짜 기준 업종별 대장주와 연속일수를 계산합니다 (DB 저장 없음).
+
+        krx_sector_leaders 는 현재 대장주만 보관하므로, 과거 날짜의 리포트를 다시 만들 때 사용합니다.
+        반환 형식은 get_sector_leaders_with_streak 와 같습니다.
+        """
+        current_leaders = self._get_current_top_stocks(conn, trade_date, market_type)
+
+        sector_leaders = {}
+        for industry, stocks in current_leaders.items():
+            sector_leaders[industry] = [
+                {
+                    'rank': rank,
+                    'stock_code': stock['stock_code'],
+                    'stock_name': stock['stock_name'],
+                    'market_cap': stock['market_cap'],
+                    'consecutive_days': self.calculate_historical_consecutive_days(
+                        conn, market_type, industry, rank, stock['stock_code'], trade_date
+                    )
+                }
+                for rank, stock in enumerate(stocks[:2], 1)
+            ]
+
+        self.logger.info(f"{market_type} {trade_date} 기준 업종별 대장주 계산 완료 - {len(sector_leaders)}개 업종")
+        return sector_leaders
+
     def calculate_historical_consecutive_days(self, conn, market_type, industry, rank_position, current_stock_code, latest_date):
         """
         과거 데이터를 기반으로 특정 종목의 연속 유지 일수를 계산합니다.
@@ -1,5 +1,9 @@
 import os
 import sys
+import signal
+import argparse
+import threading
+from contextlib import contextmanager
 from datetime import datetime, timedelta
 
 # 프로젝트 루트 디렉토리를 Python 경로에 추가
@@ -8,12 +12,30 @@ sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 from utils.logger_util import LoggerUtil
 from utils.telegram_util import TelegramUtil
 
-# krx_session_util 은 reports.* 보다 먼저 import — pykrx 내장 자동 로그인(CD010) 억제
+# pykrx 는 krx_session_util.load_pykrx_webio() 를 통해 처음 사용할 때 import (내장 자동 로그인 억제)
 from utils.krx_session_util import install_krx_session, KrxSessionError
 from krx_service import KRXDataCollector, RSICalculator, SectorLeaderTracker
-from table_report_generator import TableReportGenerator
+from table_report_generator import TableReportGenerator, RENDERERS
+from utils.image_artifact_util import ImageArtifactUtil
+from utils.telegram_client import TelegramError
+from utils.stage_runner import Stage, StageRunner, RunLedger, STATUS_FAILED
+from utils.run_report import build_run_report, write_run_report
+from utils.stage_profiler import StageProfiler, parse_profile_stages, PROFILERS
+from utils.daily_scheduler import TradingDayScheduler
+from utils.readiness_poller import ReadinessPoller
+from utils.delivery_outbox import (
+    DeliveryOutbox,
+    get_referenced_paths,
+    CHANNEL_TELEGRAM_PHOTOS,
+    CHANNEL_TELEGRAM_TEXT,
+    CHANNEL_BOARD_POST
+)
 from utils.db_manager import (
     get_db_connection, 
+    enable_connection_pool,
+    start_query_profile,
+    stop_query_profile,
+    SQL_PROFILE,
     create_tables_if_not_exists,
     delete_old_stock_data,
     insert_stock_data,
@@ -21,16 +43,70 @@ from utils.db_manager import (
     get_latest_sector_rsi
 )
 
+THUMBNAIL_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'thumbnail', 'thumbnail_sector_top.png')
+
+# (시장명, KRX 시장 코드)
+MARKETS = [('KOSPI', 'STK'), ('KOSDAQ', 'KSQ')]
+
+# 일일 작업 단계 동시 실행 수
+PIPELINE_WORKERS = int(os.getenv('PIPELINE_WORKERS', 4))
+
+# KRX 로그인 세션 재사용 최대 시간(초) - 상주 모드에서 이보다 오래된 세션은 다시 로그인
+KRX_SESSION_MAX_AGE = float(os.getenv('KRX_SESSION_MAX_AGE', 6 * 3600))
+
+# KRX 종가 데이터 공개 대기 - 최대 대기 시간(초, 0 이면 한 번만 수집) / 첫 확인 간격 / 최대 확인 간격(초)
+READINESS_DEADLINE = float(os.getenv('READINESS_DEADLINE', 90 * 60))
+READINESS_POLL_INTERVAL = float(os.getenv('READINESS_POLL_INTERVAL', 30))
+READINESS_MAX_INTERVAL = float(os.getenv('READINESS_MAX_INTERVAL', 300))
+
+# 전 거래일 종목 수 대비 이 비율 이상 수집되고, 수집 종목 중 이 비율 이상 종가가 있으면 공개 완료로 판단
+READINESS_MIN_RATIO = float(os.getenv('READINESS_MIN_RATIO', 0.98))
+
+# 전송 채널별 제한 시간(초)
+TELEGRAM_DELIVERY_TIMEOUT = float(os.getenv('DELIVERY_TIMEOUT_TELEGRAM', 60))
+API_DELIVERY_TIMEOUT = float(os.getenv('DELIVERY_TIMEOUT_API', 120))
+
 class KRXReportService:
-    def __init__(self):
-        self.logger = LoggerUtil().get_logger()
+    def __init__(self, renderer=None, profile_stages=None, profiler=None):
+        """
+        Args:
+            renderer: 리포트 이미지 렌더러 (기본값: REPORT_RENDERER 환경변수)
+            profile_stages: 일일 작업에서 프로파일링할 단계 (예: 'collect,rsi', 'all' - 기본값: PROFILE_STAGES 환경변수)
+            profiler: cprofile 또는 sample (기본값: PROFILER 환경변수 또는 cprofile)
+        """
+        self.logger = LoggerUtil().get_logger(__name__)
         self.collector = KRXDataCollector()
         self.rsi_calculator = RSICalculator()
         self.leader_tracker = SectorLeaderTracker()
-        self.table_generator = TableReportGenerator()
+        self.renderer = renderer
+        self._table_generator = None
         self.telegram = TelegramUtil()
-        self._last_rsi_date = None
+        self.artifacts = ImageArtifactUtil()
+        self.outbox = DeliveryOutbox(
+            handlers={
+                CHANNEL_TELEGRAM_PHOTOS: (self._deliver_telegram_photos, TELEGRAM_DELIVERY_TIMEOUT),
+                CHANNEL_TELEGRAM_TEXT: (self._deliver_telegram_text, TELEGRAM_DELIVERY_TIMEOUT),
+                CHANNEL_BOARD_POST: (self._deliver_board_post, API_DELIVERY_TIMEOUT),
+            },
+            on_failure=self._on_delivery_failure,
+            is_permanent_error=self._is_permanent_delivery_error,
+            lane_key=self._delivery_lane
+        )
+        self._daily_pipeline = None
+        # 상주 모드 종료 신호 (데이터 공개 대기 등 긴 대기를 중단)
+        self._stop_event = threading.Event()
+        if profile_stages is None:
+            profile_stages = os.getenv('PROFILE_STAGES', '')
+        self.profile_stages = parse_profile_stages(profile_stages)
+        self.profiler = profiler
         
+    @property
+    def table_generator(self):
+        """리포트 생성기 (렌더링하는 실행에서만 폰트/이미지 디렉토리 준비)"""
+        if self._table_generator is None:
+            self._table_generator = TableReportGenerator(renderer=self.renderer)
+        return self._table_generator
+
     def initialize_database(self):
         """데이터베이스 초기화 및 테이블 생성"""
         try:
@@ -48,10 +124,17 @@ class KRXReportService:
             return False
     
     def collect_initial_data(self, days=100):
-        """초기 데이터 수집 (과거 N일치 거래일만)"""
+        """초기 데이터 수집 (과거 N일치 거래일만)
+
+        한 시장이라도 수집에 실패하거나 빈 응답을 받은 거래일은 저장하지 않고 누락일로 모아
+        오류로 남긴다 (다시 실행하면 저장된 날짜는 건너뛰고 누락일만 수집).
+        """
         try:
             self.logger.info(f"초기 데이터 수집 시작 - 최근 {days}일간 거래일")
-            
+
+            # 수집 중 세션이 만료되면 주입된 세션이 다시 로그인 후 요청을 재전송
+            install_krx_session(max_age=KRX_SESSION_MAX_AGE)
+
             conn = get_db_connection()
             if not conn:
                 raise Exception("데이터베이스 연결 실패")
@@ -80,6 +163,7 @@ class KRXReportService:
                 # 3단계: 과거부터 최신 순으로 데이터 수집 및 저장
                 trading_days_collected = 0
                 total_inserted = 0
+                missing_days = []
                 
                 for trade_date in trading_days_list:
                     date_str_yyyymmdd = trade_date.strftime('%Y%m%d')
@@ -93,15 +177,23 @@ class KRXReportService:
                     
                     # 해당 날짜의 데이터 수집 (KOSPI + KOSDAQ)
                     day_data = []
+                    failed_markets = []
                     for market in ['STK', 'KSQ']:
                         try:
                             market_data = self.collector.fetch_stock_data(date_str_yyyymmdd, market)
                             if market_data:
                                 day_data.extend(market_data)
+                            else:
+                                failed_markets.append(market)
                         except Exception as e:
                             self.logger.warning(f"시장 데이터 수집 실패 - 날짜: {date_str_yyyymmdd}, 시장: {market}, 오류: {e}")
-                            continue
-                    
+                            failed_markets.append(market)
+
+                    # 일부 시장만 수집된 날짜는 저장하지 않음 (저장하면 재실행 시 이미 있는 날짜로 건너뜀)
+                    if failed_markets:
+                        missing_days.append(f"{date_str_sql}({','.join(failed_markets)})")
+                        continue
+
                     # 해당 날짜 데이터를 DB에 저장
                     if day_data:
                         try:
@@ -110,11 +202,14 @@ class KRXReportService:
                             trading_days_collected += 1
                         except Exception as e:
                             self.logger.error(f"데이터 저장 실패 - 날짜: {date_str_yyyymmdd}, 오류: {e}")
-                    else:
-                        self.logger.warning(f"수집된 데이터 없음 - 날짜: {date_str_yyyymmdd}")
-                        trading_days_collected += 1  # 거래일이지만 데이터가 없는 경우도 카운트
-                
+                            missing_days.append(date_str_sql)
+
                 self.logger.info(f"초기 데이터 수집 완료 - {trading_days_collected}개 거래일, 총 {total_inserted}개 레코드 저장")
+                if missing_days:
+                    self.logger.error(
+                        f"초기 데이터 누락 거래일 {len(missing_days)}일: {', '.join(missing_days)} "
+                        f"- 다시 --init 을 실행하면 누락일만 수집합니다"
+                    )
 
                 # 4단계: 최신 거래일 기준으로 RSI 계산 및 대장주 업데이트
                 if trading_days_list:
@@ -161,82 +256,258 @@ class KRXReportService:
             self.logger.error(f"데이터 존재 여부 확인 오류: {e}")
             return False
     
-    def daily_data_collection(self, target_date=None):
-        """일일 데이터 수집 및 처리"""
+    @contextmanager
+    def _db_connection(self):
+        """단계별 DB 연결 (스레드마다 별도 연결 사용)"""
+        conn = get_db_connection()
+        if not conn:
+            raise Exception("데이터베이스 연결 실패")
         try:
-            # 기준일 설정 (미지정시 오늘 날짜)
-            if target_date is None:
-                target_date = datetime.now().strftime('%Y%m%d')
-
-            if isinstance(target_date, str) and len(target_date) == 8:
-                # YYYYMMDD -> YYYY-MM-DD 변환
-                formatted_date = f"{target_date[:4]}-{target_date[4:6]}-{target_date[6:8]}"
-            else:
-                formatted_date = target_date
-
-            # 거래일 여부 확인 (주말/공휴일이면 건너뜀)
-            if not self.collector.is_trading_day(target_date):
-                self.logger.info(f"오늘({target_date})은 거래일이 아닙니다. 데이터 수집을 건너뜁니다.")
-                return False
+            yield conn
+        finally:
+            conn.close()
 
-            self.logger.info(f"일일 데이터 수집 시작 - 기준일: {target_date}")
-            
-            conn = get_db_connection()
-            if not conn:
-                raise Exception("데이터베이스 연결 실패")
-            
-            try:
-                # 1. 오래된 데이터 삭제 (매일 실행) - RSI 90 계산을 위해 데이터 보존
-                delete_old_stock_data(conn, 365)
-                
-                # 2. 오늘 날짜 데이터가 이미 존재하는지 확인
-                if self._check_data_exists(conn, formatted_date):
-                    self.logger.info(f"오늘 날짜 데이터가 이미 존재합니다. 데이터 수집을 건너뛰고 다음 단계로 진행합니다.")
-                    # RSI 계산은 진행
-                    self._last_rsi_date = formatted_date
-                else:
-                    # 3. 오늘 데이터 수집 (KOSPI + KOSDAQ)
-                    today_data = []
-                    for market in ['STK', 'KSQ']:
-                        market_data = self.collector.fetch_stock_data(target_date, market)
-                        today_data.extend(market_data)
-                    
-                    if not today_data:
-                        self.logger.warning(f"수집된 데이터가 없습니다 - 날짜: {target_date}")
-                        return False
-                    
-                    # 4. 데이터베이스에 저장
-                    insert_stock_data(conn, today_data)
-                    self.logger.info(f"오늘 날짜 KRX 데이터 수집 완료 - 날짜: {target_date}")
-                    self._last_rsi_date = formatted_date
-                
-                # 5. RSI 계산 및 저장 (KOSPI, KOSDAQ 별도 계산)
-                all_sector_rsi = []
-                for market_type, market_code in [('KOSPI', 'STK'), ('KOSDAQ', 'KSQ')]:
-                    self.logger.info(f"{market_type} 시장의 섹터 RSI 계산 시작...")
-                    sector_rsi_list = self.rsi_calculator.calculate_sector_rsi_batch(conn, formatted_date, market_type)
-                    if sector_rsi_list:
-                        all_sector_rsi.extend(sector_rsi_list)
-                
-                if all_sector_rsi:
-                    insert_sector_rsi(conn, all_sector_rsi)
-                
-                # 6. 업종별 대장주 추적 업데이트
-                try:
-                    self.leader_tracker.update_sector_leaders(conn, formatted_date)
-                except Exception as e:
-                    self.logger.error(f"대장주 추적 업데이트 오류: {e}")
-                    # 대장주 업데이트 실패해도 계속 진행
-                
-                return True
-                
-            finally:
-                conn.close()
-                
+    def _count_market_rows(self, conn, date_str, market_type):
+        """특정 날짜/시장의 저장된 종목 수"""
+        with conn.cursor() as cursor:
+            sql = "SELECT COUNT(*) as count FROM krx_stock WHERE trade_date = %s AND market_type = %s"
+            cursor.execute(sql, (date_str, market_type))
+            return cursor.fetchone()['count']
+
+    def _stage_session(self, context):
+        """KRX 로그인 세션 주입 (pykrx 내장 계정이 CD010 으로 실패하므로 필수)"""
+        install_krx_session(max_age=KRX_SESSION_MAX_AGE)
+        self.logger.info("KRX 로그인 세션 주입 완료")
+        return {'krx_session': True}
+
+    def _stage_prune(self, context):
+        """오래된 데이터 삭제 - RSI 90 계산을 위해 365일 보존"""
+        with self._db_connection() as conn:
+            deleted_count = delete_old_stock_data(conn, 365)
+        return {'pruned_rows': deleted_count}
+
+    def _expected_market_rows(self, conn, date_str, market_type):
+        """직전 거래일에 저장된 시장별 종목 수 (공개 완료 판단 기준, 이력이 없으면 0)"""
+        with conn.cursor() as cursor:
+            sql = """
+            SELECT COUNT(*) as count FROM krx_stock
+            WHERE market_type = %s
+            AND trade_date = (SELECT MAX(trade_date) FROM krx_stock WHERE market_type = %s AND trade_date < %s)
+            """
+            cursor.execute(sql, (market_type, market_type, date_str))
+            return cursor.fetchone()['count']
+
+    def _wait_for_market_data(self, trade_date, market_type, market_code, expected_rows):
+        """KRX 가 당일 종가를 모두 공개할 때까지 적응형 간격으로 다시 수집 (READINESS_DEADLINE 안에서)
+
+        공개 여부 확인 자체가 업종분류현황 요청 한 번이며, 완료되면 그 응답을 그대로 저장에 사용한다.
+        """
+        min_rows = int(expected_rows * READINESS_MIN_RATIO)
+
+        def check():
+            market_data = self.collector.fetch_stock_data(trade_date.replace('-', ''), market_code)
+            priced = sum(1 for row in market_data if row['close_price'])
+            ready = bool(market_data) and len(market_data) >= min_rows and priced >= len(market_data) * READINESS_MIN_RATIO
+            return ready, priced, market_data
+
+        poller = ReadinessPoller(
+            f"{market_type} {trade_date} (기준 {expected_rows}개 종목)",
+            check,
+            deadline_seconds=READINESS_DEADLINE,
+            initial_interval=READINESS_POLL_INTERVAL,
+            max_interval=READINESS_MAX_INTERVAL,
+            stop_event=self._stop_event
+        )
+        return poller.wait()
+
+    def _stage_collect(self, context, market_type, market_code):
+        """시장별 당일 데이터 수집 및 저장 (이미 저장된 경우 건너뜀, 공개 전이면 공개될 때까지 대기)"""
+        trade_date = context['trade_date']
+        with self._db_connection() as conn:
+            existing_count = self._count_market_rows(conn, trade_date, market_type)
+            if existing_count:
+                self.logger.info(f"{market_type} {trade_date} 데이터가 이미 존재합니다. 수집을 건너뜁니다. ({existing_count}개 종목)")
+                return {f'stock_data_{market_type}': existing_count}
+            expected_rows = self._expected_market_rows(conn, trade_date, market_type)
+
+        # 대기하는 동안 DB 연결을 잡고 있지 않도록 연결 반납 후 대기
+        market_data = self._wait_for_market_data(trade_date, market_type, market_code, expected_rows)
+
+        with self._db_connection() as conn:
+            insert_stock_data(conn, market_data)
+            self.logger.info(f"{market_type} KRX 데이터 수집 완료 - 날짜: {trade_date}, {len(market_data)}개 종목")
+        return {f'stock_data_{market_type}': len(market_data)}
+
+    def _stage_rsi(self, context, market_type):
+        """시장별 섹터 RSI 계산 및 저장"""
+        with self._db_connection() as conn:
+            self.logger.info(f"{market_type} 시장의 섹터 RSI 계산 시작...")
+            sector_rsi_list = self.rsi_calculator.calculate_sector_rsi_batch(conn, context['trade_date'], market_type)
+            if sector_rsi_list:
+                insert_sector_rsi(conn, sector_rsi_list)
+        return {f'sector_rsi_{market_type}': len(sector_rsi_list or [])}
+
+    def _stage_leaders(self, context):
+        """업종별 대장주 추적 업데이트"""
+        with self._db_connection() as conn:
+            updated_count = self.leader_tracker.update_sector_leaders(conn, context['trade_date'])
+        return {'sector_leaders': updated_count}
+
+    def _stage_render(self, context):
+        """시장별 리포트 이미지 렌더링 및 전송용 변형본 생성"""
+        return self.render_reports(context['trade_date'])
+
+    def _stage_deliver(self, context):
+        """렌더링된 리포트를 전송 대기열에 등록하고 전송"""
+        rendered = {name: context[name] for name in ('report_images', 'delivery_images', 'fallback_markets')}
+        return {'delivery_pending': self.deliver_reports(context['trade_date'], rendered)}
+
+    def build_daily_pipeline(self):
+        """일일 작업 단계 그래프 (선언된 입력/산출물로 의존 관계와 동시 실행 여부 결정)"""
+        stages = [
+            Stage('session', self._stage_session, provides=['krx_session'], checkpoint=False),
+            Stage('prune', self._stage_prune, provides=['pruned_rows'], critical=False),
+        ]
+        for market_type, market_code in MARKETS:
+            stages.append(Stage(
+                f'collect_{market_type}',
+                lambda context, m=market_type, c=market_code: self._stage_collect(context, m, c),
+                requires=['krx_session'],
+                provides=[f'stock_data_{market_type}']
+            ))
+            stages.append(Stage(
+                f'rsi_{market_type}',
+                lambda context, m=market_type: self._stage_rsi(context, m),
+                requires=[f'stock_data_{market_type}'],
+                provides=[f'sector_rsi_{market_type}']
+            ))
+        stages.extend([
+            # 대장주 업데이트 실패해도 기존 대장주 정보로 리포트 진행
+            Stage(
+                'leaders',
+                self._stage_leaders,
+                requires=[f'stock_data_{market_type}' for market_type, _ in MARKETS],
+                provides=['sector_leaders'],
+                critical=False
+            ),
+            Stage(
+                'render',
+                self._stage_render,
+                requires=[f'sector_rsi_{market_type}' for market_type, _ in MARKETS] + ['sector_leaders'],
+                provides=['report_images', 'delivery_images', 'fallback_markets']
+            ),
+            Stage(
+                'deliver',
+                self._stage_deliver,
+                requires=['report_images', 'delivery_images', 'fallback_markets'],
+                provides=['delivery_pending']
+            ),
+        ])
+        return StageRunner(stages, ledger=RunLedger('daily'), max_workers=PIPELINE_WORKERS)
+
+    def render_reports(self, target_date):
+        """시장별 테이블 리포트 이미지 렌더링 및 전송용 변형본 생성
+
+        Returns:
+            dict: {'report_images': {시장: [원본 경로]}, 'delivery_images': {시장: [전송용 경로]},
+                   'fallback_markets': {시장: 업종 수} (이미지를 만들지 못한 시장)}
+        """
+        self.logger.info(f"테이블 리포트 생성 시작 - 기준일: {target_date}")
+
+        with self._db_connection() as conn:
+            market_types = [market_type for market_type, _ in MARKETS]
+            rsi_summaries = {}
+            market_reports = []  # 렌더링할 시장별 리포트 입력
+
+            for market_type in market_types:
+                self.logger.info(f"{market_type} 리포트 생성 중...")
+
+                rsi_summary = self.rsi_calculator.get_rsi_summary(conn, target_date, market_type)
+                rsi_summaries[market_type] = rsi_summary
+
+                if not rsi_summary or not rsi_summary.get('total_sectors'):
+                    self.logger.warning(f"{market_type} RSI 데이터가 없어 리포트를 생성할 수 없습니다.")
+                    continue
+
+                leaders_data = self.leader_tracker.get_sector_leaders_with_streak(conn, target_date, market_type)
+                market_reports.append((rsi_summary, leaders_data, target_date, market_type))
+
+            # 전송 대기/재시도 중인 이전 리포트 파일은 캐시 정리 대상에서 제외
+            outbox_paths = get_referenced_paths(conn)
+
+        # 두 시장의 모든 페이지를 한 번에 병렬 렌더링 (시장별 이미지 경로 리스트 반환)
+        all_image_paths = self.table_generator.create_sector_table_reports(market_reports, keep=outbox_paths)
+
+        # 전송용 이미지 변형본을 한 번만 생성 (텔레그램/API 공용, 썸네일 포함)
+        delivery_paths = {
+            market_type: self.artifacts.prepare_variants(image_paths)
+            for market_type, image_paths in all_image_paths.items()
+        }
+        thumbnail_paths = self.artifacts.prepare_variants([THUMBNAIL_PATH]) if os.path.exists(THUMBNAIL_PATH) else []
+        try:
+            self.artifacts.prune(
+                keep=[path for paths in delivery_paths.values() for path in paths] + thumbnail_paths + list(outbox_paths)
+            )
         except Exception as e:
-            self.logger.error(f"일일 데이터 수집 오류: {e}")
-            return False
-    
+            self.logger.warning(f"전송용 이미지 정리 중 오류: {e}")
+
+        fallback_markets = {
+            market_type: (rsi_summaries.get(market_type) or {}).get('total_sectors', 0)
+            for market_type in market_types
+            if not all_image_paths.get(market_type)
+        }
+        return {
+            'report_images': all_image_paths,
+            'delivery_images': delivery_paths,
+            'fallback_markets': fallback_markets,
+        }
+
+    def deliver_reports(self, target_date, rendered):
+        """렌더링 결과를 전송 대기열(outbox)에 먼저 기록한 뒤 전송 - 실패분은 워커가 재시도
+
+        Returns:
+            int: 아직 전송되지 않은 대기열 항목 수
+
+        Raises:
+            RuntimeError: 전송할 리포트 이미지가 하나도 없는 경우
+        """
+        all_image_paths = rendered['report_images']
+        delivery_paths = rendered['delivery_images']
+        combined_image_paths = []  # API 전송용 전체 이미지 경로
+
+        with self._db_connection() as conn:
+            for market_type, _ in MARKETS:
+                image_paths = all_image_paths.get(market_type, [])
+                if image_paths:
+                    photo_paths = delivery_paths.get(market_type, image_paths)
+                    caption = f"{target_date} {market_type} 섹터 RSI & 대장주 분석"
+                    self.outbox.enqueue(
+                        conn,
+                        CHANNEL_TELEGRAM_PHOTOS,
+                        {'paths': photo_paths, 'caption': caption},
+                        key_parts=(self.telegram.chat_id, caption, *[os.path.basename(path) for path in photo_paths])
+                    )
+                    combined_image_paths.extend(image_paths)
+                elif market_type in rendered['fallback_markets']:
+                    self._send_fallback_text_report(conn, target_date, rendered['fallback_markets'][market_type], market_type)
+
+            # 모든 시장 이미지를 API로 전송
+            if combined_image_paths:
+                self.outbox.enqueue(
+                    conn,
+                    CHANNEL_BOARD_POST,
+                    {'target_date': target_date, 'image_paths': combined_image_paths},
+                    key_parts=(target_date, *[os.path.basename(path) for path in combined_image_paths])
+                )
+
+            pending_count = self.outbox.drain_all(conn)
+
+        if pending_count:
+            self.logger.warning(f"전송 대기 중인 항목 {pending_count}개 - 전송 워커(--drain-outbox)가 재시도합니다")
+        if not combined_image_paths:
+            raise RuntimeError(f"전송할 리포트 이미지가 없습니다 - 기준일: {target_date}")
+        return pending_count
+
     def generate_and_send_report(self, target_date=None):
         """테이블 리포트 생성 및 텔레그램 전송"""
         try:
@@ -244,110 +515,102 @@ class KRXReportService:
                 prev_trading_day = self.collector.get_previous_trading_day()
                 target_date = f"{prev_trading_day[:4]}-{prev_trading_day[4:6]}-{prev_trading_day[6:8]}"
 
-            self.logger.info(f"테이블 리포트 생성 시작 - 기준일: {target_date}")
-
-            conn = get_db_connection()
-            if not conn:
-                raise Exception("데이터베이스 연결 실패")
-
-            try:
-                market_types = ['KOSPI', 'KOSDAQ']
-                rsi_summaries = {}
-                leaders_datas = {}
-                all_image_paths = {}  # 시장별 이미지 경로 리스트
-
-                for market_type in market_types:
-                    self.logger.info(f"{market_type} 리포트 생성 중...")
-
-                    rsi_summary = self.rsi_calculator.get_rsi_summary(conn, target_date, market_type)
-                    rsi_summaries[market_type] = rsi_summary
-
-                    if not rsi_summary or not rsi_summary.get('total_sectors'):
-                        self.logger.warning(f"{market_type} RSI 데이터가 없어 리포트를 생성할 수 없습니다.")
-                        leaders_datas[market_type] = None
-                        all_image_paths[market_type] = []
-                        continue
-
-                    leaders_data = self.leader_tracker.get_sector_leaders_with_streak(conn, target_date, market_type)
-                    leaders_datas[market_type] = leaders_data
-
-                    # create_sector_table_report가 이미지 경로 리스트를 반환
-                    table_image_paths = self.table_generator.create_sector_table_report(
-                        rsi_summary, leaders_data, target_date, market_type
-                    )
-
-                    all_image_paths[market_type] = table_image_paths if table_image_paths else []
-
-                # 시장별로 별도 텔레그램 전송
-                success_count = 0
-                combined_image_paths = []  # API 전송용 전체 이미지 경로
-
-                for market_type in market_types:
-                    image_paths = all_image_paths.get(market_type, [])
-                    if image_paths:
-                        caption = f"{target_date} {market_type} 섹터 RSI & 대장주 분석"
-                        self.telegram.send_multiple_photo(image_paths, caption)
-                        combined_image_paths.extend(image_paths)
-                        success_count += 1
-                        self.logger.info(f"{market_type} 텔레그램 전송 완료 ({len(image_paths)}개 이미지)")
-                    else:
-                        self._send_fallback_text_report(
-                            target_date,
-                            rsi_summaries.get(market_type, {}),
-                            leaders_datas.get(market_type, {}),
-                            market_type
-                        )
-
-                # 모든 시장 이미지를 API로 전송
-                if combined_image_paths:
-                    try:
-                        from utils.api_util import ApiUtil, ApiError
-                        api_util = ApiUtil()
-                        api_util.create_post(
-                            title=f"{target_date} 섹터 RSI & 대장주 분석",
-                            content=f"{target_date} KRX 섹터 RSI & 대장주 분석",
-                            category="섹터분석",
-                            writer="admin",
-                            image_paths=combined_image_paths,
-                            thumbnail_image_path=os.path.join(os.path.dirname(os.path.abspath(__file__)), 'thumbnail', 'thumbnail_sector_top.png')
-                        )
-                    except ApiError as e:
-                        error_message = f"❌ [krx-topsector-report] API 오류 발생\n\n{e.message}"
-                        self.telegram.send_test_message(error_message)
-
-                return success_count > 0
-
-            finally:
-                conn.close()
+            self.deliver_reports(target_date, self.render_reports(target_date))
+            return True
 
         except Exception as e:
             self.logger.error(f"테이블 리포트 생성 오류: {e}")
             return False
     
-    def _send_fallback_text_report(self, target_date, rsi_summary, leaders_data, market_type):
-        """이미지 리포트 실패시 폴백 텍스트 리포트 전송"""
+    @staticmethod
+    def _delivery_lane(channel, payload):
+        """전송 순서 그룹 - 텔레그램은 채팅방별로 등록 순서(KOSPI -> KOSDAQ)대로, 게시판 API 는 별도로 동시 전송"""
+        if channel == CHANNEL_BOARD_POST:
+            return channel
+        return f"telegram:{payload.get('chat') or 'main'}"
+
+    def _deliver_telegram_photos(self, payload, idempotency_key):
+        """대기열 항목 전송: 시장별 리포트 이미지 앨범"""
+        return self.telegram.send_multiple_photo(payload['paths'], payload['caption'])
+
+    def _deliver_telegram_text(self, payload, idempotency_key):
+        """대기열 항목 전송: 텍스트 메시지 (chat 이 'test' 면 테스트 채팅방)"""
+        if payload.get('chat') == 'test':
+            return self.telegram.send_test_message(payload['text'])
+        return self.telegram.send_message(payload['text'])
+
+    def _deliver_board_post(self, payload, idempotency_key):
+        """대기열 항목 전송: 게시판 API 로 전체 시장 리포트 이미지 게시"""
+        from utils.api_util import ApiUtil
+        target_date = payload['target_date']
+        api_util = ApiUtil(artifacts=self.artifacts)
+        return api_util.create_post(
+            title=f"{target_date} 섹터 RSI & 대장주 분석",
+            content=f"{target_date} KRX 섹터 RSI & 대장주 분석",
+            category="섹터분석",
+            writer="admin",
+            image_paths=payload['image_paths'],
+            thumbnail_image_path=THUMBNAIL_PATH,
+            idempotency_key=idempotency_key
+        )
+
+    @staticmethod
+    def _is_permanent_delivery_error(error):
+        """재시도해도 성공할 수 없는 전송 오류 (파일 없음, 429 외 텔레그램 4xx)"""
+        if isinstance(error, FileNotFoundError):
+            return True
+        if isinstance(error, TelegramError):
+            return isinstance(error.error_code, int) and 400 <= error.error_code < 500 and error.error_code != 429
+        return False
+
+    def _on_delivery_failure(self, item, error, final):
+        """전송 실패 알림 (게시판 API 는 첫 실패와 최종 실패, 그 외 채널은 최종 실패 시)"""
+        if item['channel'] == CHANNEL_TELEGRAM_TEXT:
+            return
+        if item['channel'] == CHANNEL_BOARD_POST:
+            if not final and item['attempts'] > 1:
+                return
+            status = "재시도 포기" if final else "재시도 예정"
+            error_message = f"❌ [krx-topsector-report] API 오류 발생 ({status})\n\n{getattr(error, 'message', error)}"
+        elif final:
+            error_message = f"❌ [krx-topsector-report] {item['channel']} 전송 실패 (재시도 포기)\n\n{error}"
+        else:
+            return
+        self.telegram.send_test_message(error_message)
+
+    def _send_fallback_text_report(self, conn, target_date, total_sectors, market_type):
+        """이미지 리포트 실패시 폴백 텍스트 리포트 전송 (전송 대기열 경유)"""
         try:
-            simple_message = f"🏢 [krx-topsector-report] {market_type} KRX 섹터 리포트\n📅 {target_date}\n📊 총 {rsi_summary.get('total_sectors', 0)}개 업종\n❌ 테이블 리포트 생성 실패"
-            self.telegram.send_test_message(simple_message)
+            simple_message = f"🏢 [krx-topsector-report] {market_type} KRX 섹터 리포트\n📅 {target_date}\n📊 총 {total_sectors}개 업종\n❌ 테이블 리포트 생성 실패"
+            self.outbox.enqueue(conn, CHANNEL_TELEGRAM_TEXT, {'chat': 'test', 'text': simple_message})
             return True
         except Exception as e:
             self.logger.error(f"{market_type} 폴백 텍스트 리포트 전송 실패: {e}")
             return False
     
-    def run_daily_job(self):
-        """일일 작업 실행"""
-        self.logger.info("=== 일일 작업 시작 ===")
-
-        # KRX 로그인 세션 주입 (pykrx 내장 계정이 CD010 으로 실패하므로 필수)
+    def drain_delivery_outbox(self):
+        """전송 대기열에 남은 항목 재전송"""
         try:
-            install_krx_session()
-            self.logger.info("KRX 로그인 세션 주입 완료")
-        except KrxSessionError as e:
-            self.logger.error(f"KRX 로그인 실패: {e}")
-            self.telegram.send_test_message(f"❌ KRX 로그인 실패\n\n{e}")
-            sys.exit(1)
+            pending_count = self.outbox.drain_all()
+            self.logger.info(f"전송 대기열 처리 완료 - 남은 항목 {pending_count}개")
+            return pending_count
+        except Exception as e:
+            self.logger.error(f"전송 대기열 처리 오류: {e}")
+            return None
+
+    def run_daily_job(self, resume=False, today=None):
+        """일일 작업 실행
 
-        today = datetime.now().strftime('%Y%m%d')
+        Args:
+            resume: True 면 오늘 실행 기록에서 완료된 단계는 건너뛰고 실패한 단계부터 재실행
+            today: 작업 기준일 (YYYYMMDD, 기본값: 오늘)
+
+        Raises:
+            KrxSessionError: KRX 로그인 실패 (알림 전송 후)
+        """
+        self.logger.info("=== 일일 작업 시작 ===")
+
+        today = today or datetime.now().strftime('%Y%m%d')
 
         # 거래일이 아니면 작업 건너뜀
         if not self.collector.is_trading_day(today):
@@ -355,22 +618,204 @@ class KRXReportService:
             self.logger.info("=== 일일 작업 완료 ===")
             return
 
-        # 1. 데이터 수집
-        if self.daily_data_collection():
-            # 2. 리포트 생성 및 전송 (RSI가 계산된 날짜 사용)
-            report_date = getattr(self, '_last_rsi_date', None)
-            if not self.generate_and_send_report(report_date):
-                self.logger.error("리포트 전송 실패")
-                self.telegram.send_test_message("❌ [krx-topsector-report] KRX 리포트 생성 실패")
-        else:
-            self.logger.error("일일 데이터 수집 실패")
-            self.telegram.send_test_message("❌ [krx-topsector-report] KRX 데이터 수집 실패")
+        # 단계 그래프와 실행 기록 저장소는 한 번만 만들어 재사용 (상주 모드)
+        if self._daily_pipeline is None:
+            self._daily_pipeline = self.build_daily_pipeline()
+
+        trade_date = f"{today[:4]}-{today[4:6]}-{today[6:8]}"
+        # 실행 구간의 SQL 문별 통계 수집 (종료 시 상위 N개 요약 출력, 실행 리포트에 포함)
+        query_profile = start_query_profile() if SQL_PROFILE else None
+        # 선택한 단계만 cProfile/샘플링 + tracemalloc 으로 감싸 logs/profiles/ 에 결과 저장
+        stage_profiler = None
+        if self.profile_stages:
+            stage_profiler = StageProfiler(
+                self.profile_stages,
+                mode=self.profiler,
+                run_label=f"{today}_{datetime.now().strftime('%H%M%S')}"
+            )
+        try:
+            result = self._daily_pipeline.run(trade_date, resume=resume, profiler=stage_profiler)
+        finally:
+            if query_profile is not None:
+                stop_query_profile()
+        statuses, errors = result['statuses'], result['errors']
+        if query_profile is not None:
+            self.logger.info(query_profile.format_summary())
+            for slow in query_profile.slow_queries:
+                self.logger.warning(f"[느린 쿼리] {slow['seconds']:.3f}초 {slow['statement'][:200]} - EXPLAIN: {slow['explain']}")
+        self._write_run_report('daily', trade_date, result, resume, query_profile)
+
+        if statuses.get('session') == STATUS_FAILED:
+            self.logger.error(f"KRX 로그인 실패: {errors['session']}")
+            self.telegram.send_test_message(f"❌ KRX 로그인 실패\n\n{errors['session']}")
+            raise KrxSessionError(str(errors['session']))
+
+        failed = sorted(name for name, status in statuses.items() if status == STATUS_FAILED and name in errors)
+        data_failed = [name for name in failed if name.startswith(('collect_', 'rsi_'))]
+        if data_failed:
+            self.logger.error(f"일일 데이터 수집 실패: {', '.join(data_failed)}")
+            self.telegram.send_test_message(
+                f"❌ [krx-topsector-report] KRX 데이터 수집 실패 ({', '.join(data_failed)})\n재실행: python main.py --resume"
+            )
+        elif statuses.get('render') == STATUS_FAILED or statuses.get('deliver') == STATUS_FAILED:
+            self.logger.error("리포트 전송 실패")
+            self.telegram.send_test_message(
+                "❌ [krx-topsector-report] KRX 리포트 생성 실패\n재실행: python main.py --resume"
+            )
 
         self.logger.info("=== 일일 작업 완료 ===")
 
+    def _write_run_report(self, job, trade_date, result, resume, query_profile=None):
+        """단계별 측정값을 JSON/Prometheus 리포트로 저장 (실패해도 작업 결과에는 영향 없음)"""
+        try:
+            report = build_run_report(job, trade_date, result, resume=resume, query_profile=query_profile)
+            json_path, prom_path = write_run_report(report)
+        except Exception as e:
+            self.logger.error(f"실행 리포트 저장 실패: {e}")
+            return
+
+        totals = report['totals']
+        self.logger.info(
+            f"[실행 리포트] {report['duration_seconds']:.1f}초, CPU {totals['cpu_seconds']:.1f}초, "
+            f"쿼리 {totals['queries']}회, 조회 {totals['rows_fetched']}행, 변경 {totals['rows_written']}행 - {json_path}"
+        )
+
+    def warm_up(self, trade_date):
+        """상주 모드 예열 - 장 마감 후 작업이 실제 처리 시간만 걸리도록 미리 준비
+
+        KRX 로그인 세션, DB 연결 풀, 거래일 달력, RSI 계산용 과거 종가 스냅샷, 렌더러를
+        준비한다. 예열 실패는 작업 실패가 아니므로 경고만 남기고 작업 단계에서 다시 시도한다.
+
+        Args:
+            trade_date: 작업 기준일 (YYYY-MM-DD)
+        """
+        started = datetime.now()
+        self.logger.info(f"[상주 모드] 예열 시작 - 기준일: {trade_date}")
+
+        # 거래일 달력 (공휴일 목록은 연도별로 처음 조회할 때 계산됨)
+        self.collector.is_trading_day(datetime.strptime(trade_date, '%Y-%m-%d').date())
+
+        try:
+            install_krx_session(max_age=KRX_SESSION_MAX_AGE)
+        except Exception as e:
+            self.logger.warning(f"[상주 모드] KRX 로그인 예열 실패 (작업 시 재시도): {e}")
+
+        try:
+            with self._db_connection() as conn:
+                for market_type, _ in MARKETS:
+                    self.rsi_calculator.warm_price_history(conn, trade_date, market_type)
+        except Exception as e:
+            self.logger.warning(f"[상주 모드] RSI 종가 스냅샷 예열 실패 (작업 시 개별 조회): {e}")
+
+        try:
+            self.table_generator.warm_up()
+        except Exception as e:
+            self.logger.warning(f"[상주 모드] 렌더러 예열 실패: {e}")
+
+        self.logger.info(f"[상주 모드] 예열 완료 ({(datetime.now() - started).total_seconds():.1f}초)")
+
+    def _run_scheduled_job(self, run_at, resume=False):
+        """스케줄된 일일 작업 실행 (예외가 나도 상주 프로세스는 유지)"""
+        try:
+            self.run_daily_job(resume=resume, today=run_at.strftime('%Y%m%d'))
+        except KrxSessionError:
+            self.logger.error("[상주 모드] KRX 로그인 실패로 작업 중단 - 다음 실행 시각에 다시 시도합니다")
+        except Exception as e:
+            self.logger.error(f"[상주 모드] 일일 작업 오류: {e}")
+
+    def run_daemon(self):
+        """상주 모드 실행 - 거래일마다 DAEMON_RUN_TIME(KST)에 일일 작업 실행
+
+        cron 처럼 매번 새 프로세스를 띄우지 않으므로 모듈 import, KRX 로그인, DB 연결,
+        테이블 확인, 거래일 달력 계산이 프로세스당 한 번만 일어난다.
+        """
+        enable_connection_pool()
+        scheduler = TradingDayScheduler(self.collector.is_trading_day)
+        stop_event = self._stop_event
+
+        def _stop(signum, frame):
+            self.logger.info(f"[상주 모드] 종료 신호 수신 ({signal.Signals(signum).name})")
+            stop_event.set()
+
+        signal.signal(signal.SIGTERM, _stop)
+        signal.signal(signal.SIGINT, _stop)
+
+        self.outbox.start_worker()
+        self.logger.info(f"[상주 모드] 시작 - 거래일 {scheduler.run_time.strftime('%H:%M')} KST 실행")
+
+        try:
+            # 실행 시각이 지난 뒤 기동된 경우 오늘 작업을 이어서 실행 (완료된 단계는 실행 기록으로 건너뜀)
+            missed = scheduler.missed_run()
+            if missed:
+                self.logger.info("[상주 모드] 오늘 실행 시각이 지났습니다. 오늘 작업을 이어서 실행합니다.")
+                self.warm_up(missed.strftime('%Y-%m-%d'))
+                self._run_scheduled_job(missed, resume=True)
+
+            while not stop_event.is_set():
+                run_at = scheduler.next_run()
+                self.logger.info(f"[상주 모드] 다음 실행: {run_at.strftime('%Y-%m-%d %H:%M')} KST")
+
+                if not scheduler.sleep_until(scheduler.warmup_at(run_at), stop_event):
+                    break
+                self.warm_up(run_at.strftime('%Y-%m-%d'))
+
+                if not scheduler.sleep_until(run_at, stop_event):
+                    break
+                self._run_scheduled_job(run_at)
+        finally:
+            self.outbox.stop_worker(timeout=API_DELIVERY_TIMEOUT)
+            self.logger.info("[상주 모드] 종료")
+
+def _parse_date_arg(value):
+    """YYYY-MM-DD 형식 날짜 인자 검증"""
+    try:
+        return datetime.strptime(value, '%Y-%m-%d').strftime('%Y-%m-%d')
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"날짜 형식이 올바르지 않습니다 (YYYY-MM-DD): {value}")
+
+def parse_args(argv=None):
+    """명령행 인자 파싱"""
+    parser = argparse.ArgumentParser(description="KRX 섹터 RSI & 대장주 리포트")
+    parser.add_argument("--init", action="store_true", help="과거 200거래일 초기 데이터 수집")
+    parser.add_argument(
+        "--renderer",
+        choices=RENDERERS,
+        default=None,
+        help="리포트 이미지 렌더러 (기본값: REPORT_RENDERER 환경변수 또는 imgkit)"
+    )
+    parser.add_argument("--resume", action="store_true", help="오늘 실행 기록에서 실패한 단계부터 재실행")
+    parser.add_argument("--drain-outbox", action="store_true", help="전송 대기열에 남은 리포트만 재전송 후 종료")
+    parser.add_argument("--outbox-worker", action="store_true", help="전송 대기열을 주기적으로 재전송하는 워커 실행")
+    parser.add_argument("--daemon", action="store_true", help="상주 모드 - 거래일마다 DAEMON_RUN_TIME(KST)에 일일 작업 실행")
+    parser.add_argument("--from", dest="from_date", type=_parse_date_arg, help="재처리 시작일 (YYYY-MM-DD) - 적재된 데이터로 섹터 RSI 재계산")
+    parser.add_argument("--to", dest="to_date", type=_parse_date_arg, help="재처리 종료일 (YYYY-MM-DD, 기본값: 시작일)")
+    parser.add_argument("--render", action="store_true", help="재처리 시 날짜별 리포트 이미지도 다시 생성 (전송하지 않음)")
+    parser.add_argument("--workers", type=int, default=None, help="재처리 프로세스 수 (기본값: REPROCESS_WORKERS 환경변수 또는 min(4, CPU 수))")
+    parser.add_argument(
+        "--profile",
+        metavar="STAGES",
+        default=None,
+        help="일일 작업에서 프로파일링할 단계 (collect,rsi,leaders,render,deliver 또는 all - 기본값: PROFILE_STAGES 환경변수)"
+    )
+    parser.add_argument(
+        "--profiler",
+        choices=PROFILERS,
+        default=None,
+        help="프로파일러 종류 (기본값: PROFILER 환경변수 또는 cprofile)"
+    )
+    args = parser.parse_args(argv)
+    if (args.to_date or args.render) and not args.from_date:
+        parser.error("--to/--render 는 --from 과 함께 사용해야 합니다")
+    try:
+        parse_profile_stages(args.profile)
+    except ValueError as e:
+        parser.error(str(e))
+    return args
+
 def main():
     """메인 실행 함수"""
-    service = KRXReportService()
+    args = parse_args()
+    service = KRXReportService(renderer=args.renderer, profile_stages=args.profile, profiler=args.profiler)
     
     # 데이터베이스 초기화
     if not service.initialize_database():
@@ -378,17 +823,60 @@ def main():
         return
 
     # 초기 데이터 수집 여부 확인
-    if len(sys.argv) > 1 and sys.argv[1] == "--init":
+    if args.init:
         print("초기 데이터 수집을 시작합니다...")
         if service.collect_initial_data(200):
             print("초기 데이터 수집 완료")
         else:
             print("초기 데이터 수집 실패")
         return
+
+    # 과거 날짜 구간 재처리 (적재된 krx_stock 데이터 사용, 전송 없음)
+    if args.from_date:
+        from reprocess_service import DateRangeReprocessor
+        to_date = args.to_date or args.from_date
+        print(f"{args.from_date} ~ {to_date} 구간 재처리를 시작합니다...")
+        reprocessor = DateRangeReprocessor(workers=args.workers, render=args.render, renderer=args.renderer)
+        summary = reprocessor.run(args.from_date, to_date)
+        print(f"재처리 완료 - 성공 {len(summary['processed'])}일, 실패 {len(summary['failed'])}일, 데이터 없음 {len(summary['missing'])}일")
+        for trade_date, error in sorted(summary['failed'].items()):
+            print(f"  실패 {trade_date}: {error}")
+        if summary['images']:
+            print(f"재생성 이미지 위치: {reprocessor.output_dir}")
+        if summary['failed']:
+            sys.exit(1)
+        return
+
+    # 전송 대기열 재전송 (리포트 재생성 없이)
+    if args.drain_outbox:
+        pending_count = service.drain_delivery_outbox()
+        if pending_count is None:
+            print("전송 대기열 처리 실패")
+        else:
+            print(f"전송 대기열 처리 완료 (남은 항목: {pending_count}개)")
+        return
+
+    if args.outbox_worker:
+        print("전송 대기열 워커를 실행합니다... (Ctrl+C 로 종료)")
+        worker = service.outbox.start_worker()
+        try:
+            while worker.is_alive():
+                worker.join(1)
+        except KeyboardInterrupt:
+            service.outbox.stop_worker()
+        return
     
+    if args.daemon:
+        print("상주 모드로 실행합니다... (Ctrl+C 로 종료)")
+        service.run_daemon()
+        return
+
     # 기본 실행 모드 (일일 작업 실행)
     print("KRX 데이터 수집 및 리포트 작업을 실행합니다...")
-    service.run_daily_job()
+    try:
+        service.run_daily_job(resume=args.resume)
+    except KrxSessionError:
+        sys.exit(1)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -0,0 +1,290 @@
+"""
+과거 날짜 구간 재처리 모듈
+
+이미 적재된 krx_stock 데이터로 지정한 구간의 섹터 RSI 를 다시 계산해 저장하고
+(ON DUPLICATE KEY UPDATE 로 멱등), 선택적으로 날짜별 리포트 이미지를 전송 없이
+다시 렌더링합니다. 날짜 단위 작업은 프로세스 풀에 분배되며, 각 프로세스는
+계산기/렌더러/DB 연결을 한 번만 준비해 여러 날짜에 재사용합니다.
+
+- DateWorker: 프로세스 하나에서 날짜별 재처리 수행
+- DateRangeReprocessor: 구간의 날짜를 프로세스 풀에 분배하고 결과 취합
+"""
+
+# Standard library imports
+import os
+import shutil
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime, timedelta
+
+# Local imports
+from krx_service import KRXDataCollector, RSICalculator, SectorLeaderTracker
+from utils.db_manager import get_db_connection, enable_connection_pool, insert_sector_rsi
+from utils.env_util import load_env
+from utils.logger_util import LoggerUtil
+
+load_env()
+
+MARKET_TYPES = ('KOSPI', 'KOSDAQ')
+
+# 재렌더링한 리포트 이미지 저장 위치 ({출력 디렉토리}/{YYYY-MM-DD}/{시장}_{페이지}.png)
+REPROCESS_OUTPUT_DIR = os.getenv(
+    'REPROCESS_OUTPUT_DIR',
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), 'img', 'reprocess')
+)
+
+# 프로세스별 작업자 (프로세스 풀 initializer 에서 생성)
+_worker = None
+
+
+class DateWorker:
+    """한 프로세스에서 날짜별 RSI 재계산/리포트 재렌더링을 수행하는 작업자"""
+
+    def __init__(self, render=False, renderer=None, output_dir=None, render_workers=None):
+        self.logger = LoggerUtil().get_logger(__name__)
+        self.rsi_calculator = RSICalculator()
+        self.leader_tracker = SectorLeaderTracker()
+        self.output_dir = output_dir or REPROCESS_OUTPUT_DIR
+        self.table_generator = None
+        if render:
+            from table_report_generator import TableReportGenerator
+            self.table_generator = TableReportGenerator(renderer=renderer)
+            if render_workers:
+                # 프로세스 수만큼 나눠 전체 렌더링 스레드 수가 CPU 수를 넘지 않도록 조정
+                self.table_generator.render_workers = render_workers
+
+    def _count_market_rows(self, conn, trade_date):
+        """날짜별 시장별 저장된 종목 수"""
+        with conn.cursor() as cursor:
+            sql = "SELECT market_type, COUNT(*) as count FROM krx_stock WHERE trade_date = %s GROUP BY market_type"
+            cursor.execute(sql, (trade_date,))
+            return {row['market_type']: row['count'] for row in cursor.fetchall()}
+
+    def process(self, trade_date):
+        """
+        한 날짜의 섹터 RSI 를 다시 계산해 저장하고, 설정 시 리포트 이미지를 다시 렌더링합니다.
+
+        Args:
+            trade_date (str): 기준일 (YYYY-MM-DD)
+
+        Returns:
+            dict: {'trade_date', 'sector_rsi': {시장: 업종 수}, 'images': {시장: [이미지 경로]}}
+        """
+        result = {'trade_date': trade_date, 'sector_rsi': {}, 'images': {}}
+
+        conn = get_db_connection()
+        if not conn:
+            raise Exception("데이터베이스 연결 실패")
+
+        try:
+            market_rows = self._count_market_rows(conn, trade_date)
+            for market_type in MARKET_TYPES:
+                if not market_rows.get(market_type):
+                    self.logger.warning(f"[재처리] {trade_date} {market_type} 주가 데이터가 없어 건너뜁니다.")
+                    continue
+
+                # 종목별 과거 종가를 한 번에 적재한 뒤 계산 (종목마다 개별 조회하지 않음)
+                self.rsi_calculator.warm_price_history(conn, trade_date, market_type)
+                sector_rsi_list = self.rsi_calculator.calculate_sector_rsi_batch(conn, trade_date, market_type)
+                if sector_rsi_list:
+                    insert_sector_rsi(conn, sector_rsi_list)
+                result['sector_rsi'][market_type] = len(sector_rsi_list)
+
+            if self.table_generator:
+                result['images'] = self._render(conn, trade_date)
+        finally:
+            conn.close()
+
+        self.logger.info(f"[재처리] {trade_date} 완료 - RSI {result['sector_rsi']}")
+        return result
+
+    def _render(self, conn, trade_date):
+        """날짜별 리포트 이미지를 다시 렌더링해 출력 디렉토리에 복사 (전송하지 않음)"""
+        market_reports = []
+        for market_type in MARKET_TYPES:
+            rsi_summary = self.rsi_calculator.get_rsi_summary(conn, trade_date, market_type)
+            if not rsi_summary or not rsi_summary.get('total_sectors'):
+                continue
+            # krx_sector_leaders 는 현재 대장주만 보관하므로 해당 날짜 기준으로 다시 계산
+            leaders_data = self.leader_tracker.get_sector_leaders_as_of(conn, trade_date, market_type)
+            market_reports.append((rsi_summary, leaders_data, trade_date, market_type))
+
+        if not market_reports:
+            return {}
+
+        # 다른 프로세스가 렌더링한 뒤 아직 복사하지 않은 파일을 지우지 않도록 캐시 정리는 부모 프로세스가 풀 종료 후 한 번만
+        image_paths = self.table_generator.create_sector_table_reports(market_reports, prune=False)
+
+        date_dir = os.path.join(self.output_dir, trade_date)
+        os.makedirs(date_dir, exist_ok=True)
+        output_paths = {}
+        for market_type, paths in image_paths.items():
+            output_paths[market_type] = []
+            for page_num, path in enumerate(paths, 1):
+                output_path = os.path.join(date_dir, f"{market_type}_{page_num:02d}{os.path.splitext(path)[1]}")
+                shutil.copyfile(path, output_path)
+                output_paths[market_type].append(output_path)
+        return output_paths
+
+
+def _init_worker(render, renderer, output_dir, render_workers):
+    """프로세스 풀 initializer - 프로세스당 작업자와 DB 연결(풀)을 한 번만 준비"""
+    global _worker
+    enable_connection_pool(1)
+    _worker = DateWorker(render=render, renderer=renderer, output_dir=output_dir, render_workers=render_workers)
+
+
+def _process_date(trade_date):
+    return _worker.process(trade_date)
+
+
+class DateRangeReprocessor:
+    """날짜 구간 재처리 - 날짜를 프로세스 풀에 분배"""
+
+    def __init__(self, workers=None, render=False, renderer=None, output_dir=None):
+        """
+        Args:
+            workers: 프로세스 수 (REPROCESS_WORKERS, 기본 min(4, CPU 수))
+            render: True 면 날짜별 리포트 이미지를 다시 렌더링 (전송하지 않음)
+            renderer: 리포트 이미지 렌더러 (imgkit, pillow)
+            output_dir: 재렌더링 이미지 저장 위치 (REPROCESS_OUTPUT_DIR)
+        """
+        self.logger = LoggerUtil().get_logger(__name__)
+        self.collector = KRXDataCollector()
+        self.leader_tracker = SectorLeaderTracker()
+        self.workers = max(1, workers or int(os.getenv('REPROCESS_WORKERS', min(4, os.cpu_count() or 1))))
+        self.render = render
+        self.renderer = renderer
+        self.output_dir = output_dir or REPROCESS_OUTPUT_DIR
+
+    def _get_loaded_dates(self, conn, start_date, end_date):
+        """구간 내 krx_stock 데이터가 있는 날짜와 전체 최신 거래일"""
+        with conn.cursor() as cursor:
+            sql = "SELECT DISTINCT trade_date FROM krx_stock WHERE trade_date BETWEEN %s AND %s ORDER BY trade_date"
+            cursor.execute(sql, (start_date, end_date))
+            loaded_dates = [row['trade_date'].strftime('%Y-%m-%d') for row in cursor.fetchall()]
+
+            cursor.execute("SELECT MAX(trade_date) as max_date FROM krx_stock")
+            row = cursor.fetchone()
+            latest_date = row['max_date'].strftime('%Y-%m-%d') if row and row['max_date'] else None
+        return loaded_dates, latest_date
+
+    def _find_missing_trading_days(self, start_date, end_date, loaded_dates):
+        """구간 내 거래일 중 krx_stock 데이터가 없는 날짜"""
+        start = datetime.strptime(start_date, '%Y-%m-%d').date()
+        end = datetime.strptime(end_date, '%Y-%m-%d').date()
+        loaded = set(loaded_dates)
+        missing = []
+        for offset in range((end - start).days + 1):
+            day = start + timedelta(days=offset)
+            if self.collector.is_trading_day(day) and day.strftime('%Y-%m-%d') not in loaded:
+                missing.append(day.strftime('%Y-%m-%d'))
+        return missing
+
+    def run(self, start_date, end_date):
+        """
+        구간 재처리 실행
+
+        Args:
+            start_date (str): 시작일 (YYYY-MM-DD)
+            end_date (str): 종료일 (YYYY-MM-DD, 포함)
+
+        Returns:
+            dict: {'processed': [날짜], 'failed': {날짜: 오류 메시지}, 'missing': [데이터 없는 거래일],
+                   'images': {날짜: {시장: [경로]}}, 'leaders_updated': bool}
+        """
+        if start_date > end_date:
+            raise ValueError(f"시작일이 종료일보다 늦습니다: {start_date} > {end_date}")
+
+        conn = get_db_connection()
+        if not conn:
+            raise Exception("데이터베이스 연결 실패")
+        try:
+            loaded_dates, latest_date = self._get_loaded_dates(conn, start_date, end_date)
+        finally:
+            conn.close()
+
+        summary = {
+            'processed': [],
+            'failed': {},
+            'missing': self._find_missing_trading_days(start_date, end_date, loaded_dates),
+            'images': {},
+            'leaders_updated': False,
+        }
+        if summary['missing']:
+            self.logger.warning(f"[재처리] 주가 데이터가 없는 거래일 {len(summary['missing'])}일 제외: {', '.join(summary['missing'])}")
+        if not loaded_dates:
+            self.logger.warning(f"[재처리] {start_date} ~ {end_date} 구간에 적재된 주가 데이터가 없습니다.")
+            return summary
+
+        workers = min(self.workers, len(loaded_dates))
+        render_workers = max(1, (os.cpu_count() or 1) // workers) if self.render else None
+        self.logger.info(f"[재처리] {start_date} ~ {end_date} {len(loaded_dates)}일 시작 (프로세스 {workers}개, 렌더링: {self.render})")
+
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_worker,
+            initargs=(self.render, self.renderer, self.output_dir, render_workers)
+        ) as executor:
+            futures = {executor.submit(_process_date, trade_date): trade_date for trade_date in loaded_dates}
+            for future in as_completed(futures):
+                trade_date = futures[future]
+                try:
+                    result = future.result()
+                except Exception as e:
+                    summary['failed'][trade_date] = str(e)
+                    self.logger.error(f"[재처리] {trade_date} 실패: {e}")
+                    continue
+                summary['processed'].append(trade_date)
+                if result['images']:
+                    summary['images'][trade_date] = result['images']
+
+        summary['processed'].sort()
+        if self.render:
+            self._prune_render_cache()
+
+        # 대장주 테이블은 현재 상태만 보관하므로 구간이 최신 거래일을 포함할 때만 갱신
+        if latest_date and latest_date in summary['processed']:
+            summary['leaders_updated'] = self._refresh_current_leaders(latest_date)
+        else:
+            self.logger.info("[재처리] 구간에 최신 거래일이 없어 현재 대장주 정보는 갱신하지 않습니다.")
+
+        self.logger.info(
+            f"[재처리] 완료 - 성공 {len(summary['processed'])}일, 실패 {len(summary['failed'])}일, "
+            f"데이터 없음 {len(summary['missing'])}일"
+        )
+        return summary
+
+    def _prune_render_cache(self):
+        """작업 프로세스가 모두 끝난 뒤 렌더링 캐시 정리 (전송 대기 중인 리포트 파일은 유지)"""
+        from table_report_generator import REPORT_IMG_DIR
+        from utils.delivery_outbox import get_referenced_paths
+        from utils.render_cache import RenderCache
+
+        try:
+            conn = get_db_connection()
+            if not conn:
+                raise Exception("데이터베이스 연결 실패")
+            try:
+                keep = get_referenced_paths(conn)
+            finally:
+                conn.close()
+            removed = RenderCache(REPORT_IMG_DIR).prune(keep=keep)
+            if removed:
+                self.logger.info(f"[재처리] 렌더링 캐시 파일 {removed}개 정리")
+        except Exception as e:
+            self.logger.warning(f"[재처리] 렌더링 캐시 정리 중 오류: {e}")
+
+    def _refresh_current_leaders(self, latest_date):
+        """최신 거래일 기준 대장주 갱신 후 연속일수를 과거 데이터로 재계산 (여러 번 실행해도 결과 동일)"""
+        conn = get_db_connection()
+        if not conn:
+            raise Exception("데이터베이스 연결 실패")
+        try:
+            self.leader_tracker.update_sector_leaders(conn, latest_date)
+            self.leader_tracker.recalculate_all_consecutive_days(conn, latest_date)
+            return True
+        except Exception as e:
+            self.logger.error(f"[재처리] 대장주 갱신 오류: {e}")
+            return False
+        finally:
+            conn.close()
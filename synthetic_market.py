@@ -0,0 +1,334 @@
+"""
+합성 시장 데이터 생성 모듈
+
+실제 KRX 데이터 없이 RSI 일괄 계산/대장주 연속일수 재계산/리포트 단계가 데이터
+규모(기간, 종목 수, 업종 수)에 따라 어떻게 늘어나는지 측정할 수 있도록 krx_stock
+형식의 데이터를 결정적으로 생성해 DB에 일괄 적재합니다. 같은 인자(시드 포함)로
+실행하면 항상 같은 데이터가 만들어집니다.
+
+- 업종: 실제 업종명 기반, 업종별 종목 수는 소수 업종에 몰리는 분포
+- 종가: 시장/업종/종목 수익률을 합친 랜덤 워크 (일간 ±30% 가격제한폭 적용)
+- 시가총액: 상장주식수(로그정규분포) x 종가
+- 이벤트: 기간 중 신규 상장, 상장 폐지, 업종 변경
+
+합성 데이터는 실제 업종명과 오늘까지의 거래일을 사용하므로 운영 DB 에 들어가면 업종 RSI,
+대장주, 리포트에 그대로 섞인다. 그래서 적재는 --db 또는 BENCH_DB_NAME 으로 지정한 운영
+DB(DB_NAME)와 다른 전용 DB 에서만 허용한다.
+
+    python synthetic_market.py --db krx_bench --years 5 --listings 4000 --industries 200 --seed 7
+"""
+
+# Standard library imports
+import argparse
+import math
+import os
+import random
+import time
+from datetime import date, datetime, timedelta
+
+# Local imports
+from fake_services import SYNTHETIC_SECTORS, SYNTHETIC_MARKET_NAMES
+from krx_service import KRXDataCollector
+from utils.db_manager import get_db_connection, create_tables_if_not_exists, insert_stock_data
+from utils.logger_util import LoggerUtil
+
+# 시장별 종목 비중 (실제 KOSPI 약 950, KOSDAQ 약 1700 종목)
+KOSPI_RATIO = 0.36
+
+# KRX 일간 가격제한폭
+PRICE_LIMIT = 0.30
+
+# 합성 종목코드 접두어 (실제 종목코드와 겹치지 않도록 숫자가 아닌 문자로 시작, 예: Z00001)
+SYNTHETIC_CODE_PREFIX = 'Z'
+
+
+def _industry_names(market, count):
+    """시장별 업종명 count 개 (기본 업종명이 모자라면 번호를 붙여 확장)"""
+    base = SYNTHETIC_SECTORS[market]
+    names = []
+    for i in range(count):
+        suffix = i // len(base)
+        name = base[i % len(base)]
+        names.append(f"{name} {suffix + 1}" if suffix else name)
+    return names
+
+
+class SyntheticMarketGenerator:
+    """krx_stock 형식의 결정적 합성 주가 데이터 생성기"""
+
+    def __init__(self, listings=2500, industries=42, years=1.0, end_date=None, seed=0,
+                 listing_rate=0.08, delisting_rate=0.05, industry_change_rate=0.02):
+        """
+        Args:
+            listings: 전체 종목 수 (기간 중 신규 상장/상장 폐지 종목 포함)
+            industries: 전체 업종 수 (시장별로 종목 비중에 맞춰 분배)
+            years: 생성 기간 (년, end_date 까지 거슬러 올라감)
+            end_date: 마지막 거래일 (date 또는 'YYYY-MM-DD', 기본 오늘)
+            seed: 난수 시드 (같은 시드면 같은 데이터)
+            listing_rate: 기간 중 신규 상장하는 종목 비율 (연간)
+            delisting_rate: 기간 중 상장 폐지되는 종목 비율 (연간)
+            industry_change_rate: 기간 중 업종이 바뀌는 종목 비율 (연간)
+        """
+        self.logger = LoggerUtil().get_logger(__name__)
+        if isinstance(end_date, str):
+            end_date = datetime.strptime(end_date, '%Y-%m-%d').date()
+        self.end_date = end_date or date.today()
+        self.start_date = self.end_date - timedelta(days=int(round(years * 365)))
+        self.listings = max(2, int(listings))
+        self.industries = max(2, int(industries))
+        self.years = years
+        self.seed = seed
+        self.listing_rate = listing_rate
+        self.delisting_rate = delisting_rate
+        self.industry_change_rate = industry_change_rate
+        self.collector = KRXDataCollector()
+        self._trading_days = None
+        self._universe = None
+
+    def trading_days(self):
+        """기간 내 거래일 목록 (주말/한국 공휴일 제외)"""
+        if self._trading_days is None:
+            days = []
+            day = self.start_date
+            while day <= self.end_date:
+                if self.collector.is_trading_day(day):
+                    days.append(day)
+                day += timedelta(days=1)
+            self._trading_days = days
+        return self._trading_days
+
+    def _event_index(self, rng, rate, day_count):
+        """연간 비율 rate 로 발생하는 이벤트의 거래일 인덱스 (발생하지 않으면 None)"""
+        if rng.random() < min(1.0, rate * self.years):
+            return rng.randrange(1, day_count)
+        return None
+
+    def universe(self):
+        """
+        종목 목록 (한 번 생성)
+
+        Returns:
+            list: [{'code', 'name', 'market_type', 'industry', 'shares', 'price', 'volatility',
+                    'listed_at', 'delisted_at', 'industry_change_at', 'new_industry'}]
+                  *_at 은 trading_days() 인덱스 (None 이면 해당 이벤트 없음)
+        """
+        if self._universe is not None:
+            return self._universe
+
+        rng = random.Random(f"synthetic:{self.seed}")
+        day_count = len(self.trading_days())
+        kospi_count = max(1, int(round(self.listings * KOSPI_RATIO)))
+        kospi_industries = max(1, min(self.industries - 1, int(round(self.industries * KOSPI_RATIO))))
+        layout = (
+            ('STK', kospi_count, kospi_industries),
+            ('KSQ', self.listings - kospi_count, self.industries - kospi_industries),
+        )
+
+        stocks = []
+        for market, count, industry_count in layout:
+            market_type = SYNTHETIC_MARKET_NAMES[market]
+            industries = _industry_names(market, industry_count)
+            # 업종별 종목 수가 소수 업종에 몰리도록 Zipf 형태 가중치 (종목 수가 충분하면 업종마다 최소 1종목)
+            weights = [1 / (rank + 1) ** 0.8 for rank in range(industry_count)]
+            assigned = industries + rng.choices(industries, weights=weights, k=max(0, count - industry_count))
+            rng.shuffle(assigned)
+
+            for i, industry in enumerate(assigned[:count]):
+                new_industry = None
+                change_at = self._event_index(rng, self.industry_change_rate, day_count) if day_count > 1 else None
+                if change_at is not None and industry_count > 1:
+                    new_industry = rng.choice([name for name in industries if name != industry])
+                else:
+                    change_at = None
+
+                listed_at = self._event_index(rng, self.listing_rate, day_count) if day_count > 1 else None
+                delisted_at = self._event_index(rng, self.delisting_rate, day_count) if day_count > 1 else None
+                if delisted_at is not None and listed_at is not None and delisted_at <= listed_at:
+                    delisted_at = None
+
+                stocks.append({
+                    'code': f"{SYNTHETIC_CODE_PREFIX}{len(stocks):05d}",
+                    'name': f"{market_type}합성{i:05d}",
+                    'market_type': market_type,
+                    'industry': industry,
+                    'shares': int(rng.lognormvariate(16.5, 1.3)),
+                    'price': float(round(rng.lognormvariate(9.3, 1.1))) + 100,
+                    'volatility': rng.uniform(0.01, 0.04),
+                    'listed_at': listed_at,
+                    'delisted_at': delisted_at,
+                    'industry_change_at': change_at,
+                    'new_industry': new_industry,
+                })
+
+        self._universe = stocks
+        return stocks
+
+    def iter_days(self):
+        """
+        거래일 순서대로 (거래일, 행 목록) 생성
+
+        행은 insert_stock_data() 입력 형식과 같습니다. 종가는 시장/업종/종목 수익률을
+        합친 랜덤 워크이며, 상장 전/폐지 후 종목은 행을 만들지 않습니다.
+        """
+        stocks = self.universe()
+        rng = random.Random(f"synthetic-prices:{self.seed}")
+        industries = sorted({stock['industry'] for stock in stocks} | {stock['new_industry'] for stock in stocks if stock['new_industry']})
+        prices = [stock['price'] for stock in stocks]
+
+        for index, day in enumerate(self.trading_days()):
+            trade_date = day.strftime('%Y-%m-%d')
+            market_return = {market: rng.gauss(0.0002, 0.01) for market in ('KOSPI', 'KOSDAQ')}
+            industry_return = {industry: rng.gauss(0, 0.008) for industry in industries}
+
+            rows = []
+            for i, stock in enumerate(stocks):
+                if stock['listed_at'] is not None and index < stock['listed_at']:
+                    continue
+                if stock['delisted_at'] is not None and index >= stock['delisted_at']:
+                    continue
+
+                industry = stock['industry']
+                if stock['industry_change_at'] is not None and index >= stock['industry_change_at']:
+                    industry = stock['new_industry']
+
+                prev_close = prices[i]
+                if index == 0 or stock['listed_at'] == index:
+                    close = prev_close
+                else:
+                    daily_return = (market_return[stock['market_type']] + industry_return[industry]
+                                    + rng.gauss(0, stock['volatility']))
+                    daily_return = max(-PRICE_LIMIT, min(PRICE_LIMIT, math.expm1(daily_return)))
+                    close = max(1.0, float(round(prev_close * (1 + daily_return))))
+                prices[i] = close
+
+                change = close - prev_close
+                rows.append({
+                    'stock_code': stock['code'],
+                    'stock_name': stock['name'],
+                    'market_type': stock['market_type'],
+                    'industry': industry,
+                    'trade_date': trade_date,
+                    'close_price': close,
+                    'change_amount': change,
+                    'change_rate': round(change / prev_close * 100, 2) if prev_close else 0.0,
+                    'market_cap': int(close * stock['shares']),
+                })
+            yield trade_date, rows
+
+    def summary(self):
+        """생성 규모 요약 (거래일 수, 종목/업종 수, 이벤트 수)"""
+        stocks = self.universe()
+        return {
+            'start_date': self.start_date.strftime('%Y-%m-%d'),
+            'end_date': self.end_date.strftime('%Y-%m-%d'),
+            'trading_days': len(self.trading_days()),
+            'listings': len(stocks),
+            'industries': len({stock['industry'] for stock in stocks}),
+            'new_listings': sum(1 for stock in stocks if stock['listed_at'] is not None),
+            'delistings': sum(1 for stock in stocks if stock['delisted_at'] is not None),
+            'industry_changes': sum(1 for stock in stocks if stock['industry_change_at'] is not None),
+        }
+
+    def load(self, conn, batch_size=5000, clear=False):
+        """
+        생성한 데이터를 krx_stock 에 일괄 적재
+
+        Args:
+            conn: DB 연결
+            batch_size: 한 번에 삽입할 행 수 (여러 거래일을 묶어 삽입)
+            clear: True 면 적재 전에 기간 내 합성 종목 데이터를 삭제
+
+        Returns:
+            dict: summary() + {'rows', 'seconds', 'rows_per_sec'}
+        """
+        create_tables_if_not_exists(conn)
+        if clear:
+            self._clear(conn)
+
+        started = time.perf_counter()
+        total_rows = 0
+        batch = []
+        for trade_date, rows in self.iter_days():
+            batch.extend(rows)
+            if len(batch) >= batch_size:
+                insert_stock_data(conn, batch)
+                total_rows += len(batch)
+                batch = []
+                self.logger.info(f"[합성 데이터] {trade_date} 까지 {total_rows:,}행 적재")
+        if batch:
+            insert_stock_data(conn, batch)
+            total_rows += len(batch)
+
+        elapsed = time.perf_counter() - started
+        result = self.summary()
+        result.update({
+            'rows': total_rows,
+            'seconds': round(elapsed, 2),
+            'rows_per_sec': int(total_rows / elapsed) if elapsed else total_rows,
+        })
+        self.logger.info(f"[합성 데이터] 적재 완료 - {total_rows:,}행, {elapsed:.1f}초")
+        return result
+
+    def _clear(self, conn):
+        """기간 내 합성 종목코드(Z00000~) 데이터 삭제"""
+        with conn.cursor() as cursor:
+            sql = "DELETE FROM krx_stock WHERE trade_date BETWEEN %s AND %s AND stock_code LIKE %s"
+            cursor.execute(sql, (self.start_date, self.end_date, f"{SYNTHETIC_CODE_PREFIX}%"))
+            deleted = cursor.rowcount
+        conn.commit()
+        self.logger.info(f"[합성 데이터] 기존 합성 데이터 {deleted:,}행 삭제")
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="합성 시장 데이터 생성/적재 (부하·규모 테스트용)")
+    parser.add_argument('--years', type=float, default=1.0, help="생성 기간 (년, 기본 1)")
+    parser.add_argument('--listings', type=int, default=2500, help="전체 종목 수 (기본 2500)")
+    parser.add_argument('--industries', type=int, default=42, help="전체 업종 수 (기본 42)")
+    parser.add_argument('--end', help="마지막 거래일 YYYY-MM-DD (기본 오늘)")
+    parser.add_argument('--seed', type=int, default=0, help="난수 시드 (기본 0)")
+    parser.add_argument('--batch-size', type=int, default=5000, help="일괄 삽입 행 수 (기본 5000)")
+    parser.add_argument('--clear', action='store_true', help="적재 전 기간 내 기존 합성 데이터 삭제")
+    parser.add_argument('--dry-run', action='store_true', help="DB 에 적재하지 않고 생성 규모만 출력")
+    parser.add_argument('--db', default=os.getenv('BENCH_DB_NAME'),
+                        help="적재할 전용 DB 이름 (기본 BENCH_DB_NAME, 운영 DB_NAME 과 같으면 거부)")
+    return parser.parse_args(argv)
+
+
+def resolve_target_db(db_name):
+    """합성 데이터를 적재할 DB 이름 확인 (지정하지 않았거나 운영 DB 면 SystemExit)"""
+    if not db_name:
+        raise SystemExit("합성 데이터는 전용 DB 에만 적재합니다 - --db 또는 BENCH_DB_NAME 으로 운영 DB(DB_NAME)와 다른 DB 를 지정하세요")
+    if db_name == os.getenv('DB_NAME'):
+        raise SystemExit(f"--db/BENCH_DB_NAME({db_name})이 운영 DB(DB_NAME)와 같습니다 - 합성 데이터가 리포트에 섞이므로 적재하지 않습니다")
+    return db_name
+
+
+def main():
+    args = parse_args()
+    generator = SyntheticMarketGenerator(
+        listings=args.listings,
+        industries=args.industries,
+        years=args.years,
+        end_date=args.end,
+        seed=args.seed
+    )
+
+    if args.dry_run:
+        result = generator.summary()
+        result['rows'] = sum(len(rows) for _, rows in generator.iter_days())
+    else:
+        db_name = resolve_target_db(args.db)
+        conn = get_db_connection(database=db_name)
+        if not conn:
+            raise SystemExit(f"데이터베이스 연결 실패 ({db_name})")
+        try:
+            result = generator.load(conn, batch_size=args.batch_size, clear=args.clear)
+        finally:
+            conn.close()
+
+    for key, value in result.items():
+        print(f"{key}: {value}")
+
+
+if __name__ == '__main__':
+    main()
@@ -1,21 +1,64 @@
-import pandas as pd
 import os
-import imgkit
-from datetime import datetime
-from dotenv import load_dotenv
+from concurrent.futures import ThreadPoolExecutor
+from utils.env_util import load_env
 from utils.telegram_util import TelegramUtil
 from utils.logger_util import LoggerUtil
-load_dotenv()
+from utils.html_table_template import HtmlTableTemplate
+from utils.render_cache import RenderCache
+from utils.render_assets import FontBundleError, preload_render_assets
+load_env()
+
+# 리포트 이미지(렌더링 캐시) 저장 위치
+REPORT_IMG_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'img')
+
+# 이미지 렌더링 백엔드 (REPORT_RENDERER 환경변수 또는 --renderer 옵션으로 선택)
+RENDERER_IMGKIT = 'imgkit'
+RENDERER_PILLOW = 'pillow'
+RENDERERS = (RENDERER_IMGKIT, RENDERER_PILLOW)
+
+# 렌더링 캐시 키에 포함되는 스타일 버전 (레이아웃/색상 변경 시 올릴 것)
+REPORT_STYLE_VERSION = '2'
+
+# RSI 구간별 (하한, 상한, 배경색, 글자색) - 구간 사이 값은 흰 배경
+RSI_COLOR_BANDS = [
+    (0, 19, '#5c88c7', '#ffffff'),
+    (20, 29, '#b2c7e2', '#000000'),
+    (30, 44, '#e7eef8', '#000000'),
+    (45, 55, '#ffffff', '#000000'),
+    (56, 70, '#ffdadb', '#000000'),
+    (71, 80, '#fa9396', '#000000'),
+    (81, 100, '#fc676b', '#ffffff'),
+]
+RSI_DEFAULT_COLORS = ('#ffffff', '#000000', 600)
+RSI_NA_COLORS = ('#f0f0f0', '#666666', 500)
 
 class TableReportGenerator:
-    def __init__(self):
-        self.logger = LoggerUtil().get_logger()
+    def __init__(self, renderer=None):
+        self.logger = LoggerUtil().get_logger(__name__)
         self.telegram = TelegramUtil()
-        self.img_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'img')
+        self.img_dir = REPORT_IMG_DIR
         self.wkhtmltoimage_path = os.getenv('WKHTMLTOIMAGE_PATH')
+        self.renderer = (renderer or os.getenv('REPORT_RENDERER') or RENDERER_IMGKIT).lower()
+        self._pillow_renderer = None
+        self._html_template = None
+        # 페이지 병렬 렌더링 설정
+        self.render_workers = max(1, int(os.getenv('REPORT_RENDER_WORKERS', min(8, os.cpu_count() or 1))))
+        self.render_retries = max(0, int(os.getenv('REPORT_RENDER_RETRIES', 2)))
+
+        if self.renderer not in RENDERERS:
+            raise ValueError(f"지원하지 않는 렌더러입니다: {self.renderer} (사용 가능: {', '.join(RENDERERS)})")
         
         if not os.path.exists(self.img_dir):
             os.makedirs(self.img_dir)
+
+        self.render_cache = RenderCache(self.img_dir)
+        # 폰트/CSS 에셋을 프로세스당 한 번 메모리에 올림 (오프라인 렌더링)
+        # 번들 문제는 생성 시점이 아니라 렌더링 시점에 오류로 처리
+        self.asset_digest = None
+        try:
+            self.asset_digest = preload_render_assets()
+        except FontBundleError as e:
+            self.logger.error(f"렌더링 폰트 번들 오류 (렌더링 시 다시 확인): {e}")
     
     def format_market_cap_billions(self, market_cap):
         """시가총액을 억원 단위로 변환 (천단위 콤마 포함)"""
@@ -47,6 +90,47 @@ class TableReportGenerator:
         else:
             return "#000000"
     
+    def get_rsi_colors(self, rsi_value):
+        """RSI 값에 따른 (배경색, 글자색, font-weight) 반환"""
+        if rsi_value == 'N/A' or rsi_value is None:
+            return RSI_NA_COLORS
+
+        try:
+            rsi = float(rsi_value)
+        except (ValueError, TypeError):
+            return RSI_NA_COLORS
+
+        for lower, upper, background, color in RSI_COLOR_BANDS:
+            if lower <= rsi <= upper:
+                return background, color, 600
+        return RSI_DEFAULT_COLORS
+
+    def _get_asset_digest(self):
+        """렌더링 캐시 키에 넣을 에셋 해시 (생성 시 실패했으면 다시 로드, 실패 시 FontBundleError)"""
+        if self.asset_digest is None:
+            self.asset_digest = preload_render_assets()
+        return self.asset_digest
+
+    def _get_html_template(self):
+        """HTML 템플릿을 처음 사용할 때 한 번만 생성"""
+        if self._html_template is None:
+            self._html_template = HtmlTableTemplate(self.get_rsi_colors)
+        return self._html_template
+
+    def _get_pillow_renderer(self):
+        """Pillow 렌더러를 처음 사용할 때 생성"""
+        if self._pillow_renderer is None:
+            from utils.pillow_table_renderer import PillowTableRenderer
+            self._pillow_renderer = PillowTableRenderer(self.get_rsi_colors)
+        return self._pillow_renderer
+
+    def warm_up(self):
+        """상주 모드 예열: 선택된 렌더러를 미리 준비 (HTML 템플릿 또는 Pillow 렌더러)"""
+        if self.renderer == RENDERER_PILLOW:
+            self._get_pillow_renderer()
+        else:
+            self._get_html_template()
+
     def format_rsi_cell(self, rsi_value):
         """RSI 셀 포맷팅 (단순 숫자 반환)"""
         if rsi_value is None:
@@ -62,6 +146,8 @@ class TableReportGenerator:
     
     def create_sector_dataframe(self, rsi_data, leaders_data, market_type):
         """섹터별 RSI와 대장주 정보를 DataFrame으로 변환"""
+        import pandas as pd
+
         try:
             # RSI 데이터를 딕셔너리로 변환 (빠른 조회를 위해)
             rsi_dict = {}
@@ -157,148 +243,50 @@ class TableReportGenerator:
             return None, None
 
         file_name_base, file_extension = os.path.splitext(file_name)
-        current_date = datetime.now().strftime('%Y%m%d')
-
-        # 페이지 번호가 있으면 파일명에 추가
-        if page_num is not None:
-            new_file_path = os.path.join(self.img_dir, f"{file_name_base}_{current_date}_p{page_num}{file_extension}")
-        else:
-            new_file_path = os.path.join(self.img_dir, f"{file_name_base}_{current_date}{file_extension}")
-        
-        # 기본 HTML 테이블 생성
-        html_table = df.to_html(index=False, classes='styled-table', escape=False, table_id='styled-table')
-        
-        # RSI 값에 따른 배경색 적용 함수
-        def get_rsi_background_style(rsi_value):
-            """RSI 값에 따른 인라인 스타일 반환"""
-            if rsi_value == 'N/A' or rsi_value is None:
-                return 'background-color: #f0f0f0; color: #666666; font-weight: 500; text-align: center;'
-            
-            try:
-                rsi = float(rsi_value)
-                if 0 <= rsi <= 19:
-                    return 'background-color: #5c88c7; color: #ffffff; font-weight: 600; text-align: center;'  # 0-19
-                elif 20 <= rsi <= 29:
-                    return 'background-color: #b2c7e2; color: #000000; font-weight: 600; text-align: center;'  # 20-29
-                elif 30 <= rsi <= 44:
-                    return 'background-color: #e7eef8; color: #000000; font-weight: 600; text-align: center;'  # 30-44
-                elif 45 <= rsi <= 55:
-                    return 'background-color: #ffffff; color: #000000; font-weight: 600; text-align: center;'  # 45-55
-                elif 56 <= rsi <= 70:
-                    return 'background-color: #ffdadb; color: #000000; font-weight: 600; text-align: center;'  # 56-70
-                elif 71 <= rsi <= 80:
-                    return 'background-color: #fa9396; color: #000000; font-weight: 600; text-align: center;'  # 71-80
-                elif 81 <= rsi <= 100:
-                    return 'background-color: #fc676b; color: #ffffff; font-weight: 600; text-align: center;'  # 81-100
-                else:
-                    return 'background-color: #ffffff; color: #000000; font-weight: 600; text-align: center;'
-            except:
-                return 'background-color: #f0f0f0; color: #666666; font-weight: 500; text-align: center;'
-        
-        # HTML에서 RSI 컬럼 셀들에 정규식으로 스타일 적용
-        import re
-        
-        # 각 행을 찾아서 RSI 값이 있는 셀에 스타일 적용
-        def replace_rsi_cells(match):
-            row_html = match.group(0)
-            cells = re.findall(r'<td>(.*?)</td>', row_html)
-            
-            # 헤더 순서에 맞춰 RSI 컬럼 찾기 (RSI(90), RSI(30), RSI(14)는 2,3,4번째 컬럼)
-            rsi_columns = [1, 2, 3]  # 0-based 인덱스 (섹터명 다음 세 컬럼)
-            
-            for i, cell_content in enumerate(cells):
-                if i in rsi_columns:
-                    rsi_value = cell_content.strip()
-                    style = get_rsi_background_style(rsi_value)
-                    # 해당 셀을 스타일이 적용된 것으로 교체
-                    old_cell = f'<td>{cell_content}</td>'
-                    new_cell = f'<td style="{style}">{cell_content}</td>'
-                    row_html = row_html.replace(old_cell, new_cell, 1)
-            
-            return row_html
-        
-        # tbody 내의 모든 행에 적용
-        html_table = re.sub(r'<tr>\s*(<td>.*?</td>\s*)+</tr>', replace_rsi_cells, html_table, flags=re.DOTALL)
 
         # 페이지 정보가 있으면 제목에 추가
         display_title = title
         if page_num is not None and total_pages is not None:
             display_title = f"{title} ({page_num}/{total_pages})"
 
-        # example.py와 동일한 HTML 스타일
-        html_str = f'''
-        <!DOCTYPE html>
-        <html>
-        <head>
-            <meta charset="UTF-8">
-            <link href="https://fonts.googleapis.com/css2?family=Noto+Sans+KR:wght@400;500;700&display=swap" rel="stylesheet">
-            <style>
-                body {{
-                    font-family: 'Noto Sans KR', sans-serif;
-                    margin: 20px;
-                }}
-                table {{
-                    border-collapse: collapse;
-                    width: 100%;
-                    margin: 20px auto;
-                    box-shadow: 0 1px 3px rgba(0,0,0,0.1);
-                }}
-                th, td {{
-                    border: 1px solid #e0e0e0;
-                    padding: 12px 15px;
-                    text-align: center;
-                    vertical-align: middle;
-                }}
-                th {{
-                    background-color: #333333;
-                    color: white;
-                    font-weight: 700;
-                    font-size: 15px;
-                }}
-                td {{
-                    font-size: 13px;
-                    font-weight: 500;
-                    line-height: 1.4;
-                }}
-                
-                .caption {{
-                    text-align: center;
-                    font-size: 22px;
-                    font-weight: 700;
-                    margin: 20px 0;
-                    color: #333333;
-                }}
-                .source {{
-                    text-align: right;
-                    font-size: 12px;
-                    color: #666666;
-                    margin-top: 15px;
-                    font-weight: 400;
-                }}
-                /* 대장주 컬럼 너비 조정 */
-                #styled-table th:nth-child(5),
-                #styled-table th:nth-child(6),
-                #styled-table td:nth-child(5),
-                #styled-table td:nth-child(6) {{
-                    min-width: 150px;
-                    white-space: pre-line;
-                }}
-            </style>
-        </head>
-        <body>
-            <div class="caption">{display_title}</div>
-            {html_table}
-            <div class="source">※ 출처 : MQ(Money Quotient)</div>
-        </body>
-        </html>
-        '''
+        # 페이지 데이터/제목/스타일 버전 해시로 파일명 결정 (동일 페이지는 캐시 재사용)
+        cache_key = self.render_cache.make_key(
+            REPORT_STYLE_VERSION,
+            self._get_asset_digest(),
+            self.renderer,
+            display_title,
+            df.to_json(orient='split', index=False, force_ascii=False)
+        )
+        name_base = f"{file_name_base}_p{page_num}" if page_num is not None else file_name_base
+        new_file_path = self.render_cache.path_for(name_base, cache_key, file_extension)
+
+        if self.render_cache.lookup(new_file_path):
+            self.logger.info(f"렌더링 캐시 사용: {new_file_path}")
+            return new_file_path, title
+
+        temp_file_path = self.render_cache.temp_path_for(new_file_path)
+
+        if self.renderer == RENDERER_PILLOW:
+            try:
+                self._get_pillow_renderer().render(df, display_title, temp_file_path)
+                self.render_cache.store(temp_file_path, new_file_path)
+                return new_file_path, title
+            except Exception as e:
+                self.render_cache.discard(temp_file_path)
+                error_message = f"❌ 테이블 이미지 생성 오류\n\n함수: save_df_as_image (pillow)\n파일: {file_name}\n오류: {str(e)}"
+                self.logger.error(error_message)
+                return None, None
+
+        # 정적 HEAD 와 RSI 룩업 테이블을 재사용하는 템플릿으로 페이지 HTML 생성
+        html_str = self._get_html_template().render(df, display_title)
 
         options = {
             'format': 'png',
             'encoding': "UTF-8",
             'quality': 90,
             'width': 800,  # 테이블이 넓어서 800px로 조정
-            'enable-local-file-access': None
+            'enable-local-file-access': None,
+            'disable-javascript': None  # 번들 에셋만 사용 (외부 리소스 없음)
         }
 
         try:
@@ -307,79 +295,178 @@ class TableReportGenerator:
                 self.logger.error(error_message)
                 raise ValueError("WKHTMLTOIMAGE_PATH 환경변수가 필요합니다.")
                 
+            import imgkit
             config = imgkit.config(wkhtmltoimage=self.wkhtmltoimage_path)
-            imgkit.from_string(html_str, new_file_path, options=options, config=config)
+            imgkit.from_string(html_str, temp_file_path, options=options, config=config)
+            self.render_cache.store(temp_file_path, new_file_path)
             return new_file_path, title
             
         except Exception as e:
+            self.render_cache.discard(temp_file_path)
             error_message = f"❌ 테이블 이미지 생성 오류\n\n함수: save_df_as_image\n파일: {file_name}\n오류: {str(e)}"
             self.logger.error(error_message)
             return None, None
     
-    def create_sector_table_report(self, rsi_data, leaders_data, trade_date, market_type, rows_per_page=10):
-        """섹터 테이블 리포트를 생성하고 이미지 경로 리스트 반환
+    def prepare_sector_pages(self, rsi_data, leaders_data, trade_date, market_type, rows_per_page=10):
+        """섹터 테이블을 페이지 단위 렌더링 작업 리스트로 변환
 
-        Args:
-            rsi_data: RSI 데이터
-            leaders_data: 대장주 데이터
-            trade_date: 거래일
-            market_type: 시장 유형 (KOSPI/KOSDAQ)
-            rows_per_page: 페이지당 행 수 (기본값: 10)
+        Returns:
+            list[dict]: 페이지별 렌더링 작업 (market_type, page_num, total_pages, df, title, file_name)
+        """
+        self.logger.info(f"{market_type} 섹터 테이블 리포트 생성 시작 - 기준일: {trade_date}")
+
+        df = self.create_sector_dataframe(rsi_data, leaders_data, market_type)
+
+        if df.empty:
+            self.logger.warning(f"{market_type}에서 생성할 데이터가 없어 테이블 리포트 생성 중단")
+            return []
+
+        # DataFrame을 페이지별로 분할
+        df_chunks = self.split_dataframe(df, rows_per_page)
+        total_pages = len(df_chunks)
+
+        title = f"{trade_date} {market_type} 섹터 RSI & 대장주 현황"
+        file_name_base = f"sector_table_{market_type.lower()}"
+        file_extension = ".png"
+
+        return [
+            {
+                'market_type': market_type,
+                'page_num': page_num,
+                'total_pages': total_pages,
+                'df': chunk_df,
+                'title': title,
+                'file_name': f"{file_name_base}{file_extension}",
+            }
+            for page_num, chunk_df in enumerate(df_chunks, start=1)
+        ]
+
+    def _render_page(self, page):
+        """단일 페이지 렌더링 (실패 시 None 반환)"""
+        img_path, _ = self.save_df_as_image(
+            page['df'],
+            page['title'],
+            page['file_name'],
+            page_num=page['page_num'],
+            total_pages=page['total_pages']
+        )
+        return img_path
+
+    def render_pages(self, pages):
+        """페이지 작업들을 스레드 풀에서 병렬 렌더링
+
+        실패한 페이지만 개별적으로 최대 render_retries 회 재시도한다.
+        결과는 입력 순서(시장, 페이지 번호)를 유지한다.
 
         Returns:
-            list[str]: 생성된 이미지 경로 리스트 (실패 시 빈 리스트)
+            list[str|None]: pages 와 같은 순서의 이미지 경로 (최종 실패 시 None)
         """
-        try:
-            self.logger.info(f"{market_type} 섹터 테이블 리포트 생성 시작 - 기준일: {trade_date}")
+        if not pages:
+            return []
+
+        results = [None] * len(pages)
+        pending = list(range(len(pages)))
+        workers = min(self.render_workers, len(pages))
+
+        # 워커 스레드 간 경쟁 없이 렌더러를 미리 준비
+        if self.renderer == RENDERER_PILLOW:
+            self._get_pillow_renderer()
+        else:
+            self._get_html_template()
+
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='report-render') as executor:
+            for attempt in range(self.render_retries + 1):
+                if not pending:
+                    break
+                if attempt > 0:
+                    self.logger.warning(f"테이블 이미지 {len(pending)}개 페이지 재시도 ({attempt}/{self.render_retries})")
 
-            df = self.create_sector_dataframe(rsi_data, leaders_data, market_type)
+                futures = {executor.submit(self._render_page, pages[idx]): idx for idx in pending}
+                failed = []
+                for future, idx in futures.items():
+                    page = pages[idx]
+                    try:
+                        img_path = future.result()
+                    except Exception as e:
+                        self.logger.error(f"{page['market_type']} 테이블 이미지 ({page['page_num']}/{page['total_pages']}) 렌더링 예외: {e}")
+                        img_path = None
 
-            if df.empty:
-                self.logger.warning(f"{market_type}에서 생성할 데이터가 없어 테이블 리포트 생성 중단")
-                return []
+                    if img_path:
+                        results[idx] = img_path
+                        self.logger.info(f"{page['market_type']} 테이블 리포트 ({page['page_num']}/{page['total_pages']}) 생성 완료: {img_path}")
+                    else:
+                        failed.append(idx)
+                pending = failed
 
-            # DataFrame을 페이지별로 분할
-            df_chunks = self.split_dataframe(df, rows_per_page)
-            total_pages = len(df_chunks)
+        for idx in pending:
+            page = pages[idx]
+            self.logger.error(f"{page['market_type']} 테이블 이미지 ({page['page_num']}/{page['total_pages']}) 생성 실패")
 
-            title = f"{trade_date} {market_type} 섹터 RSI & 대장주 현황"
-            file_name_base = f"sector_table_{market_type.lower()}"
-            file_extension = ".png"
+        return results
 
-            # 이미지 생성 전 기존 파일 삭제 (한 번만 실행)
+    def create_sector_table_reports(self, market_reports, rows_per_page=10, keep=(), prune=True):
+        """여러 시장의 섹터 테이블 리포트를 한 번에 병렬 렌더링
+
+        Args:
+            market_reports: [(rsi_data, leaders_data, trade_date, market_type), ...]
+            rows_per_page: 페이지당 행 수 (기본값: 10)
+            keep: 캐시 정리 시 이번 결과와 함께 남길 경로 (전송 대기 중인 이전 리포트 등)
+            prune: 렌더링 후 캐시 정리 여부 (여러 프로세스가 같은 캐시에 렌더링하는 동안에는 False)
+
+        Returns:
+            dict: {market_type: [이미지 경로, ...]} (시장별 페이지 순서 유지)
+        """
+        image_paths = {}
+        all_pages = []
+        for rsi_data, leaders_data, trade_date, market_type in market_reports:
+            image_paths[market_type] = []
             try:
-                for old_file in os.listdir(self.img_dir):
-                    if old_file.startswith(file_name_base) and old_file.endswith(file_extension):
-                        os.remove(os.path.join(self.img_dir, old_file))
+                all_pages.extend(self.prepare_sector_pages(rsi_data, leaders_data, trade_date, market_type, rows_per_page))
             except Exception as e:
-                self.logger.warning(f"기존 파일 삭제 중 오류: {e}")
-
-            image_paths = []
-            for page_num, chunk_df in enumerate(df_chunks, start=1):
-                img_path, caption = self.save_df_as_image(
-                    chunk_df,
-                    title,
-                    f"{file_name_base}{file_extension}",
-                    page_num=page_num,
-                    total_pages=total_pages
-                )
-
-                if img_path:
-                    image_paths.append(img_path)
-                    self.logger.info(f"{market_type} 테이블 리포트 ({page_num}/{total_pages}) 생성 완료: {img_path}")
-                else:
-                    self.logger.error(f"{market_type} 테이블 이미지 ({page_num}/{total_pages}) 생성 실패")
-
-            if image_paths:
-                self.logger.info(f"{market_type} 섹터 테이블 리포트 총 {len(image_paths)}개 이미지 생성 완료")
+                self.logger.error(f"{market_type} 섹터 테이블 리포트 생성 오류: {e}")
+
+        try:
+            results = self.render_pages(all_pages)
+        except Exception as e:
+            self.logger.error(f"섹터 테이블 리포트 렌더링 오류: {e}")
+            results = [None] * len(all_pages)
+
+        for page, img_path in zip(all_pages, results):
+            if img_path:
+                image_paths[page['market_type']].append(img_path)
+
+        for market_type, paths in image_paths.items():
+            if paths:
+                self.logger.info(f"{market_type} 섹터 테이블 리포트 총 {len(paths)}개 이미지 생성 완료")
             else:
                 self.logger.error(f"{market_type} 테이블 리포트 이미지 생성 실패")
 
-            return image_paths
+        # 보존 기간/용량 한도를 넘는 이전 렌더링 결과 정리 (이번 결과와 keep 은 유지)
+        if prune:
+            try:
+                self.render_cache.prune(keep=[path for path in results if path] + list(keep))
+            except Exception as e:
+                self.logger.warning(f"렌더링 캐시 정리 중 오류: {e}")
+
+        return image_paths
 
-        except Exception as e:
-            self.logger.error(f"{market_type} 섹터 테이블 리포트 생성 오류: {e}")
-            return []
+    def create_sector_table_report(self, rsi_data, leaders_data, trade_date, market_type, rows_per_page=10):
+        """섹터 테이블 리포트를 생성하고 이미지 경로 리스트 반환
+
+        Args:
+            rsi_data: RSI 데이터
+            leaders_data: 대장주 데이터
+            trade_date: 거래일
+            market_type: 시장 유형 (KOSPI/KOSDAQ)
+            rows_per_page: 페이지당 행 수 (기본값: 10)
+
+        Returns:
+            list[str]: 생성된 이미지 경로 리스트 (실패 시 빈 리스트)
+        """
+        results = self.create_sector_table_reports(
+            [(rsi_data, leaders_data, trade_date, market_type)], rows_per_page
+        )
+        return results.get(market_type, [])
 
 # 테스트용 실행 코드
 if __name__ == "__main__":
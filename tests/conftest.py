@@ -0,0 +1,14 @@
+"""단위 테스트 공용 설정.
+
+테스트 파일에서 프로젝트 모듈(utils.* 등)을 import 할 수 있도록 저장소 루트를
+sys.path 에 추가한다. DB/네트워크 대체 구현은 각 테스트 파일에 둔다.
+
+    python -m pytest -q tests
+"""
+
+import os
+import sys
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT_DIR not in sys.path:
+    sys.path.insert(0, ROOT_DIR)
@@ -0,0 +1,123 @@
+"""DeliveryDispatcher 와 전송 마감 도우미 단위 테스트"""
+
+import threading
+import time
+
+import pytest
+
+from utils import delivery_dispatcher
+from utils.delivery_dispatcher import (
+    DeliveryDispatcher,
+    DeliveryTimeoutError,
+    bounded_timeout,
+    delivery_deadline,
+    delivery_time_limit,
+    remaining_time,
+    wait_before_retry,
+)
+
+
+def _dispatch_one(func, timeout=10):
+    result = DeliveryDispatcher().add('channel', func, timeout=timeout).dispatch()['channel']
+    if not result['success']:
+        raise result['error']
+    return result['result']
+
+
+def test_helpers_are_no_op_outside_dispatcher():
+    assert delivery_deadline() is None
+    assert remaining_time() is None
+    assert bounded_timeout((5, 30)) == (5, 30)
+    wait_before_retry(0)
+
+
+def test_bounded_timeout_clips_to_remaining_time():
+    connect, read = _dispatch_one(lambda: bounded_timeout((5, 30)), timeout=2)
+
+    assert connect == pytest.approx(2, abs=0.5)
+    assert read == pytest.approx(2, abs=0.5)
+    assert _dispatch_one(lambda: bounded_timeout(1), timeout=2) == 1
+
+
+def test_bounded_timeout_raises_after_deadline():
+    def late():
+        time.sleep(0.1)
+        return bounded_timeout(30)
+
+    with pytest.raises(DeliveryTimeoutError) as excinfo:
+        _dispatch_one(late, timeout=0.05)
+    assert excinfo.value.outcome_unknown is False
+
+
+def test_wait_before_retry_gives_up_when_deadline_is_closer():
+    error = ConnectionError("응답 없음")
+
+    def retry():
+        wait_before_retry(5, outcome_unknown=True, error=error)
+
+    started = time.monotonic()
+    with pytest.raises(DeliveryTimeoutError) as excinfo:
+        _dispatch_one(retry, timeout=1)
+
+    # 기다리지 않고 바로 포기
+    assert time.monotonic() - started < 0.5
+    assert excinfo.value.outcome_unknown is True
+    assert excinfo.value.__cause__ is error
+
+
+def test_delivery_time_limit_nests_and_restores():
+    def nested():
+        outer = delivery_deadline()
+        with delivery_time_limit(1):
+            inner = remaining_time()
+            with delivery_time_limit(100):
+                # 바깥 마감보다 늦어지지 않음
+                capped = delivery_deadline()
+        return outer, inner, capped, delivery_deadline()
+
+    outer, inner, capped, restored = _dispatch_one(nested, timeout=10)
+
+    assert inner == pytest.approx(1, abs=0.2)
+    assert capped < outer
+    assert restored == outer
+
+    with delivery_time_limit(1):
+        assert remaining_time() == pytest.approx(1, abs=0.2)
+    assert delivery_deadline() is None
+
+
+def test_channels_run_in_parallel_and_fail_independently():
+    def slow(value):
+        time.sleep(0.2)
+        return value
+
+    def broken():
+        raise ConnectionError("게시판 API 오류")
+
+    dispatcher = DeliveryDispatcher()
+    dispatcher.add('telegram', slow, 'ok', timeout=5).add('board', broken, timeout=5).add('extra', slow, 'ok2')
+
+    started = time.monotonic()
+    results = dispatcher.dispatch()
+
+    assert time.monotonic() - started < 0.35
+    assert results['telegram']['success'] and results['telegram']['result'] == 'ok'
+    assert results['extra']['result'] == 'ok2'
+    assert not results['board']['success']
+    assert isinstance(results['board']['error'], ConnectionError)
+    # 등록한 작업은 한 번만 실행
+    assert dispatcher.dispatch() == {}
+
+
+def test_task_ignoring_deadline_is_reported_as_unknown_outcome(monkeypatch):
+    monkeypatch.setattr(delivery_dispatcher, 'DELIVERY_TIMEOUT_GRACE', 0.05)
+    release = threading.Event()
+
+    started = time.monotonic()
+    results = DeliveryDispatcher().add('stuck', release.wait, 5, timeout=0.05).dispatch()
+    release.set()
+
+    assert time.monotonic() - started < 1
+    error = results['stuck']['error']
+    assert isinstance(error, DeliveryTimeoutError)
+    assert error.outcome_unknown is True
@@ -0,0 +1,431 @@
+"""DeliveryOutbox 단위 테스트 (메모리 대기열 테이블 + 가짜 전송 함수)"""
+
+import json
+import threading
+import time
+
+import pytest
+
+from utils import delivery_outbox
+from utils.delivery_dispatcher import DeliveryTimeoutError
+from utils.delivery_outbox import CHANNEL_BOARD_POST, CHANNEL_TELEGRAM_PHOTOS, CHANNEL_TELEGRAM_TEXT, DeliveryOutbox
+
+LEASE_SECONDS = 300
+
+
+class MemoryOutboxTable:
+    """krx_delivery_outbox 쿼리와 같은 규칙으로 동작하는 메모리 테이블 (now 를 직접 움직이는 시계)"""
+
+    def __init__(self):
+        self.rows = {}
+        self.now = 1_000_000.0
+        self._next_idx = 1
+
+    def by_key(self, key):
+        return next(row for row in self.rows.values() if row['idempotency_key'] == key)
+
+    def ensure(self, conn):
+        pass
+
+    def enqueue(self, conn, idempotency_key, channel, payload):
+        for row in self.rows.values():
+            if row['idempotency_key'] != idempotency_key:
+                continue
+            if row['status'] != 'dead':
+                return 0
+            row.update(payload=payload, attempts=0, next_attempt_at=self.now, last_error=None, status='pending')
+            return 2
+        idx = self._next_idx
+        self._next_idx += 1
+        self.rows[idx] = {
+            'idx': idx, 'idempotency_key': idempotency_key, 'channel': channel, 'payload': payload,
+            'status': 'pending', 'attempts': 0, 'next_attempt_at': self.now, 'last_error': None,
+            'lease_owner': None, 'lease_until': None,
+        }
+        return 1
+
+    def claim(self, conn, lease_owner, limit=20, lease_seconds=300):
+        claimable = [
+            row for _, row in sorted(self.rows.items())
+            if (row['status'] == 'pending' and row['next_attempt_at'] <= self.now)
+            or (row['status'] == 'sending' and row['lease_until'] < self.now)
+        ][:limit]
+        for row in claimable:
+            row.update(status='sending', lease_owner=lease_owner, lease_until=self.now + lease_seconds)
+            row['attempts'] += 1
+        return [
+            {key: row[key] for key in ('idx', 'idempotency_key', 'channel', 'payload', 'attempts')}
+            for _, row in sorted(self.rows.items())
+            if row['lease_owner'] == lease_owner and row['status'] == 'sending'
+        ]
+
+    def _owned(self, idx, lease_owner):
+        row = self.rows.get(idx)
+        return row if row and row['lease_owner'] == lease_owner else None
+
+    def mark_sent(self, conn, idx, lease_owner):
+        row = self._owned(idx, lease_owner)
+        if row:
+            row.update(status='sent', lease_owner=None, lease_until=None, last_error=None)
+        return int(bool(row))
+
+    def mark_failed(self, conn, idx, lease_owner, error, retry_delay=None):
+        row = self._owned(idx, lease_owner)
+        if not row:
+            return 0
+        row.update(lease_owner=None, lease_until=None, last_error=error)
+        if retry_delay is None:
+            row['status'] = 'dead'
+        else:
+            row.update(status='pending', next_attempt_at=self.now + int(retry_delay))
+        return 1
+
+    def hold(self, conn, idx, lease_owner, error):
+        row = self._owned(idx, lease_owner)
+        if not row or row['status'] != 'sending':
+            return 0
+        row['last_error'] = error
+        return 1
+
+    def defer(self, conn, idx, lease_owner, retry_delay):
+        row = self._owned(idx, lease_owner)
+        if not row:
+            return 0
+        row.update(status='pending', lease_owner=None, lease_until=None, next_attempt_at=self.now + int(retry_delay))
+        row['attempts'] = max(0, row['attempts'] - 1)
+        return 1
+
+    def active_payloads(self, conn):
+        return [row['payload'] for row in self.rows.values() if row['status'] in ('pending', 'sending')]
+
+
+@pytest.fixture
+def table(monkeypatch):
+    table = MemoryOutboxTable()
+    for name, func in {
+        'ensure_delivery_outbox_table': table.ensure,
+        'enqueue_delivery': table.enqueue,
+        'claim_deliveries': table.claim,
+        'mark_delivery_sent': table.mark_sent,
+        'mark_delivery_failed': table.mark_failed,
+        'hold_delivery': table.hold,
+        'defer_delivery': table.defer,
+        'get_active_delivery_payloads': table.active_payloads,
+    }.items():
+        monkeypatch.setattr(delivery_outbox, name, func)
+    return table
+
+
+class FakeChannel:
+    """호출 인자를 기록하고 미리 정한 예외를 순서대로 던지는 전송 함수"""
+
+    def __init__(self, *errors):
+        self.errors = list(errors)
+        self.calls = []
+
+    def __call__(self, payload, idempotency_key):
+        self.calls.append((payload, idempotency_key))
+        if self.errors:
+            error = self.errors.pop(0)
+            if error is not None:
+                raise error
+        return {'ok': True}
+
+
+def _outbox(channel, **kwargs):
+    failures = []
+    kwargs.setdefault('max_attempts', 3)
+    outbox = DeliveryOutbox(
+        {CHANNEL_TELEGRAM_PHOTOS: (channel, 5), CHANNEL_BOARD_POST: (FakeChannel(), 5)},
+        on_failure=lambda item, error, final: failures.append((item['idx'], type(error), final)),
+        retry_base=60, retry_max=3600, lease_seconds=LEASE_SECONDS, **kwargs
+    )
+    return outbox, failures
+
+
+def _enqueue(outbox, paths=('img/a.png',)):
+    return outbox.enqueue(None, CHANNEL_TELEGRAM_PHOTOS, {'paths': list(paths)}, key_parts=list(paths))
+
+
+def test_enqueue_is_idempotent(table):
+    outbox, _ = _outbox(FakeChannel())
+
+    key = _enqueue(outbox)
+
+    assert _enqueue(outbox) == key
+    assert len(table.rows) == 1
+    assert _enqueue(outbox, ['img/b.png']) != key
+    assert len(table.rows) == 2
+
+
+def test_enqueue_rejects_unknown_channel(table):
+    outbox, _ = _outbox(FakeChannel())
+
+    with pytest.raises(ValueError):
+        outbox.enqueue(None, 'unknown', {})
+
+
+def test_drain_sends_with_idempotency_key(table):
+    channel = FakeChannel()
+    outbox, failures = _outbox(channel)
+    key = _enqueue(outbox)
+
+    summary = outbox.drain(None)
+
+    assert summary == {'sent': 1, 'retry': 0, 'held': 0, 'deferred': 0, 'dead': 0}
+    assert channel.calls == [({'paths': ['img/a.png']}, key)]
+    assert table.by_key(key)['status'] == 'sent'
+    assert failures == []
+    assert outbox.drain(None)['sent'] == 0
+
+
+def test_transient_failure_retries_after_backoff(table):
+    channel = FakeChannel(ConnectionError("일시 오류"))
+    outbox, failures = _outbox(channel)
+    key = _enqueue(outbox)
+
+    assert outbox.drain(None)['retry'] == 1
+    row = table.by_key(key)
+    assert row['status'] == 'pending'
+    assert row['lease_owner'] is None
+    # 첫 재시도 대기는 retry_base ± 20%
+    assert 48 <= row['next_attempt_at'] - table.now <= 72
+    assert failures == [(row['idx'], ConnectionError, False)]
+
+    # 대기 시간 전에는 다시 보내지 않음
+    assert outbox.drain(None) == {'sent': 0, 'retry': 0, 'held': 0, 'deferred': 0, 'dead': 0}
+
+    table.now += 73
+    assert outbox.drain(None)['sent'] == 1
+    assert table.by_key(key)['attempts'] == 2
+    assert len(channel.calls) == 2
+
+
+def test_retry_delay_grows_exponentially(monkeypatch, table):
+    outbox, _ = _outbox(FakeChannel())
+    monkeypatch.setattr(delivery_outbox.random, 'uniform', lambda low, high: 1.0)
+
+    assert [outbox._retry_delay(attempts) for attempts in (1, 2, 3, 8)] == [60, 120, 240, 3600]
+
+
+def test_gives_up_after_max_attempts(table):
+    channel = FakeChannel(*[ConnectionError("일시 오류")] * 3)
+    outbox, failures = _outbox(channel, max_attempts=2)
+    key = _enqueue(outbox)
+
+    assert outbox.drain(None)['retry'] == 1
+    table.now += 3600
+    assert outbox.drain(None)['dead'] == 1
+    assert table.by_key(key)['status'] == 'dead'
+    assert [final for _, _, final in failures] == [False, True]
+
+    table.now += 3600
+    assert outbox.drain(None)['dead'] == 0
+    assert len(channel.calls) == 2
+
+
+def test_permanent_error_is_not_retried(table):
+    outbox, failures = _outbox(FakeChannel(FileNotFoundError("img/a.png")))
+    key = _enqueue(outbox)
+
+    assert outbox.drain(None)['dead'] == 1
+    assert table.by_key(key)['status'] == 'dead'
+    assert failures[0][1:] == (FileNotFoundError, True)
+
+
+def test_dead_row_is_requeued_on_enqueue(table):
+    channel = FakeChannel(FileNotFoundError("img/a.png"))
+    outbox, _ = _outbox(channel)
+    key = _enqueue(outbox)
+    outbox.drain(None)
+
+    assert _enqueue(outbox) == key
+    row = table.by_key(key)
+    assert (row['status'], row['attempts'], row['last_error']) == ('pending', 0, None)
+
+    assert outbox.drain(None)['sent'] == 1
+    assert len(channel.calls) == 2
+
+
+def test_unknown_outcome_is_held_until_lease_expires(table):
+    channel = FakeChannel(DeliveryTimeoutError("응답 대기 중 제한 시간 초과", outcome_unknown=True))
+    outbox, failures = _outbox(channel)
+    key = _enqueue(outbox)
+
+    assert outbox.drain(None) == {'sent': 0, 'retry': 0, 'held': 1, 'deferred': 0, 'dead': 0}
+    row = table.by_key(key)
+    assert row['status'] == 'sending'
+    assert row['lease_owner'] is not None
+    assert '제한 시간' in row['last_error']
+    assert failures[0][1:] == (DeliveryTimeoutError, False)
+
+    # 이미 전달됐을 수 있으므로 점유가 끝나기 전에는 다시 보내지 않음
+    table.now += LEASE_SECONDS - 1
+    assert outbox.drain(None)['sent'] == 0
+    assert len(channel.calls) == 1
+
+    table.now += 2
+    assert outbox.drain(None)['sent'] == 1
+    assert table.by_key(key)['attempts'] == 2
+
+
+def test_timeout_before_sending_is_retried(table):
+    channel = FakeChannel(DeliveryTimeoutError("요청 보내기 전 제한 시간 초과"))
+    outbox, _ = _outbox(channel)
+    key = _enqueue(outbox)
+
+    assert outbox.drain(None)['retry'] == 1
+    assert table.by_key(key)['status'] == 'pending'
+
+
+def test_unknown_outcome_on_last_attempt_gives_up(table):
+    outbox, _ = _outbox(FakeChannel(DeliveryTimeoutError("결과 불명", outcome_unknown=True)), max_attempts=1)
+    key = _enqueue(outbox)
+
+    assert outbox.drain(None)['dead'] == 1
+    assert table.by_key(key)['status'] == 'dead'
+
+
+def test_expired_lease_of_crashed_worker_is_reclaimed(table):
+    channel = FakeChannel()
+    outbox, _ = _outbox(channel)
+    key = _enqueue(outbox)
+    # 다른 워커가 점유한 뒤 결과를 기록하지 못하고 종료
+    table.claim(None, 'crashed-worker', lease_seconds=LEASE_SECONDS)
+
+    assert outbox.drain(None)['sent'] == 0
+    table.now += LEASE_SECONDS + 1
+    assert outbox.drain(None)['sent'] == 1
+    assert table.by_key(key)['attempts'] == 2
+
+
+def test_referenced_paths_cover_unsent_rows(table):
+    outbox, _ = _outbox(FakeChannel(None, ConnectionError("일시 오류")))
+    _enqueue(outbox, ['img/sent.png'])
+    outbox.drain(None)
+    _enqueue(outbox, ['img/retry.png'])
+    outbox.drain(None)
+    outbox.enqueue(None, CHANNEL_BOARD_POST, {'title': '리포트', 'image_paths': ['img/board.png']})
+    table.enqueue(None, 'broken', 'telegram_text', '{not json')
+
+    assert delivery_outbox.get_referenced_paths(None) == {'img/retry.png', 'img/board.png'}
+
+
+def test_payload_round_trips_as_json(table):
+    outbox, _ = _outbox(FakeChannel())
+    key = outbox.enqueue(None, CHANNEL_BOARD_POST, {'title': '제목', 'image_paths': []})
+
+    assert json.loads(table.by_key(key)['payload']) == {'image_paths': [], 'title': '제목'}
+
+
+class OrderedChannel(FakeChannel):
+    """전송 순서와 동시 실행 여부를 기록하는 전송 함수"""
+
+    def __init__(self, log, *errors, delay=0.05):
+        super().__init__(*errors)
+        self.log = log
+        self.delay = delay
+
+    def __call__(self, payload, idempotency_key):
+        self.log.append(('start', payload.get('caption') or payload.get('title')))
+        time.sleep(self.delay)
+        try:
+            return super().__call__(payload, idempotency_key)
+        finally:
+            self.log.append(('end', payload.get('caption') or payload.get('title')))
+
+
+def _lane_outbox(telegram, board, **kwargs):
+    return DeliveryOutbox(
+        {CHANNEL_TELEGRAM_PHOTOS: (telegram, 5), CHANNEL_BOARD_POST: (board, 5)},
+        retry_base=60, retry_max=3600, lease_seconds=LEASE_SECONDS, max_attempts=3, **kwargs
+    )
+
+
+def _enqueue_markets(outbox):
+    for market in ('KOSPI', 'KOSDAQ'):
+        outbox.enqueue(None, CHANNEL_TELEGRAM_PHOTOS, {'paths': [f"img/{market}.png"], 'caption': market},
+                       key_parts=[market])
+    outbox.enqueue(None, CHANNEL_BOARD_POST, {'title': 'board', 'image_paths': []})
+
+
+def test_same_lane_is_sent_in_order_while_channels_run_concurrently(table):
+    log = []
+    outbox = _lane_outbox(OrderedChannel(log), OrderedChannel(log, delay=0.1))
+    _enqueue_markets(outbox)
+
+    assert outbox.drain(None)['sent'] == 3
+
+    telegram = [event for event in log if event[1] != 'board']
+    assert telegram == [('start', 'KOSPI'), ('end', 'KOSPI'), ('start', 'KOSDAQ'), ('end', 'KOSDAQ')]
+    # 게시판 API 는 텔레그램과 동시에 전송
+    assert log.index(('start', 'board')) < log.index(('end', 'KOSPI'))
+
+
+def test_failed_item_defers_the_rest_of_its_lane(table):
+    log = []
+    telegram = OrderedChannel(log, ConnectionError("일시 오류"), delay=0)
+    outbox = _lane_outbox(telegram, OrderedChannel(log, delay=0))
+    _enqueue_markets(outbox)
+
+    summary = outbox.drain(None)
+
+    assert (summary['retry'], summary['deferred'], summary['sent']) == (1, 1, 1)
+    kospi, kosdaq = table.by_key(outbox.make_key(CHANNEL_TELEGRAM_PHOTOS, 'KOSPI')), \
+        table.by_key(outbox.make_key(CHANNEL_TELEGRAM_PHOTOS, 'KOSDAQ'))
+    # 보내지 않은 항목은 시도 횟수를 쓰지 않고 앞 항목보다 늦게 다시 전송 시점이 됨
+    assert (kosdaq['status'], kosdaq['attempts']) == ('pending', 0)
+    assert kosdaq['next_attempt_at'] > kospi['next_attempt_at']
+    assert [caption for state, caption in log if state == 'start' and caption != 'board'] == ['KOSPI']
+
+    table.now = kospi['next_attempt_at']
+    assert outbox.drain(None)['sent'] == 1
+    table.now = kosdaq['next_attempt_at']
+    assert outbox.drain(None)['sent'] == 1
+    assert [caption for state, caption in log if state == 'start' and caption != 'board'] == ['KOSPI', 'KOSPI', 'KOSDAQ']
+
+
+def test_unknown_outcome_defers_the_rest_until_lease_expires(table):
+    telegram = FakeChannel(DeliveryTimeoutError("결과 불명", outcome_unknown=True))
+    outbox = _lane_outbox(telegram, FakeChannel())
+    _enqueue_markets(outbox)
+
+    summary = outbox.drain(None)
+
+    assert (summary['held'], summary['deferred']) == (1, 1)
+    kosdaq = table.by_key(outbox.make_key(CHANNEL_TELEGRAM_PHOTOS, 'KOSDAQ'))
+    assert kosdaq['next_attempt_at'] > table.now + LEASE_SECONDS
+
+
+def test_final_failure_does_not_block_its_lane(table):
+    telegram = FakeChannel(FileNotFoundError("img/KOSPI.png"))
+    outbox = _lane_outbox(telegram, FakeChannel())
+    _enqueue_markets(outbox)
+
+    summary = outbox.drain(None)
+
+    assert (summary['dead'], summary['sent'], summary['deferred']) == (1, 2, 0)
+
+
+def test_lane_key_groups_channels(table):
+    log = []
+    lock = threading.Lock()
+
+    def record(name):
+        def handler(payload, idempotency_key):
+            with lock:
+                log.append(('start', name))
+            time.sleep(0.05)
+            with lock:
+                log.append(('end', name))
+        return handler
+
+    outbox = DeliveryOutbox(
+        {CHANNEL_TELEGRAM_PHOTOS: (record('photo'), 5), CHANNEL_TELEGRAM_TEXT: (record('text'), 5)},
+        lease_seconds=LEASE_SECONDS, lane_key=lambda channel, payload: 'chat'
+    )
+    outbox.enqueue(None, CHANNEL_TELEGRAM_PHOTOS, {'paths': []})
+    outbox.enqueue(None, CHANNEL_TELEGRAM_TEXT, {'text': '폴백'})
+
+    assert outbox.drain(None)['sent'] == 2
+    assert log == [('start', 'photo'), ('end', 'photo'), ('start', 'text'), ('end', 'text')]
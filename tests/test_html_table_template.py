@@ -0,0 +1,86 @@
+"""HtmlTableTemplate 단위 테스트 (RSI 스타일 룩업 테이블과 HTML 생성)"""
+
+import pandas as pd
+import pytest
+
+from utils.html_table_template import HtmlTableTemplate
+
+
+def _rsi_colors(value):
+    """RSI 구간별 색상 - 70 이상 과매수, 30 이하 과매도"""
+    if value == 'N/A':
+        return '#ffffff', '#000000', 400
+    try:
+        rsi = float(value)
+    except ValueError:
+        return '#ffffff', '#000000', 400
+    if rsi >= 70:
+        return '#fc676b', '#ffffff', 600
+    if rsi <= 30:
+        return '#5c88c7', '#ffffff', 600
+    return '#f2f2f2', '#000000', 500
+
+
+@pytest.fixture
+def template(tmp_path):
+    return HtmlTableTemplate(_rsi_colors, font_dir=str(tmp_path / 'fonts'))
+
+
+def _expected_style(value):
+    background, color, weight = _rsi_colors(value)
+    return f' style="background-color: {background}; color: {color}; font-weight: {weight}; text-align: center;"'
+
+
+@pytest.mark.parametrize('value', ['0', '29.99', '30', '30.00', '55.5', '70', '72.34', '100', '100.00'])
+def test_rsi_style_lookup_matches_color_function(template, value):
+    assert template.rsi_style(value) == _expected_style(value)
+
+
+@pytest.mark.parametrize('value', ['120', '-5', '69.999', '70.001'])
+def test_rsi_style_outside_lookup_uses_color_function(template, value):
+    assert template.rsi_style(value) == _expected_style(value)
+
+
+@pytest.mark.parametrize('value', ['N/A', None, 'abc', ''])
+def test_rsi_style_for_missing_value(template, value):
+    assert template.rsi_style(value) == _expected_style('N/A')
+
+
+def test_same_style_is_shared(template):
+    assert template.rsi_style('80') is template.rsi_style('99.99')
+    assert len(template._style_cache) == 4
+
+
+def test_render_table_styles_only_rsi_columns(template):
+    df = pd.DataFrame({
+        '섹터': ['반도체'],
+        'RSI(14)': [' 75.00 '],
+        '1등주': ['삼성전자<br><span style="color: #E53935;">+3.20%</span>'],
+    })
+
+    html = template.render_table(df)
+
+    assert '<th>섹터</th><th>RSI(14)</th><th>1등주</th>' in html
+    assert f'<td{_expected_style("75.00")}> 75.00 </td>' in html
+    # 셀 값은 이미 만든 HTML 이므로 이스케이프하지 않음
+    assert '<td>삼성전자<br><span style="color: #E53935;">+3.20%</span></td>' in html
+    assert html.count('<tr>') == 1
+    assert html.endswith('</tbody>\n</table>')
+
+
+def test_render_table_escapes_headers(template):
+    html = template.render_table(pd.DataFrame({'<섹터>': ['a']}))
+
+    assert '<th>&lt;섹터&gt;</th>' in html
+
+
+def test_render_builds_full_page(template):
+    html = template.render(pd.DataFrame({'섹터': ['반도체']}), 'KOSPI 섹터 리포트')
+
+    assert html.startswith('<!DOCTYPE html>')
+    assert '<div class="caption">KOSPI 섹터 리포트</div>' in html
+    # 번들 폰트가 없으면 설치된 로컬 폰트를 가리키는 @font-face
+    assert "src: local('NanumGothic');" in html
+    assert 'fonts.googleapis.com' not in html
+    assert '※ 출처 : MQ(Money Quotient)' in html
+    assert html.rstrip().endswith('</html>')
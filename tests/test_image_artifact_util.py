@@ -0,0 +1,107 @@
+"""ImageArtifactUtil 단위 테스트 (JPEG 품질 이진 탐색과 전송용 변형본 캐시)"""
+
+import os
+import random
+
+import pytest
+from PIL import Image
+
+from utils.image_artifact_util import ImageArtifactUtil
+
+
+def _util(tmp_path, **kwargs):
+    return ImageArtifactUtil(delivery_dir=str(tmp_path / 'delivery'), **kwargs)
+
+
+def _fake_encoder(util, calls):
+    """품질에 비례한 크기(품질 x 100 바이트)를 돌려주는 _encode 대체"""
+    def encode(img, fmt, quality=None):
+        calls.append(quality)
+        return b'x' * (quality * 100)
+    util._encode = encode
+
+
+@pytest.mark.parametrize('max_file_size, expected_quality', [
+    (5050, 50),
+    (3000, 30),
+    (8500, 85),
+    (100_000, 85),
+])
+def test_search_picks_highest_quality_within_limit(tmp_path, max_file_size, expected_quality):
+    util = _util(tmp_path, max_file_size=max_file_size)
+    calls = []
+    _fake_encoder(util, calls)
+
+    data = util._search_jpeg_quality(Image.new('RGB', (10, 10)))
+
+    assert len(data) == expected_quality * 100
+    # 30~85 구간 이진 탐색 - 품질을 하나씩 내리지 않음
+    assert len(calls) <= 6
+
+
+def test_search_returns_smallest_when_nothing_fits(tmp_path):
+    util = _util(tmp_path, max_file_size=1000)
+    calls = []
+    _fake_encoder(util, calls)
+
+    data = util._search_jpeg_quality(Image.new('RGBA', (10, 10)))
+
+    assert len(data) == util.min_quality * 100
+    assert min(calls) == util.min_quality
+
+
+def _noise_png(path, width, height):
+    rng = random.Random(42)
+    img = Image.frombytes('RGB', (width, height), bytes(rng.getrandbits(8) for _ in range(width * height * 3)))
+    img.save(path, format='PNG')
+    return str(path)
+
+
+def test_small_png_variant_stays_png(tmp_path):
+    util = _util(tmp_path)
+    source = tmp_path / 'report.png'
+    Image.new('RGB', (400, 200), '#ffffff').save(source, format='PNG')
+
+    artifact = util.get_variant(str(source))
+
+    assert artifact['format'] == 'png'
+    assert artifact['path'].endswith('.png')
+    assert os.path.dirname(artifact['path']) == util.store.cache_dir
+
+
+def test_oversized_png_is_resized_and_recompressed(tmp_path):
+    util = _util(tmp_path, max_file_size=200 * 1024)
+    source = _noise_png(tmp_path / 'report.png', 1000, 400)
+
+    artifact = util.get_variant(source)
+
+    assert artifact['format'] == 'jpeg'
+    assert artifact['size'] == os.path.getsize(artifact['path']) <= util.max_file_size
+    with Image.open(artifact['path']) as img:
+        assert (img.format, img.width, img.height) == ('JPEG', 800, 320)
+
+
+def test_variant_is_reused_until_source_changes(tmp_path):
+    util = _util(tmp_path)
+    source = tmp_path / 'report.png'
+    Image.new('RGB', (100, 100), '#ffffff').save(source, format='PNG')
+
+    first = util.get_variant(str(source))
+    # 새 인스턴스도 같은 내용이면 디스크의 변형본을 그대로 사용
+    assert _util(tmp_path).get_variant(str(source))['path'] == first['path']
+
+    Image.new('RGB', (100, 100), '#000000').save(source, format='PNG')
+    assert util.get_variant(str(source))['path'] != first['path']
+
+
+def test_prepare_variants_falls_back_to_source_path(tmp_path):
+    util = _util(tmp_path)
+    good = tmp_path / 'good.png'
+    Image.new('RGB', (10, 10)).save(good, format='PNG')
+    broken = tmp_path / 'broken.png'
+    broken.write_bytes(b'not an image')
+
+    paths = util.prepare_variants([str(good), str(broken)])
+
+    assert paths[0] != str(good) and os.path.isfile(paths[0])
+    assert paths[1] == str(broken)
@@ -0,0 +1,282 @@
+"""KRX 세션 저장/복원 및 만료 시 재로그인·재전송 단위 테스트 (가짜 로그인/서버와 가짜 pykrx webio - 네트워크 없음)"""
+
+import json
+import os
+import stat
+import threading
+import types
+
+import pytest
+import requests
+
+from utils import krx_session_util, rate_limiter
+from utils.krx_session_util import install_krx_session
+
+LOGIN_ID = 'krx-user'
+
+
+class FakeLogin:
+    """_login 대체 - 로그인 횟수를 세고 회차별 쿠키를 가진 세션 반환"""
+
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, login_id, password):
+        self.count += 1
+        session = krx_session_util._new_krx_session()
+        session.cookies.set('JSESSIONID', f'login-{self.count}', domain='data.krx.co.kr', path='/')
+        return session
+
+
+@pytest.fixture
+def krx(monkeypatch, tmp_path):
+    """새 프로세스처럼 주입 상태를 비우고 세션 파일을 임시 디렉토리로 지정"""
+    session_file = tmp_path / 'krx_session.json'
+    monkeypatch.setenv('KRX_LOGIN_ID', LOGIN_ID)
+    monkeypatch.setenv('KRX_LOGIN_PASSWORD', 'secret')
+    monkeypatch.setenv('KRX_SESSION_FILE', str(session_file))
+    monkeypatch.delenv('KRX_SESSION_PERSIST', raising=False)
+    monkeypatch.delenv('KRX_SESSION_TTL', raising=False)
+    monkeypatch.delenv('KRX_BASE_URL', raising=False)
+
+    webio = types.SimpleNamespace(_session=None)
+    monkeypatch.setattr(krx_session_util, 'load_pykrx_webio', lambda: webio)
+    login = FakeLogin()
+    monkeypatch.setattr(krx_session_util, '_login', login)
+    monkeypatch.setattr(krx_session_util, '_session_generation', 0)
+    _new_process(monkeypatch)
+    return types.SimpleNamespace(login=login, webio=webio, session_file=session_file, monkeypatch=monkeypatch)
+
+
+def _new_process(monkeypatch):
+    monkeypatch.setattr(krx_session_util, '_installed', False)
+    monkeypatch.setattr(krx_session_util, '_installed_at', 0.0)
+
+
+def _cookie(session):
+    return session.cookies.get('JSESSIONID')
+
+
+def test_first_install_logs_in_and_saves_session(krx):
+    session = install_krx_session()
+
+    assert krx.login.count == 1
+    assert krx.webio._session is session
+    assert stat.S_IMODE(os.stat(krx.session_file).st_mode) == 0o600
+    saved = json.loads(krx.session_file.read_text(encoding='utf-8'))
+    # 계정 ID 는 평문으로 남기지 않음
+    assert LOGIN_ID not in krx.session_file.read_text(encoding='utf-8')
+    assert saved['expires_at'] - saved['saved_at'] == krx_session_util._DEFAULT_SESSION_TTL
+    assert [cookie['value'] for cookie in saved['cookies']] == ['login-1']
+
+
+def test_installed_session_is_reused_in_process(krx):
+    first = install_krx_session()
+
+    assert install_krx_session() is first
+    assert krx.login.count == 1
+
+
+def test_next_process_restores_saved_session_without_login(krx):
+    install_krx_session()
+    _new_process(krx.monkeypatch)
+
+    session = install_krx_session()
+
+    assert krx.login.count == 1
+    assert _cookie(session) == 'login-1'
+    assert krx.webio._session is session
+
+
+@pytest.mark.parametrize('change', ['account', 'base_url', 'expired', 'cookie_expired'])
+def test_saved_session_is_not_restored_when_invalid(krx, change):
+    install_krx_session()
+    _new_process(krx.monkeypatch)
+    saved = json.loads(krx.session_file.read_text(encoding='utf-8'))
+    if change == 'account':
+        krx.monkeypatch.setenv('KRX_LOGIN_ID', 'other-user')
+    elif change == 'base_url':
+        krx.monkeypatch.setenv('KRX_BASE_URL', 'http://127.0.0.1:8801')
+    elif change == 'expired':
+        saved['expires_at'] = saved['saved_at'] - 1
+    else:
+        saved['cookies'][0]['expires'] = 1
+    krx.session_file.write_text(json.dumps(saved), encoding='utf-8')
+
+    session = install_krx_session()
+
+    assert krx.login.count == 2
+    assert _cookie(session) == 'login-2'
+
+
+def test_max_age_forces_relogin(krx):
+    install_krx_session()
+    _new_process(krx.monkeypatch)
+
+    install_krx_session(max_age=-1)
+
+    assert krx.login.count == 2
+
+
+def test_force_reuses_session_saved_later_by_another_process(krx):
+    install_krx_session()
+    # 다른 프로세스가 그 사이 다시 로그인해 더 새 세션을 저장
+    saved = json.loads(krx.session_file.read_text(encoding='utf-8'))
+    saved['saved_at'] += 60
+    saved['cookies'][0]['value'] = 'other-process'
+    krx.session_file.write_text(json.dumps(saved), encoding='utf-8')
+
+    assert _cookie(install_krx_session(force=True)) == 'other-process'
+    assert krx.login.count == 1
+
+    # 저장된 세션이 지금 것보다 새롭지 않으면 다시 로그인
+    assert _cookie(install_krx_session(force=True)) == 'login-2'
+    assert krx.login.count == 2
+
+
+def test_persist_disabled_never_writes_file(krx):
+    krx.monkeypatch.setenv('KRX_SESSION_PERSIST', 'false')
+
+    install_krx_session()
+    _new_process(krx.monkeypatch)
+    install_krx_session()
+
+    assert krx.login.count == 2
+    assert not krx.session_file.exists()
+
+
+def test_missing_credentials_raise(krx):
+    krx.monkeypatch.delenv('KRX_LOGIN_PASSWORD')
+
+    with pytest.raises(krx_session_util.KrxSessionError):
+        install_krx_session()
+
+
+DATA_URL = 'https://data.krx.co.kr' + krx_session_util._KRX_DATA_PATH
+
+
+class FakeKrxServer(requests.adapters.BaseAdapter):
+    """마지막 로그인 쿠키만 유효하게 보는 가짜 KRX 서버 (데이터 요청 쿠키 기록)"""
+
+    def __init__(self, login, barrier=None):
+        super().__init__()
+        self.login = login
+        self.barrier = barrier
+        self.cookies = []
+        self.lock = threading.Lock()
+
+    def send(self, request, **kwargs):
+        cookie = request.headers.get('Cookie', '')
+        with self.lock:
+            self.cookies.append(cookie)
+        if f'JSESSIONID=login-{self.login.count}' in cookie:
+            return self._response(request, 200, '{"OutBlock_1": []}', 'application/json')
+        if self.barrier is not None:
+            # 모든 스레드가 만료 응답을 받은 뒤 재로그인 시작
+            self.barrier.wait(timeout=5)
+        return self._response(request, 200, 'LOGOUT', 'text/plain')
+
+    @staticmethod
+    def _response(request, status_code, body, content_type):
+        response = requests.models.Response()
+        response.status_code = status_code
+        response._content = body.encode('utf-8')
+        response.headers['Content-Type'] = content_type
+        response.encoding = 'utf-8'
+        response.request = request
+        response.url = request.url
+        return response
+
+    def close(self):
+        pass
+
+
+@pytest.fixture
+def server(krx, monkeypatch):
+    """가짜 서버를 붙인 세션으로 로그인해 주입한 상태 (요청 제한기 없음)"""
+    server = FakeKrxServer(krx.login)
+    new_session = krx_session_util._new_krx_session
+
+    def mounted_session():
+        session = new_session()
+        session.mount('https://data.krx.co.kr', server)
+        return session
+
+    monkeypatch.setattr(krx_session_util, '_new_krx_session', mounted_session)
+    monkeypatch.setattr(rate_limiter, 'get_krx_rate_limiter', lambda: None)
+    install_krx_session()
+    return server
+
+
+def test_expired_response_relogins_and_replays_once(krx, server):
+    session = krx.webio._session
+    krx.login.count += 1  # 서버 쪽에서 세션 만료
+
+    response = session.post(DATA_URL, data={'bld': 'dbms/MDC/STAT/standard/MDCSTAT03901'})
+
+    assert response.json() == {'OutBlock_1': []}
+    assert krx.login.count == 3
+    assert server.cookies == ['JSESSIONID=login-1', 'JSESSIONID=login-3']
+    assert krx.webio._session is not session
+
+
+def test_threads_hitting_same_expiry_share_one_relogin(krx, server):
+    session = krx.webio._session
+    krx.login.count += 1
+    server.barrier = threading.Barrier(4)
+    responses = []
+
+    def fetch():
+        responses.append(session.post(DATA_URL, data={}).text)
+
+    threads = [threading.Thread(target=fetch) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(timeout=10)
+
+    assert responses == ['{"OutBlock_1": []}'] * 4
+    assert krx.login.count == 3
+
+
+def test_replay_is_not_repeated_when_still_expired(krx, server, monkeypatch):
+    session = krx.webio._session
+    krx.login.count += 1
+    # 다시 로그인해도 서버가 계속 만료 응답
+    monkeypatch.setattr(server, 'login', types.SimpleNamespace(count=0))
+
+    response = session.post(DATA_URL, data={})
+
+    assert response.text == 'LOGOUT'
+    assert len(server.cookies) == 2
+
+
+def test_failed_relogin_returns_expired_response(krx, server, monkeypatch):
+    session = krx.webio._session
+    krx.login.count += 1
+
+    def broken_login(login_id, password):
+        raise krx_session_util.KrxSessionError("KRX 로그인 실패: CD010")
+
+    monkeypatch.setattr(krx_session_util, '_login', broken_login)
+    # 저장 세션도 재사용하지 않도록 제거
+    krx.session_file.unlink()
+
+    response = session.post(DATA_URL, data={})
+
+    assert response.text == 'LOGOUT'
+    assert krx.webio._session is session
+
+
+@pytest.mark.parametrize('url, status_code, body, content_type, expired', [
+    (DATA_URL, 200, '{"OutBlock_1": []}', 'application/json', False),
+    (DATA_URL, 200, 'LOGOUT', 'text/plain', True),
+    (DATA_URL, 403, '', 'text/plain', True),
+    (DATA_URL, 200, '<html><body>로그인</body></html>', 'text/html', True),
+    ('https://data.krx.co.kr/contents/MDC/COMS/client/MDCCOMS001.cmd', 200, '<html></html>', 'text/html', False),
+])
+def test_is_expired_response(url, status_code, body, content_type, expired):
+    request = requests.Request('POST', url).prepare()
+    response = FakeKrxServer._response(request, status_code, body, content_type)
+
+    assert krx_session_util._is_expired_response(response) is expired
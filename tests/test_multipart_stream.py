@@ -0,0 +1,123 @@
+"""StreamingMultipartEncoder 단위 테스트 (requests 가 사용하는 urllib3 인코딩과 비교)"""
+
+import os
+import time
+
+import pytest
+from urllib3 import encode_multipart_formdata
+
+from utils.multipart_stream import StreamingMultipartEncoder, UploadDeadlineExceeded
+
+BOUNDARY = 'test-boundary'
+
+
+@pytest.fixture
+def images(tmp_path):
+    paths = []
+    for name, size in (('a.png', 150_000), ('b.png', 10), ('empty.png', 0)):
+        path = tmp_path / name
+        path.write_bytes(os.urandom(size))
+        paths.append(str(path))
+    return paths
+
+
+def _fields(images):
+    fields = [('title', '주간 리포트'), ('category', 'RSI')]
+    fields += [(f"image[{i}]", (os.path.basename(path), path, 'image/png')) for i, path in enumerate(images)]
+    return fields
+
+
+def _expected(fields):
+    """파일을 메모리에 올려 urllib3 로 만든 같은 경계의 본문"""
+    encoded = []
+    for name, value in fields:
+        if isinstance(value, tuple):
+            file_name, path, content_type = value
+            with open(path, 'rb') as f:
+                value = (file_name, f.read(), content_type)
+        encoded.append((name, value))
+    return encode_multipart_formdata(encoded, boundary=BOUNDARY)
+
+
+def test_body_matches_urllib3_encoding(images):
+    fields = _fields(images)
+    encoder = StreamingMultipartEncoder(fields, boundary=BOUNDARY)
+    body, content_type = _expected(fields)
+
+    assert encoder.content_type == content_type
+    assert len(encoder) == encoder.len == len(body)
+    assert encoder.read() == body
+    assert encoder.read() == b''
+
+
+@pytest.mark.parametrize('size', [1, 1000, 64 * 1024, 10 ** 6])
+def test_read_in_chunks(images, size):
+    fields = _fields(images)
+    encoder = StreamingMultipartEncoder(fields, chunk_size=4096, boundary=BOUNDARY)
+
+    chunks = []
+    while True:
+        chunk = encoder.read(size)
+        if not chunk:
+            break
+        assert len(chunk) <= size
+        chunks.append(chunk)
+
+    assert b''.join(chunks) == _expected(fields)[0]
+    assert encoder.bytes_sent == encoder.len
+
+
+def test_iter_chunks_streams_file_in_chunk_size(images):
+    fields = _fields(images)
+    encoder = StreamingMultipartEncoder(fields, chunk_size=4096, boundary=BOUNDARY)
+
+    chunks = list(encoder.iter_chunks())
+
+    assert b''.join(chunks) == _expected(fields)[0]
+    assert max(len(chunk) for chunk in chunks) == 4096
+    assert b'' not in chunks
+
+
+def test_progress_reports_total(images):
+    reports = []
+    encoder = StreamingMultipartEncoder(_fields(images), chunk_size=8192,
+                                        progress=lambda sent, total: reports.append((sent, total)))
+
+    for _ in encoder.iter_chunks():
+        pass
+
+    assert reports[-1] == (encoder.len, encoder.len)
+    assert [sent for sent, _ in reports] == sorted(sent for sent, _ in reports)
+
+
+def test_deadline_passed_aborts_upload(images):
+    encoder = StreamingMultipartEncoder(_fields(images), deadline=time.monotonic() - 1)
+
+    with pytest.raises(UploadDeadlineExceeded):
+        encoder.read(1024)
+    assert encoder.bytes_sent == 0
+    # urllib3 가 연결 오류로 감싸지 않도록 OSError 가 아니어야 함
+    assert not issubclass(UploadDeadlineExceeded, OSError)
+
+
+def test_deadline_checked_per_chunk(monkeypatch, images):
+    now = [0.0]
+    monkeypatch.setattr('utils.multipart_stream.time.monotonic', lambda: now[0])
+    encoder = StreamingMultipartEncoder(_fields(images), chunk_size=4096, deadline=10.0)
+
+    stream = encoder.iter_chunks()
+    next(stream)
+    sent = encoder.bytes_sent
+    now[0] = 10.0
+
+    with pytest.raises(UploadDeadlineExceeded, match=f"{sent}/{encoder.len}"):
+        next(stream)
+
+
+def test_file_size_change_aborts(images):
+    encoder = StreamingMultipartEncoder(_fields(images), boundary=BOUNDARY)
+    with open(images[1], 'ab') as f:
+        f.write(b'grown')
+
+    with pytest.raises(IOError, match="파일 크기"):
+        encoder.read()
@@ -0,0 +1,84 @@
+"""PillowTableRenderer 단위 테스트 (번들 폰트 없이 대체 폰트로 렌더링)"""
+
+import pandas as pd
+import pytest
+from PIL import Image
+
+from utils.pillow_table_renderer import PillowTableRenderer
+
+RSI_BACKGROUND = '#fc676b'
+
+
+def _rsi_colors(value):
+    return (RSI_BACKGROUND, '#ffffff', 600) if value != 'N/A' else ('#ffffff', '#000000', 400)
+
+
+@pytest.fixture
+def renderer(tmp_path):
+    # 빈 폰트 디렉토리 - 번들이 없으면 경고 후 시스템/기본 폰트로 대체
+    return PillowTableRenderer(_rsi_colors, font_dir=str(tmp_path / 'fonts'))
+
+
+def _hex(pixel):
+    return '#{:02x}{:02x}{:02x}'.format(*pixel[:3])
+
+
+def test_parse_cell_splits_lines_and_colors(renderer):
+    cell = '삼성전자<br><span style="color: #E53935;">+3.20%</span>'
+
+    assert renderer._parse_cell(cell) == [('삼성전자', None), ('+3.20%', '#E53935')]
+    assert renderer._parse_cell('<b>반도체</b>') == [('반도체', None)]
+    assert renderer._parse_cell('') == [('', None)]
+
+
+def test_wrap_keeps_lines_within_width(renderer):
+    font = renderer._font(400, renderer.cell_size)
+    text = '아주 긴 섹터 이름이 열 너비를 넘는 경우 ' * 3
+
+    lines = renderer._wrap(font, text, 120)
+
+    assert len(lines) > 1
+    assert all(renderer._text_width(font, line) <= 120 for line in lines)
+    assert renderer._wrap(font, '짧음', 120) == ['짧음']
+
+
+def test_column_widths_fill_table_and_keep_leader_minimum(renderer):
+    header_font = renderer._font(700, renderer.header_size)
+    cell_font = renderer._font(400, renderer.cell_size)
+    columns = ['섹터', '1등주']
+    rows = [[[('반도체', None)], [('삼', None)]]]
+
+    widths = renderer._column_widths(columns, rows, header_font, cell_font)
+
+    assert sum(widths) == pytest.approx(renderer.width - renderer.body_margin * 2)
+    assert widths[1] >= renderer.leader_min_width + renderer.cell_padding_x * 2
+
+
+def test_render_writes_report_png(renderer, tmp_path):
+    df = pd.DataFrame({'섹터': ['반도체', '2차전지'], 'RSI(14)': ['72.5', 'N/A']})
+    file_path = str(tmp_path / 'report.png')
+
+    assert renderer.render(df, 'KOSPI 섹터 리포트', file_path) == file_path
+
+    with Image.open(file_path) as image:
+        assert image.format == 'PNG'
+        assert image.width == renderer.width
+        image = image.convert('RGB')
+        table_top = (renderer.body_margin + renderer.caption_margin * 2
+                     + round(renderer.caption_size * renderer.line_height))
+        header_height = round(renderer.header_size * renderer.line_height) + renderer.cell_padding_y * 2
+        rsi_x = image.width - renderer.body_margin - 5
+        assert _hex(image.getpixel((renderer.body_margin + 5, table_top + 5))) == renderer.header_bg
+        assert _hex(image.getpixel((rsi_x, table_top + header_height + 5))) == RSI_BACKGROUND
+
+
+def test_render_height_grows_with_rows(renderer, tmp_path):
+    heights = []
+    for count in (1, 5):
+        df = pd.DataFrame({'섹터': [f'섹터{i}' for i in range(count)], '1등주': ['삼성전자<br>+1.00%'] * count})
+        file_path = str(tmp_path / f'report_{count}.png')
+        renderer.render(df, '리포트', file_path)
+        with Image.open(file_path) as image:
+            heights.append(image.height)
+
+    assert heights[1] > heights[0]
@@ -0,0 +1,145 @@
+"""SQL 문별 통계(QueryProfile)와 InstrumentedCursor 단위 테스트 (가짜 연결 - DB 없음)"""
+
+import pymysql.cursors
+import pytest
+
+from utils import db_manager
+from utils.db_manager import InstrumentedCursor, QueryProfile, normalize_sql
+from utils.run_report import build_run_report
+
+
+@pytest.mark.parametrize('sql, expected', [
+    ("SELECT * FROM krx_stock_data WHERE code = %s AND date >= %(since)s",
+     "SELECT * FROM krx_stock_data WHERE code = ? AND date >= ?"),
+    ("SELECT *\n  FROM t   WHERE name = 'O''Neil' AND price > -12.5 AND col1 = 3",
+     "SELECT * FROM t WHERE name = ? AND price > ? AND col1 = ?"),
+    ("DELETE FROM t WHERE idx IN (1, 2, 3, 4)", "DELETE FROM t WHERE idx IN (?+)"),
+    ("INSERT INTO t (a, b) VALUES (%s, %s), (%s, %s), (%s, %s)", "INSERT INTO t (a, b) VALUES (?+)+"),
+])
+def test_normalize_sql(sql, expected):
+    assert normalize_sql(sql) == expected
+
+
+def test_in_lists_of_any_length_share_statement():
+    assert normalize_sql("SELECT * FROM t WHERE id IN (%s, %s)") == \
+        normalize_sql("SELECT * FROM t WHERE id IN (%s, %s, %s, %s, %s)")
+
+
+def test_percentile_is_nearest_rank():
+    values = list(range(1, 101))
+
+    assert db_manager._percentile(values, 95) == 95
+    assert db_manager._percentile([3.0], 95) == 3.0
+    assert db_manager._percentile([1, 2, 3, 4], 50) == 2
+
+
+def test_summary_orders_by_total_time_with_p95():
+    profile = QueryProfile(slow_seconds=1)
+    for seconds in [0.01] * 19 + [0.2]:
+        profile.record('SELECT ? FROM a', seconds, rows=10)
+    profile.record('UPDATE b SET x = ?', 0.5, rows=3)
+    profile.record('SELECT ? FROM c', 0.001, rows=1)
+
+    top = profile.summary(top_n=2)
+
+    assert [item['statement'] for item in top] == ['UPDATE b SET x = ?', 'SELECT ? FROM a']
+    assert top[1] == {'statement': 'SELECT ? FROM a', 'count': 20, 'total_seconds': 0.39, 'avg_ms': 19.5,
+                      'p95_ms': 10.0, 'rows': 200}
+    assert profile.totals() == {'queries': 22, 'statements': 3, 'total_seconds': 0.891, 'slow_queries': 0}
+    assert len(profile.summary()) == 3
+
+
+def test_should_explain_slow_statement_once():
+    profile = QueryProfile(slow_seconds=0.5)
+
+    assert not profile.should_explain('SELECT ? FROM a', 0.1)
+    assert profile.should_explain('SELECT ? FROM a', 0.7)
+    assert not profile.should_explain('SELECT ? FROM a', 0.9)
+    # EXPLAIN 할 수 없는 문장
+    assert not profile.should_explain('INSERT INTO a VALUES (?)', 2.0)
+    assert profile.should_explain('delete from a where id = ?', 2.0)
+
+
+def test_format_summary_lists_top_statements():
+    profile = QueryProfile()
+    profile.record('SELECT ? FROM a', 0.25, rows=4)
+    profile.record('SELECT ' + 'x, ' * 80 + 'y FROM b', 0.5, rows=1)
+
+    lines = profile.format_summary(top_n=5).splitlines()
+
+    assert lines[0].startswith('[SQL 통계] 쿼리 2회 / 문장 2종 / 0.75초 / 느린 쿼리 0건')
+    assert lines[1].strip().startswith('1.') and lines[1].endswith('...')
+    assert lines[2].endswith('SELECT ? FROM a')
+
+
+class FakeConnection:
+    """InstrumentedCursor 가 사용하는 연결 대체 - SELECT/EXPLAIN 은 고정 행, 그 외는 변경 행 수 반환"""
+
+    def __init__(self, rows=None, written=0):
+        self.rows = rows or []
+        self.written = written
+        self.executed = []
+
+    def cursor(self):
+        return InstrumentedCursor(self)
+
+
+def _fake_execute(self, query, args=None):
+    sql = query % tuple(repr(arg) for arg in args) if args else query
+    self.connection.executed.append(sql)
+    self._executed = sql
+    if sql.upper().startswith(('SELECT', 'EXPLAIN')):
+        self._rows = [{'id': 1, 'type': 'ALL'}] if sql.startswith('EXPLAIN') else self.connection.rows
+        self.description = (('column',),)
+        self.rowcount = len(self._rows)
+    else:
+        self._rows = None
+        self.description = None
+        self.rowcount = self.connection.written
+    return self.rowcount
+
+
+@pytest.fixture
+def fake_mysql(monkeypatch):
+    monkeypatch.setattr(pymysql.cursors.Cursor, 'execute', _fake_execute)
+    yield
+    db_manager.stop_query_profile()
+
+
+def test_cursor_records_profile_and_explains_slow_query(fake_mysql):
+    conn = FakeConnection(rows=[{'code': '005930', 'close': 71000}] * 3)
+    profile = db_manager.start_query_profile(slow_seconds=0)
+
+    with conn.cursor() as cursor:
+        cursor.execute("SELECT * FROM krx_stock_data WHERE code = %s", ('005930',))
+        cursor.execute("SELECT * FROM krx_stock_data WHERE code = %s", ('000660',))
+
+    assert db_manager.stop_query_profile() is profile
+    assert profile.totals()['queries'] == 2
+    assert profile.summary()[0]['rows'] == 6
+    # 느린 문장은 한 번만 EXPLAIN 하고, EXPLAIN 자체는 통계에 넣지 않음
+    assert conn.executed.count("EXPLAIN SELECT * FROM krx_stock_data WHERE code = '005930'") == 1
+    assert len(conn.executed) == 3
+    assert profile.slow_queries == [{
+        'statement': 'SELECT * FROM krx_stock_data WHERE code = ?',
+        'seconds': profile.slow_queries[0]['seconds'],
+        'sql': "SELECT * FROM krx_stock_data WHERE code = '005930'",
+        'explain': [{'id': 1, 'type': 'ALL'}],
+    }]
+
+    report = build_run_report('daily', '2026-10-16', {
+        'success': True, 'statuses': {}, 'errors': {}, 'started_at': 0, 'duration_seconds': 1,
+    }, query_profile=profile)
+    assert report['sql']['totals']['slow_queries'] == 1
+    assert report['sql']['top'][0]['count'] == 2
+
+
+def test_cursor_counts_stage_rows_without_profile(fake_mysql):
+    conn = FakeConnection(rows=[{'name': '삼성전자'}], written=4)
+
+    with db_manager.track_queries() as stats, conn.cursor() as cursor:
+        cursor.execute("SELECT name FROM t")
+        cursor.execute("UPDATE t SET flag = 1")
+
+    assert stats == {'queries': 2, 'rows_fetched': 1, 'bytes_fetched': 4, 'rows_written': 4}
+    assert conn.executed == ["SELECT name FROM t", "UPDATE t SET flag = 1"]
@@ -0,0 +1,147 @@
+"""TokenBucketRateLimiter 단위 테스트 (가짜 시계 사용, 실제로 대기하지 않음)"""
+
+import json
+
+import pytest
+
+from utils import rate_limiter
+from utils.rate_limiter import TokenBucketRateLimiter
+
+
+class FakeClock:
+    """time.time/time.sleep 대체 - sleep 은 시계만 앞으로 돌림"""
+
+    def __init__(self):
+        self.now = 1_000_000.0
+        self.sleeps = []
+
+    def time(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(rate_limiter, 'time', clock)
+    return clock
+
+
+def _limiter(state_file=None, rate=2.0, burst=2):
+    return TokenBucketRateLimiter(rate, min_rate=0.5, max_rate=4.0, step=0.5, decrease=0.5, burst=burst,
+                                  state_file=state_file)
+
+
+def test_burst_then_paced(clock):
+    limiter = _limiter()
+
+    assert limiter.acquire() == 0
+    assert limiter.acquire() == 0
+    # 버킷이 비면 초당 2회 속도로 토큰이 채워질 때까지 대기
+    assert limiter.acquire() == pytest.approx(0.5)
+    assert limiter.snapshot()['requests'] == 3
+
+
+def test_tokens_refill_up_to_burst(clock):
+    limiter = _limiter()
+    limiter.acquire()
+    limiter.acquire()
+
+    clock.now += 60
+
+    assert limiter.snapshot()['tokens'] == 2
+    assert limiter.acquire() == 0
+    assert limiter.acquire() == 0
+    assert limiter.acquire() > 0
+
+
+def test_success_raises_rate_up_to_max(clock):
+    limiter = _limiter()
+
+    for _ in range(10):
+        limiter.record(False)
+
+    assert limiter.snapshot()['rate'] == 4.0
+
+
+def test_throttle_decreases_rate_and_blocks(clock):
+    limiter = _limiter()
+
+    limiter.record(True, retry_after=5)
+
+    state = limiter.snapshot()
+    assert state['rate'] == 1.0
+    assert state['throttled'] == 1
+    # 차단 중에도 토큰은 채워지므로 해제 시각에 바로 보냄
+    assert limiter.acquire() == pytest.approx(5)
+
+    for _ in range(5):
+        limiter.record(True, retry_after=0)
+    assert limiter.snapshot()['rate'] == 0.5
+
+
+def test_retry_after_is_capped(clock):
+    limiter = _limiter()
+
+    limiter.record(True, retry_after=3600)
+
+    assert limiter.snapshot()['blocked_until'] == clock.now + rate_limiter._MAX_RETRY_AFTER
+
+
+class FakeResponse:
+    def __init__(self, status_code, headers=None):
+        self.status_code = status_code
+        self.headers = headers or {}
+
+
+@pytest.mark.parametrize('response, throttled, blocked', [
+    (FakeResponse(200), 0, 0),
+    (FakeResponse(404), 0, 0),
+    (FakeResponse(429, {'Retry-After': '7'}), 1, 7),
+    (FakeResponse(503, {'Retry-After': 'Wed, 21 Oct 2015 07:28:00 GMT'}), 1, 1 / 1.0),
+])
+def test_record_response(clock, response, throttled, blocked):
+    limiter = _limiter()
+
+    limiter.record_response(response)
+
+    state = limiter.snapshot()
+    assert state['throttled'] == throttled
+    assert max(0.0, state['blocked_until'] - clock.now) == pytest.approx(blocked)
+
+
+def test_state_file_is_shared_between_instances(clock, tmp_path):
+    state_file = str(tmp_path / 'rate.json')
+    first = _limiter(state_file)
+    second = _limiter(state_file)
+
+    first.acquire()
+    first.record(True, retry_after=3)
+
+    state = second.snapshot()
+    assert state['requests'] == 1
+    assert state['rate'] == 1.0
+    assert second.acquire() == pytest.approx(3)
+    with open(state_file, encoding='utf-8') as f:
+        assert json.load(f)['requests'] == 2
+
+
+def test_saved_rate_is_clamped_to_configured_range(clock, tmp_path):
+    state_file = tmp_path / 'rate.json'
+    state_file.write_text(json.dumps({'rate': 100, 'tokens': 0, 'updated_at': clock.now, 'blocked_until': 0,
+                                      'requests': 0, 'throttled': 0}), encoding='utf-8')
+
+    assert _limiter(str(state_file)).snapshot()['rate'] == 4.0
+
+
+def test_corrupt_state_file_starts_fresh(clock, tmp_path):
+    state_file = tmp_path / 'rate.json'
+    state_file.write_text('{broken', encoding='utf-8')
+
+    state = _limiter(str(state_file), rate=3.0).snapshot()
+
+    assert state['rate'] == 3.0
+    assert state['tokens'] == 2
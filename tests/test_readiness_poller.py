@@ -0,0 +1,123 @@
+"""ReadinessPoller 단위 테스트 (가짜 시계와 가짜 종료 신호 - 실제로 대기하지 않음)"""
+
+import types
+
+import pytest
+
+from utils import readiness_poller
+from utils.readiness_poller import ReadinessPoller, ReadinessTimeout
+
+
+class FakeStopEvent:
+    """threading.Event 대체 - wait 는 시계만 앞으로 돌리고 대기 시간을 기록"""
+
+    def __init__(self, clock, stop_after=None):
+        self.clock = clock
+        self.waits = []
+        self.stop_after = stop_after
+
+    def wait(self, timeout):
+        self.waits.append(timeout)
+        self.clock.now += timeout
+        return self.stop_after is not None and len(self.waits) >= self.stop_after
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = types.SimpleNamespace(now=1_000.0)
+    monkeypatch.setattr(readiness_poller, 'time', types.SimpleNamespace(monotonic=lambda: clock.now))
+    # 지터 없이 간격 그대로
+    monkeypatch.setattr(readiness_poller, 'random', types.SimpleNamespace(uniform=lambda low, high: 1.0))
+    return clock
+
+
+def _scripted(*outcomes):
+    """(완료 여부, 진행값) 또는 예외를 차례로 돌려주는 check"""
+    outcomes = list(outcomes)
+    calls = []
+
+    def check():
+        calls.append(len(calls))
+        outcome = outcomes.pop(0)
+        if isinstance(outcome, Exception):
+            raise outcome
+        ready, progress = outcome
+        return ready, progress, 'result' if ready else None
+
+    check.calls = calls
+    return check
+
+
+def _poller(clock, check, deadline_seconds=3600, stop_after=None):
+    stop_event = FakeStopEvent(clock, stop_after)
+    poller = ReadinessPoller('KOSPI', check, deadline_seconds, initial_interval=30, max_interval=300,
+                             backoff=2.0, stop_event=stop_event)
+    return poller, stop_event
+
+
+def test_returns_immediately_when_ready(clock):
+    poller, stop_event = _poller(clock, _scripted((True, 950)))
+
+    assert poller.wait() == 'result'
+    assert stop_event.waits == []
+
+
+def test_interval_backs_off_without_progress(clock):
+    check = _scripted(*[(False, 0)] * 7, (True, 950))
+    poller, stop_event = _poller(clock, check)
+
+    assert poller.wait() == 'result'
+    assert stop_event.waits == [30, 60, 120, 240, 300, 300, 300]
+
+
+def test_progress_resets_interval(clock):
+    check = _scripted((False, 0), (False, 0), (False, 0), (False, 400), (False, 400), (True, 950))
+    poller, stop_event = _poller(clock, check)
+
+    poller.wait()
+
+    # 진행값이 늘어난 다음 확인은 처음 간격으로
+    assert stop_event.waits == [30, 60, 120, 30, 60]
+
+
+def test_check_errors_are_retried(clock):
+    check = _scripted(ConnectionError("빈 응답"), (False, None), (True, 950))
+    poller, stop_event = _poller(clock, check)
+
+    assert poller.wait() == 'result'
+    assert len(check.calls) == 3
+
+
+def test_timeout_clips_last_wait_and_chains_last_error(clock):
+    error = ValueError("JSON 디코딩 실패")
+    check = _scripted((False, 0), (False, 0), (False, 0), error)
+    poller, stop_event = _poller(clock, check, deadline_seconds=100)
+
+    with pytest.raises(ReadinessTimeout) as excinfo:
+        poller.wait()
+
+    # 마감 시각에 마지막으로 한 번 더 확인
+    assert stop_event.waits == [30, 60, 10]
+    assert len(check.calls) == 4
+    assert excinfo.value.__cause__ is error
+
+
+def test_zero_deadline_checks_once(clock):
+    check = _scripted((False, 0))
+    poller, stop_event = _poller(clock, check, deadline_seconds=0)
+
+    with pytest.raises(ReadinessTimeout):
+        poller.wait()
+
+    assert len(check.calls) == 1
+    assert stop_event.waits == []
+
+
+def test_stop_event_interrupts_wait(clock):
+    check = _scripted(*[(False, 0)] * 5)
+    poller, stop_event = _poller(clock, check, stop_after=2)
+
+    with pytest.raises(ReadinessTimeout, match='종료 신호'):
+        poller.wait()
+
+    assert len(check.calls) == 2
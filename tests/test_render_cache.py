@@ -0,0 +1,97 @@
+"""RenderCache 단위 테스트 (키/경로, 적중 확인, 원자적 저장, 보존 기간·용량 정리)"""
+
+import os
+import time
+
+import pytest
+
+from utils.render_cache import RenderCache
+
+DAY = 24 * 60 * 60
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return RenderCache(str(tmp_path / 'img'), max_bytes=1000, max_age_days=7)
+
+
+def _write(path, size=100, age=0):
+    with open(path, 'wb') as f:
+        f.write(b'x' * size)
+    mtime = time.time() - age
+    os.utime(path, (mtime, mtime))
+    return path
+
+
+def test_make_key_is_stable_and_separates_parts():
+    key = RenderCache.make_key('KOSPI', 1, 'v2')
+
+    assert key == RenderCache.make_key('KOSPI', 1, 'v2')
+    assert len(key) == 64
+    assert RenderCache.make_key('ab', 'c') != RenderCache.make_key('a', 'bc')
+    assert RenderCache.make_key('KOSPI', 1, 'v2') != RenderCache.make_key('KOSPI', 1, 'v3')
+
+
+def test_path_for_uses_key_prefix(cache):
+    key = RenderCache.make_key('page')
+
+    path = cache.path_for('sector_table_kospi_1', key)
+
+    assert path == os.path.join(cache.cache_dir, f"sector_table_kospi_1_{key[:16]}.png")
+
+
+def test_lookup_hit_refreshes_mtime(cache):
+    path = cache.path_for('sector_table_a', RenderCache.make_key('a'))
+    assert not cache.lookup(path)
+
+    _write(path, age=3 * DAY)
+
+    assert cache.lookup(path)
+    assert time.time() - os.path.getmtime(path) < 60
+
+
+def test_store_replaces_and_discard_removes_temp(cache):
+    path = cache.path_for('sector_table_a', RenderCache.make_key('a'))
+    temp_path = cache.temp_path_for(path)
+    _write(temp_path, size=10)
+
+    assert cache.store(temp_path, path) == path
+    assert os.path.isfile(path) and not os.path.exists(temp_path)
+
+    failed = cache.temp_path_for(path)
+    _write(failed)
+    cache.discard(failed)
+    cache.discard(failed)
+    assert not os.path.exists(failed)
+
+
+def test_prune_removes_expired_and_stale_temp_files(cache):
+    directory = cache.cache_dir
+    fresh = _write(os.path.join(directory, 'sector_table_fresh.png'), age=DAY)
+    expired = _write(os.path.join(directory, 'sector_table_old.png'), age=8 * DAY)
+    stale_tmp = _write(os.path.join(directory, 'sector_table_x.png.1.2.tmp'), age=2 * 60 * 60)
+    running_tmp = _write(os.path.join(directory, 'sector_table_y.png.1.2.tmp'), age=60)
+    other = _write(os.path.join(directory, 'thumbnail.png'), age=30 * DAY)
+
+    assert cache.prune() == 2
+
+    assert [os.path.exists(path) for path in (fresh, expired, stale_tmp, running_tmp, other)] == \
+        [True, False, False, True, True]
+
+
+def test_prune_keeps_recent_files_within_size_limit(cache):
+    directory = cache.cache_dir
+    paths = [_write(os.path.join(directory, f'sector_table_{i}.png'), size=400, age=i * 60) for i in range(4)]
+
+    # 최근 사용한 2개(800 바이트)만 한도 1000 바이트 안에 남음
+    assert cache.prune() == 2
+
+    assert [os.path.exists(path) for path in paths] == [True, True, False, False]
+
+
+def test_prune_never_removes_kept_paths(cache):
+    directory = cache.cache_dir
+    in_use = _write(os.path.join(directory, 'sector_table_in_use.png'), size=2000, age=30 * DAY)
+
+    assert cache.prune(keep=[in_use, None]) == 0
+    assert os.path.exists(in_use)
@@ -0,0 +1,106 @@
+"""실행 리포트(JSON/Prometheus)와 단계별 쿼리 통계 단위 테스트"""
+
+import json
+import os
+from datetime import datetime
+
+import pytest
+
+from utils import db_manager
+from utils.run_report import build_run_report, render_prometheus, write_run_report
+from utils.stage_runner import STATUS_DONE, STATUS_FAILED, STATUS_SKIPPED
+
+STARTED_AT = datetime(2026, 10, 16, 15, 40, 5).timestamp()
+
+
+def _metrics(wall, queries=0, rows_fetched=0, rows_written=0, bytes_fetched=0, cpu=0.1):
+    return {'wall_seconds': wall, 'cpu_seconds': cpu, 'queries': queries, 'rows_fetched': rows_fetched,
+            'rows_written': rows_written, 'bytes_fetched': bytes_fetched}
+
+
+def _result():
+    """StageRunner.run() 결과 - collect 는 이전 실행 기록에서 복원"""
+    return {
+        'success': False,
+        'statuses': {'collect': STATUS_DONE, 'rsi': STATUS_DONE, 'report': STATUS_FAILED, 'deliver': STATUS_SKIPPED},
+        'errors': {'report': RuntimeError("렌더링 실패")},
+        'metrics': {
+            'rsi': _metrics(1.5, queries=3, rows_fetched=900, bytes_fetched=7200, cpu=0.25),
+            'report': _metrics(0.5, queries=1, rows_written=2, cpu=0.05),
+        },
+        'restored': ['collect'],
+        'started_at': STARTED_AT,
+        'duration_seconds': 2.25,
+    }
+
+
+def test_build_run_report_sums_stage_metrics():
+    report = build_run_report('daily', '2026-10-16', _result(), resume=True)
+
+    assert report['started_at'] == '2026-10-16T15:40:05'
+    assert report['finished_at'] == '2026-10-16T15:40:07'
+    assert (report['resume'], report['success']) == (True, False)
+    assert report['totals'] == {'cpu_seconds': 0.3, 'queries': 4, 'rows_fetched': 900, 'rows_written': 2,
+                                'bytes_fetched': 7200}
+    assert report['stages']['collect'] == {'status': STATUS_DONE, 'restored': True, 'error': None}
+    assert report['stages']['report']['error'] == "렌더링 실패"
+    assert report['stages']['rsi']['rows_fetched'] == 900
+    assert 'sql' not in report
+
+
+def test_prometheus_exposes_only_executed_stages():
+    text = render_prometheus(build_run_report('daily', '2026-10-16', _result()))
+
+    assert '# TYPE krx_job_success gauge' in text
+    assert 'krx_job_success{job="daily"} 0' in text
+    assert 'krx_job_duration_seconds{job="daily"} 2.25' in text
+    assert 'krx_stage_success{job="daily",stage="rsi"} 1' in text
+    assert 'krx_stage_success{job="daily",stage="report"} 0' in text
+    assert 'krx_stage_rows_fetched{job="daily",stage="rsi"} 900' in text
+    # 복원한 단계는 이번 실행에서 측정하지 않았으므로 제외
+    assert 'stage="collect"' not in text
+    assert text.endswith('\n')
+
+
+def test_prometheus_escapes_label_values():
+    report = build_run_report('daily "kospi"\\', '2026-10-16', _result())
+
+    assert 'krx_job_success{job="daily \\"kospi\\"\\\\"} 0' in render_prometheus(report)
+
+
+def test_write_run_report_writes_json_and_replaces_prom(tmp_path):
+    report = build_run_report('daily', '2026-10-16', _result())
+    report_dir, textfile_dir = str(tmp_path / 'reports'), str(tmp_path / 'textfile')
+
+    json_path, prom_path = write_run_report(report, report_dir, textfile_dir)
+
+    assert json_path == os.path.join(report_dir, 'daily_20261016_154005.json')
+    assert prom_path == os.path.join(textfile_dir, 'krx_daily.prom')
+    with open(json_path, encoding='utf-8') as f:
+        assert json.load(f)['totals']['queries'] == 4
+    with open(prom_path, encoding='utf-8') as f:
+        assert f.read() == render_prometheus(report)
+
+    write_run_report(dict(report, duration_seconds=9.5), report_dir, textfile_dir)
+    assert os.listdir(textfile_dir) == ['krx_daily.prom']
+    with open(prom_path, encoding='utf-8') as f:
+        assert 'krx_job_duration_seconds{job="daily"} 9.5' in f.read()
+
+
+def test_track_queries_nested_blocks_add_to_outer():
+    with db_manager.track_queries() as outer:
+        db_manager._query_tracking.stats['queries'] += 1
+        with db_manager.track_queries() as inner:
+            db_manager._query_tracking.stats['rows_written'] += 5
+
+    assert inner == {'queries': 0, 'rows_fetched': 0, 'bytes_fetched': 0, 'rows_written': 5}
+    assert outer == {'queries': 1, 'rows_fetched': 0, 'bytes_fetched': 0, 'rows_written': 5}
+    assert getattr(db_manager._query_tracking, 'stats', None) is None
+
+
+@pytest.mark.parametrize('rows, expected', [
+    ([], 0),
+    ([{'name': '삼성전자', 'close': 71000, 'raw': b'abc'}], 4 + 8 + 3),
+])
+def test_estimate_row_bytes(rows, expected):
+    assert db_manager._estimate_row_bytes(rows) == expected
@@ -0,0 +1,233 @@
+"""StageRunner 단위 테스트 (메모리 실행 기록 + 가짜 단계 함수)"""
+
+import json
+import threading
+
+import pytest
+
+from utils.stage_runner import (
+    STATUS_DONE,
+    STATUS_FAILED,
+    STATUS_SKIPPED,
+    Stage,
+    StageGraphError,
+    StageRunner,
+)
+
+TRADE_DATE = '2024-12-09'
+
+
+class MemoryLedger:
+    """RunLedger 와 같은 인터페이스의 메모리 실행 기록 (산출물은 JSON 으로 왕복)"""
+
+    def __init__(self):
+        self.records = {}
+        self.events = []
+        self.opened = 0
+        self.closed = 0
+
+    def open(self):
+        self.opened += 1
+        return self
+
+    def close(self):
+        self.closed += 1
+
+    def load(self, trade_date):
+        return {
+            stage: {'status': record['status'], 'outputs': json.loads(record['outputs']) if record['outputs'] else {}}
+            for stage, record in self.records.get(trade_date, {}).items()
+        }
+
+    def started(self, trade_date, stage):
+        self.events.append(('started', stage))
+
+    def finished(self, trade_date, stage, status, outputs=None, error=None, duration_ms=None):
+        self.events.append((status, stage))
+        self.records.setdefault(trade_date, {})[stage] = {
+            'status': status,
+            'outputs': json.dumps(outputs, ensure_ascii=False) if outputs is not None else None,
+            'error': error,
+        }
+
+
+class FakeHandlers:
+    """호출 횟수를 세고 지정한 단계만 실패시키는 단계 함수 모음"""
+
+    def __init__(self, fail=()):
+        self.fail = set(fail)
+        self.calls = {}
+        self._lock = threading.Lock()
+
+    def make(self, name, outputs):
+        def handler(context):
+            with self._lock:
+                self.calls[name] = self.calls.get(name, 0) + 1
+            if name in self.fail:
+                raise RuntimeError(f"{name} 실패")
+            return outputs(context) if callable(outputs) else dict(outputs)
+        return handler
+
+
+def _pipeline(handlers, login_checkpoint=True, report_critical=True):
+    """login -> collect -> (rsi, report) -> deliver 구조의 단계 그래프"""
+    return [
+        Stage('login', handlers.make('login', {'session': 'token'}), provides=['session'],
+              checkpoint=login_checkpoint),
+        Stage('collect', handlers.make('collect', lambda ctx: {'rows': 3 if ctx['session'] else 0}),
+              requires=['session'], provides=['rows']),
+        Stage('rsi', handlers.make('rsi', lambda ctx: {'rsi': ctx['rows'] * 10}), requires=['rows'], provides=['rsi']),
+        Stage('report', handlers.make('report', {'images': ['a.png']}), requires=['rows'], provides=['images'],
+              critical=report_critical),
+        Stage('deliver', handlers.make('deliver', lambda ctx: {'sent': ctx['images'] is not None}),
+              requires=['rsi', 'images'], provides=['sent']),
+    ]
+
+
+def test_run_passes_outputs_along_dependencies():
+    ledger = MemoryLedger()
+    handlers = FakeHandlers()
+
+    result = StageRunner(_pipeline(handlers), ledger=ledger).run(TRADE_DATE)
+
+    assert result['success']
+    assert set(result['statuses'].values()) == {STATUS_DONE}
+    assert result['context']['rsi'] == 30
+    assert result['context']['sent'] is True
+    assert set(result['metrics']) == {'login', 'collect', 'rsi', 'report', 'deliver'}
+    assert ledger.opened == ledger.closed == 1
+    assert ledger.load(TRADE_DATE)['collect'] == {'status': STATUS_DONE, 'outputs': {'rows': 3}}
+
+
+def test_critical_failure_skips_dependents():
+    ledger = MemoryLedger()
+    handlers = FakeHandlers(fail=['rsi'])
+
+    result = StageRunner(_pipeline(handlers), ledger=ledger).run(TRADE_DATE)
+
+    assert not result['success']
+    assert result['statuses']['rsi'] == STATUS_FAILED
+    assert result['statuses']['report'] == STATUS_DONE
+    assert result['statuses']['deliver'] == STATUS_SKIPPED
+    assert 'deliver' not in handlers.calls
+    assert isinstance(result['errors']['rsi'], RuntimeError)
+    assert ledger.records[TRADE_DATE]['deliver']['status'] == STATUS_SKIPPED
+    assert 'rsi' in ledger.records[TRADE_DATE]['deliver']['error']
+
+
+def test_skip_propagates_through_skipped_stages():
+    handlers = FakeHandlers(fail=['login'])
+
+    result = StageRunner(_pipeline(handlers), ledger=MemoryLedger()).run(TRADE_DATE)
+
+    assert result['statuses']['login'] == STATUS_FAILED
+    assert all(result['statuses'][name] == STATUS_SKIPPED for name in ('collect', 'rsi', 'report', 'deliver'))
+    assert set(handlers.calls) == {'login'}
+
+
+def test_non_critical_failure_continues_with_none_output():
+    handlers = FakeHandlers(fail=['report'])
+
+    result = StageRunner(_pipeline(handlers, report_critical=False), ledger=MemoryLedger()).run(TRADE_DATE)
+
+    assert result['success']
+    assert result['statuses']['report'] == STATUS_FAILED
+    assert result['statuses']['deliver'] == STATUS_DONE
+    assert result['context']['images'] is None
+    assert result['context']['sent'] is False
+
+
+def test_resume_restores_completed_stages_from_ledger():
+    ledger = MemoryLedger()
+    first = FakeHandlers(fail=['deliver'])
+    assert not StageRunner(_pipeline(first), ledger=ledger).run(TRADE_DATE)['success']
+
+    second = FakeHandlers()
+    result = StageRunner(_pipeline(second), ledger=ledger).run(TRADE_DATE, resume=True)
+
+    assert result['success']
+    assert set(second.calls) == {'deliver'}
+    assert result['restored'] == ['collect', 'login', 'report', 'rsi']
+    assert set(result['metrics']) == {'deliver'}
+    # 복원한 산출물이 재실행 단계의 입력으로 전달됨
+    assert result['context']['rsi'] == 30
+    assert result['context']['images'] == ['a.png']
+
+
+def test_resume_reruns_failed_and_skipped_stages():
+    ledger = MemoryLedger()
+    StageRunner(_pipeline(FakeHandlers(fail=['rsi'])), ledger=ledger).run(TRADE_DATE)
+
+    handlers = FakeHandlers()
+    result = StageRunner(_pipeline(handlers), ledger=ledger).run(TRADE_DATE, resume=True)
+
+    assert result['success']
+    assert set(handlers.calls) == {'rsi', 'deliver'}
+    assert ledger.load(TRADE_DATE)['deliver']['status'] == STATUS_DONE
+
+
+def test_resume_is_scoped_to_trade_date():
+    ledger = MemoryLedger()
+    StageRunner(_pipeline(FakeHandlers()), ledger=ledger).run(TRADE_DATE)
+
+    handlers = FakeHandlers()
+    result = StageRunner(_pipeline(handlers), ledger=ledger).run('2024-12-10', resume=True)
+
+    assert result['restored'] == []
+    assert set(handlers.calls) == {'login', 'collect', 'rsi', 'report', 'deliver'}
+
+
+def test_without_resume_ignores_ledger():
+    ledger = MemoryLedger()
+    StageRunner(_pipeline(FakeHandlers()), ledger=ledger).run(TRADE_DATE)
+
+    handlers = FakeHandlers()
+    result = StageRunner(_pipeline(handlers), ledger=ledger).run(TRADE_DATE)
+
+    assert result['restored'] == []
+    assert len(handlers.calls) == 5
+
+
+def test_checkpoint_false_stage_reruns_when_dependent_pending():
+    ledger = MemoryLedger()
+    StageRunner(_pipeline(FakeHandlers(fail=['collect']), login_checkpoint=False), ledger=ledger).run(TRADE_DATE)
+
+    handlers = FakeHandlers()
+    result = StageRunner(_pipeline(handlers, login_checkpoint=False), ledger=ledger).run(TRADE_DATE, resume=True)
+
+    assert result['success']
+    # 세션은 프로세스 안에만 남으므로 기록이 done 이어도 다시 로그인
+    assert handlers.calls['login'] == 1
+    assert 'login' not in result['restored']
+
+
+def test_checkpoint_false_stage_restored_when_dependents_done():
+    ledger = MemoryLedger()
+    StageRunner(_pipeline(FakeHandlers(fail=['deliver']), login_checkpoint=False), ledger=ledger).run(TRADE_DATE)
+
+    handlers = FakeHandlers()
+    result = StageRunner(_pipeline(handlers, login_checkpoint=False), ledger=ledger).run(TRADE_DATE, resume=True)
+
+    assert result['success']
+    assert set(handlers.calls) == {'deliver'}
+    assert 'login' in result['restored']
+
+
+def test_run_without_ledger():
+    handlers = FakeHandlers()
+
+    result = StageRunner(_pipeline(handlers)).run(TRADE_DATE, resume=True)
+
+    assert result['success']
+    assert len(handlers.calls) == 5
+
+
+@pytest.mark.parametrize('stages, message', [
+    ([Stage('a', None, provides=['x']), Stage('b', None, provides=['x'])], '여러 단계'),
+    ([Stage('a', None, requires=['missing'])], '제공하는 단계가 없습니다'),
+    ([Stage('a', None, requires=['y'], provides=['x']), Stage('b', None, requires=['x'], provides=['y'])], '순환'),
+    ([Stage('a', None), Stage('a', None)], '중복'),
+])
+def test_invalid_graph(stages, message):
+    with pytest.raises(StageGraphError, match=message):
+        StageRunner(stages)
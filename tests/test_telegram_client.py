@@ -0,0 +1,211 @@
+"""TelegramClient 단위 테스트 (가짜 세션과 가짜 시계 - 네트워크 호출/실제 대기 없음)"""
+
+import pytest
+import requests
+
+from utils import delivery_dispatcher, telegram_client
+from utils.delivery_dispatcher import DeliveryTimeoutError, delivery_time_limit
+from utils.telegram_client import ChatRateLimiter, TelegramClient, TelegramError
+
+
+class FakeClock:
+    """time 모듈 대체 - sleep 은 시계만 앞으로 돌림"""
+
+    def __init__(self):
+        self.now = 1_000.0
+        self.sleeps = []
+
+    def monotonic(self):
+        return self.now
+
+    perf_counter = monotonic
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+class FakeResponse:
+    def __init__(self, status_code, body=None, headers=None):
+        self.status_code = status_code
+        self.ok = status_code < 400
+        self._body = body
+        self.headers = headers or {}
+        self.text = '' if body is None else str(body)
+
+    def json(self):
+        if self._body is None:
+            raise ValueError("본문 없음")
+        return self._body
+
+
+class FakeSession:
+    """미리 정한 응답(또는 예외)을 순서대로 돌려주고 호출 인자를 기록"""
+
+    def __init__(self, *outcomes):
+        self.outcomes = list(outcomes)
+        self.calls = []
+
+    def post(self, url, data=None, files=None, timeout=None):
+        self.calls.append({'url': url, 'data': data, 'files': files, 'timeout': timeout})
+        outcome = self.outcomes.pop(0)
+        if callable(outcome):
+            outcome = outcome()
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+
+OK = FakeResponse(200, {'ok': True, 'result': {'message_id': 1}})
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(telegram_client, 'time', clock)
+    monkeypatch.setattr(delivery_dispatcher, 'time', clock)
+    # 지터는 항상 상한값
+    monkeypatch.setattr(telegram_client.random, 'uniform', lambda low, high: high)
+    return clock
+
+
+def _client(clock, *outcomes, **kwargs):
+    kwargs.setdefault('chat_min_interval', 0)
+    client = TelegramClient(bot_token='TOKEN', connect_timeout=5, read_timeout=60, max_retries=3,
+                            backoff_base=0.5, backoff_max=8, api_base='https://telegram.test', **kwargs)
+    client.session = FakeSession(*outcomes)
+    return client
+
+
+def _too_many_requests(retry_after=None, header=None):
+    body = {'ok': False, 'error_code': 429, 'description': 'Too Many Requests'}
+    if retry_after is not None:
+        body['parameters'] = {'retry_after': retry_after}
+    return FakeResponse(429, body, {'Retry-After': header} if header else None)
+
+
+def test_success_returns_body(clock):
+    client = _client(clock, OK)
+
+    assert client.call('sendMessage', {'chat_id': 1, 'text': '리포트'}) == OK.json()
+
+    call = client.session.calls[0]
+    assert call['url'] == 'https://telegram.test/botTOKEN/sendMessage'
+    assert call['timeout'] == (5, 60)
+    assert clock.sleeps == []
+
+
+def test_429_waits_retry_after_before_retrying(clock):
+    client = _client(clock, _too_many_requests(retry_after=7), OK)
+
+    assert client.call('sendPhoto', {'chat_id': 1})['ok']
+
+    # retry_after + 지터(최대 backoff_base)
+    assert clock.sleeps == [pytest.approx(7.5)]
+    assert len(client.session.calls) == 2
+
+
+def test_429_falls_back_to_retry_after_header(clock):
+    client = _client(clock, _too_many_requests(header='3'), OK)
+
+    client.call('sendPhoto', {'chat_id': 1})
+
+    assert clock.sleeps == [pytest.approx(3.5)]
+
+
+def test_429_on_last_attempt_raises_with_retry_after(clock):
+    client = _client(clock, *[_too_many_requests(retry_after=2)] * 4)
+
+    with pytest.raises(TelegramError) as excinfo:
+        client.call('sendMediaGroup', {'chat_id': 1})
+
+    assert (excinfo.value.error_code, excinfo.value.retry_after) == (429, 2.0)
+    assert len(client.session.calls) == 4
+
+
+def test_429_defers_next_send_to_same_chat(clock):
+    client = _client(clock, _too_many_requests(retry_after=10), chat_min_interval=1)
+    client.max_retries = 0
+
+    with pytest.raises(TelegramError):
+        client.call('sendMessage', {'chat_id': 1})
+    clock.sleeps.clear()
+
+    client.session.outcomes.append(OK)
+    client.call('sendMessage', {'chat_id': 1})
+    assert clock.sleeps == [pytest.approx(10)]
+
+
+def test_server_error_retries_with_backoff(clock):
+    client = _client(clock, FakeResponse(502), FakeResponse(503, {'ok': False}), OK)
+
+    assert client.call('sendMessage', {'chat_id': 1})['ok']
+
+    # full jitter 상한: backoff_base * 2^attempt
+    assert clock.sleeps == [pytest.approx(0.5), pytest.approx(1.0)]
+
+
+def test_client_error_fails_without_retry(clock):
+    client = _client(clock, FakeResponse(400, {'ok': False, 'error_code': 400, 'description': 'chat not found'}))
+
+    with pytest.raises(TelegramError) as excinfo:
+        client.call('sendMessage', {'chat_id': 1})
+
+    assert excinfo.value.error_code == 400
+    assert 'chat not found' in str(excinfo.value)
+    assert len(client.session.calls) == 1
+
+
+def test_network_error_retries_then_gives_up(clock):
+    client = _client(clock, *[requests.ConnectionError("연결 거부")] * 4)
+
+    with pytest.raises(TelegramError):
+        client.call('sendMessage', {'chat_id': 1})
+
+    assert len(client.session.calls) == 4
+    assert len(clock.sleeps) == 3
+
+
+def test_request_timeout_is_bounded_by_deadline(clock):
+    client = _client(clock, OK)
+
+    with delivery_time_limit(3):
+        client.call('sendMessage', {'chat_id': 1})
+
+    assert client.session.calls[0]['timeout'] == (3, 3)
+
+
+def test_read_timeout_at_deadline_is_unknown_outcome(clock):
+    def timed_out():
+        clock.now += 5
+        return requests.ReadTimeout("응답 없음")
+
+    client = _client(clock, timed_out)
+
+    with delivery_time_limit(3), pytest.raises(DeliveryTimeoutError) as excinfo:
+        client.call('sendPhoto', {'chat_id': 1})
+
+    assert excinfo.value.outcome_unknown is True
+    assert len(client.session.calls) == 1
+
+
+def test_retry_after_beyond_deadline_gives_up_without_waiting(clock):
+    client = _client(clock, _too_many_requests(retry_after=30))
+
+    with delivery_time_limit(10), pytest.raises(DeliveryTimeoutError) as excinfo:
+        client.call('sendPhoto', {'chat_id': 1})
+
+    # 429 는 처리되지 않은 요청이므로 결과가 확정됨
+    assert excinfo.value.outcome_unknown is False
+    assert clock.sleeps == []
+
+
+def test_chat_rate_limiter_spaces_sends_per_chat(clock):
+    limiter = ChatRateLimiter(1.0)
+
+    limiter.acquire('a')
+    limiter.acquire('b')
+    limiter.acquire('a')
+    limiter.acquire(None)
+
+    assert clock.sleeps == [pytest.approx(1.0)]
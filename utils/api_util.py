@@ -1,12 +1,14 @@
+import logging
 import requests
 from typing import List, Optional
 import os
-from PIL import Image
-import io
-from dotenv import load_dotenv
+from utils.env_util import load_env
 from utils.logger_util import LoggerUtil
+from utils.image_artifact_util import ImageArtifactUtil
+from utils.delivery_dispatcher import DeliveryTimeoutError, bounded_timeout, delivery_deadline, remaining_time
+from utils.multipart_stream import StreamingMultipartEncoder, UploadDeadlineExceeded
 
-load_dotenv()
+load_env()
 
 class ApiError(Exception):
     """API 호출 관련 커스텀 예외"""
@@ -16,7 +18,7 @@ class ApiError(Exception):
         super().__init__(f"API Error (Status: {status_code}): {message}")
 
 class ApiUtil:
-    def __init__(self):
+    def __init__(self, artifacts: Optional[ImageArtifactUtil] = None):
         base_url = os.getenv("BASE_URL")
         if not base_url:
             raise EnvironmentError("환경 변수 'BASE_URL'가 설정되어 있지 않습니다.")
@@ -28,45 +30,44 @@ class ApiUtil:
         }
         self.max_file_size = 1 * 1024 * 1024  # 1MB
         self.max_width = 800  # 최대 너비
-        self.logger = LoggerUtil().get_logger()
-
-    def _compress_image(self, image_path: str):
-        """이미지 압축"""
+        # (연결, 응답) 타임아웃 - 응답 타임아웃은 전체 업로드가 아니라 소켓 대기 단위로 적용
+        self.timeout = (float(os.getenv("API_CONNECT_TIMEOUT", 10)), float(os.getenv("API_READ_TIMEOUT", 60)))
+        self.upload_chunked = os.getenv("API_UPLOAD_CHUNKED", "false").lower() in ("1", "true", "yes")
+        self.logger = LoggerUtil().get_logger(__name__)
+        # 전송용 이미지 변형본 (텔레그램 전송과 공유하면 이미 만든 결과를 재사용)
+        self.artifacts = artifacts or ImageArtifactUtil(max_width=self.max_width, max_file_size=self.max_file_size)
+
+    def _resolve_image(self, image_path: str):
+        """전송용 변형본 경로와 포맷 (캐시된 변형본을 사용하며 본문은 업로드 시 스트리밍으로 읽음)"""
         try:
-            with Image.open(image_path) as img:
-                # 이미지 크기 조정
-                if img.width > self.max_width:
-                    ratio = self.max_width / img.width
-                    new_height = int(img.height * ratio)
-                    img = img.resize((self.max_width, new_height), Image.Resampling.LANCZOS)
-                
-                # 이미지 품질 조정
-                buffer = io.BytesIO()
-                format = img.format if img.format else 'PNG'
-                
-                if format == 'PNG':
-                    img.save(buffer, format=format, optimize=True)
-                else:
-                    img.save(buffer, format=format, quality=85, optimize=True)
-                
-                compressed_image = buffer.getvalue()
-                
-                # 압축 후에도 크기가 큰 경우 추가 압축
-                quality = 85
-                while len(compressed_image) > self.max_file_size and quality > 30:
-                    buffer = io.BytesIO()
-                    img.save(buffer, format='JPEG', quality=quality, optimize=True)
-                    compressed_image = buffer.getvalue()
-                    quality -= 10
-                
-                self.logger.info(f"이미지 압축 완료: {image_path} (크기: {len(compressed_image)/1024:.1f}KB)")
-                return compressed_image, format.lower()
+            artifact = self.artifacts.get_variant(image_path)
+            self.logger.info(f"이미지 압축 완료: {image_path} (크기: {artifact['size']/1024:.1f}KB)")
+            return artifact['path'], artifact['format']
         except Exception as e:
             self.logger.error(f"이미지 압축 실패: {image_path} - {str(e)}")
             raise
 
-    def create_post(self, title: str, content: str, category: str, writer: str, image_paths: Optional[List[str]] = None, thumbnail_image_path: str = None):
-        """게시글 생성 API 호출 (이미지/썸네일 유무와 관계없이 단일 흐름)"""
+    def _upload_progress(self, title: str):
+        """업로드 진행률 로그 콜백 (25% 단위)"""
+        state = {'logged': -1}
+
+        def report(sent: int, total: int):
+            percent = int(sent * 100 / total) if total else 100
+            step = percent // 25
+            if step > state['logged']:
+                state['logged'] = step
+                self.logger.info(f"게시글 업로드 진행률 {percent}% ({sent/1024:.1f}KB / {total/1024:.1f}KB) - 제목: {title}")
+
+        return report
+
+    def create_post(self, title: str, content: str, category: str, writer: str, image_paths: Optional[List[str]] = None, thumbnail_image_path: str = None, idempotency_key: Optional[str] = None):
+        """게시글 생성 API 호출 (이미지/썸네일 유무와 관계없이 단일 흐름)
+
+        이미지는 메모리에 모으지 않고 업로드 중 디스크에서 조금씩 읽어 스트리밍으로 전송한다.
+        idempotency_key 를 주면 Idempotency-Key 헤더로 전달해 재시도 시 서버가 중복 게시를 걸러낼 수 있게 한다.
+        DeliveryDispatcher 작업 안에서 호출되면 연결/응답 타임아웃과 업로드를 채널 마감 시각 안으로 제한하고,
+        시간이 다 되면 요청을 중단한 뒤 DeliveryTimeoutError 를 던진다.
+        """
         url = f"{self.api_base_url}/board-research"
 
         try:
@@ -86,10 +87,10 @@ class ApiUtil:
                 for i, image_path in enumerate(image_paths):
                     if os.path.exists(image_path):
                         try:
-                            compressed_image, format = self._compress_image(image_path)
+                            variant_path, format = self._resolve_image(image_path)
                             original_filename = os.path.basename(image_path)
-                            files[f"image[{i}]"] = (original_filename, compressed_image, f"image/{format}")
-                            self.logger.debug(f"이미지 {i+1} 추가: {original_filename}")
+                            files[f"image[{i}]"] = (original_filename, variant_path, f"image/{format}")
+                            self.logger.debug("이미지 %d 추가: %s", i + 1, original_filename)
                         except Exception as e:
                             self.logger.error(f"이미지 처리 실패: {image_path} - {str(e)}")
                             continue
@@ -99,10 +100,10 @@ class ApiUtil:
             # 썸네일 이미지 처리 (있으면 추가)
             if thumbnail_image_path and os.path.exists(thumbnail_image_path):
                 try:
-                    compressed_image, format = self._compress_image(thumbnail_image_path)
+                    variant_path, format = self._resolve_image(thumbnail_image_path)
                     thumbnail_filename = os.path.basename(thumbnail_image_path)
-                    files["thumbnail_image"] = (thumbnail_filename, compressed_image, f"image/{format}")
-                    self.logger.debug(f"썸네일 이미지 추가: {thumbnail_filename}")
+                    files["thumbnail_image"] = (thumbnail_filename, variant_path, f"image/{format}")
+                    self.logger.debug("썸네일 이미지 추가: %s", thumbnail_filename)
                 except Exception as e:
                     self.logger.error(f"썸네일 이미지 처리 실패: {thumbnail_image_path} - {str(e)}")
             elif thumbnail_image_path:
@@ -115,38 +116,45 @@ class ApiUtil:
                 raise ApiError(400, error_msg)
 
             response = None
+            headers = self.headers.copy()
+            if idempotency_key:
+                headers["Idempotency-Key"] = idempotency_key
             
             # multipart/form-data 또는 JSON 전송 결정
             if files:
-                try:
-                    headers = self.headers.copy()
-                    form_data = {key: (None, str(value)) for key, value in data.items()}
-                    form_data.update(files)
-                    self.logger.debug(f"API 요청 데이터: {data}")
-                    self.logger.debug(f"파일 데이터: {[f'{k}: {v[0]}' for k, v in files.items()]}")
-                    self.logger.debug(f"최종 전송 데이터: {[(k, v[0] if isinstance(v, tuple) else v) for k, v in form_data.items()]}")
-
-                    response = requests.post(
-                        url,
-                        headers=headers,
-                        files=form_data,
-                        timeout=30
-                    )
-
-                    self.logger.debug(f"응답 상태 코드: {response.status_code}")
-                    self.logger.debug(f"응답 헤더: {dict(response.headers)}")
-                finally:
-                    files.clear()
+                fields = [(key, str(value)) for key, value in data.items()]
+                fields.extend(files.items())
+                encoder = StreamingMultipartEncoder(fields, progress=self._upload_progress(title), deadline=delivery_deadline())
+                headers["Content-Type"] = encoder.content_type
+                # DEBUG 가 꺼져 있으면 요청/응답 덤프 문자열을 만들지 않음
+                debug = self.logger.isEnabledFor(logging.DEBUG)
+                if debug:
+                    self.logger.debug("API 요청 데이터: %s", data)
+                    self.logger.debug("파일 데이터: %s", [f'{k}: {v[0]}' for k, v in files.items()])
+                    self.logger.debug("업로드 크기: %.1fKB (chunked: %s)", encoder.len / 1024, self.upload_chunked)
+
+                # chunked 전송은 전체 길이를 알리지 않고, 기본은 Content-Length 와 함께 스트리밍
+                body = encoder.iter_chunks() if self.upload_chunked else encoder
+                response = requests.post(
+                    url,
+                    headers=headers,
+                    data=body,
+                    timeout=bounded_timeout(self.timeout, "게시판 API")
+                )
+
+                if debug:
+                    self.logger.debug("응답 상태 코드: %s", response.status_code)
+                    self.logger.debug("응답 헤더: %s", dict(response.headers))
             else:
                 self.logger.info(f"게시글 생성 시작 (이미지 없음) - 제목: {title}")
-                response = requests.post(url, headers=self.headers, json=data)
+                response = requests.post(url, headers=headers, json=data, timeout=bounded_timeout(self.timeout, "게시판 API"))
 
             # 응답 확인 및 한글 디코딩
             try:
                 response.encoding = 'utf-8'
                 response_data = response.json()
 
-                self.logger.debug(f"API 응답: {response_data}")
+                self.logger.debug("API 응답: %s", response_data)
 
                 if not response_data.get('success', False):
                     error_msg = f"게시글 생성 실패\n제목: {title}\n카테고리: {category}\n응답: {response.text}"
@@ -168,7 +176,20 @@ class ApiUtil:
                 self.logger.error(error_msg)
                 raise ApiError(response.status_code, error_msg)
 
+        except UploadDeadlineExceeded as e:
+            # 본문을 끝까지 보내지 못했으므로 서버에 게시되지 않음
+            self.logger.error(f"게시글 업로드 제한 시간 초과 - 제목: {title} ({e})")
+            raise DeliveryTimeoutError(f"게시판 API 업로드 제한 시간 초과: {e}") from e
         except requests.RequestException as e:
+            remaining = remaining_time()
+            if remaining is not None and remaining <= 0:
+                if isinstance(e, requests.ReadTimeout):
+                    # 요청을 모두 보낸 뒤 응답을 기다리다 중단 - 서버가 이미 게시했을 수 있음
+                    self.logger.error(f"게시글 응답 대기 중 제한 시간 초과 - 제목: {title}")
+                    raise DeliveryTimeoutError("게시판 API 응답 대기 중 제한 시간 초과", outcome_unknown=True) from e
+                # 연결/업로드 중 중단 - 서버는 완전한 요청을 받지 못함
+                self.logger.error(f"게시글 업로드 제한 시간 초과 - 제목: {title} ({e})")
+                raise DeliveryTimeoutError(f"게시판 API 업로드 제한 시간 초과: {e}") from e
             error_msg = f"API 요청 중 오류 발생\n제목: {title}\n카테고리: {category}\n오류: {str(e)}"
             self.logger.error(error_msg)
             raise ApiError(500, error_msg)
@@ -0,0 +1,82 @@
+"""거래일 기준 일일 작업 스케줄러 (상주 모드용).
+
+cron 대신 프로세스 안에서 다음 실행 시각(한국 시간 기준 거래일의 지정 시각)을
+계산하고, 그 전에 예열(warm-up) 시각을 두어 KRX 세션/DB 연결/종가 스냅샷을
+미리 준비할 수 있게 한다. 대기는 짧은 간격으로 나눠 종료 신호에 바로 반응한다.
+"""
+
+import os
+from datetime import datetime, timedelta, time as dt_time
+from zoneinfo import ZoneInfo
+
+from utils.env_util import load_env
+
+load_env()
+
+KST = ZoneInfo('Asia/Seoul')
+
+# 대기 중 종료 신호/시계 변경을 확인하는 최대 간격(초)
+_MAX_SLEEP_SLICE = 60
+
+
+def parse_run_time(value):
+    """'HH:MM' 문자열을 time 으로 변환"""
+    try:
+        hour, minute = (int(part) for part in str(value).split(':'))
+        return dt_time(hour, minute)
+    except ValueError as e:
+        raise ValueError(f"실행 시각 형식이 올바르지 않습니다 (HH:MM): {value}") from e
+
+
+class TradingDayScheduler:
+    """거래일마다 지정된 한국 시간에 실행할 시각을 계산하는 스케줄러"""
+
+    def __init__(self, is_trading_day, run_time=None, warmup_minutes=None):
+        """
+        Args:
+            is_trading_day: 거래일 판별 함수 (date) -> bool
+            run_time: 실행 시각 'HH:MM' (DAEMON_RUN_TIME, 기본 18:00 KST)
+            warmup_minutes: 실행 몇 분 전에 예열할지 (DAEMON_WARMUP_MINUTES, 기본 30)
+        """
+        self.is_trading_day = is_trading_day
+        self.run_time = parse_run_time(run_time or os.getenv('DAEMON_RUN_TIME', '18:00'))
+        self.warmup = timedelta(minutes=warmup_minutes if warmup_minutes is not None
+                                else float(os.getenv('DAEMON_WARMUP_MINUTES', 30)))
+
+    @staticmethod
+    def now():
+        return datetime.now(KST)
+
+    def run_at(self, day):
+        """해당 날짜의 실행 시각 (KST)"""
+        return datetime.combine(day, self.run_time, tzinfo=KST)
+
+    def missed_run(self, now=None):
+        """오늘이 거래일이고 실행 시각이 이미 지났으면 오늘 실행 시각, 아니면 None (기동 시 누락분 확인)"""
+        now = now or self.now()
+        if self.is_trading_day(now.date()) and now >= self.run_at(now.date()):
+            return self.run_at(now.date())
+        return None
+
+    def next_run(self, now=None):
+        """now 이후 첫 거래일 실행 시각 (KST)"""
+        now = now or self.now()
+        day = now.date()
+        if now >= self.run_at(day):
+            day += timedelta(days=1)
+        while not self.is_trading_day(day):
+            day += timedelta(days=1)
+        return self.run_at(day)
+
+    def warmup_at(self, run_at):
+        """예열 시각 (실행 시각 - 예열 시간)"""
+        return run_at - self.warmup
+
+    def sleep_until(self, when, stop_event):
+        """when 까지 대기 (종료 신호가 오면 False 반환)"""
+        while not stop_event.is_set():
+            remaining = (when - self.now()).total_seconds()
+            if remaining <= 0:
+                return True
+            stop_event.wait(min(remaining, _MAX_SLEEP_SLICE))
+        return False
@@ -1,13 +1,19 @@
 import pymysql
+import math
 import os
-from dotenv import load_dotenv
+import queue
+import re
+import threading
+import time
+from contextlib import contextmanager
+from utils.env_util import load_env
 from utils.logger_util import LoggerUtil
 
 # 로거 설정
-logger = LoggerUtil().get_logger()
+logger = LoggerUtil().get_logger(__name__)
 
 # .env 파일에서 환경 변수 로드
-load_dotenv()
+load_env()
 
 DB_HOST = os.getenv("DB_HOST")
 DB_USER = os.getenv("DB_USER")
@@ -15,23 +21,360 @@ DB_PASSWORD = os.getenv("DB_PASSWORD")
 DB_NAME = os.getenv("DB_NAME")
 DB_PORT = int(os.getenv("DB_PORT", 3306))
 
-def get_db_connection():
-    """DB 연결을 생성하고 반환합니다."""
+# SQL 문별 통계 수집 설정 - 사용 여부 / 느린 쿼리 기준(초) / 실행 종료 시 출력할 상위 문장 수
+SQL_PROFILE = os.getenv("SQL_PROFILE", "true").lower() in ("1", "true", "yes")
+SQL_SLOW_QUERY_SECONDS = float(os.getenv("SQL_SLOW_QUERY_SECONDS", 0.5))
+SQL_PROFILE_TOP_N = int(os.getenv("SQL_PROFILE_TOP_N", 10))
+
+# 스레드별 쿼리 통계 수집 상태 (track_queries() 구간에서만 기록)
+_query_tracking = threading.local()
+
+
+def _estimate_row_bytes(rows):
+    """조회 행의 대략적인 크기 (문자열/바이트는 길이, 그 외 값은 8바이트로 계산)"""
+    total = 0
+    for row in rows:
+        for value in row.values():
+            total += len(value) if isinstance(value, (str, bytes)) else 8
+    return total
+
+
+# SQL 정규화 (값 자리표시자 통일, IN 목록/다중 VALUES 축약, 공백 정리)
+_SQL_PLACEHOLDER = re.compile(r"%\(\w+\)s|%s")
+_SQL_STRING = re.compile(r"'(?:[^'\\]|\\.|'')*'")
+_SQL_NUMBER = re.compile(r"(?<![\w.])-?\d+(?:\.\d+)?\b")
+_SQL_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+_SQL_VALUES_ROWS = re.compile(r"(\(\?(?:, \?)*\)|\(\?\+\))(?:\s*,\s*(?:\(\?(?:, \?)*\)|\(\?\+\)))+")
+_SQL_SPACES = re.compile(r"\s+")
+
+# EXPLAIN 을 지원하는 문장
+_EXPLAINABLE = ('SELECT', 'UPDATE', 'DELETE')
+
+
+def normalize_sql(sql):
+    """값만 다른 쿼리가 같은 문장으로 집계되도록 SQL 정규화"""
+    normalized = _SQL_PLACEHOLDER.sub('?', sql)
+    normalized = _SQL_STRING.sub('?', normalized)
+    normalized = _SQL_NUMBER.sub('?', normalized)
+    normalized = _SQL_SPACES.sub(' ', normalized).strip()
+    normalized = _SQL_LIST.sub('(?+)', normalized)
+    return _SQL_VALUES_ROWS.sub(r'\1+', normalized)
+
+
+def _percentile(values, percent):
+    """nearest-rank 백분위수"""
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(percent / 100 * len(ordered)) - 1)]
+
+
+class QueryProfile:
+    """start_query_profile() ~ stop_query_profile() 구간의 SQL 문별 통계 (모든 스레드, 스레드 안전)"""
+
+    def __init__(self, slow_seconds=None):
+        self.slow_seconds = SQL_SLOW_QUERY_SECONDS if slow_seconds is None else slow_seconds
+        self.statements = {}
+        self.slow_queries = []
+        self._explained = set()
+        self._lock = threading.Lock()
+
+    def record(self, statement, seconds, rows):
+        with self._lock:
+            stats = self.statements.get(statement)
+            if stats is None:
+                stats = self.statements[statement] = {'count': 0, 'total_seconds': 0.0, 'rows': 0, 'durations': []}
+            stats['count'] += 1
+            stats['total_seconds'] += seconds
+            stats['rows'] += rows
+            stats['durations'].append(seconds)
+
+    def should_explain(self, statement, seconds):
+        """느린 쿼리면서 아직 EXPLAIN 하지 않은 문장인지 (문장당 한 번)"""
+        if seconds < self.slow_seconds or not statement.upper().startswith(_EXPLAINABLE):
+            return False
+        with self._lock:
+            if statement in self._explained:
+                return False
+            self._explained.add(statement)
+            return True
+
+    def record_slow(self, statement, seconds, sql, explain):
+        with self._lock:
+            self.slow_queries.append({
+                'statement': statement,
+                'seconds': round(seconds, 4),
+                'sql': sql[:1000],
+                'explain': explain,
+            })
+
+    def summary(self, top_n=None):
+        """
+        총 소요 시간 상위 문장 통계
+
+        Returns:
+            list: [{'statement', 'count', 'total_seconds', 'avg_ms', 'p95_ms', 'rows'}]
+        """
+        with self._lock:
+            items = [(statement, dict(stats, durations=list(stats['durations'])))
+                     for statement, stats in self.statements.items()]
+        items.sort(key=lambda item: item[1]['total_seconds'], reverse=True)
+        if top_n:
+            items = items[:top_n]
+        return [
+            {
+                'statement': statement,
+                'count': stats['count'],
+                'total_seconds': round(stats['total_seconds'], 4),
+                'avg_ms': round(stats['total_seconds'] / stats['count'] * 1000, 2),
+                'p95_ms': round(_percentile(stats['durations'], 95) * 1000, 2),
+                'rows': stats['rows'],
+            }
+            for statement, stats in items
+        ]
+
+    def totals(self):
+        with self._lock:
+            return {
+                'queries': sum(stats['count'] for stats in self.statements.values()),
+                'statements': len(self.statements),
+                'total_seconds': round(sum(stats['total_seconds'] for stats in self.statements.values()), 4),
+                'slow_queries': len(self.slow_queries),
+            }
+
+    def format_summary(self, top_n=None):
+        """로그 출력용 상위 N개 문장 요약"""
+        top_n = top_n or SQL_PROFILE_TOP_N
+        totals = self.totals()
+        lines = [
+            f"[SQL 통계] 쿼리 {totals['queries']}회 / 문장 {totals['statements']}종 / "
+            f"{totals['total_seconds']:.2f}초 / 느린 쿼리 {totals['slow_queries']}건 - 총 시간 상위 {top_n}개"
+        ]
+        for rank, item in enumerate(self.summary(top_n), 1):
+            statement = item['statement'] if len(item['statement']) <= 160 else item['statement'][:157] + '...'
+            lines.append(
+                f"  {rank:>2}. {item['total_seconds']:8.3f}초 {item['count']:6d}회 "
+                f"평균 {item['avg_ms']:8.2f}ms p95 {item['p95_ms']:8.2f}ms {item['rows']:8d}행  {statement}"
+            )
+        return '\n'.join(lines)
+
+
+_active_profile = None
+
+
+def start_query_profile(slow_seconds=None):
+    """SQL 문별 통계 수집 시작 (이전 수집 구간은 교체)"""
+    global _active_profile
+    _active_profile = QueryProfile(slow_seconds)
+    return _active_profile
+
+
+def stop_query_profile():
+    """SQL 문별 통계 수집 종료 후 수집 결과 반환"""
+    global _active_profile
+    profile, _active_profile = _active_profile, None
+    return profile
+
+
+class InstrumentedCursor(pymysql.cursors.DictCursor):
+    """쿼리 통계를 기록하는 커서
+
+    - track_queries() 구간: 현재 스레드의 쿼리 수/조회 행 수·바이트/변경 행 수
+    - start_query_profile() 구간: 정규화한 문장별 횟수/시간/p95/행 수, 느린 쿼리 EXPLAIN
+
+    executemany() 도 내부적으로 execute() 를 호출하므로 실제 전송된 쿼리 단위로 집계된다.
+    """
+
+    _template = None
+
+    def executemany(self, query, args):
+        # 여러 행을 하나의 INSERT 로 묶어 전송해도 원래 문장으로 집계
+        self._template = query
+        try:
+            return super().executemany(query, args)
+        finally:
+            self._template = None
+
+    def execute(self, query, args=None):
+        if getattr(_query_tracking, 'explaining', False):
+            return super().execute(query, args)
+
+        started = time.perf_counter()
+        result = super().execute(query, args)
+        elapsed = time.perf_counter() - started
+
+        rows = len(self._rows or ()) if self.description else max(0, self.rowcount)
+        stats = getattr(_query_tracking, 'stats', None)
+        if stats is not None:
+            stats['queries'] += 1
+            if self.description:
+                stats['rows_fetched'] += rows
+                stats['bytes_fetched'] += _estimate_row_bytes(self._rows or ())
+            else:
+                stats['rows_written'] += rows
+
+        profile = _active_profile
+        if profile is not None:
+            statement = normalize_sql(self._template or query)
+            profile.record(statement, elapsed, rows)
+            if profile.should_explain(statement, elapsed):
+                executed = self._executed.decode('utf-8', 'replace') if isinstance(self._executed, (bytes, bytearray)) else self._executed
+                profile.record_slow(statement, elapsed, executed, self._explain(executed))
+        return result
+
+    def _explain(self, sql):
+        """느린 쿼리의 실행 계획 (결과 행은 이미 버퍼에 있으므로 같은 연결에서 조회)"""
+        _query_tracking.explaining = True
+        try:
+            with self.connection.cursor() as cursor:
+                cursor.execute(f"EXPLAIN {sql}")
+                return cursor.fetchall()
+        except pymysql.MySQLError as e:
+            return [{'error': str(e)}]
+        finally:
+            _query_tracking.explaining = False
+
+
+@contextmanager
+def track_queries():
+    """with 블록 동안 현재 스레드에서 실행한 쿼리 통계 수집
+
+    Yields:
+        dict: {'queries', 'rows_fetched', 'bytes_fetched', 'rows_written'} (블록 종료 후 확정)
+
+    중첩해서 사용하면 안쪽 구간의 통계도 바깥 구간에 합산된다.
+    """
+    stats = {'queries': 0, 'rows_fetched': 0, 'bytes_fetched': 0, 'rows_written': 0}
+    outer = getattr(_query_tracking, 'stats', None)
+    _query_tracking.stats = stats
+    try:
+        yield stats
+    finally:
+        _query_tracking.stats = outer
+        if outer is not None:
+            for key, value in stats.items():
+                outer[key] += value
+
+
+def _connect(database=None):
+    """새 DB 연결을 생성합니다. (database 를 주면 DB_NAME 대신 해당 DB 에 연결)"""
     try:
         conn = pymysql.connect(
             host=DB_HOST,
             user=DB_USER,
             password=DB_PASSWORD,
-            db=DB_NAME,
+            db=database or DB_NAME,
             port=DB_PORT,
             charset='utf8mb4',
-            cursorclass=pymysql.cursors.DictCursor
+            cursorclass=InstrumentedCursor
         )
         logger.info("DB에 성공적으로 연결되었습니다.")
         return conn
     except pymysql.MySQLError as e:
         logger.error(f"DB 연결 오류: {e}")
         return None
+
+
+class _PooledConnection:
+    """풀에서 빌려준 연결 - close() 시 실제로 닫지 않고 풀에 반납"""
+
+    def __init__(self, pool, conn):
+        self._pool = pool
+        self._conn = conn
+
+    def __getattr__(self, name):
+        return getattr(self._conn, name)
+
+    def close(self):
+        conn, self._conn = self._conn, None
+        if conn is not None:
+            self._pool.release(conn)
+
+
+class ConnectionPool:
+    """상주(데몬) 모드용 DB 연결 풀 (스레드 안전)
+
+    반납된 연결을 최대 max_idle 개까지 보관하고, 빌려줄 때 ping 으로 끊긴 연결을
+    재연결한다. 사용하는 쪽은 기존처럼 get_db_connection() / conn.close() 를 호출한다.
+    """
+
+    def __init__(self, max_idle=4):
+        self.max_idle = max_idle
+        self._idle = queue.LifoQueue()
+
+    def acquire(self):
+        while True:
+            try:
+                conn = self._idle.get_nowait()
+            except queue.Empty:
+                conn = _connect()
+                return _PooledConnection(self, conn) if conn else None
+            try:
+                conn.ping(reconnect=True)
+                return _PooledConnection(self, conn)
+            except pymysql.MySQLError as e:
+                logger.warning(f"풀 연결 재사용 실패, 새로 연결합니다: {e}")
+                self._discard(conn)
+
+    def release(self, conn):
+        try:
+            # 커밋되지 않은 트랜잭션이 다음 사용자에게 넘어가지 않도록 정리
+            conn.rollback()
+        except pymysql.MySQLError:
+            self._discard(conn)
+            return
+        if self._idle.qsize() >= self.max_idle:
+            self._discard(conn)
+            return
+        self._idle.put(conn)
+
+    @staticmethod
+    def _discard(conn):
+        try:
+            conn.close()
+        except Exception:
+            pass
+
+    def close_all(self):
+        while True:
+            try:
+                self._discard(self._idle.get_nowait())
+            except queue.Empty:
+                return
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def enable_connection_pool(max_idle=None):
+    """이후 get_db_connection() 이 풀의 연결을 반환하도록 설정 (DB_POOL_SIZE, 기본 4)"""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ConnectionPool(max_idle if max_idle is not None else int(os.getenv("DB_POOL_SIZE", 4)))
+            logger.info(f"DB 연결 풀 사용 (최대 유휴 연결 {_pool.max_idle}개)")
+        return _pool
+
+
+def disable_connection_pool():
+    """연결 풀 사용 중지 및 유휴 연결 정리"""
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.close_all()
+            _pool = None
+
+
+def get_db_connection(database=None):
+    """DB 연결을 반환합니다. (연결 풀 사용 시 풀에서 빌린 연결, close() 시 반납)
+
+    database 를 주면 풀을 거치지 않고 해당 DB 에 새로 연결합니다. (합성 데이터 적재 등 전용 DB 용)
+    """
+    if database:
+        return _connect(database)
+    if _pool is not None:
+        return _pool.acquire()
+    return _connect()
+
 # 테이블 생성 SQL
 CREATE_KRX_STOCK_TABLE = """
 CREATE TABLE IF NOT EXISTS krx_stock (
@@ -89,6 +432,47 @@ CREATE TABLE IF NOT EXISTS krx_sector_leaders (
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COMMENT='업종별 대장주 추적';
 """
 
+CREATE_KRX_DELIVERY_OUTBOX_TABLE = """
+CREATE TABLE IF NOT EXISTS krx_delivery_outbox (
+    idx INT AUTO_INCREMENT PRIMARY KEY COMMENT '내부 고유 ID (Auto Increment)',
+    idempotency_key CHAR(64) NOT NULL COMMENT '중복 전송 방지 키 (SHA-256)',
+    channel VARCHAR(30) NOT NULL COMMENT '전송 채널 (telegram_photos, telegram_text, board_post)',
+    payload MEDIUMTEXT NOT NULL COMMENT '전송 데이터 (JSON)',
+    status VARCHAR(10) NOT NULL DEFAULT 'pending' COMMENT '상태 (pending, sending, sent, dead)',
+    attempts INT NOT NULL DEFAULT 0 COMMENT '전송 시도 횟수',
+    next_attempt_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP COMMENT '다음 전송 시도 가능 일시',
+    lease_owner VARCHAR(64) DEFAULT NULL COMMENT '전송 중인 워커 ID',
+    lease_until DATETIME DEFAULT NULL COMMENT '전송 점유 만료 일시 (만료 시 다른 워커가 재시도)',
+    last_error TEXT COMMENT '마지막 오류 메시지',
+    sent_date DATETIME DEFAULT NULL COMMENT '전송 완료 일시',
+    reg_date DATETIME DEFAULT CURRENT_TIMESTAMP COMMENT '등록일시',
+    update_date DATETIME DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP COMMENT '최종 업데이트일시',
+
+    UNIQUE KEY uq_idempotency_key (idempotency_key),
+    KEY idx_status_next_attempt (status, next_attempt_at),
+    KEY idx_lease_owner (lease_owner)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COMMENT='리포트 전송 대기열 (outbox)';
+"""
+
+CREATE_KRX_RUN_LEDGER_TABLE = """
+CREATE TABLE IF NOT EXISTS krx_run_ledger (
+    idx INT AUTO_INCREMENT PRIMARY KEY COMMENT '내부 고유 ID (Auto Increment)',
+    job VARCHAR(30) NOT NULL COMMENT '작업명 (예: daily)',
+    trade_date DATE NOT NULL COMMENT '작업 기준 거래일',
+    stage VARCHAR(50) NOT NULL COMMENT '단계명',
+    status VARCHAR(10) NOT NULL COMMENT '상태 (running, done, failed, skipped)',
+    outputs MEDIUMTEXT COMMENT '단계 산출물 (JSON, 재개 시 복원)',
+    error TEXT COMMENT '실패 오류 메시지',
+    attempts INT NOT NULL DEFAULT 0 COMMENT '실행 횟수',
+    duration_ms INT COMMENT '마지막 실행 소요 시간(ms)',
+    started_at DATETIME COMMENT '마지막 실행 시작 일시',
+    finished_at DATETIME COMMENT '마지막 실행 종료 일시',
+
+    UNIQUE KEY uq_job_date_stage (job, trade_date, stage),
+    KEY idx_trade_date (trade_date)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COMMENT='작업 단계별 실행 기록 (체크포인트)';
+"""
+
 def create_tables_if_not_exists(conn):
     """필요한 테이블이 없으면 생성합니다."""
     with conn.cursor() as cursor:
@@ -96,18 +480,31 @@ def create_tables_if_not_exists(conn):
             cursor.execute(CREATE_KRX_STOCK_TABLE)
             logger.info("'krx_stock' 테이블이 준비되었습니다.")
 
-            # krx_sector_rsi 테이블 재생성
-            try:
-                cursor.execute("DROP TABLE IF EXISTS krx_sector_rsi")
-                logger.info("기존 'krx_sector_rsi' 테이블을 삭제했습니다.")
-            except pymysql.MySQLError as e:
-                logger.warning(f"'krx_sector_rsi' 테이블 삭제 실패 (무시): {e}")
+            # krx_sector_rsi 테이블이 이전 구조(rsi_d/rsi_w/rsi_m 없음)면 재생성
+            # (매 실행마다 삭제하면 과거 날짜 재처리 결과가 사라지므로 구조가 다를 때만)
+            cursor.execute("SHOW TABLES LIKE 'krx_sector_rsi'")
+            if cursor.fetchone():
+                cursor.execute("SHOW COLUMNS FROM krx_sector_rsi LIKE 'rsi_m'")
+                if not cursor.fetchone():
+                    try:
+                        cursor.execute("DROP TABLE IF EXISTS krx_sector_rsi")
+                        logger.info("이전 구조의 'krx_sector_rsi' 테이블을 삭제했습니다.")
+                    except pymysql.MySQLError as e:
+                        logger.warning(f"'krx_sector_rsi' 테이블 삭제 실패 (무시): {e}")
             cursor.execute(CREATE_KRX_SECTOR_RSI_TABLE)
-            logger.info("'krx_sector_rsi' 테이블이 새로운 구조로 생성되었습니다.")
+            logger.info("'krx_sector_rsi' 테이블이 준비되었습니다.")
 
             # krx_sector_leaders 테이블 생성
             cursor.execute(CREATE_KRX_SECTOR_LEADERS_TABLE)
             logger.info("'krx_sector_leaders' 테이블이 준비되었습니다.")
+
+            # krx_delivery_outbox 테이블 생성
+            cursor.execute(CREATE_KRX_DELIVERY_OUTBOX_TABLE)
+            logger.info("'krx_delivery_outbox' 테이블이 준비되었습니다.")
+
+            # krx_run_ledger 테이블 생성
+            cursor.execute(CREATE_KRX_RUN_LEDGER_TABLE)
+            logger.info("'krx_run_ledger' 테이블이 준비되었습니다.")
             
             conn.commit()
         except pymysql.MySQLError as e:
@@ -313,6 +710,277 @@ def get_sector_leaders(conn):
             logger.error(f"섹터 대장주 데이터 조회 오류: {e}")
             raise
 
+def ensure_delivery_outbox_table(conn):
+    """전송 대기열 테이블이 없으면 생성합니다. (--init 없이 업그레이드한 환경 대비)"""
+    with conn.cursor() as cursor:
+        try:
+            cursor.execute(CREATE_KRX_DELIVERY_OUTBOX_TABLE)
+            conn.commit()
+        except pymysql.MySQLError as e:
+            logger.error(f"전송 대기열 테이블 생성 오류: {e}")
+            conn.rollback()
+            raise
+
+def enqueue_delivery(conn, idempotency_key, channel, payload):
+    """전송 대기열에 항목을 추가합니다.
+
+    같은 키가 이미 있으면 추가하지 않지만, 재시도를 포기한(dead) 항목이면 새 payload 로
+    시도 횟수를 초기화해 다시 대기열에 올립니다 (--resume/재실행 시 재전송).
+    대기/전송 중이거나 전송 완료된 항목은 그대로 둡니다.
+
+    Returns:
+        int: 1 새로 추가, 2 포기 항목 재등록, 0 이미 등록된 전송
+    """
+    with conn.cursor() as cursor:
+        try:
+            # MySQL 은 SET 절을 왼쪽부터 적용하므로 status 는 마지막에 변경
+            sql = """
+            INSERT INTO krx_delivery_outbox (idempotency_key, channel, payload)
+            VALUES (%s, %s, %s)
+            ON DUPLICATE KEY UPDATE
+                payload = IF(status = 'dead', VALUES(payload), payload),
+                attempts = IF(status = 'dead', 0, attempts),
+                next_attempt_at = IF(status = 'dead', NOW(), next_attempt_at),
+                last_error = IF(status = 'dead', NULL, last_error),
+                status = IF(status = 'dead', 'pending', status)
+            """
+            cursor.execute(sql, (idempotency_key, channel, payload))
+            affected_count = cursor.rowcount
+            conn.commit()
+            return affected_count
+        except pymysql.MySQLError as e:
+            logger.error(f"전송 대기열 등록 오류 ({channel}): {e}")
+            conn.rollback()
+            raise
+
+def claim_deliveries(conn, lease_owner, limit=20, lease_seconds=300):
+    """전송 시점이 된 항목(또는 점유가 만료된 항목)을 점유하고 반환합니다.
+
+    점유와 동시에 시도 횟수를 올리므로, 전송 도중 프로세스가 종료되어도
+    점유 만료 후 다른 워커가 이어서 재시도합니다.
+    """
+    with conn.cursor() as cursor:
+        try:
+            sql = """
+            UPDATE krx_delivery_outbox
+            SET status = 'sending',
+                lease_owner = %s,
+                lease_until = DATE_ADD(NOW(), INTERVAL %s SECOND),
+                attempts = attempts + 1
+            WHERE (status = 'pending' AND next_attempt_at <= NOW())
+               OR (status = 'sending' AND lease_until < NOW())
+            ORDER BY idx
+            LIMIT %s
+            """
+            cursor.execute(sql, (lease_owner, lease_seconds, limit))
+            conn.commit()
+
+            sql = """
+            SELECT idx, idempotency_key, channel, payload, attempts
+            FROM krx_delivery_outbox
+            WHERE lease_owner = %s AND status = 'sending'
+            ORDER BY idx
+            """
+            cursor.execute(sql, (lease_owner,))
+            return cursor.fetchall()
+        except pymysql.MySQLError as e:
+            logger.error(f"전송 대기열 점유 오류: {e}")
+            conn.rollback()
+            raise
+
+def mark_delivery_sent(conn, idx, lease_owner):
+    """전송 완료 처리"""
+    with conn.cursor() as cursor:
+        try:
+            sql = """
+            UPDATE krx_delivery_outbox
+            SET status = 'sent', sent_date = NOW(), lease_owner = NULL, lease_until = NULL, last_error = NULL
+            WHERE idx = %s AND lease_owner = %s
+            """
+            cursor.execute(sql, (idx, lease_owner))
+            conn.commit()
+            return cursor.rowcount
+        except pymysql.MySQLError as e:
+            logger.error(f"전송 완료 처리 오류 (idx: {idx}): {e}")
+            conn.rollback()
+            raise
+
+def mark_delivery_failed(conn, idx, lease_owner, error, retry_delay=None):
+    """전송 실패 처리 (retry_delay 초 후 재시도, None 이면 더 이상 재시도하지 않음)"""
+    with conn.cursor() as cursor:
+        try:
+            if retry_delay is None:
+                sql = """
+                UPDATE krx_delivery_outbox
+                SET status = 'dead', lease_owner = NULL, lease_until = NULL, last_error = %s
+                WHERE idx = %s AND lease_owner = %s
+                """
+                cursor.execute(sql, (error, idx, lease_owner))
+            else:
+                sql = """
+                UPDATE krx_delivery_outbox
+                SET status = 'pending', lease_owner = NULL, lease_until = NULL, last_error = %s,
+                    next_attempt_at = DATE_ADD(NOW(), INTERVAL %s SECOND)
+                WHERE idx = %s AND lease_owner = %s
+                """
+                cursor.execute(sql, (error, int(retry_delay), idx, lease_owner))
+            conn.commit()
+            return cursor.rowcount
+        except pymysql.MySQLError as e:
+            logger.error(f"전송 실패 처리 오류 (idx: {idx}): {e}")
+            conn.rollback()
+            raise
+
+def hold_delivery(conn, idx, lease_owner, error):
+    """전송 결과를 알 수 없는 항목을 점유 상태로 유지 (점유 만료 후에만 다시 전송)
+
+    요청을 보낸 뒤 응답을 받지 못한 경우 상대 서버가 이미 처리했을 수 있으므로
+    바로 재시도하지 않고, 점유 만료 시각까지 'sending' 상태로 남겨 둡니다.
+    """
+    with conn.cursor() as cursor:
+        try:
+            sql = """
+            UPDATE krx_delivery_outbox
+            SET last_error = %s
+            WHERE idx = %s AND lease_owner = %s AND status = 'sending'
+            """
+            cursor.execute(sql, (error, idx, lease_owner))
+            conn.commit()
+            return cursor.rowcount
+        except pymysql.MySQLError as e:
+            logger.error(f"전송 결과 불명 처리 오류 (idx: {idx}): {e}")
+            conn.rollback()
+            raise
+
+def defer_delivery(conn, idx, lease_owner, retry_delay):
+    """보내지 않은 항목의 점유를 풀고 retry_delay 초 뒤로 미룸 (시도 횟수는 되돌림)
+
+    같은 채팅방의 앞 항목이 재시도 대기 중이라 순서를 지키기 위해 보내지 않은 경우에 사용합니다.
+    """
+    with conn.cursor() as cursor:
+        try:
+            sql = """
+            UPDATE krx_delivery_outbox
+            SET status = 'pending', lease_owner = NULL, lease_until = NULL,
+                attempts = GREATEST(attempts - 1, 0),
+                next_attempt_at = DATE_ADD(NOW(), INTERVAL %s SECOND)
+            WHERE idx = %s AND lease_owner = %s
+            """
+            cursor.execute(sql, (int(retry_delay), idx, lease_owner))
+            conn.commit()
+            return cursor.rowcount
+        except pymysql.MySQLError as e:
+            logger.error(f"전송 보류 처리 오류 (idx: {idx}): {e}")
+            conn.rollback()
+            raise
+
+def get_active_delivery_payloads(conn):
+    """아직 전송되지 않은(pending, sending) 대기열 항목의 payload(JSON 문자열) 목록을 조회합니다."""
+    with conn.cursor() as cursor:
+        try:
+            sql = "SELECT payload FROM krx_delivery_outbox WHERE status IN ('pending', 'sending')"
+            cursor.execute(sql)
+            return [row['payload'] for row in cursor.fetchall()]
+        except pymysql.MySQLError as e:
+            logger.error(f"전송 대기열 payload 조회 오류: {e}")
+            raise
+
+def count_pending_deliveries(conn):
+    """아직 전송되지 않은 대기열 항목 수를 조회합니다."""
+    with conn.cursor() as cursor:
+        try:
+            sql = "SELECT COUNT(*) AS cnt FROM krx_delivery_outbox WHERE status IN ('pending', 'sending')"
+            cursor.execute(sql)
+            return cursor.fetchone()['cnt']
+        except pymysql.MySQLError as e:
+            logger.error(f"전송 대기열 조회 오류: {e}")
+            raise
+
+def delete_old_deliveries(conn, days=30):
+    """지정된 일수보다 오래된 전송 완료/포기 항목을 삭제합니다."""
+    with conn.cursor() as cursor:
+        try:
+            sql = """
+            DELETE FROM krx_delivery_outbox
+            WHERE status IN ('sent', 'dead') AND update_date < DATE_SUB(NOW(), INTERVAL %s DAY)
+            """
+            cursor.execute(sql, (days,))
+            deleted_count = cursor.rowcount
+            conn.commit()
+            return deleted_count
+        except pymysql.MySQLError as e:
+            logger.error(f"오래된 전송 대기열 삭제 오류: {e}")
+            conn.rollback()
+            raise
+
+def ensure_run_ledger_table(conn):
+    """작업 실행 기록 테이블이 없으면 생성합니다."""
+    with conn.cursor() as cursor:
+        try:
+            cursor.execute(CREATE_KRX_RUN_LEDGER_TABLE)
+            conn.commit()
+        except pymysql.MySQLError as e:
+            logger.error(f"작업 실행 기록 테이블 생성 오류: {e}")
+            conn.rollback()
+            raise
+
+def get_run_ledger(conn, job, trade_date):
+    """특정 작업/거래일의 단계별 실행 기록을 조회합니다."""
+    with conn.cursor() as cursor:
+        try:
+            sql = """
+            SELECT stage, status, outputs, error, attempts, duration_ms, started_at, finished_at
+            FROM krx_run_ledger
+            WHERE job = %s AND trade_date = %s
+            """
+            cursor.execute(sql, (job, trade_date))
+            return cursor.fetchall()
+        except pymysql.MySQLError as e:
+            logger.error(f"작업 실행 기록 조회 오류 ({job}, {trade_date}): {e}")
+            raise
+
+def mark_run_stage_started(conn, job, trade_date, stage):
+    """단계 실행 시작 기록 (실행 횟수 증가)"""
+    with conn.cursor() as cursor:
+        try:
+            sql = """
+            INSERT INTO krx_run_ledger (job, trade_date, stage, status, attempts, started_at)
+            VALUES (%s, %s, %s, 'running', 1, NOW())
+            ON DUPLICATE KEY UPDATE
+            status = 'running',
+            error = NULL,
+            attempts = attempts + 1,
+            started_at = NOW(),
+            finished_at = NULL
+            """
+            cursor.execute(sql, (job, trade_date, stage))
+            conn.commit()
+        except pymysql.MySQLError as e:
+            logger.error(f"단계 시작 기록 오류 ({job}, {trade_date}, {stage}): {e}")
+            conn.rollback()
+            raise
+
+def mark_run_stage_finished(conn, job, trade_date, stage, status, outputs=None, error=None, duration_ms=None):
+    """단계 실행 결과 기록 (done, failed, skipped)"""
+    with conn.cursor() as cursor:
+        try:
+            sql = """
+            INSERT INTO krx_run_ledger (job, trade_date, stage, status, outputs, error, duration_ms, finished_at)
+            VALUES (%s, %s, %s, %s, %s, %s, %s, NOW())
+            ON DUPLICATE KEY UPDATE
+            status = VALUES(status),
+            outputs = VALUES(outputs),
+            error = VALUES(error),
+            duration_ms = VALUES(duration_ms),
+            finished_at = NOW()
+            """
+            cursor.execute(sql, (job, trade_date, stage, status, outputs, error, duration_ms))
+            conn.commit()
+        except pymysql.MySQLError as e:
+            logger.error(f"단계 결과 기록 오류 ({job}, {trade_date}, {stage}): {e}")
+            conn.rollback()
+            raise
+
 # 이 파일이 직접 실행될 때 테이블 생성 로직을 실행 (테스트용)
 if __name__ == '__main__':
     db_conn = get_db_connection()
@@ -0,0 +1,172 @@
+"""리포트 전송 채널(텔레그램, 게시판 API 등)을 병렬로 실행하는 디스패처.
+
+각 채널은 독립된 스레드에서 실행되며 채널별 타임아웃과 예외가 서로 영향을 주지
+않는다. 전체 전송 시간은 가장 느린 채널의 시간에 수렴한다.
+
+제한 시간은 스레드를 버려 두는 방식이 아니라 HTTP 호출 자체에 적용한다. 작업 스레드에
+마감 시각을 두면 TelegramClient/ApiUtil 이 bounded_timeout()/wait_before_retry() 로
+requests 타임아웃과 재시도 대기를 남은 시간 안으로 줄이고, 시간이 다 되면 요청을
+중단한 뒤 DeliveryTimeoutError 를 던진다.
+"""
+
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from utils.env_util import load_env
+
+from utils.logger_util import LoggerUtil
+
+load_env()
+
+DEFAULT_DELIVERY_TIMEOUT = float(os.getenv('DELIVERY_TIMEOUT', 120))
+
+# 마감 시각 이후 작업이 스스로 끝나기를 기다리는 여유 시간(초) - 마감을 따르지 않는 전송 함수 대비
+DELIVERY_TIMEOUT_GRACE = float(os.getenv('DELIVERY_TIMEOUT_GRACE', 30))
+
+# 작업 스레드별 전송 마감 시각 (time.monotonic 기준)
+_deadline = threading.local()
+
+
+class DeliveryTimeoutError(TimeoutError):
+    """채널 전송이 제한 시간 안에 끝나지 않음
+
+    outcome_unknown 이 True 면 요청을 보낸 뒤 응답을 기다리다 중단한 것이라 상대
+    서버가 이미 처리했을 수 있다. False 면 요청을 끝까지 보내지 못하고 포기한 것이다.
+    """
+
+    def __init__(self, message, outcome_unknown=False):
+        super().__init__(message)
+        self.outcome_unknown = outcome_unknown
+
+
+def delivery_deadline():
+    """현재 스레드의 전송 마감 시각 (디스패처 밖이면 None)"""
+    return getattr(_deadline, 'value', None)
+
+
+def remaining_time():
+    """마감까지 남은 시간(초) (마감이 없으면 None)"""
+    deadline = delivery_deadline()
+    return None if deadline is None else deadline - time.monotonic()
+
+
+def bounded_timeout(timeout, what='전송'):
+    """requests 타임아웃((연결, 응답) 또는 초)을 남은 시간 안으로 줄여 반환
+
+    Raises:
+        DeliveryTimeoutError: 요청을 보내기 전에 이미 마감이 지난 경우 (outcome_unknown=False)
+    """
+    remaining = remaining_time()
+    if remaining is None:
+        return timeout
+    if remaining <= 0:
+        raise DeliveryTimeoutError(f"{what} 제한 시간 초과 (요청 보내기 전)")
+    if isinstance(timeout, tuple):
+        return tuple(min(value, remaining) for value in timeout)
+    return min(timeout, remaining)
+
+
+@contextmanager
+def delivery_time_limit(timeout):
+    """블록 안의 전송을 timeout 초 안으로 제한 (바깥 마감보다 늦어지지 않음)
+
+    하나의 디스패처 작업에서 여러 전송을 차례로 보낼 때 전송마다 마감을 따로 준다.
+    """
+    outer = delivery_deadline()
+    deadline = time.monotonic() + timeout
+    _deadline.value = deadline if outer is None else min(outer, deadline)
+    try:
+        yield
+    finally:
+        _deadline.value = outer
+
+
+def wait_before_retry(delay, what='전송', outcome_unknown=False, error=None):
+    """재시도 전 delay 초 대기 (마감 안에 다시 보낼 수 없으면 대기하지 않고 포기)
+
+    Raises:
+        DeliveryTimeoutError: 대기 후 남은 시간이 없는 경우
+    """
+    remaining = remaining_time()
+    if remaining is not None and delay >= remaining:
+        raise DeliveryTimeoutError(
+            f"{what} 제한 시간 초과 (재시도 대기 {delay:.1f}초 > 남은 시간 {max(0.0, remaining):.1f}초)",
+            outcome_unknown=outcome_unknown
+        ) from error
+    time.sleep(delay)
+
+
+class DeliveryDispatcher:
+    """여러 전송 작업을 동시에 실행하고 채널별 결과를 모으는 클래스"""
+
+    def __init__(self, default_timeout=None):
+        self.logger = LoggerUtil().get_logger(__name__)
+        self.default_timeout = default_timeout if default_timeout is not None else DEFAULT_DELIVERY_TIMEOUT
+        self._tasks = []
+
+    def add(self, name, func, *args, timeout=None, **kwargs):
+        """전송 작업 등록
+
+        Args:
+            name: 채널 이름 (결과 dict 의 키)
+            func: 실행할 전송 함수 (bounded_timeout/wait_before_retry 로 마감을 따라야 함)
+            timeout: 이 채널의 제한 시간(초), None 이면 기본값
+        """
+        self._tasks.append((name, func, args, kwargs, timeout if timeout is not None else self.default_timeout))
+        return self
+
+    def _run(self, name, func, args, kwargs, deadline):
+        started = time.perf_counter()
+        _deadline.value = deadline
+        try:
+            result = func(*args, **kwargs)
+        finally:
+            _deadline.value = None
+        self.logger.info(f"[전송] {name} 완료 ({time.perf_counter() - started:.2f}초)")
+        return result
+
+    def dispatch(self):
+        """등록된 작업을 병렬 실행
+
+        Returns:
+            dict: {name: {'success': bool, 'result': 반환값, 'error': 예외, 'elapsed': 초}}
+        """
+        tasks, self._tasks = self._tasks, []
+        if not tasks:
+            return {}
+
+        results = {}
+        started = time.monotonic()
+        executor = ThreadPoolExecutor(max_workers=len(tasks), thread_name_prefix='delivery')
+        try:
+            # 마감은 디스패치 시작 시점 기준 (채널 간 대기 시간이 누적되지 않음)
+            futures = [
+                (name, executor.submit(self._run, name, func, args, kwargs, started + timeout), timeout)
+                for name, func, args, kwargs, timeout in tasks
+            ]
+
+            for name, future, timeout in futures:
+                # 전송 함수가 마감에 맞춰 스스로 끝나므로 결과를 기다림 (여유 시간을 넘기면 응답 없음으로 처리)
+                remaining = max(0.0, started + timeout + DELIVERY_TIMEOUT_GRACE - time.monotonic())
+                try:
+                    result = future.result(timeout=remaining)
+                    results[name] = {'success': True, 'result': result, 'error': None}
+                except Exception as e:
+                    # concurrent.futures.TimeoutError 는 3.11 부터 TimeoutError 와 같으므로 완료 여부로 구분
+                    if not future.done():
+                        # 전송 스레드가 아직 실행 중이라 요청이 처리될 수 있음
+                        e = DeliveryTimeoutError(
+                            f"{name} 전송 시간 초과 ({timeout:g}초) - 전송 함수가 마감 후에도 끝나지 않음",
+                            outcome_unknown=True
+                        )
+                    self.logger.error(f"[전송] {name} 실패: {e}")
+                    results[name] = {'success': False, 'result': None, 'error': e}
+                results[name]['elapsed'] = time.monotonic() - started
+        finally:
+            # 여유 시간까지 넘긴 작업은 기다리지 않고 반환
+            executor.shutdown(wait=False, cancel_futures=True)
+
+        self.logger.info(f"[전송] 전체 {len(tasks)}개 채널 처리 완료 ({time.monotonic() - started:.2f}초)")
+        return results
@@ -0,0 +1,315 @@
+"""리포트 전송 대기열(outbox)과 재시도 워커.
+
+렌더링이 끝난 리포트의 전송 요청(텔레그램 이미지/텍스트, 게시판 게시글)을
+krx_delivery_outbox 테이블에 먼저 기록한 뒤 전송한다. 텔레그램이나 게시판 API 가
+일시적으로 실패해도 항목은 대기열에 남아 있으므로, 전체 파이프라인을 다시 돌리지
+않고 워커(`python main.py --drain-outbox` 또는 --outbox-worker)가 지수 백오프로
+재시도한다. 각 항목은 채널/대상/내용으로 만든 멱등 키를 가지므로 같은 리포트를
+다시 등록해도 중복 전송되지 않는다. 재시도를 포기한(dead) 항목은 같은 리포트를 다시
+등록하면(--resume/재실행) 대기열에 다시 올라간다.
+
+요청을 보낸 뒤 응답 대기 중 제한 시간이 지난 전송(결과 불명)은 이미 전달됐을 수 있고
+텔레그램은 중복 전송을 걸러내지 않으므로, 바로 재시도하지 않고 점유 만료 시각까지
+'sending' 상태로 유지한다.
+
+동시 전송은 순서 그룹(lane, 기본은 채널) 사이에서만 일어난다. 같은 그룹(예: 같은 채팅방)의
+항목은 등록 순서대로 하나씩 보내며, 앞 항목이 재시도 대기/결과 불명이면 뒤 항목은 보내지
+않고 앞 항목 뒤로 미뤄 채팅방의 메시지 순서(KOSPI -> KOSDAQ)를 지킨다.
+"""
+
+import json
+import os
+import random
+import threading
+import time
+import uuid
+
+from utils.env_util import load_env
+
+from utils.db_manager import (
+    get_db_connection,
+    ensure_delivery_outbox_table,
+    enqueue_delivery,
+    claim_deliveries,
+    mark_delivery_sent,
+    mark_delivery_failed,
+    hold_delivery,
+    defer_delivery,
+    get_active_delivery_payloads,
+    count_pending_deliveries,
+    delete_old_deliveries
+)
+from utils.delivery_dispatcher import DeliveryDispatcher, DeliveryTimeoutError, delivery_time_limit
+from utils.logger_util import LoggerUtil
+from utils.render_cache import RenderCache
+
+load_env()
+
+CHANNEL_TELEGRAM_PHOTOS = 'telegram_photos'
+CHANNEL_TELEGRAM_TEXT = 'telegram_text'
+CHANNEL_BOARD_POST = 'board_post'
+
+# payload 에서 전송할 파일 경로 목록을 담는 키 (telegram_photos: paths, board_post: image_paths)
+PAYLOAD_PATH_KEYS = ('paths', 'image_paths')
+
+
+def get_referenced_paths(conn):
+    """아직 전송되지 않은 대기열 항목이 참조하는 파일 경로 (이미지 캐시 정리 시 삭제 제외 대상)"""
+    ensure_delivery_outbox_table(conn)
+    paths = set()
+    for payload in get_active_delivery_payloads(conn):
+        try:
+            data = json.loads(payload)
+        except ValueError:
+            continue
+        for key in PAYLOAD_PATH_KEYS:
+            paths.update(path for path in data.get(key) or () if isinstance(path, str))
+    return paths
+
+
+class DeliveryOutbox:
+    """전송 대기열 등록/소진(drain) 및 백그라운드 재시도 워커"""
+
+    def __init__(self, handlers, on_failure=None, is_permanent_error=None, max_attempts=None,
+                 retry_base=None, retry_max=None, lease_seconds=None, batch_size=20, lane_key=None):
+        """
+        Args:
+            handlers: {채널: (전송 함수(payload, idempotency_key), 제한 시간 초)}
+            on_failure: 전송 실패 시 호출 (item, error, final) - final 은 재시도 포기 여부
+            is_permanent_error: 재시도해도 성공할 수 없는 오류 판별 함수
+            max_attempts: 최대 시도 횟수 (DELIVERY_OUTBOX_MAX_ATTEMPTS, 기본 8)
+            retry_base: 재시도 기본 대기(초) (DELIVERY_OUTBOX_RETRY_BASE, 기본 60)
+            retry_max: 재시도 최대 대기(초) (DELIVERY_OUTBOX_RETRY_MAX, 기본 3600)
+            lease_seconds: 전송 점유 시간(초) - 워커가 비정상 종료되면 이후 다른 워커가 재시도
+            lane_key: (채널, payload) -> 순서 그룹 키 - 같은 그룹은 등록 순서대로 하나씩 전송 (기본: 채널)
+        """
+        self.logger = LoggerUtil().get_logger(__name__)
+        self.handlers = handlers
+        self.on_failure = on_failure
+        self.is_permanent_error = is_permanent_error or (lambda error: isinstance(error, FileNotFoundError))
+        self.max_attempts = max_attempts if max_attempts is not None else int(os.getenv('DELIVERY_OUTBOX_MAX_ATTEMPTS', 8))
+        self.retry_base = retry_base if retry_base is not None else float(os.getenv('DELIVERY_OUTBOX_RETRY_BASE', 60))
+        self.retry_max = retry_max if retry_max is not None else float(os.getenv('DELIVERY_OUTBOX_RETRY_MAX', 3600))
+        self.batch_size = batch_size
+        self.lane_key = lane_key or (lambda channel, payload: channel)
+
+        # 점유 시간은 가장 긴 채널 제한 시간보다 길어야 전송 중인 항목을 다른 워커가 가져가지 않음
+        longest_timeout = max((timeout for _, timeout in handlers.values()), default=0)
+        self.lease_seconds = lease_seconds if lease_seconds is not None else int(longest_timeout * 2 + 60)
+
+        self._table_ready = False
+        self._worker = None
+        self._stop_event = threading.Event()
+
+    @staticmethod
+    def make_key(channel, *parts):
+        """채널과 전송 대상/내용으로 멱등 키 생성"""
+        return RenderCache.make_key(channel, *parts)
+
+    def _ensure_table(self, conn):
+        if not self._table_ready:
+            ensure_delivery_outbox_table(conn)
+            self._table_ready = True
+
+    def enqueue(self, conn, channel, payload, key_parts=()):
+        """전송 항목 등록
+
+        Args:
+            channel: 전송 채널 (CHANNEL_*)
+            payload: JSON 직렬화 가능한 전송 데이터
+            key_parts: 멱등 키에 포함할 값 (없으면 payload 전체)
+
+        Returns:
+            str: 멱등 키
+        """
+        if channel not in self.handlers:
+            raise ValueError(f"등록되지 않은 전송 채널: {channel}")
+        self._ensure_table(conn)
+
+        payload_json = json.dumps(payload, ensure_ascii=False, sort_keys=True)
+        key = self.make_key(channel, *(key_parts or (payload_json,)))
+        affected = enqueue_delivery(conn, key, channel, payload_json)
+        if affected == 1:
+            self.logger.info(f"[전송 대기열] {channel} 등록 (키: {key[:12]})")
+        elif affected == 2:
+            self.logger.info(f"[전송 대기열] {channel} 재시도를 포기했던 전송 다시 등록 (키: {key[:12]})")
+        else:
+            self.logger.info(f"[전송 대기열] {channel} 이미 등록된 전송 - 건너뜀 (키: {key[:12]})")
+        return key
+
+    def _retry_delay(self, attempts):
+        """시도 횟수에 따른 재시도 대기(초) - 지수 백오프 + 지터"""
+        delay = min(self.retry_max, self.retry_base * (2 ** max(0, attempts - 1)))
+        return delay * random.uniform(0.8, 1.2)
+
+    def _notify_failure(self, item, error, final):
+        if not self.on_failure:
+            return
+        try:
+            self.on_failure(item, error, final)
+        except Exception as e:
+            self.logger.error(f"[전송 대기열] 실패 알림 처리 오류: {e}")
+
+    def _is_final(self, item, error):
+        return self.is_permanent_error(error) or item['attempts'] >= self.max_attempts
+
+    def _send_lane(self, lane_items, stop_event, lease_until):
+        """같은 순서 그룹의 항목을 등록 순서대로 하나씩 전송
+
+        앞 항목이 재시도할 수 있는 오류로 실패하면(결과 불명 포함) 뒤 항목은 보내지 않는다.
+        디스패처가 그룹 전체를 포기했거나 점유 만료 전에 끝낼 수 없으면 남은 항목을 보내지 않는다.
+        """
+        for item in lane_items:
+            handler, timeout = self.handlers[item['channel']]
+            if stop_event.is_set() or (item is not lane_items[0] and time.monotonic() + timeout > lease_until):
+                return
+            item['state'] = 'running'
+            try:
+                with delivery_time_limit(timeout):
+                    handler(item['payload'], item['idempotency_key'])
+                item['error'] = None
+            except Exception as e:
+                item['error'] = e
+            item['state'] = 'done'
+            if item['error'] is not None and not self._is_final(item, item['error']):
+                return
+
+    def drain(self, conn):
+        """전송 시점이 된 항목을 한 번 점유해 순서 그룹별로 병렬 전송하고 결과를 기록
+
+        Returns:
+            dict: {'sent': 성공 수, 'retry': 재시도 예정 수, 'held': 결과 불명으로 점유 유지 수,
+                   'deferred': 앞 항목 때문에 미룬 수, 'dead': 포기 수}
+        """
+        self._ensure_table(conn)
+        lease_owner = f"{os.getpid()}-{uuid.uuid4().hex}"
+        lease_until = time.monotonic() + self.lease_seconds
+        items = claim_deliveries(conn, lease_owner, self.batch_size, self.lease_seconds)
+        summary = {'sent': 0, 'retry': 0, 'held': 0, 'deferred': 0, 'dead': 0}
+        if not items:
+            return summary
+
+        lanes = {}
+        for item in items:
+            item['payload'] = json.loads(item['payload'])
+            item['state'] = None
+            if item['channel'] not in self.handlers:
+                item['state'] = 'done'
+                item['error'] = ValueError(f"등록되지 않은 전송 채널: {item['channel']}")
+                continue
+            lanes.setdefault(self.lane_key(item['channel'], item['payload']), []).append(item)
+
+        dispatcher = DeliveryDispatcher()
+        stop_event = threading.Event()
+        for lane, lane_items in lanes.items():
+            timeout = sum(self.handlers[item['channel']][1] for item in lane_items)
+            dispatcher.add(lane, self._send_lane, lane_items, stop_event, lease_until, timeout=timeout)
+        results = dispatcher.dispatch()
+        # 여유 시간을 넘겨 포기한 그룹은 아직 보내지 않은 항목을 더 보내지 않음
+        stop_event.set()
+
+        for lane_items in [*lanes.values(), [item for item in items if item['channel'] not in self.handlers]]:
+            # 앞 항목이 다시 전송될 때까지 남은 시간 (뒤 항목은 그 뒤로 미룸)
+            lane_wait = 0
+            for item in lane_items:
+                if item['state'] is None:
+                    defer_delivery(conn, item['idx'], lease_owner, lane_wait)
+                    summary['deferred'] += 1
+                    continue
+
+                if item['state'] == 'running':
+                    # 그룹 작업이 여유 시간까지 끝나지 않음 - 전송 중이던 항목은 결과 불명
+                    lane_result = results.get(self.lane_key(item['channel'], item['payload'])) or {}
+                    error = lane_result.get('error') or DeliveryTimeoutError(
+                        f"{item['channel']} 전송이 끝나지 않음", outcome_unknown=True)
+                else:
+                    error = item['error']
+
+                if error is None:
+                    mark_delivery_sent(conn, item['idx'], lease_owner)
+                    summary['sent'] += 1
+                    continue
+
+                final = item['channel'] not in self.handlers or self._is_final(item, error)
+                if not final and isinstance(error, DeliveryTimeoutError) and error.outcome_unknown:
+                    # 이미 전송됐을 수 있으므로 "미전송"으로 보고 바로 재시도하지 않음 - 점유 만료 후 재시도
+                    hold_delivery(conn, item['idx'], lease_owner, str(error))
+                    lane_wait = self.lease_seconds + 1
+                    summary['held'] += 1
+                    self.logger.warning(
+                        f"[전송 대기열] {item['channel']} 전송 결과 불명 - 점유 만료({self.lease_seconds}초) 후 재시도 "
+                        f"({item['attempts']}/{self.max_attempts}): {error}"
+                    )
+                elif final:
+                    mark_delivery_failed(conn, item['idx'], lease_owner, str(error))
+                    summary['dead'] += 1
+                    self.logger.error(f"[전송 대기열] {item['channel']} 전송 포기 ({item['attempts']}회 시도): {error}")
+                else:
+                    delay = self._retry_delay(item['attempts'])
+                    mark_delivery_failed(conn, item['idx'], lease_owner, str(error), delay)
+                    lane_wait = int(delay) + 1
+                    summary['retry'] += 1
+                    self.logger.warning(
+                        f"[전송 대기열] {item['channel']} 전송 실패, {delay:.0f}초 후 재시도 "
+                        f"({item['attempts']}/{self.max_attempts}): {error}"
+                    )
+                self._notify_failure(item, error, final)
+
+        self.logger.info(
+            f"[전송 대기열] 처리 결과 - 성공 {summary['sent']}, 재시도 예정 {summary['retry']}, "
+            f"결과 불명 {summary['held']}, 순서 대기 {summary['deferred']}, 포기 {summary['dead']}"
+        )
+        return summary
+
+    def drain_all(self, conn=None, retention_days=None):
+        """전송 시점이 된 항목이 없을 때까지 반복 소진하고 오래된 완료 항목 정리
+
+        Returns:
+            int: 아직 전송되지 않은(재시도 대기 중인) 항목 수
+        """
+        own_conn = conn is None
+        if own_conn:
+            conn = get_db_connection()
+            if not conn:
+                raise Exception("데이터베이스 연결 실패")
+        try:
+            while True:
+                summary = self.drain(conn)
+                # 이번에 점유한 항목이 모두 재시도 대기/포기로 끝났으면 더 처리할 항목이 없음
+                if not summary['sent']:
+                    break
+
+            retention_days = retention_days if retention_days is not None else int(os.getenv('DELIVERY_OUTBOX_RETENTION_DAYS', 30))
+            deleted = delete_old_deliveries(conn, retention_days)
+            if deleted:
+                self.logger.info(f"[전송 대기열] 오래된 항목 {deleted}개 삭제")
+            return count_pending_deliveries(conn)
+        finally:
+            if own_conn:
+                conn.close()
+
+    def _worker_loop(self, interval):
+        while not self._stop_event.is_set():
+            try:
+                self.drain_all()
+            except Exception as e:
+                self.logger.error(f"[전송 대기열] 워커 오류: {e}")
+            self._stop_event.wait(interval)
+
+    def start_worker(self, interval=None):
+        """백그라운드 스레드에서 주기적으로 대기열 소진"""
+        if self._worker and self._worker.is_alive():
+            return self._worker
+        interval = interval if interval is not None else float(os.getenv('DELIVERY_OUTBOX_POLL_INTERVAL', 60))
+        self._stop_event.clear()
+        self._worker = threading.Thread(target=self._worker_loop, args=(interval,), name='delivery-outbox', daemon=True)
+        self._worker.start()
+        self.logger.info(f"[전송 대기열] 워커 시작 (주기: {interval:g}초)")
+        return self._worker
+
+    def stop_worker(self, timeout=None):
+        """백그라운드 워커 중지"""
+        self._stop_event.set()
+        if self._worker:
+            self._worker.join(timeout)
+            self._worker = None
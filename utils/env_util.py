@@ -0,0 +1,25 @@
+"""프로젝트 .env 로딩 유틸.
+
+각 모듈이 import 될 때마다 load_dotenv() 로 .env 를 다시 찾고 읽던 것을
+프로세스당 한 번으로 줄인다. 이미 설정된 환경변수는 덮어쓰지 않는다.
+"""
+
+import os
+import threading
+
+_ENV_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), '.env')
+
+_loaded = False
+_lock = threading.Lock()
+
+
+def load_env():
+    """프로젝트 루트의 .env 를 한 번만 로드"""
+    global _loaded
+    if _loaded:
+        return
+    with _lock:
+        if not _loaded:
+            from dotenv import load_dotenv
+            load_dotenv(_ENV_PATH)
+            _loaded = True
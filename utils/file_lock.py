@@ -0,0 +1,55 @@
+"""프로세스 간 배타 잠금 (잠금 파일 기반).
+
+같은 장비의 여러 프로세스(상주 모드, cron 실행, 재처리 작업자)가 공유 파일을
+동시에 고치지 않도록 {경로}.lock 파일에 OS 잠금을 건다. 잠금은 파일 핸들을 닫거나
+프로세스가 종료되면 OS 가 해제하므로, 비정상 종료 후에도 남지 않는다.
+"""
+
+import os
+import time
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+
+@contextmanager
+def file_lock(path, timeout=None):
+    """
+    {path}.lock 에 배타 잠금을 걸고 블록 실행
+
+    Args:
+        path: 보호할 파일 경로 (잠금 파일은 같은 디렉토리에 생성)
+        timeout: 잠금 대기 최대 시간(초, 기본 무제한)
+
+    Raises:
+        TimeoutError: timeout 안에 잠금을 얻지 못한 경우
+    """
+    lock_path = f"{path}.lock"
+    os.makedirs(os.path.dirname(os.path.abspath(lock_path)), exist_ok=True)
+    deadline = None if timeout is None else time.monotonic() + timeout
+
+    with open(lock_path, 'a+') as f:
+        while True:
+            try:
+                if fcntl:
+                    fcntl.flock(f.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+                else:
+                    f.seek(0)
+                    msvcrt.locking(f.fileno(), msvcrt.LK_NBLCK, 1)
+                break
+            except OSError:
+                if deadline is not None and time.monotonic() >= deadline:
+                    raise TimeoutError(f"잠금 대기 시간 초과: {lock_path}")
+                time.sleep(0.05)
+        try:
+            yield
+        finally:
+            if fcntl:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+            else:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
@@ -0,0 +1,164 @@
+"""섹터 테이블 HTML 템플릿 렌더러.
+
+DataFrame.to_html() 결과를 정규식으로 후처리하던 방식 대신, 정적 <head>(CSS)와
+페이지 골격을 한 번만 만들어 두고 데이터에서 스타일이 적용된 셀을 바로 생성한다.
+RSI 셀 스타일은 소수점 둘째 자리 값(0.00~100.00)을 인덱스로 하는 룩업 테이블에서
+조회한다. 폰트는 render_assets 의 인라인 @font-face 로 포함해 네트워크 없이 렌더링한다.
+"""
+
+from html import escape
+
+from utils.render_assets import get_font_dir, get_font_face_css
+
+# 소수점 둘째 자리 RSI 값 -> 룩업 테이블 인덱스 배율
+_RSI_LUT_SCALE = 100
+
+_STYLE = """
+                body {
+                    font-family: 'NanumGothic', 'Noto Sans KR', sans-serif;
+                    margin: 20px;
+                }
+                table {
+                    border-collapse: collapse;
+                    width: 100%;
+                    margin: 20px auto;
+                    box-shadow: 0 1px 3px rgba(0,0,0,0.1);
+                }
+                th, td {
+                    border: 1px solid #e0e0e0;
+                    padding: 12px 15px;
+                    text-align: center;
+                    vertical-align: middle;
+                }
+                th {
+                    background-color: #333333;
+                    color: white;
+                    font-weight: 700;
+                    font-size: 15px;
+                }
+                td {
+                    font-size: 13px;
+                    font-weight: 500;
+                    line-height: 1.4;
+                }
+
+                .caption {
+                    text-align: center;
+                    font-size: 22px;
+                    font-weight: 700;
+                    margin: 20px 0;
+                    color: #333333;
+                }
+                .source {
+                    text-align: right;
+                    font-size: 12px;
+                    color: #666666;
+                    margin-top: 15px;
+                    font-weight: 400;
+                }
+                /* 대장주 컬럼 너비 조정 */
+                #styled-table th:nth-child(5),
+                #styled-table th:nth-child(6),
+                #styled-table td:nth-child(5),
+                #styled-table td:nth-child(6) {
+                    min-width: 150px;
+                    white-space: pre-line;
+                }
+"""
+
+_SOURCE_TEXT = '※ 출처 : MQ(Money Quotient)'
+
+
+class HtmlTableTemplate:
+    """정적 HEAD 와 RSI 스타일 룩업 테이블을 한 번만 만들어 재사용하는 HTML 템플릿"""
+
+    def __init__(self, rsi_color_fn, rsi_columns=('RSI(90)', 'RSI(30)', 'RSI(14)'), font_dir=None):
+        """
+        Args:
+            rsi_color_fn: RSI 문자열 -> (배경색, 글자색, font-weight) 반환 함수
+            rsi_columns: RSI 색상을 적용할 컬럼명
+            font_dir: 폰트 디렉토리 (None 이면 REPORT_FONT_DIR 또는 fonts/)
+        """
+        self.rsi_color_fn = rsi_color_fn
+        self.rsi_columns = tuple(rsi_columns)
+        self._style_cache = {}
+        self._thead_cache = {}
+
+        # 페이지마다 동일한 문서 앞/뒷부분
+        self._page_head = (
+            '<!DOCTYPE html>\n<html>\n<head>\n'
+            '<meta charset="UTF-8">\n'
+            f'<style>\n{get_font_face_css(font_dir or get_font_dir())}\n{_STYLE}</style>\n'
+            '</head>\n<body>\n<div class="caption">'
+        )
+        self._page_middle = '</div>\n'
+        self._page_tail = f'\n<div class="source">{_SOURCE_TEXT}</div>\n</body>\n</html>\n'
+
+        # RSI 0.00 ~ 100.00 스타일 룩업 테이블
+        self._rsi_style_lut = [
+            self._style_attr(f'{value / _RSI_LUT_SCALE:.2f}')
+            for value in range(100 * _RSI_LUT_SCALE + 1)
+        ]
+        self._na_style = self._style_attr('N/A')
+
+    def _style_attr(self, rsi_value):
+        """RSI 값의 인라인 style 속성 문자열 (동일 스타일은 같은 객체 공유)"""
+        background, color, weight = self.rsi_color_fn(rsi_value)
+        key = (background, color, weight)
+        if key not in self._style_cache:
+            self._style_cache[key] = (
+                f' style="background-color: {background}; color: {color}; '
+                f'font-weight: {weight}; text-align: center;"'
+            )
+        return self._style_cache[key]
+
+    def rsi_style(self, rsi_value):
+        """RSI 셀 문자열에 해당하는 style 속성 조회"""
+        if rsi_value is None or rsi_value == 'N/A':
+            return self._na_style
+        try:
+            scaled = float(rsi_value) * _RSI_LUT_SCALE
+        except (ValueError, TypeError):
+            return self._na_style
+        index = round(scaled)
+        if 0 <= index < len(self._rsi_style_lut) and abs(scaled - index) < 1e-6:
+            return self._rsi_style_lut[index]
+        # 룩업 범위 밖이거나 소수점 셋째 자리 이상인 값
+        return self._style_attr(rsi_value)
+
+    def _thead(self, columns):
+        if columns not in self._thead_cache:
+            header_cells = ''.join(f'<th>{escape(column)}</th>' for column in columns)
+            self._thead_cache[columns] = (
+                '<table border="1" class="dataframe styled-table" id="styled-table">\n'
+                f'<thead>\n<tr style="text-align: right;">{header_cells}</tr>\n</thead>\n<tbody>\n'
+            )
+        return self._thead_cache[columns]
+
+    def render_table(self, df):
+        """DataFrame 을 스타일이 적용된 <table> HTML 로 변환 (셀 값은 HTML 그대로 사용)"""
+        columns = tuple(str(column) for column in df.columns)
+        rsi_positions = {idx for idx, column in enumerate(columns) if column in self.rsi_columns}
+
+        parts = [self._thead(columns)]
+        for record in df.itertuples(index=False):
+            parts.append('<tr>')
+            for idx, value in enumerate(record):
+                if idx in rsi_positions:
+                    cell = str(value).strip()
+                    parts.append(f'<td{self.rsi_style(cell)}>{value}</td>')
+                else:
+                    parts.append(f'<td>{value}</td>')
+            parts.append('</tr>\n')
+        parts.append('</tbody>\n</table>')
+        return ''.join(parts)
+
+    def render(self, df, title):
+        """페이지 전체 HTML 문서 생성"""
+        return ''.join((
+            self._page_head,
+            title,
+            self._page_middle,
+            self.render_table(df),
+            self._page_tail,
+        ))
@@ -0,0 +1,167 @@
+"""전송용 이미지 변형본(delivery variant) 생성/캐시 유틸.
+
+렌더링된 리포트 PNG 와 썸네일을 전송 규격(최대 너비, 최대 용량)에 맞게 한 번만
+변환해 img/delivery/ 에 저장하고, TelegramUtil 과 ApiUtil 이 같은 결과를 재사용한다.
+용량 초과 시 JPEG 품질은 선형으로 낮추지 않고 이진 탐색으로 한도 내 최고 품질을 찾는다.
+"""
+
+import hashlib
+import io
+import os
+import threading
+
+from utils.logger_util import LoggerUtil
+from utils.render_cache import RenderCache
+
+_ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_DELIVERY_DIR = os.path.join(_ROOT_DIR, 'img', 'delivery')
+
+# 변환 규칙이 바뀌면 올려서 기존 변형본을 무효화
+VARIANT_VERSION = '1'
+
+
+class ImageArtifactUtil:
+    """원본 이미지 -> 전송용 변형본 변환 및 캐시"""
+
+    def __init__(self, delivery_dir=None, max_width=800, max_file_size=1 * 1024 * 1024,
+                 min_quality=30, max_quality=85):
+        self.logger = LoggerUtil().get_logger(__name__)
+        self.max_width = max_width
+        self.max_file_size = max_file_size
+        self.min_quality = min_quality
+        self.max_quality = max_quality
+        self.store = RenderCache(delivery_dir or DEFAULT_DELIVERY_DIR, prefix='')
+        self._index = {}  # (경로, 크기, mtime) -> 변형본 정보
+        self._lock = threading.Lock()
+
+    def _source_key(self, image_path):
+        stat = os.stat(image_path)
+        return os.path.abspath(image_path), stat.st_size, stat.st_mtime_ns
+
+    def _content_key(self, data):
+        digest = hashlib.sha256(data)
+        digest.update(f"|{VARIANT_VERSION}|{self.max_width}|{self.max_file_size}|{self.min_quality}|{self.max_quality}".encode())
+        return digest.hexdigest()
+
+    def _encode(self, img, fmt, quality=None):
+        buffer = io.BytesIO()
+        if fmt == 'JPEG':
+            img.save(buffer, format='JPEG', quality=quality, optimize=True)
+        else:
+            img.save(buffer, format=fmt, optimize=True)
+        return buffer.getvalue()
+
+    def _search_jpeg_quality(self, img):
+        """용량 한도 안에서 가장 높은 JPEG 품질을 이진 탐색 (한도 내 결과가 없으면 최저 품질)"""
+        if img.mode not in ('RGB', 'L'):
+            img = img.convert('RGB')
+
+        low, high = self.min_quality, self.max_quality
+        best = None
+        smallest = None
+        while low <= high:
+            quality = (low + high) // 2
+            data = self._encode(img, 'JPEG', quality)
+            if len(data) <= self.max_file_size:
+                best = data
+                low = quality + 1
+            else:
+                # 모두 초과하면 탐색이 최저 품질까지 내려가므로 마지막 결과가 가장 작음
+                smallest = data
+                high = quality - 1
+
+        return best if best is not None else smallest
+
+    def _build_variant(self, source_bytes):
+        """원본 바이트를 전송 규격에 맞게 변환해 (바이트, 포맷) 반환"""
+        from PIL import Image
+
+        with Image.open(io.BytesIO(source_bytes)) as img:
+            source_format = img.format or 'PNG'
+            img.load()
+
+            # 이미지 크기 조정
+            if img.width > self.max_width:
+                ratio = self.max_width / img.width
+                img = img.resize((self.max_width, int(img.height * ratio)), Image.Resampling.LANCZOS)
+
+            if source_format == 'PNG':
+                data = self._encode(img, 'PNG')
+                fmt = 'PNG'
+            else:
+                data = self._encode(img if img.mode in ('RGB', 'L') else img.convert('RGB'), 'JPEG', self.max_quality)
+                fmt = 'JPEG'
+
+            # 한도를 넘으면 JPEG 품질 탐색
+            if len(data) > self.max_file_size:
+                data = self._search_jpeg_quality(img)
+                fmt = 'JPEG'
+
+        return data, fmt
+
+    def get_variant(self, image_path):
+        """전송용 변형본 정보 반환 (이미 만들어진 경우 재사용)
+
+        Returns:
+            dict: {'path': 변형본 경로, 'format': 'png'|'jpeg', 'size': 바이트 수, 'source': 원본 경로}
+        """
+        source_key = self._source_key(image_path)
+        with self._lock:
+            cached = self._index.get(source_key)
+        if cached and os.path.isfile(cached['path']):
+            return cached
+
+        with open(image_path, 'rb') as f:
+            source_bytes = f.read()
+        content_key = self._content_key(source_bytes)
+        name_base = os.path.splitext(os.path.basename(image_path))[0]
+
+        artifact = None
+        for fmt, extension in (('png', '.png'), ('jpeg', '.jpg')):
+            path = self.store.path_for(name_base, content_key, extension)
+            if self.store.lookup(path):
+                artifact = {'path': path, 'format': fmt, 'size': os.path.getsize(path), 'source': image_path}
+                break
+
+        if artifact is None:
+            data, fmt = self._build_variant(source_bytes)
+            extension = '.png' if fmt == 'PNG' else '.jpg'
+            path = self.store.path_for(name_base, content_key, extension)
+            temp_path = self.store.temp_path_for(path)
+            try:
+                with open(temp_path, 'wb') as f:
+                    f.write(data)
+                self.store.store(temp_path, path)
+            except Exception:
+                self.store.discard(temp_path)
+                raise
+            artifact = {'path': path, 'format': fmt.lower(), 'size': len(data), 'source': image_path}
+            self.logger.info(f"전송용 이미지 생성 완료: {image_path} -> {path} (크기: {len(data)/1024:.1f}KB)")
+
+        with self._lock:
+            self._index[source_key] = artifact
+        return artifact
+
+    def prepare_variants(self, image_paths):
+        """여러 이미지의 전송용 변형본을 미리 생성하고 같은 순서의 경로 리스트 반환
+
+        변환에 실패한 이미지는 원본 경로를 그대로 사용한다.
+        """
+        variant_paths = []
+        for image_path in image_paths:
+            try:
+                variant_paths.append(self.get_variant(image_path)['path'])
+            except Exception as e:
+                self.logger.error(f"전송용 이미지 생성 실패: {image_path} - {e}")
+                variant_paths.append(image_path)
+        return variant_paths
+
+    def read_variant(self, image_path):
+        """전송용 변형본 바이트와 포맷 반환 (ApiUtil 업로드용)"""
+        artifact = self.get_variant(image_path)
+        with open(artifact['path'], 'rb') as f:
+            return f.read(), artifact['format']
+
+    def prune(self, keep=()):
+        """보존 기간/용량 한도를 넘는 변형본 정리"""
+        return self.store.prune(keep=keep)
@@ -7,21 +7,45 @@ pykrx (0.1.x) 의 pykrx.website.comm.webio 는 모듈 로드 시점에 내장된
 직접 덮어써야 한다.
 
 이 모듈은 다음을 수행한다:
-1. pykrx webio 가 import 되기 전에 requests.Session.get/post 를 no-op 으로 일시
-   교체해, 내장된 bluevisor 자동 로그인의 네트워크 호출 + "[KRX] 로그인 실패:
-   CD010" stdout 출력을 모두 제거한다 (import 완료 후 원상복구).
+1. load_pykrx_webio() 로 pykrx webio 를 처음 필요할 때 import 하면서, 그 동안만
+   requests.Session.get/post 를 no-op 으로 일시 교체해 내장된 bluevisor 자동
+   로그인의 네트워크 호출 + "[KRX] 로그인 실패: CD010" stdout 출력을 모두 제거한다
+   (import 완료 후 원상복구). pykrx 는 pandas/matplotlib 까지 불러오므로 이 모듈을
+   import 하는 것만으로는 로드하지 않는다 - pykrx 를 쓰는 코드는 반드시 이 함수를
+   먼저 호출해야 한다.
 2. install_krx_session() 으로 주어진 계정 로그인 후, pykrx webio._session 을
    교체한다. main.py 초기화 시점에 한 번만 호출.
+3. 로그인한 쿠키는 KRX_SESSION_FILE(기본 .cache/krx_session.json)에 만료 시각과 함께
+   저장하고, 다음 실행(상주 모드 재기동, cron, 병렬 작업자)은 파일 잠금 아래에서 이를
+   읽어 로그인 왕복(페이지 GET, iframe GET, 로그인 POST) 없이 세션을 복원한다. 복원 시에는
+   네트워크 없이 만료 시각/계정/KRX_BASE_URL 만 확인하고, 실제 만료는 4 에서 처리한다.
+4. 주입하는 세션(_KrxSession)은 KRX 데이터 요청이 JSON 대신 만료 응답(LOGOUT, 로그인
+   페이지)을 받으면, 모든 수집 스레드가 공유하는 잠금 아래에서 한 번만 다시 로그인하고
+   실패한 요청을 새 세션으로 재전송한다. 긴 --init 백필 중 세션이 만료되어도 pykrx 호출은
+   정상 응답을 받으므로 빈 데이터로 날짜가 누락되지 않는다.
+5. 주입하는 세션의 모든 요청(로그인 포함)은 utils.rate_limiter 의 공유 토큰 버킷을 거쳐,
+   여러 스레드/프로세스가 동시에 수집해도 KRX 로 가는 전체 요청 속도가 제한된다.
+
+KRX_BASE_URL 환경변수를 지정하면 로그인과 pykrx 의 data.krx.co.kr 요청을 모두
+해당 주소(예: fake_services.py 의 로컬 대체 서버)로 보낸다.
 """
 
 from __future__ import annotations
 
 import contextlib
+import hashlib
 import io
+import json
 import os
+import sys
+import threading
+import time
 from typing import Optional
 
 import requests
+from requests.adapters import HTTPAdapter
+
+from utils.file_lock import file_lock
 
 
 class _DummyResponse:
@@ -40,16 +64,22 @@ def _silence_pykrx_autologin() -> None:
 
     webio 모듈 최상단의 login_krx() 는 requests.Session 인스턴스의 get/post 를
     통해 네트워크를 사용한다. import 직전에 Session 클래스 레벨의 get/post 를
-    no-op 으로 교체 → import 후 원상복구 하는 방식으로 차단한다.
+    no-op 으로 교체 → import 후 원상복구 하는 방식으로 차단한다. 교체는 import 하는
+    스레드에만 적용되어, 그 사이 다른 스레드(텔레그램 전송 등)의 요청은 그대로 나간다.
     """
-
-    def _noop(self, *args, **kwargs):  # type: ignore[no-untyped-def]
-        return _DummyResponse()
-
+    importing_thread = threading.get_ident()
     orig_get = requests.Session.get
     orig_post = requests.Session.post
-    requests.Session.get = _noop  # type: ignore[assignment]
-    requests.Session.post = _noop  # type: ignore[assignment]
+
+    def _guard(orig):  # type: ignore[no-untyped-def]
+        def _noop(self, *args, **kwargs):  # type: ignore[no-untyped-def]
+            if threading.get_ident() == importing_thread:
+                return _DummyResponse()
+            return orig(self, *args, **kwargs)
+        return _noop
+
+    requests.Session.get = _guard(orig_get)  # type: ignore[assignment]
+    requests.Session.post = _guard(orig_post)  # type: ignore[assignment]
     try:
         with contextlib.redirect_stdout(io.StringIO()):
             import pykrx.website.comm.webio  # noqa: F401
@@ -58,9 +88,22 @@ def _silence_pykrx_autologin() -> None:
         requests.Session.post = orig_post
 
 
-_silence_pykrx_autologin()
+_webio = None
+_webio_lock = threading.Lock()
 
-from pykrx.website.comm import webio as _webio
+
+def load_pykrx_webio():  # type: ignore[no-untyped-def]
+    """pykrx webio 모듈을 자동 로그인 없이 처음 필요할 때 import (이후 호출은 캐시 반환)."""
+    global _webio
+    if _webio is None:
+        with _webio_lock:
+            if _webio is None:
+                if "pykrx.website.comm.webio" not in sys.modules:
+                    _silence_pykrx_autologin()
+                from pykrx.website.comm import webio
+
+                _webio = webio
+    return _webio
 
 _USER_AGENT = (
     "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
@@ -70,43 +113,211 @@ _LOGIN_PAGE_URL = "https://data.krx.co.kr/contents/MDC/COMS/client/MDCCOMS001.cm
 _LOGIN_IFRAME_URL = "https://data.krx.co.kr/contents/MDC/COMS/client/view/login.jsp?site=mdc"
 _LOGIN_POST_URL = "https://data.krx.co.kr/contents/MDC/COMS/client/MDCCOMS001D1.cmd"
 
+_KRX_ORIGINS = ("https://data.krx.co.kr", "http://data.krx.co.kr")
+
+# pykrx 가 호출하는 KRX 데이터 조회 경로 (만료 응답 감지 대상)
+_KRX_DATA_PATH = "/comm/bldAttendant/getJsonData.cmd"
+
+_ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# 로그인 세션 저장 파일 / 저장 세션 유효 시간(초)
+_DEFAULT_SESSION_FILE = os.path.join(_ROOT_DIR, ".cache", "krx_session.json")
+_DEFAULT_SESSION_TTL = 6 * 3600
+
 _installed = False
+_installed_at = 0.0  # 주입한 세션의 로그인 시각 (epoch 초, 저장 세션이면 저장 시각)
+_install_lock = threading.Lock()
+
+# 세션을 주입할 때마다 증가 - 만료 응답을 받은 요청이 그 사이 다른 스레드가 이미 다시 로그인했는지 판단
+_session_generation = 0
+_renew_lock = threading.Lock()
+
+
+class _KrxRedirectAdapter(HTTPAdapter):
+    """data.krx.co.kr 요청을 KRX_BASE_URL 로 보내는 어댑터 (pykrx URL 은 하드코딩되어 있음)."""
+
+    def __init__(self, base_url: str, **kwargs):  # type: ignore[no-untyped-def]
+        super().__init__(**kwargs)
+        self.base_url = base_url.rstrip("/")
+
+    def send(self, request, **kwargs):  # type: ignore[no-untyped-def]
+        for origin in _KRX_ORIGINS:
+            if request.url.startswith(origin):
+                request.url = self.base_url + request.url[len(origin):]
+                break
+        return super().send(request, **kwargs)
+
+
+def _is_expired_response(response: requests.Response) -> bool:
+    """KRX 데이터 요청이 로그인 만료 응답(JSON 대신 LOGOUT 문자열/로그인 페이지)을 받았는지"""
+    if _KRX_DATA_PATH not in (response.request.url or ""):
+        return False
+    if response.status_code in (401, 403):
+        return True
+    body = response.text.lstrip()[:64]
+    if body.upper().startswith("LOGOUT"):
+        return True
+    return body.startswith("<") or "html" in response.headers.get("Content-Type", "").lower()
+
+
+def _renew_expired_session(generation: int) -> Optional[requests.Session]:
+    """만료 응답을 받은 요청들이 공유 잠금 아래에서 한 번만 다시 로그인 (이미 갱신됐으면 그 세션 사용)"""
+    from utils.logger_util import LoggerUtil
+
+    with _renew_lock:
+        if generation == _session_generation:
+            try:
+                install_krx_session(force=True)
+            except Exception as e:
+                LoggerUtil().get_logger(__name__).error(f"KRX 세션 만료 후 재로그인 실패: {e}")
+                return None
+            LoggerUtil().get_logger(__name__).warning("KRX 세션 만료 감지 - 다시 로그인 후 요청 재전송")
+        return load_pykrx_webio()._session  # pyright: ignore[reportPrivateUsage, reportReturnType]
+
+
+def _send_limited(session: requests.Session, request, **kwargs) -> requests.Response:  # type: ignore[no-untyped-def]
+    """공유 요청 제한기에서 토큰을 받은 뒤 전송하고 결과(거부/오류 여부)를 제한기에 반영
+
+    거부(429/5xx)/연결 오류면 제한기가 정한 대기 시간 뒤 KRX_RATE_LIMIT_RETRIES 번까지 다시 보낸다
+    (KRX 조회 요청은 읽기 전용이라 재전송해도 안전).
+    """
+    from utils.rate_limiter import get_krx_rate_limiter, KRX_RATE_LIMIT_RETRIES, THROTTLE_STATUS_CODES
+
+    limiter = get_krx_rate_limiter()
+    if limiter is None:
+        return requests.Session.send(session, request, **kwargs)
+    for attempt in range(KRX_RATE_LIMIT_RETRIES + 1):
+        limiter.acquire()
+        try:
+            response = requests.Session.send(session, request, **kwargs)
+        except (requests.ConnectionError, requests.Timeout):
+            limiter.record(True)
+            if attempt == KRX_RATE_LIMIT_RETRIES:
+                raise
+            continue
+        limiter.record_response(response)
+        if response.status_code not in THROTTLE_STATUS_CODES:
+            break
+    return response
+
+
+class _KrxSession(requests.Session):
+    """KRX 요청용 세션 (pykrx webio._session 으로 주입)
+
+    - 모든 요청은 스레드/프로세스가 공유하는 요청 제한기(utils.rate_limiter)를 거쳐 전송
+    - 만료 응답을 받으면 다시 로그인한 세션으로 요청을 재전송
+    """
+
+    def send(self, request, **kwargs):  # type: ignore[no-untyped-def]
+        generation = _session_generation
+        # 리다이렉트 어댑터가 URL 을 바꾸기 전 원본을 재전송용으로 보관
+        replay = request.copy()
+        response = _send_limited(self, request, **kwargs)
+        if not _is_expired_response(response):
+            return response
+
+        session = _renew_expired_session(generation)
+        if session is None:
+            return response
+        replay.headers.pop("Cookie", None)
+        replay.prepare_cookies(session.cookies)
+        # 재전송은 한 번만 (다시 만료 응답이면 그대로 반환해 호출자가 실패 처리)
+        return _send_limited(session, replay, **kwargs)
+
+
+def _new_krx_session() -> requests.Session:
+    """KRX 요청용 세션 (KRX_BASE_URL 지정 시 대체 서버로 리다이렉트)"""
+    session = _KrxSession()
+    base_url = os.getenv("KRX_BASE_URL")
+    if base_url:
+        adapter = _KrxRedirectAdapter(base_url)
+        for origin in _KRX_ORIGINS:
+            session.mount(origin, adapter)
+    return session
 
 
 class KrxSessionError(RuntimeError):
     """KRX 로그인/세션 주입 실패"""
 
 
-def install_krx_session(
-    login_id: Optional[str] = None,
-    password: Optional[str] = None,
-    force: bool = False,
-) -> requests.Session:
-    """KRX 에 로그인한 세션을 pykrx webio 에 주입.
+def _session_file() -> Optional[str]:
+    """로그인 세션 저장 파일 경로 (KRX_SESSION_PERSIST=false 면 None)"""
+    if os.getenv("KRX_SESSION_PERSIST", "true").lower() not in ("1", "true", "yes"):
+        return None
+    return os.getenv("KRX_SESSION_FILE") or _DEFAULT_SESSION_FILE
 
-    Args:
-        login_id: KRX Data Marketplace 계정 ID. 생략 시 KRX_LOGIN_ID 환경변수.
-        password: 계정 비밀번호. 생략 시 KRX_LOGIN_PASSWORD 환경변수.
-        force: True 이면 이미 주입된 경우에도 다시 로그인.
 
-    Returns:
-        로그인 완료된 requests.Session (이미 pykrx 에 주입됨)
+def _account_key(login_id: str) -> str:
+    """저장 파일에 계정 ID 대신 남기는 식별값"""
+    return hashlib.sha256(login_id.encode("utf-8")).hexdigest()[:16]
 
-    Raises:
-        KrxSessionError: 자격 증명 누락 또는 KRX 로그인 실패 시.
-    """
-    global _installed
-    if _installed and not force:
-        return _webio._session  # pyright: ignore[reportPrivateUsage, reportReturnType]
-
-    login_id = login_id or os.getenv("KRX_LOGIN_ID")
-    password = password or os.getenv("KRX_LOGIN_PASSWORD")
-    if not login_id or not password:
-        raise KrxSessionError(
-            "KRX_LOGIN_ID / KRX_LOGIN_PASSWORD 환경변수가 필요합니다."
+
+def _load_saved_session(path: str, login_id: str, max_age: Optional[float]) -> Optional[dict]:
+    """저장된 세션이 같은 계정/KRX 주소이고 만료 전이면 반환 (네트워크 확인 없음)"""
+    try:
+        with open(path, encoding="utf-8") as f:
+            saved = json.load(f)
+    except (OSError, ValueError):
+        return None
+
+    now = time.time()
+    if saved.get("account") != _account_key(login_id) or saved.get("base_url") != (os.getenv("KRX_BASE_URL") or ""):
+        return None
+    if now >= saved.get("expires_at", 0):
+        return None
+    if max_age is not None and now - saved.get("saved_at", 0) > max_age:
+        return None
+    cookies = saved.get("cookies") or []
+    if not cookies or any(c.get("expires") and c["expires"] <= now for c in cookies):
+        return None
+    return saved
+
+
+def _save_session(path: str, session: requests.Session, login_id: str, saved_at: float) -> None:
+    """세션 쿠키를 만료 시각과 함께 저장 (소유자만 읽기/쓰기, 원자적 교체)"""
+    ttl = float(os.getenv("KRX_SESSION_TTL", _DEFAULT_SESSION_TTL))
+    saved = {
+        "account": _account_key(login_id),
+        "base_url": os.getenv("KRX_BASE_URL") or "",
+        "saved_at": saved_at,
+        "expires_at": saved_at + ttl,
+        "cookies": [
+            {
+                "name": cookie.name,
+                "value": cookie.value,
+                "domain": cookie.domain,
+                "path": cookie.path,
+                "expires": cookie.expires,
+                "secure": cookie.secure,
+            }
+            for cookie in session.cookies
+        ],
+    }
+    temp_path = f"{path}.{os.getpid()}.tmp"
+    fd = os.open(temp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    with os.fdopen(fd, "w", encoding="utf-8") as f:
+        json.dump(saved, f)
+    os.replace(temp_path, path)
+
+
+def _restore_session(saved: dict) -> requests.Session:
+    """저장된 쿠키로 KRX 세션 복원"""
+    session = _new_krx_session()
+    for cookie in saved["cookies"]:
+        session.cookies.set(
+            cookie["name"],
+            cookie["value"],
+            domain=cookie.get("domain"),
+            path=cookie.get("path") or "/",
+            expires=cookie.get("expires"),
+            secure=bool(cookie.get("secure")),
         )
+    return session
 
-    session = requests.Session()
+
+def _login(login_id: str, password: str) -> requests.Session:
+    """KRX Data Marketplace 로그인 (페이지 GET, iframe GET, 로그인 POST - 중복 로그인 시 한 번 더)"""
+    session = _new_krx_session()
 
     session.get(_LOGIN_PAGE_URL, headers={"User-Agent": _USER_AGENT}, timeout=15)
     session.get(
@@ -142,7 +353,67 @@ def install_krx_session(
     if code != "CD001":
         msg = str(data.get("_error_message") or "unknown").strip()
         raise KrxSessionError(f"KRX 로그인 실패: {code} {msg}".strip())
-
-    _webio._session = session  # pyright: ignore[reportPrivateUsage]
-    _installed = True
     return session
+
+
+def install_krx_session(
+    login_id: Optional[str] = None,
+    password: Optional[str] = None,
+    force: bool = False,
+    max_age: Optional[float] = None,
+) -> requests.Session:
+    """KRX 에 로그인한 세션을 pykrx webio 에 주입.
+
+    저장된 세션(KRX_SESSION_FILE)이 유효하면 로그인 없이 복원하고, 새로 로그인한 세션은
+    저장해 다른 프로세스/다음 실행이 재사용한다. 로그인과 저장은 파일 잠금 아래에서 하므로
+    동시에 시작한 작업자들도 한 번만 로그인한다.
+
+    Args:
+        login_id: KRX Data Marketplace 계정 ID. 생략 시 KRX_LOGIN_ID 환경변수.
+        password: 계정 비밀번호. 생략 시 KRX_LOGIN_PASSWORD 환경변수.
+        force: True 이면 지금 주입된 세션을 버리고 다시 로그인 (다른 프로세스가 그 사이
+            저장한 더 새 세션이 있으면 그 세션 사용).
+        max_age: 세션이 로그인한 지 이 시간(초)보다 오래되었으면 다시 로그인 (상주 모드용).
+
+    Returns:
+        로그인 완료된 requests.Session (이미 pykrx 에 주입됨)
+
+    Raises:
+        KrxSessionError: 자격 증명 누락 또는 KRX 로그인 실패 시.
+    """
+    global _installed, _installed_at, _session_generation
+    with _install_lock:
+        expired = max_age is not None and time.time() - _installed_at > max_age
+        if _installed and not force and not expired:
+            return load_pykrx_webio()._session  # pyright: ignore[reportPrivateUsage, reportReturnType]
+
+        login_id = login_id or os.getenv("KRX_LOGIN_ID")
+        password = password or os.getenv("KRX_LOGIN_PASSWORD")
+        if not login_id or not password:
+            raise KrxSessionError(
+                "KRX_LOGIN_ID / KRX_LOGIN_PASSWORD 환경변수가 필요합니다."
+            )
+
+        path = _session_file()
+        lock = file_lock(path) if path else contextlib.nullcontext()
+        with lock:
+            saved = _load_saved_session(path, login_id, max_age) if path else None
+            # 강제 갱신이면 지금 쓰는(만료된) 세션보다 나중에 저장된 세션만 재사용
+            if saved and (not force or not _installed or saved["saved_at"] > _installed_at):
+                session = _restore_session(saved)
+                logged_in_at = saved["saved_at"]
+            else:
+                session = _login(login_id, password)
+                logged_in_at = time.time()
+                if path:
+                    try:
+                        _save_session(path, session, login_id, logged_in_at)
+                    except OSError:
+                        pass  # 저장 실패는 다음 실행에서 다시 로그인할 뿐 작업에는 영향 없음
+
+        load_pykrx_webio()._session = session  # pyright: ignore[reportPrivateUsage]
+        _installed = True
+        _installed_at = logged_in_at
+        _session_generation += 1
+        return session
+
@@ -1,9 +1,143 @@
+import atexit
+import glob
+import gzip
 import logging
+import logging.handlers
+import os
+import queue
+import shutil
+import time
 from pathlib import Path
 from datetime import datetime
-import os
+
+from utils.env_util import load_env
+
+load_env()
+
+LOGGER_NAME = 'MQLogger'
+
+# 로거 기본 레벨 / 콘솔 출력 레벨
+LOG_LEVEL = os.getenv('LOG_LEVEL', 'DEBUG').upper()
+LOG_CONSOLE_LEVEL = os.getenv('LOG_CONSOLE_LEVEL', LOG_LEVEL).upper()
+
+# 모듈별 레벨 (모듈명=레벨, 쉼표로 구분 - 예: utils.api_util=INFO,krx_service=WARNING)
+LOG_LEVELS = os.getenv('LOG_LEVELS', '')
+
+# 일별 로그 파일 최대 크기(바이트) - 넘으면 {날짜}_log.{n}.log(.gz) 로 분리 (0 이면 크기 제한 없음)
+LOG_MAX_BYTES = int(os.getenv('LOG_MAX_BYTES', 20 * 1024 * 1024))
+
+# 로그 파일 보존 기간(일) - 지난 파일은 교체 시 삭제 (0 이면 삭제하지 않음)
+LOG_RETENTION_DAYS = int(os.getenv('LOG_RETENTION_DAYS', 30))
+
+# 교체된 로그 파일 gzip 압축 여부
+LOG_COMPRESS = os.getenv('LOG_COMPRESS', 'true').lower() in ('1', 'true', 'yes')
+
+
+def parse_log_levels(value):
+    """'모듈명=레벨,...' 형식을 {로거명: 레벨} 로 변환"""
+    levels = {}
+    for item in (value or '').split(','):
+        if not item.strip():
+            continue
+        name, sep, level = item.partition('=')
+        if not sep or not name.strip() or not isinstance(logging.getLevelName(level.strip().upper()), int):
+            raise ValueError(f"LOG_LEVELS 형식이 올바르지 않습니다: {item.strip()} (예: utils.api_util=INFO)")
+        levels[name.strip()] = level.strip().upper()
+    return levels
+
+
+class _DailyRotatingFileHandler(logging.handlers.BaseRotatingHandler):
+    """{날짜}_log.log 에 기록하고 날짜가 바뀌거나 최대 크기를 넘으면 교체하는 파일 핸들러
+
+    - 날짜 변경: 새 날짜 파일로 전환하고 이전 파일은 압축
+    - 크기 초과: 현재 파일을 {날짜}_log.{n}.log 로 옮겨 압축하고 같은 날짜 파일을 새로 시작
+    - 교체 시 보존 기간이 지난 로그 파일 삭제
+    첫 로그를 기록할 때 로그 디렉토리/파일을 만든다 (import 시 파일 생성 방지).
+    fork 된 자식 프로세스(재처리 프로세스 풀)는 같은 파일에 이어서 쓰기만 하고, 파일 이동·압축·삭제는
+    핸들러를 만든 프로세스만 한다 (다른 프로세스가 쓰는 중인 파일을 옮기지 않도록).
+    """
+
+    def __init__(self, log_dir, max_bytes=0, retention_days=0, compress=True, encoding=None):
+        self.log_dir = Path(log_dir)
+        self.max_bytes = max_bytes
+        self.retention_days = retention_days
+        self.compress = compress
+        self.owner_pid = os.getpid()
+        self.current_date = self._today()
+        super().__init__(self._path_for(self.current_date), 'a', encoding=encoding, delay=True)
+
+    @staticmethod
+    def _today():
+        return datetime.now().strftime('%Y-%m-%d')
+
+    def _path_for(self, date_str):
+        return str(self.log_dir / f"{date_str}_log.log")
+
+    def _open(self):
+        Path(self.baseFilename).parent.mkdir(parents=True, exist_ok=True)
+        return super()._open()
+
+    def shouldRollover(self, record):
+        if self._today() != self.current_date:
+            return True
+        if self.max_bytes <= 0 or os.getpid() != self.owner_pid:
+            return False
+        if self.stream is None:
+            return os.path.exists(self.baseFilename) and os.path.getsize(self.baseFilename) >= self.max_bytes
+        self.stream.seek(0, os.SEEK_END)
+        return self.stream.tell() >= self.max_bytes
+
+    def doRollover(self):
+        if self.stream:
+            self.stream.close()
+            self.stream = None
+
+        previous = self.baseFilename
+        today = self._today()
+        if os.getpid() != self.owner_pid:
+            self.current_date = today
+            self.baseFilename = self._path_for(today)
+            return
+        if today != self.current_date:
+            # 날짜가 바뀌면 이전 날짜 파일은 그대로 두고(압축만) 새 날짜 파일로 전환
+            self.current_date = today
+            self.baseFilename = self._path_for(today)
+            rotated = previous
+        else:
+            index = 1
+            while glob.glob(f"{previous[:-len('.log')]}.{index}.log*"):
+                index += 1
+            rotated = f"{previous[:-len('.log')]}.{index}.log"
+            os.replace(previous, rotated)
+
+        if self.compress and os.path.exists(rotated):
+            self._compress(rotated)
+        self._remove_expired()
+
+    @staticmethod
+    def _compress(path):
+        with open(path, 'rb') as src, gzip.open(f"{path}.gz", 'wb') as dst:
+            shutil.copyfileobj(src, dst)
+        os.remove(path)
+
+    def _remove_expired(self):
+        if self.retention_days <= 0:
+            return
+        cutoff = time.time() - self.retention_days * 86400
+        for path in glob.glob(str(self.log_dir / '*_log*.log*')):
+            if path != self.baseFilename and os.path.getmtime(path) < cutoff:
+                os.remove(path)
+
 
 class LoggerUtil:
+    """애플리케이션 로거 (MQLogger)
+
+    로그 호출은 레코드를 큐에 넣기만 하고, 콘솔/파일 기록은 QueueListener 스레드가 처리해
+    디스크·콘솔 I/O 가 호출한 스레드의 지연으로 이어지지 않는다. 모듈별 로거는
+    get_logger(__name__) 로 MQLogger 의 하위 로거를 받아 LOG_LEVELS 로 레벨을 따로 지정한다.
+    반복문 안의 로그는 logger.debug("... %s", 값) 처럼 % 인자를 넘겨, 레벨이 꺼져 있으면
+    메시지 문자열을 만들지 않도록 한다.
+    """
     _instance = None
     _initialized = False
 
@@ -17,47 +151,78 @@ class LoggerUtil:
             # 루트 디렉토리 경로 찾기 (상위 디렉토리)
             current_dir = Path(os.path.dirname(os.path.abspath(__file__)))
             root_dir = current_dir.parent
-            
-            # 로그 디렉토리를 루트 경로의 logs 폴더로 설정
-            log_dir = root_dir / 'logs'
 
-            # 디렉토리가 없으면 생성
-            log_dir.mkdir(parents=True, exist_ok=True)
-
-            # 로그 파일 설정
-            log_file = log_dir / f"{datetime.now().strftime('%Y-%m-%d')}_log.log"
+            # 로그 디렉토리를 루트 경로의 logs 폴더로 설정 (디렉토리는 첫 기록 시 생성)
+            log_dir = root_dir / 'logs'
 
             # 로거 생성
-            self.logger = logging.getLogger('MQLogger')
-            self.logger.setLevel(logging.DEBUG)
+            self.logger = logging.getLogger(LOGGER_NAME)
+            self.logger.setLevel(LOG_LEVEL)
 
             # 이미 핸들러가 있다면 제거
             if self.logger.handlers:
                 self.logger.handlers.clear()
 
-            # 파일 핸들러
-            file_handler = logging.FileHandler(log_file, encoding='utf-8')
+            # 파일 핸들러 (일별 + 크기 기준 교체, 압축, 보존 기간)
+            file_handler = _DailyRotatingFileHandler(
+                log_dir,
+                max_bytes=LOG_MAX_BYTES,
+                retention_days=LOG_RETENTION_DAYS,
+                compress=LOG_COMPRESS,
+                encoding='utf-8'
+            )
             file_handler.setLevel(logging.DEBUG)
 
             # 콘솔 핸들러
             console_handler = logging.StreamHandler()
-            console_handler.setLevel(logging.DEBUG)
+            console_handler.setLevel(LOG_CONSOLE_LEVEL)
 
             # 포맷터 설정
             formatter = logging.Formatter('%(asctime)s [%(levelname)s] %(message)s')
             file_handler.setFormatter(formatter)
             console_handler.setFormatter(formatter)
 
-            # 핸들러 추가
-            self.logger.addHandler(file_handler)
-            self.logger.addHandler(console_handler)
-            
+            # 로거에는 큐 핸들러만 두고 실제 기록은 리스너 스레드에서 처리
+            log_queue = queue.SimpleQueue()
+            self.queue_handler = logging.handlers.QueueHandler(log_queue)
+            self.logger.addHandler(self.queue_handler)
+            self.listener = logging.handlers.QueueListener(
+                log_queue, file_handler, console_handler, respect_handler_level=True
+            )
+            self.listener.start()
+            # 종료 시 큐에 남은 로그를 모두 기록
+            atexit.register(self.stop)
+            os.register_at_fork(after_in_child=self._restart_listener)
+
+            # 모듈별 레벨
+            for name, level in parse_log_levels(LOG_LEVELS).items():
+                logging.getLogger(f"{LOGGER_NAME}.{name}").setLevel(level)
+
             LoggerUtil._initialized = True
 
-    def get_logger(self):
-        return self.logger 
+    def _restart_listener(self):
+        """fork 된 자식 프로세스에서 리스너 스레드 재시작 (스레드는 fork 로 복제되지 않음)"""
+        log_queue = queue.SimpleQueue()
+        self.queue_handler.queue = log_queue
+        self.listener.queue = log_queue
+        self.listener._thread = None
+        self.listener.start()
+        # multiprocessing 자식은 atexit 없이 종료되므로 종료 처리기에 등록
+        from multiprocessing import util
+        util.Finalize(self, self.stop, exitpriority=0)
+
+    def stop(self):
+        """큐에 남은 로그를 모두 기록하고 리스너 스레드 종료 (여러 번 호출해도 안전)"""
+        if self.listener._thread is not None:
+            self.listener.stop()
+
+    def get_logger(self, name=None):
+        """애플리케이션 로거 반환 (name 을 주면 LOG_LEVELS 로 레벨을 지정할 수 있는 모듈별 하위 로거)"""
+        if name:
+            return self.logger.getChild(name)
+        return self.logger
 
 # 모듈 테스트용
 if __name__ == "__main__":
     logger = LoggerUtil().get_logger()
-    logger.info("로거 테스트 메시지") 
\ No newline at end of file
+    logger.info("로거 테스트 메시지")
@@ -0,0 +1,125 @@
+"""파일 본문을 디스크에서 필요할 때만 읽는 스트리밍 multipart/form-data 인코더.
+
+requests 의 files= 인자는 모든 파일을 메모리에 올려 요청 본문 전체를 한 번에 만든다.
+이 인코더는 각 파트의 크기를 미리 계산해 Content-Length 를 정하고, 전송 중에는
+파일을 chunk_size 단위로 읽어 보내므로 이미지 수와 관계없이 메모리 사용량이 일정하다.
+길이를 알 수 없는 경우를 위해 chunked 전송용 제너레이터(iter_chunks)도 제공한다.
+deadline 을 주면 그 시각이 지난 뒤에는 본문을 더 내보내지 않고 업로드를 중단한다.
+"""
+
+import os
+import time
+import uuid
+from email.utils import quote as _quote
+
+DEFAULT_CHUNK_SIZE = 64 * 1024
+
+
+class UploadDeadlineExceeded(Exception):
+    """업로드 마감 시각이 지나 본문 전송을 중단함 (서버는 완전한 요청을 받지 못함)
+
+    requests/urllib3 가 OSError 계열 예외를 연결 오류로 감싸므로 Exception 을 상속한다.
+    """
+
+
+class StreamingMultipartEncoder:
+    """multipart/form-data 본문을 스트리밍으로 생성하는 파일 유사 객체
+
+    fields 는 (이름, 값) 리스트이며 값은 문자열 또는
+    (파일명, 파일 경로, content-type) 튜플이다.
+    """
+
+    def __init__(self, fields, chunk_size=DEFAULT_CHUNK_SIZE, progress=None, boundary=None, deadline=None):
+        """
+        Args:
+            fields: [(필드명, 문자열 | (파일명, 경로, content-type))]
+            chunk_size: 파일 읽기 단위 (바이트)
+            progress: 전송 진행 콜백 (보낸 바이트, 전체 바이트)
+            deadline: 업로드 마감 시각 (time.monotonic 기준, None 이면 제한 없음)
+        """
+        self.deadline = deadline
+        self.boundary = boundary or uuid.uuid4().hex
+        self.content_type = f"multipart/form-data; boundary={self.boundary}"
+        self.chunk_size = chunk_size
+        self.progress = progress
+
+        # 파트별 (헤더 바이트, 본문: bytes 또는 파일 경로, 본문 크기)
+        self._parts = []
+        for name, value in fields:
+            if isinstance(value, tuple):
+                file_name, path, content_type = value
+                header = (
+                    f'--{self.boundary}\r\n'
+                    f'Content-Disposition: form-data; name="{_quote(name)}"; filename="{_quote(file_name)}"\r\n'
+                    f'Content-Type: {content_type}\r\n\r\n'
+                ).encode('utf-8')
+                self._parts.append((header, path, os.path.getsize(path)))
+            else:
+                header = (
+                    f'--{self.boundary}\r\n'
+                    f'Content-Disposition: form-data; name="{_quote(name)}"\r\n\r\n'
+                ).encode('utf-8')
+                body = str(value).encode('utf-8')
+                self._parts.append((header, body, len(body)))
+        self._closing = f'--{self.boundary}--\r\n'.encode('utf-8')
+
+        # 파트 헤더 + 본문 + CRLF, 마지막 경계
+        self.len = sum(len(header) + size + 2 for header, _, size in self._parts) + len(self._closing)
+        self.bytes_sent = 0
+        self._stream = None
+        self._buffer = b''
+
+    def _generate(self):
+        for header, body, size in self._parts:
+            yield header
+            if isinstance(body, bytes):
+                yield body
+            else:
+                sent = 0
+                with open(body, 'rb') as f:
+                    while True:
+                        chunk = f.read(self.chunk_size)
+                        if not chunk:
+                            break
+                        sent += len(chunk)
+                        yield chunk
+                if sent != size:
+                    # Content-Length 와 실제 본문이 달라지면 서버가 요청을 잘못 해석하므로 중단
+                    raise IOError(f"전송 중 파일 크기가 변경되었습니다: {body} ({size} -> {sent} 바이트)")
+            yield b'\r\n'
+        yield self._closing
+
+    def _advance(self, data):
+        if self.deadline is not None and time.monotonic() >= self.deadline:
+            raise UploadDeadlineExceeded(f"업로드 제한 시간 초과 ({self.bytes_sent}/{self.len} 바이트 전송)")
+        self.bytes_sent += len(data)
+        if self.progress:
+            self.progress(self.bytes_sent, self.len)
+        return data
+
+    def iter_chunks(self):
+        """chunked 전송용 제너레이터 (requests 의 data= 에 그대로 전달)"""
+        for data in self._generate():
+            if data:
+                yield self._advance(data)
+
+    def read(self, size=-1):
+        """파일 유사 인터페이스 (Content-Length 를 알고 있는 스트리밍 전송용)"""
+        if self._stream is None:
+            self._stream = self._generate()
+
+        if size is None or size < 0:
+            data = self._buffer + b''.join(self._stream)
+            self._buffer = b''
+            return self._advance(data) if data else data
+
+        while len(self._buffer) < size:
+            try:
+                self._buffer += next(self._stream)
+            except StopIteration:
+                break
+        data, self._buffer = self._buffer[:size], self._buffer[size:]
+        return self._advance(data) if data else data
+
+    def __len__(self):
+        return self.len
@@ -0,0 +1,266 @@
+"""Pillow 기반 섹터 테이블 이미지 렌더러.
+
+wkhtmltoimage(imgkit) 외부 프로세스 없이 save_df_as_image 의 HTML 테이블과
+동일한 레이아웃(캡션, 헤더, RSI 색상 셀, 대장주 2줄 셀, 출처)을 직접 그린다.
+폰트는 render_assets 번들(fonts/ 또는 REPORT_FONT_DIR 의 나눔고딕)을 사용한다.
+"""
+
+import io
+import re
+import threading
+
+from PIL import Image, ImageDraw, ImageFont
+
+from utils.logger_util import LoggerUtil
+from utils.render_assets import get_font_dir, load_font_bytes, normalize_weight
+
+# 번들이 없을 때(REPORT_FONT_FALLBACK=true) 사용할 시스템 폰트 (한글 폰트 우선)
+_FALLBACK_FONTS = {
+    400: ['NanumGothic.ttf', 'NotoSansCJK-Regular.ttc', 'DejaVuSans.ttf'],
+    700: ['NanumGothicBold.ttf', 'NotoSansCJK-Bold.ttc', 'DejaVuSans-Bold.ttf', 'DejaVuSans.ttf'],
+}
+
+_SPAN_PATTERN = re.compile(r'<span style="color:\s*(#[0-9A-Fa-f]{6});?">(.*?)</span>', re.DOTALL)
+_BR_PATTERN = re.compile(r'<br\s*/?>', re.IGNORECASE)
+_TAG_PATTERN = re.compile(r'<[^>]+>')
+
+
+# FreeType 객체는 스레드 간 공유하지 않으므로 스레드별 캐시 (스레드가 끝나면 함께 해제)
+_thread_fonts = threading.local()
+
+
+def _load_font(font_dir, weight, size):
+    """굵기/크기별 폰트를 스레드당 한 번만 로드"""
+    cache = getattr(_thread_fonts, 'cache', None)
+    if cache is None:
+        cache = _thread_fonts.cache = {}
+    key = (font_dir, normalize_weight(weight), size)
+    font = cache.get(key)
+    if font is None:
+        font = cache[key] = _open_font(*key)
+    return font
+
+
+def _open_font(font_dir, weight, size):
+    """번들 폰트(없으면 대체 폰트)로 FreeType 폰트 생성"""
+    _, data = load_font_bytes(font_dir, weight)
+    if data is not None:
+        return ImageFont.truetype(io.BytesIO(data), size)
+
+    for candidate in _FALLBACK_FONTS[weight]:
+        try:
+            return ImageFont.truetype(candidate, size)
+        except OSError:
+            continue
+
+    LoggerUtil().get_logger(__name__).warning(f"렌더링 폰트를 찾을 수 없어 기본 폰트를 사용합니다: {font_dir}")
+    try:
+        return ImageFont.load_default(size)
+    except TypeError:
+        # Pillow 10.1 미만은 크기 지정 불가
+        return ImageFont.load_default()
+
+
+class PillowTableRenderer:
+    """DataFrame 을 HTML 리포트와 동일한 스타일의 PNG 로 직접 그리는 렌더러"""
+
+    # save_df_as_image 의 CSS 와 같은 값
+    width = 800
+    body_margin = 20
+    caption_size = 22
+    caption_margin = 20
+    header_size = 15
+    cell_size = 13
+    source_size = 12
+    cell_padding_x = 15
+    cell_padding_y = 12
+    line_height = 1.4
+    leader_min_width = 150
+    leader_columns = ('1등주', '2등주')
+
+    header_bg = '#333333'
+    header_fg = '#ffffff'
+    border_color = '#e0e0e0'
+    text_color = '#000000'
+    caption_color = '#333333'
+    source_color = '#666666'
+    source_text = '※ 출처 : MQ(Money Quotient)'
+
+    def __init__(self, rsi_color_fn, rsi_columns=('RSI(90)', 'RSI(30)', 'RSI(14)'), font_dir=None):
+        """
+        Args:
+            rsi_color_fn: RSI 문자열 -> (배경색, 글자색, font-weight) 반환 함수
+            rsi_columns: RSI 색상을 적용할 컬럼명
+            font_dir: 폰트 디렉토리 (None 이면 REPORT_FONT_DIR 또는 fonts/)
+        """
+        self.logger = LoggerUtil().get_logger(__name__)
+        self.rsi_color_fn = rsi_color_fn
+        self.rsi_columns = set(rsi_columns)
+        self.font_dir = font_dir or get_font_dir()
+
+    def _font(self, weight, size):
+        return _load_font(self.font_dir, weight, size)
+
+    @staticmethod
+    def _text_width(font, text):
+        return font.getlength(text) if text else 0
+
+    def _parse_cell(self, value):
+        """셀 마크업(<br>, <span style="color">)을 [(텍스트, 색상)] 줄 목록으로 변환"""
+        lines = []
+        for segment in _BR_PATTERN.split(str(value)):
+            match = _SPAN_PATTERN.search(segment)
+            if match:
+                color, text = match.group(1), match.group(2)
+            else:
+                color, text = None, _TAG_PATTERN.sub('', segment)
+            text = text.strip()
+            if text:
+                lines.append((text, color))
+        return lines or [('', None)]
+
+    def _wrap(self, font, text, max_width):
+        """열 너비를 넘는 텍스트를 글자 단위로 줄바꿈"""
+        if self._text_width(font, text) <= max_width:
+            return [text]
+
+        wrapped, current = [], ''
+        for char in text:
+            if current and self._text_width(font, current + char) > max_width:
+                wrapped.append(current.rstrip())
+                current = char.lstrip()
+            else:
+                current += char
+        if current:
+            wrapped.append(current)
+        return wrapped
+
+    def _column_widths(self, columns, rows, header_font, cell_font):
+        """HTML auto table layout 과 유사하게 내용 너비 비례로 열 너비 배분"""
+        table_width = self.width - self.body_margin * 2
+        padding = self.cell_padding_x * 2
+
+        natural = []
+        minimum = []
+        for col_idx, column in enumerate(columns):
+            content_width = self._text_width(header_font, column)
+            for row in rows:
+                for text, _ in row[col_idx]:
+                    content_width = max(content_width, self._text_width(cell_font, text))
+            natural.append(content_width + padding)
+            minimum.append(self.leader_min_width + padding if column in self.leader_columns else padding)
+
+        natural = [max(n, m) for n, m in zip(natural, minimum)]
+        total = sum(natural)
+        if total <= table_width:
+            extra = table_width - total
+            return [n + extra * n / total for n in natural]
+
+        # 내용이 넓으면 최소 너비를 보장하고 나머지를 비례 배분
+        flexible = table_width - sum(minimum)
+        overflow = [n - m for n, m in zip(natural, minimum)]
+        overflow_total = sum(overflow) or 1
+        return [m + flexible * o / overflow_total for m, o in zip(minimum, overflow)]
+
+    def render(self, df, title, file_path):
+        """DataFrame 을 PNG 로 렌더링하고 파일 경로 반환"""
+        columns = [str(col) for col in df.columns]
+        rows = [[self._parse_cell(value) for value in record] for record in df.itertuples(index=False)]
+
+        caption_font = self._font(700, self.caption_size)
+        header_font = self._font(700, self.header_size)
+        cell_font = self._font(500, self.cell_size)
+        source_font = self._font(400, self.source_size)
+
+        col_widths = self._column_widths(columns, rows, header_font, cell_font)
+        header_line = round(self.header_size * self.line_height)
+        cell_line = round(self.cell_size * self.line_height)
+
+        # 줄바꿈 적용 후 행 높이 계산
+        wrapped_rows = []
+        row_heights = []
+        for row in rows:
+            wrapped_row = []
+            max_lines = 1
+            for col_idx, lines in enumerate(row):
+                inner_width = col_widths[col_idx] - self.cell_padding_x * 2
+                cell_lines = []
+                for text, color in lines:
+                    cell_lines.extend((part, color) for part in self._wrap(cell_font, text, inner_width))
+                wrapped_row.append(cell_lines)
+                max_lines = max(max_lines, len(cell_lines))
+            wrapped_rows.append(wrapped_row)
+            row_heights.append(max_lines * cell_line + self.cell_padding_y * 2)
+
+        header_height = header_line + self.cell_padding_y * 2
+        caption_height = round(self.caption_size * self.line_height)
+        source_height = round(self.source_size * self.line_height)
+
+        # 캡션/테이블/출처 사이 세로 마진은 HTML 처럼 큰 쪽(20px)으로 병합
+        table_top = self.body_margin + self.caption_margin + caption_height + self.caption_margin
+        table_height = header_height + sum(row_heights)
+        source_top = table_top + table_height + self.caption_margin
+        image_height = source_top + source_height + self.body_margin
+
+        image = Image.new('RGB', (self.width, image_height), '#ffffff')
+        draw = ImageDraw.Draw(image)
+
+        # 캡션
+        caption_width = self._text_width(caption_font, title)
+        draw.text(
+            ((self.width - caption_width) / 2, self.body_margin + self.caption_margin),
+            title, font=caption_font, fill=self.caption_color
+        )
+
+        # 헤더
+        x = self.body_margin
+        y = table_top
+        for col_idx, column in enumerate(columns):
+            cell_box = (x, y, x + col_widths[col_idx], y + header_height)
+            draw.rectangle(cell_box, fill=self.header_bg, outline=self.border_color)
+            self._draw_centered(draw, cell_box, [(column, self.header_fg)], header_font, header_line)
+            x += col_widths[col_idx]
+
+        # 본문
+        y += header_height
+        for row_idx, wrapped_row in enumerate(wrapped_rows):
+            x = self.body_margin
+            row_height = row_heights[row_idx]
+            for col_idx, cell_lines in enumerate(wrapped_row):
+                cell_box = (x, y, x + col_widths[col_idx], y + row_height)
+                background = '#ffffff'
+                font = cell_font
+                default_color = self.text_color
+
+                if columns[col_idx] in self.rsi_columns:
+                    background, default_color, weight = self.rsi_color_fn(cell_lines[0][0])
+                    font = self._font(weight, self.cell_size)
+
+                draw.rectangle(cell_box, fill=background, outline=self.border_color)
+                lines = [(text, color or default_color) for text, color in cell_lines]
+                self._draw_centered(draw, cell_box, lines, font, cell_line)
+                x += col_widths[col_idx]
+            y += row_height
+
+        # 출처
+        source_width = self._text_width(source_font, self.source_text)
+        draw.text(
+            (self.width - self.body_margin - source_width, source_top),
+            self.source_text, font=source_font, fill=self.source_color
+        )
+
+        image.save(file_path, format='PNG', optimize=False)
+        return file_path
+
+    def _draw_centered(self, draw, box, lines, font, line_height):
+        """셀 영역 가운데에 여러 줄 텍스트 그리기"""
+        left, top, right, bottom = box
+        block_height = line_height * len(lines)
+        y = top + (bottom - top - block_height) / 2
+        for text, color in lines:
+            text_width = self._text_width(font, text)
+            draw.text(
+                (left + (right - left - text_width) / 2, y + line_height / 2),
+                text, font=font, fill=color, anchor='lm'
+            )
+            y += line_height
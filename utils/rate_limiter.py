@@ -0,0 +1,192 @@
+"""프로세스 간 공유 토큰 버킷 요청 속도 제한기 (KRX 요청용).
+
+data.krx.co.kr 는 짧은 시간에 요청이 몰리면 요청을 거부(429/5xx)하거나 접속을
+차단한다. 주입된 KRX 세션의 모든 요청은 보내기 전에 이 버킷에서 토큰을 하나씩 받고,
+버킷 상태(토큰 수, 현재 속도, 차단 해제 시각)는 파일 잠금으로 보호되는 상태 파일에
+두어 같은 장비의 스레드/프로세스(상주 모드, cron, 재처리 작업자)가 함께 쓴다.
+
+속도는 응답에 따라 AIMD 로 조정한다.
+- 정상 응답: 초당 요청 수를 step 만큼 올림 (max_rate 까지)
+- 429/5xx/연결 오류: 속도를 decrease 배로 줄이고 (min_rate 까지), Retry-After 동안 모든 요청 대기
+조정된 속도는 상태 파일에 남아 다음 실행도 마지막으로 안전했던 속도에서 시작한다.
+"""
+
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+
+from utils.env_util import load_env
+from utils.file_lock import file_lock
+from utils.logger_util import LoggerUtil
+
+load_env()
+
+_ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# 요청 제한 사용 여부 / 상태 파일 (비우면 프로세스 안에서만 공유)
+KRX_RATE_LIMIT_ENABLED = os.getenv('KRX_RATE_LIMIT_ENABLED', 'true').lower() in ('1', 'true', 'yes')
+KRX_RATE_LIMIT_FILE = os.getenv('KRX_RATE_LIMIT_FILE', os.path.join(_ROOT_DIR, '.cache', 'krx_rate_limit.json'))
+
+# 시작 속도 / 최저·최고 속도 (초당 요청 수) / 정상 응답마다 올리는 폭 / 오류 시 감소 배수 / 최대 연속 요청 수
+KRX_RATE_LIMIT = float(os.getenv('KRX_RATE_LIMIT', 2))
+KRX_RATE_LIMIT_MIN = float(os.getenv('KRX_RATE_LIMIT_MIN', 0.2))
+KRX_RATE_LIMIT_MAX = float(os.getenv('KRX_RATE_LIMIT_MAX', 5))
+KRX_RATE_LIMIT_STEP = float(os.getenv('KRX_RATE_LIMIT_STEP', 0.1))
+KRX_RATE_LIMIT_DECREASE = float(os.getenv('KRX_RATE_LIMIT_DECREASE', 0.5))
+KRX_RATE_LIMIT_BURST = float(os.getenv('KRX_RATE_LIMIT_BURST', 2))
+
+# 거부/오류 응답을 받은 요청의 재전송 횟수 (차단 해제 시각까지 기다린 뒤 다시 보냄)
+KRX_RATE_LIMIT_RETRIES = int(os.getenv('KRX_RATE_LIMIT_RETRIES', 2))
+
+# Retry-After 최대 반영 시간(초)
+_MAX_RETRY_AFTER = 60
+
+# 속도를 줄이는 응답 상태 코드
+THROTTLE_STATUS_CODES = frozenset({429, 500, 502, 503, 504})
+
+
+class TokenBucketRateLimiter:
+    """스레드/프로세스가 공유하는 적응형 토큰 버킷"""
+
+    def __init__(self, rate, min_rate, max_rate, step, decrease, burst, state_file=None, name='KRX'):
+        """
+        Args:
+            rate: 상태 파일이 없을 때 시작 속도 (초당 요청 수)
+            min_rate, max_rate: 속도 조정 범위
+            step: 정상 응답마다 올리는 속도
+            decrease: 속도를 줄일 때 곱하는 값 (0~1)
+            burst: 버킷 최대 토큰 수 (쉬었다가 한 번에 보낼 수 있는 요청 수)
+            state_file: 프로세스 간 공유 상태 파일 (None 이면 프로세스 안에서만 공유)
+        """
+        self.logger = LoggerUtil().get_logger(__name__)
+        self.initial_rate = rate
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.step = step
+        self.decrease = decrease
+        self.burst = burst
+        self.state_file = state_file
+        self.name = name
+        self._lock = threading.Lock()
+        self._state = None
+
+    @contextmanager
+    def _locked(self):
+        """스레드 잠금 + (상태 파일이 있으면) 파일 잠금"""
+        with self._lock:
+            with file_lock(self.state_file) if self.state_file else nullcontext():
+                yield
+
+    def _load(self, now):
+        state = self._state
+        if self.state_file:
+            try:
+                with open(self.state_file, encoding='utf-8') as f:
+                    state = json.load(f)
+            except (OSError, ValueError):
+                state = None
+        if not state:
+            state = {'rate': self.initial_rate, 'tokens': self.burst, 'updated_at': now, 'blocked_until': 0.0,
+                     'requests': 0, 'throttled': 0}
+        # 설정 범위가 바뀌었으면 저장된 속도를 범위 안으로
+        state['rate'] = min(self.max_rate, max(self.min_rate, state['rate']))
+        # 마지막 갱신 이후 채워진 토큰
+        elapsed = max(0.0, now - state['updated_at'])
+        state['tokens'] = min(self.burst, state['tokens'] + elapsed * state['rate'])
+        state['updated_at'] = now
+        return state
+
+    def _save(self, state):
+        self._state = state
+        if not self.state_file:
+            return
+        temp_path = f"{self.state_file}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(state, f)
+        os.replace(temp_path, self.state_file)
+
+    def acquire(self):
+        """토큰을 받을 때까지 대기 (차단 해제 시각 이전이면 그때까지 대기)
+
+        Returns:
+            float: 대기한 시간(초)
+        """
+        waited = 0.0
+        while True:
+            with self._locked():
+                now = time.time()
+                state = self._load(now)
+                if now < state['blocked_until']:
+                    wait = state['blocked_until'] - now
+                elif state['tokens'] >= 1:
+                    state['tokens'] -= 1
+                    state['requests'] += 1
+                    self._save(state)
+                    return waited
+                else:
+                    wait = (1 - state['tokens']) / state['rate']
+                self._save(state)
+            time.sleep(wait)
+            waited += wait
+
+    def record(self, throttled, retry_after=None):
+        """요청 결과 반영 - 정상이면 속도를 조금 올리고, 거부/오류면 줄이고 잠시 전체 대기"""
+        with self._locked():
+            now = time.time()
+            state = self._load(now)
+            if not throttled:
+                state['rate'] = min(self.max_rate, state['rate'] + self.step)
+            else:
+                previous = state['rate']
+                state['rate'] = max(self.min_rate, state['rate'] * self.decrease)
+                state['tokens'] = 0.0
+                pause = min(retry_after if retry_after is not None else 1 / state['rate'], _MAX_RETRY_AFTER)
+                state['blocked_until'] = max(state['blocked_until'], now + pause)
+                state['throttled'] += 1
+                self.logger.warning(
+                    f"[요청 제한] {self.name} 요청 거부/오류 - 초당 {previous:.2f} -> {state['rate']:.2f}회, {pause:.1f}초 대기"
+                )
+            self._save(state)
+
+    def record_response(self, response):
+        """HTTP 응답으로 결과 반영 (429/5xx 는 거부로 보고 Retry-After 반영)"""
+        if response.status_code not in THROTTLE_STATUS_CODES:
+            self.record(False)
+            return
+        retry_after = None
+        try:
+            retry_after = float(response.headers.get('Retry-After'))
+        except (TypeError, ValueError):
+            pass
+        self.record(True, retry_after)
+
+    def snapshot(self):
+        """현재 상태 (속도, 토큰, 누적 요청/거부 수)"""
+        with self._locked():
+            return dict(self._load(time.time()))
+
+
+_krx_limiter = None
+_krx_limiter_lock = threading.Lock()
+
+
+def get_krx_rate_limiter():
+    """KRX 요청 공용 제한기 (KRX_RATE_LIMIT_ENABLED=false 면 None)"""
+    global _krx_limiter
+    if not KRX_RATE_LIMIT_ENABLED:
+        return None
+    if _krx_limiter is None:
+        with _krx_limiter_lock:
+            if _krx_limiter is None:
+                _krx_limiter = TokenBucketRateLimiter(
+                    KRX_RATE_LIMIT,
+                    KRX_RATE_LIMIT_MIN,
+                    KRX_RATE_LIMIT_MAX,
+                    KRX_RATE_LIMIT_STEP,
+                    KRX_RATE_LIMIT_DECREASE,
+                    KRX_RATE_LIMIT_BURST,
+                    state_file=KRX_RATE_LIMIT_FILE or None,
+                )
+    return _krx_limiter
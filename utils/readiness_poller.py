@@ -0,0 +1,91 @@
+"""데이터 공개 대기 폴러.
+
+장 마감 직후에는 KRX 가 종가 데이터를 아직 공개하지 않아 빈/일부 응답이 올 수 있다.
+check() 가 완료를 알릴 때까지 마감 시간(deadline) 안에서 반복 확인하고, 완료되는 즉시
+결과를 반환한다. 확인 간격은 적응형으로 조정한다.
+
+- 진행값(예: 수집된 종목 수)이 늘어나는 중이면 공개가 진행 중이므로 처음 간격으로 되돌림
+- 변화가 없으면 간격을 backoff 배씩 늘려 max_interval 까지 (불필요한 요청 감소)
+"""
+
+import random
+import threading
+import time
+
+from utils.logger_util import LoggerUtil
+
+
+class ReadinessTimeout(RuntimeError):
+    """마감 시간 안에 데이터가 준비되지 않음 (또는 종료 신호로 대기 중단)"""
+
+
+class ReadinessPoller:
+    """완료될 때까지 적응형 간격으로 check() 를 반복 호출하는 폴러"""
+
+    def __init__(self, name, check, deadline_seconds, initial_interval=30, max_interval=300, backoff=2.0, stop_event=None):
+        """
+        Args:
+            name: 로그에 표시할 대상 이름
+            check: () -> (완료 여부, 진행값, 결과) - 예외는 미완료로 보고 다시 확인
+            deadline_seconds: 최대 대기 시간(초) - 0 이면 한 번만 확인
+            initial_interval: 첫 확인 간격(초)
+            max_interval: 최대 확인 간격(초)
+            backoff: 진행이 없을 때 간격 증가 배수
+            stop_event: 설정되면 대기 중단 (상주 모드 종료 신호)
+        """
+        self.logger = LoggerUtil().get_logger(__name__)
+        self.name = name
+        self.check = check
+        self.deadline_seconds = deadline_seconds
+        self.initial_interval = initial_interval
+        self.max_interval = max_interval
+        self.backoff = backoff
+        self.stop_event = stop_event or threading.Event()
+
+    def wait(self):
+        """
+        데이터가 준비될 때까지 대기 후 check() 결과 반환
+
+        Raises:
+            ReadinessTimeout: 마감 시간 초과 또는 종료 신호 (마지막 확인 오류를 원인으로 연결)
+        """
+        started = time.monotonic()
+        deadline = started + self.deadline_seconds
+        interval = self.initial_interval
+        last_progress = None
+        last_error = None
+        attempt = 0
+
+        while True:
+            attempt += 1
+            try:
+                ready, progress, result = self.check()
+                last_error = None
+            except Exception as e:
+                ready, progress, result = False, last_progress, None
+                last_error = e
+
+            if ready:
+                if attempt > 1:
+                    self.logger.info(f"[데이터 대기] {self.name} 준비 완료 ({attempt}회 확인, {time.monotonic() - started:.0f}초 대기)")
+                return result
+
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise ReadinessTimeout(
+                    f"{self.name} 데이터가 {self.deadline_seconds:.0f}초 안에 준비되지 않았습니다 ({attempt}회 확인)"
+                ) from last_error
+
+            # 공개가 진행 중이면 짧은 간격으로, 변화가 없으면 간격을 늘림
+            if progress is not None and last_progress is not None and progress > last_progress:
+                interval = self.initial_interval
+            elif attempt > 1:
+                interval = min(interval * self.backoff, self.max_interval)
+            last_progress = progress if progress is not None else last_progress
+
+            # 여러 시장/프로세스가 같은 시각에 몰리지 않도록 ±10% 지터
+            delay = min(interval * random.uniform(0.9, 1.1), remaining)
+            reason = f"오류: {last_error}" if last_error else f"진행: {progress}"
+            self.logger.info(f"[데이터 대기] {self.name} 미완료 ({reason}) - {delay:.0f}초 후 다시 확인")
+            if self.stop_event.wait(delay):
+                raise ReadinessTimeout(f"{self.name} 데이터 대기 중 종료 신호 수신") from last_error
@@ -0,0 +1,154 @@
+"""리포트 렌더링용 로컬 에셋(폰트/CSS) 번들.
+
+Google Fonts 를 네트워크로 불러오지 않도록 프로젝트 fonts/ 디렉토리(또는
+REPORT_FONT_DIR)의 나눔고딕(NanumGothic) 파일을 프로세스당 한 번만 읽어 두고,
+- HTML 렌더러에는 로컬 폰트 파일(file://)을 가리키는 인라인 @font-face CSS 를,
+- Pillow 렌더러에는 메모리에 올린 폰트 바이트를
+제공한다. 폰트 파일은 fetch_fonts.py 가 fonts/fonts.lock.json 의 고정 URL 에서 받아
+체크섬을 확인해 설치한다. 번들이 없으면 경고 후 시스템 폰트로 렌더링하며(호스트마다
+결과가 다를 수 있음), REPORT_FONT_FALLBACK=false 면 렌더링 시 FontBundleError 로 중단한다.
+설치된 파일의 체크섬이 fonts.lock.json 과 다르거나 고정되어 있지 않으면 항상 중단한다.
+"""
+
+import hashlib
+import json
+import os
+from functools import lru_cache
+from pathlib import Path
+
+from utils.env_util import load_env
+from utils.logger_util import LoggerUtil
+
+load_env()
+
+_ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_FONT_DIR = os.path.join(_ROOT_DIR, 'fonts')
+
+# 폰트 출처 URL 과 SHA-256 체크섬 (fetch_fonts.py 가 사용)
+FONT_LOCK_FILE = os.path.join(DEFAULT_FONT_DIR, 'fonts.lock.json')
+
+FONT_FAMILY = 'NanumGothic'
+
+# 굵기별 폰트 파일명 (CSS font-weight 400/700 에 대응, 500 은 400 사용)
+FONT_FILES = {
+    400: 'NanumGothic.ttf',
+    700: 'NanumGothicBold.ttf',
+}
+
+_FONT_FORMATS = {
+    '.ttf': 'truetype',
+    '.otf': 'opentype',
+    '.woff2': 'woff2',
+    '.woff': 'woff',
+}
+
+
+class FontBundleError(RuntimeError):
+    """렌더링 폰트 번들이 없거나 고정된 체크섬과 다르거나 체크섬이 고정되어 있지 않음"""
+
+
+def get_font_dir():
+    """폰트 디렉토리 (REPORT_FONT_DIR 환경변수 우선)"""
+    return os.getenv('REPORT_FONT_DIR') or DEFAULT_FONT_DIR
+
+
+def font_fallback_enabled():
+    """번들이 없을 때 시스템 폰트로 대체할지 (REPORT_FONT_FALLBACK, 기본 true - 번들을 강제하려면 false)"""
+    return os.getenv('REPORT_FONT_FALLBACK', 'true').lower() in ('1', 'true', 'yes')
+
+
+def normalize_weight(weight):
+    """CSS 와 같이 600 이상은 Bold, 그 외는 Regular 번들 굵기로 변환"""
+    return 700 if weight >= 600 else 400
+
+
+@lru_cache(maxsize=None)
+def load_font_lock(lock_file=FONT_LOCK_FILE):
+    """fonts.lock.json 의 파일별 {'url', 'sha256'} (파일이 없으면 빈 dict)"""
+    try:
+        with open(lock_file, encoding='utf-8') as f:
+            return json.load(f).get('files', {})
+    except FileNotFoundError:
+        return {}
+
+
+@lru_cache(maxsize=None)
+def load_font_bytes(font_dir, weight):
+    """굵기별 폰트 파일을 읽어 (파일명, 바이트) 반환 (프로세스당 한 번)
+
+    파일이 없으면 경고 후 (None, None) 을 반환해 시스템 폰트로 대체한다.
+
+    Raises:
+        FontBundleError: fonts.lock.json 에 체크섬이 없거나 다른 경우, REPORT_FONT_FALLBACK=false 인데 파일이 없는 경우
+    """
+    file_name = FONT_FILES[weight]
+    path = os.path.join(font_dir, file_name)
+    if not os.path.isfile(path):
+        if font_fallback_enabled():
+            LoggerUtil().get_logger(__name__).warning(
+                f"번들 폰트 파일이 없어 시스템 폰트를 사용합니다 (호스트마다 결과가 다를 수 있음, "
+                f"'python fetch_fonts.py' 로 설치): {path}"
+            )
+            return None, None
+        raise FontBundleError(
+            f"렌더링 폰트 파일이 없습니다: {path} - 'python fetch_fonts.py' 로 폰트 번들을 설치하세요"
+        )
+
+    with open(path, 'rb') as f:
+        data = f.read()
+    expected = (load_font_lock().get(file_name) or {}).get('sha256')
+    if not expected:
+        raise FontBundleError(f"fonts.lock.json 에 {file_name} 의 sha256 이 고정되어 있지 않습니다 - 검증할 수 없는 폰트는 사용하지 않습니다")
+    if hashlib.sha256(data).hexdigest() != expected:
+        raise FontBundleError(
+            f"폰트 파일 체크섬이 fonts.lock.json 과 다릅니다: {path} - 'python fetch_fonts.py --force' 로 다시 설치하세요"
+        )
+    return file_name, data
+
+
+@lru_cache(maxsize=None)
+def get_font_face_css(font_dir):
+    """번들 폰트 파일을 참조하는 @font-face CSS (프로세스당 한 번 생성, HTML 에 인라인)"""
+    rules = []
+    for weight in sorted(FONT_FILES):
+        file_name, data = load_font_bytes(font_dir, weight)
+        if data is None:
+            source = f"local('{FONT_FAMILY}')"
+        else:
+            extension = os.path.splitext(file_name)[1].lower()
+            font_format = _FONT_FORMATS.get(extension, 'truetype')
+            font_uri = Path(font_dir, file_name).resolve().as_uri()
+            source = f"url('{font_uri}') format('{font_format}')"
+        rules.append(
+            "@font-face {\n"
+            f"    font-family: '{FONT_FAMILY}';\n"
+            "    font-style: normal;\n"
+            f"    font-weight: {weight};\n"
+            f"    src: {source};\n"
+            "}"
+        )
+    return '\n'.join(rules)
+
+
+@lru_cache(maxsize=None)
+def get_asset_digest(font_dir):
+    """번들 에셋 내용 해시 (렌더링 캐시 키에 포함해 폰트 교체 시 캐시 무효화)"""
+    digest = hashlib.sha256()
+    for weight in sorted(FONT_FILES):
+        file_name, data = load_font_bytes(font_dir, weight)
+        digest.update(str(file_name).encode('utf-8'))
+        digest.update(data or b'')
+    return digest.hexdigest()[:16]
+
+
+def preload_render_assets(font_dir=None):
+    """렌더링 전 폰트/CSS 를 미리 메모리에 올림 (이후 호출은 캐시 사용)
+
+    Raises:
+        FontBundleError: 체크섬이 다르거나, REPORT_FONT_FALLBACK=false 인데 번들이 없는 경우
+    """
+    font_dir = font_dir or get_font_dir()
+    for weight in FONT_FILES:
+        load_font_bytes(font_dir, weight)
+    get_font_face_css(font_dir)
+    return get_asset_digest(font_dir)
@@ -0,0 +1,118 @@
+"""리포트 이미지 렌더링 결과 캐시.
+
+페이지 데이터, 제목, 스타일 버전으로 만든 해시를 파일명에 사용해 동일한 페이지는
+다시 렌더링하지 않고 기존 파일을 그대로 반환한다. 보존 기간과 전체 용량 한도를
+넘는 오래된 파일은 prune() 으로 정리한다.
+"""
+
+import hashlib
+import os
+import threading
+import time
+
+from utils.logger_util import LoggerUtil
+
+
+class RenderCache:
+    """해시 기반 렌더링 산출물 저장소"""
+
+    def __init__(self, cache_dir, prefix='sector_table_', max_bytes=None, max_age_days=None):
+        """
+        Args:
+            cache_dir: 이미지 저장 디렉토리
+            prefix: 캐시가 관리하는 파일명 접두어 (정리 대상)
+            max_bytes: 전체 용량 한도 (None 이면 REPORT_CACHE_MAX_MB, 기본 200MB)
+            max_age_days: 보존 일수 (None 이면 REPORT_CACHE_MAX_AGE_DAYS, 기본 14일)
+        """
+        self.logger = LoggerUtil().get_logger(__name__)
+        self.cache_dir = cache_dir
+        self.prefix = prefix
+        self.max_bytes = max_bytes if max_bytes is not None else int(float(os.getenv('REPORT_CACHE_MAX_MB', 200)) * 1024 * 1024)
+        self.max_age_days = max_age_days if max_age_days is not None else float(os.getenv('REPORT_CACHE_MAX_AGE_DAYS', 14))
+
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+    @staticmethod
+    def make_key(*parts):
+        """캐시 키 생성 (각 요소를 구분자로 이어 SHA-256)"""
+        digest = hashlib.sha256()
+        for part in parts:
+            digest.update(str(part).encode('utf-8'))
+            digest.update(b'\x1f')
+        return digest.hexdigest()
+
+    def path_for(self, name_base, key, extension='.png'):
+        """키에 해당하는 산출물 경로 (파일명: <name_base>_<해시 16자리><확장자>)"""
+        return os.path.join(self.cache_dir, f"{name_base}_{key[:16]}{extension}")
+
+    def lookup(self, path):
+        """캐시 적중 여부 확인 (적중 시 보존 기간 갱신을 위해 mtime 갱신)"""
+        if not os.path.isfile(path):
+            return False
+        try:
+            os.utime(path, None)
+        except OSError:
+            pass
+        return True
+
+    def temp_path_for(self, path):
+        """렌더링 중 사용할 임시 경로 (완료 후 store 로 원자적 교체)"""
+        return f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+
+    def store(self, temp_path, path):
+        """임시 파일을 최종 경로로 원자적으로 이동"""
+        os.replace(temp_path, path)
+        return path
+
+    def discard(self, temp_path):
+        """실패한 렌더링의 임시 파일 제거"""
+        try:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+        except OSError:
+            pass
+
+    def prune(self, keep=()):
+        """보존 기간이 지났거나 용량 한도를 넘는 오래된 파일 삭제
+
+        Args:
+            keep: 이번 실행에서 사용 중이라 삭제하면 안 되는 경로들
+
+        Returns:
+            int: 삭제한 파일 수
+        """
+        keep = {os.path.abspath(path) for path in keep if path}
+        now = time.time()
+        max_age_seconds = self.max_age_days * 24 * 60 * 60
+
+        entries = []
+        for name in os.listdir(self.cache_dir):
+            if not name.startswith(self.prefix):
+                continue
+            path = os.path.join(self.cache_dir, name)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+
+        # 최근 사용 순으로 정렬해 오래된 것부터 삭제
+        entries.sort(reverse=True)
+        removed = 0
+        total_bytes = 0
+        for mtime, size, path in entries:
+            is_stale_tmp = path.endswith('.tmp') and now - mtime > 60 * 60
+            expired = now - mtime > max_age_seconds
+            over_limit = total_bytes + size > self.max_bytes
+            if os.path.abspath(path) not in keep and (is_stale_tmp or expired or over_limit):
+                try:
+                    os.remove(path)
+                    removed += 1
+                    continue
+                except OSError as e:
+                    self.logger.warning(f"렌더링 캐시 파일 삭제 실패: {path} - {e}")
+            total_bytes += size
+
+        if removed:
+            self.logger.info(f"렌더링 캐시 정리 완료 - {removed}개 파일 삭제 (사용량: {total_bytes / 1024 / 1024:.1f}MB)")
+        return removed
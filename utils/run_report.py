@@ -0,0 +1,152 @@
+"""작업 실행 리포트 (JSON + Prometheus textfile exporter).
+
+StageRunner 실행 결과의 단계별 측정값(경과/CPU 시간, 쿼리 수, 조회·변경 행 수,
+조회 바이트)과 SQL 문별 상위 통계/느린 쿼리 실행 계획을 실행마다 JSON 파일로 남기고, node_exporter textfile collector 가
+읽을 수 있는 .prom 파일을 최신 실행 기준으로 갱신한다.
+
+- JSON: {RUN_REPORT_DIR}/{작업}_{거래일}_{시작시각}.json (실행마다 하나, 추세 분석용)
+- Prometheus: {PROMETHEUS_TEXTFILE_DIR}/krx_{작업}.prom (실행마다 덮어씀, 원자적 교체)
+"""
+
+import json
+import os
+from datetime import datetime
+
+from utils.db_manager import SQL_PROFILE_TOP_N
+from utils.env_util import load_env
+from utils.stage_runner import STATUS_DONE
+
+load_env()
+
+_ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+RUN_REPORT_DIR = os.getenv('RUN_REPORT_DIR', os.path.join(_ROOT_DIR, 'logs', 'run_reports'))
+
+# 미지정 시 JSON 리포트와 같은 디렉토리에 저장
+PROMETHEUS_TEXTFILE_DIR = os.getenv('PROMETHEUS_TEXTFILE_DIR') or RUN_REPORT_DIR
+
+# 단계 측정값 항목 (JSON 키, Prometheus 지표명, 설명)
+STAGE_METRICS = (
+    ('wall_seconds', 'krx_stage_duration_seconds', "단계 경과 시간(초)"),
+    ('cpu_seconds', 'krx_stage_cpu_seconds', "단계 스레드 CPU 시간(초)"),
+    ('queries', 'krx_stage_queries', "단계에서 실행한 SQL 쿼리 수"),
+    ('rows_fetched', 'krx_stage_rows_fetched', "단계에서 조회한 행 수"),
+    ('rows_written', 'krx_stage_rows_written', "단계에서 삽입/수정/삭제한 행 수"),
+    ('bytes_fetched', 'krx_stage_bytes_fetched', "단계에서 조회한 데이터 크기(추정, 바이트)"),
+)
+
+_TOTAL_KEYS = ('cpu_seconds', 'queries', 'rows_fetched', 'rows_written', 'bytes_fetched')
+
+
+def build_run_report(job, trade_date, result, resume=False, query_profile=None, top_n=None):
+    """
+    StageRunner.run() 결과로 실행 리포트 생성
+
+    Args:
+        query_profile: 실행 구간의 db_manager.QueryProfile (있으면 SQL 문별 상위 통계/느린 쿼리 포함)
+        top_n: 리포트에 남길 SQL 문장 수 (기본 SQL_PROFILE_TOP_N)
+
+    Returns:
+        dict: {'job', 'trade_date', 'resume', 'success', 'started_at', 'finished_at', 'duration_seconds',
+               'totals': {측정값 합계}, 'stages': {단계: {'status', 'restored', 'error', 측정값...}},
+               'sql': {'totals', 'top', 'slow_queries'} (query_profile 이 있을 때)}
+    """
+    started_at = datetime.fromtimestamp(result['started_at'])
+    metrics = result.get('metrics', {})
+    restored = set(result.get('restored', ()))
+
+    stages = {}
+    for name, status in sorted(result['statuses'].items()):
+        error = result['errors'].get(name)
+        stages[name] = {
+            'status': status,
+            'restored': name in restored,
+            'error': str(error) if error is not None else None,
+            **metrics.get(name, {}),
+        }
+
+    totals = {key: 0 for key in _TOTAL_KEYS}
+    for stage_metrics in metrics.values():
+        for key in _TOTAL_KEYS:
+            totals[key] += stage_metrics.get(key, 0)
+    totals['cpu_seconds'] = round(totals['cpu_seconds'], 4)
+
+    report = {
+        'job': job,
+        'trade_date': trade_date,
+        'resume': resume,
+        'success': result['success'],
+        'started_at': started_at.isoformat(timespec='seconds'),
+        'finished_at': datetime.fromtimestamp(result['started_at'] + result['duration_seconds']).isoformat(timespec='seconds'),
+        'duration_seconds': result['duration_seconds'],
+        'totals': totals,
+        'stages': stages,
+    }
+    if query_profile is not None:
+        report['sql'] = {
+            'totals': query_profile.totals(),
+            'top': query_profile.summary(top_n or SQL_PROFILE_TOP_N),
+            'slow_queries': list(query_profile.slow_queries),
+        }
+    return report
+
+
+def _escape_label(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def render_prometheus(report):
+    """실행 리포트를 Prometheus text exposition 형식으로 변환"""
+    job = report['job']
+    finished_ts = datetime.fromisoformat(report['finished_at']).timestamp()
+    lines = []
+
+    def gauge(name, help_text, samples):
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} gauge")
+        for labels, value in samples:
+            label_str = ','.join(f'{key}="{_escape_label(val)}"' for key, val in labels.items())
+            lines.append(f"{name}{{{label_str}}} {value}")
+
+    gauge('krx_job_last_run_timestamp_seconds', "마지막 실행 종료 시각 (epoch 초)", [({'job': job}, f"{finished_ts:.0f}")])
+    gauge('krx_job_duration_seconds', "작업 전체 소요 시간(초)", [({'job': job}, report['duration_seconds'])])
+    gauge('krx_job_success', "작업 성공 여부 (1 성공, 0 실패)", [({'job': job}, int(report['success']))])
+
+    executed = {name: stage for name, stage in report['stages'].items() if not stage['restored']}
+    gauge('krx_stage_success', "단계 성공 여부 (1 완료, 0 실패/건너뜀)",
+          [({'job': job, 'stage': name}, int(stage['status'] == STATUS_DONE)) for name, stage in executed.items()])
+    for key, metric_name, help_text in STAGE_METRICS:
+        gauge(metric_name, help_text,
+              [({'job': job, 'stage': name}, stage[key]) for name, stage in executed.items() if key in stage])
+
+    return '\n'.join(lines) + '\n'
+
+
+def write_run_report(report, report_dir=None, textfile_dir=None):
+    """
+    실행 리포트를 JSON 과 Prometheus textfile 로 저장
+
+    Returns:
+        tuple: (JSON 경로, .prom 경로)
+    """
+    report_dir = report_dir or RUN_REPORT_DIR
+    textfile_dir = textfile_dir or PROMETHEUS_TEXTFILE_DIR
+    os.makedirs(report_dir, exist_ok=True)
+    os.makedirs(textfile_dir, exist_ok=True)
+
+    started = datetime.fromisoformat(report['started_at'])
+    json_path = os.path.join(
+        report_dir, f"{report['job']}_{report['trade_date'].replace('-', '')}_{started.strftime('%H%M%S')}.json"
+    )
+    with open(json_path, 'w', encoding='utf-8') as f:
+        # EXPLAIN 결과의 Decimal 등은 문자열로 기록
+        json.dump(report, f, ensure_ascii=False, indent=2, default=str)
+
+    # textfile collector 가 쓰는 중인 파일을 읽지 않도록 임시 파일에 쓴 뒤 교체
+    prom_path = os.path.join(textfile_dir, f"krx_{report['job']}.prom")
+    temp_path = f"{prom_path}.{os.getpid()}.tmp"
+    with open(temp_path, 'w', encoding='utf-8') as f:
+        f.write(render_prometheus(report))
+    os.replace(temp_path, prom_path)
+
+    return json_path, prom_path
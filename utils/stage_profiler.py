@@ -0,0 +1,235 @@
+"""일일 작업 단계별 프로파일러 (cProfile / 샘플링, tracemalloc).
+
+코드 수정 없이 운영 환경에서 병목을 확인할 수 있도록, 선택한 단계(collect, rsi,
+leaders, render, deliver)만 프로파일러로 감싸 logs/profiles/{거래일}_{시각}/ 아래에
+단계별 결과를 남긴다.
+
+- cprofile: {단계}.prof (pstats - snakeviz/flameprof/gprof2dot 로 시각화), {단계}.txt (누적 시간 상위 함수)
+  단계 스레드에서 실행된 코드만 측정한다.
+- sample: {단계}.folded (collapsed stack - flamegraph.pl/speedscope/inferno 입력), {단계}.txt (샘플 상위 함수)
+  단계 스레드와 단계 실행 중 새로 생긴 스레드(렌더링/전송 풀)를 주기적으로 샘플링한다.
+- memory (tracemalloc): {단계}.memory.txt (최대 사용량, 단계 동안 늘어난 할당 상위 위치)
+
+cProfile/tracemalloc 은 프로세스 단위 설정이라, 프로파일링 대상 단계끼리는 겹치지 않도록
+한 번에 하나씩 실행한다 (대상이 아닌 단계는 기존처럼 동시에 실행).
+"""
+
+import cProfile
+import io
+import os
+import pstats
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter
+from contextlib import contextmanager
+from datetime import datetime
+
+from utils.env_util import load_env
+from utils.logger_util import LoggerUtil
+
+load_env()
+
+_ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+PROFILE_DIR = os.getenv('PROFILE_DIR', os.path.join(_ROOT_DIR, 'logs', 'profiles'))
+
+# 프로파일링 가능한 단계 그룹 (단계명 접두어: collect_kospi -> collect)
+PROFILE_STAGE_GROUPS = ('collect', 'rsi', 'leaders', 'render', 'deliver')
+
+PROFILER_CPROFILE = 'cprofile'
+PROFILER_SAMPLE = 'sample'
+PROFILERS = (PROFILER_CPROFILE, PROFILER_SAMPLE)
+
+# 텍스트 요약에 남길 상위 항목 수 / tracemalloc 이 저장할 스택 깊이
+_TOP_ENTRIES = 40
+_TRACEMALLOC_FRAMES = 10
+
+# 프로파일링 대상 단계끼리 겹치지 않도록 하는 잠금 (프로세스 단위 설정 보호)
+_profile_lock = threading.Lock()
+
+
+def parse_profile_stages(value):
+    """'collect,rsi' / 'all' 형식을 단계 그룹 집합으로 변환 (빈 값이면 빈 집합)"""
+    names = {name.strip().lower() for name in (value or '').split(',') if name.strip()}
+    if 'all' in names:
+        return set(PROFILE_STAGE_GROUPS)
+    unknown = names - set(PROFILE_STAGE_GROUPS)
+    if unknown:
+        raise ValueError(
+            f"알 수 없는 프로파일 단계: {', '.join(sorted(unknown))} (사용 가능: {', '.join(PROFILE_STAGE_GROUPS)}, all)"
+        )
+    return names
+
+
+def _frame_label(frame):
+    code = frame.f_code
+    return f"{os.path.basename(code.co_filename)}:{code.co_name}"
+
+
+class _StackSampler(threading.Thread):
+    """대상 스레드들의 호출 스택을 주기적으로 수집해 collapsed stack 으로 집계"""
+
+    def __init__(self, target_ident, interval):
+        super().__init__(name='stage-profiler', daemon=True)
+        self.target_ident = target_ident
+        self.interval = interval
+        # 시작 시점에 이미 있던 스레드(다른 단계, 워커 등)는 제외
+        self.excluded = {thread.ident for thread in threading.enumerate()} - {target_ident}
+        self.stacks = Counter()
+        self.samples = 0
+        self._stop_event = threading.Event()
+
+    def run(self):
+        self.excluded.add(threading.get_ident())
+        while not self._stop_event.wait(self.interval):
+            names = {thread.ident: thread.name for thread in threading.enumerate()}
+            for ident, frame in sys._current_frames().items():
+                if ident in self.excluded or ident not in names:
+                    continue
+                stack = []
+                while frame is not None:
+                    stack.append(_frame_label(frame))
+                    frame = frame.f_back
+                # 스레드 이름(번호 제외)을 루트로 두어 단계 스레드와 풀 스레드를 구분
+                root = names[ident].rstrip('0123456789_-') or 'thread'
+                self.stacks[';'.join([root] + stack[::-1])] += 1
+            self.samples += 1
+
+    def stop(self):
+        self._stop_event.set()
+        self.join()
+
+
+class StageProfiler:
+    """선택한 단계를 프로파일러로 감싸 결과 파일을 남기는 실행 훅 (StageRunner.run(profiler=...))"""
+
+    def __init__(self, stages, mode=None, output_dir=None, memory=None, sample_interval_ms=None, run_label=None):
+        """
+        Args:
+            stages: 프로파일링할 단계 그룹 집합 (parse_profile_stages 결과)
+            mode: cprofile 또는 sample (PROFILER, 기본 cprofile)
+            output_dir: 결과 상위 디렉토리 (PROFILE_DIR, 기본 logs/profiles)
+            memory: tracemalloc 메모리 추적 여부 (PROFILE_MEMORY, 기본 true)
+            sample_interval_ms: 샘플링 간격(ms) (PROFILE_SAMPLE_INTERVAL_MS, 기본 5)
+            run_label: 결과 디렉토리명 (기본: 실행 시각)
+        """
+        self.logger = LoggerUtil().get_logger(__name__)
+        self.stages = set(stages)
+        self.mode = (mode or os.getenv('PROFILER') or PROFILER_CPROFILE).lower()
+        if self.mode not in PROFILERS:
+            raise ValueError(f"지원하지 않는 프로파일러입니다: {self.mode} (사용 가능: {', '.join(PROFILERS)})")
+        if memory is None:
+            memory = os.getenv('PROFILE_MEMORY', 'true').lower() in ('1', 'true', 'yes')
+        self.memory = memory
+        self.sample_interval = (sample_interval_ms or float(os.getenv('PROFILE_SAMPLE_INTERVAL_MS', 5))) / 1000
+        self.output_dir = os.path.join(output_dir or PROFILE_DIR, run_label or datetime.now().strftime('%Y%m%d_%H%M%S'))
+        self.results = {}
+
+    def wants(self, stage_name):
+        """프로파일링 대상 단계인지 (단계명 접두어로 판별)"""
+        return stage_name.split('_', 1)[0] in self.stages
+
+    @contextmanager
+    def profile(self, stage_name):
+        """단계 실행을 감싸 프로파일 결과 저장 (대상이 아니면 그대로 실행)"""
+        if not self.wants(stage_name):
+            yield
+            return
+
+        with _profile_lock:
+            os.makedirs(self.output_dir, exist_ok=True)
+            base_path = os.path.join(self.output_dir, stage_name)
+
+            started_tracing = False
+            memory_start = None
+            if self.memory:
+                if not tracemalloc.is_tracing():
+                    tracemalloc.start(_TRACEMALLOC_FRAMES)
+                    started_tracing = True
+                tracemalloc.reset_peak()
+                memory_start = tracemalloc.take_snapshot()
+
+            profiler = sampler = None
+            if self.mode == PROFILER_CPROFILE:
+                profiler = cProfile.Profile()
+                profiler.enable()
+            else:
+                sampler = _StackSampler(threading.get_ident(), self.sample_interval)
+                sampler.start()
+
+            started = time.perf_counter()
+            try:
+                yield
+            finally:
+                elapsed = time.perf_counter() - started
+                files = []
+                try:
+                    if profiler is not None:
+                        profiler.disable()
+                        files += self._write_cprofile(profiler, base_path)
+                    if sampler is not None:
+                        sampler.stop()
+                        files += self._write_samples(sampler, base_path)
+
+                    result = {'seconds': round(elapsed, 3), 'files': files}
+                    if memory_start is not None:
+                        memory_result, memory_file = self._write_memory(memory_start, base_path)
+                        result.update(memory_result)
+                        files.append(memory_file)
+                    self.results[stage_name] = result
+                    self.logger.info(f"[프로파일] {stage_name} {elapsed:.2f}초 - {', '.join(files)}")
+                except Exception as e:
+                    self.logger.error(f"[프로파일] {stage_name} 결과 저장 실패: {e}")
+                finally:
+                    if started_tracing:
+                        tracemalloc.stop()
+
+    def _write_cprofile(self, profiler, base_path):
+        prof_path = f"{base_path}.prof"
+        profiler.dump_stats(prof_path)
+
+        stream = io.StringIO()
+        stats = pstats.Stats(profiler, stream=stream)
+        stats.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(_TOP_ENTRIES)
+        text_path = f"{base_path}.txt"
+        with open(text_path, 'w', encoding='utf-8') as f:
+            f.write(stream.getvalue())
+        return [prof_path, text_path]
+
+    def _write_samples(self, sampler, base_path):
+        folded_path = f"{base_path}.folded"
+        with open(folded_path, 'w', encoding='utf-8') as f:
+            for stack, count in sampler.stacks.most_common():
+                f.write(f"{stack} {count}\n")
+
+        # 스택 맨 위(실제로 실행 중이던) 함수 기준 상위 목록
+        self_counts = Counter()
+        for stack, count in sampler.stacks.items():
+            self_counts[stack.rsplit(';', 1)[-1]] += count
+        total = sum(self_counts.values()) or 1
+        text_path = f"{base_path}.txt"
+        with open(text_path, 'w', encoding='utf-8') as f:
+            f.write(f"샘플 {sampler.samples}회 (간격 {self.sample_interval * 1000:.1f}ms), 스택 {total}개\n\n")
+            for label, count in self_counts.most_common(_TOP_ENTRIES):
+                f.write(f"{count / total * 100:6.2f}%  {count:7d}  {label}\n")
+        return [folded_path, text_path]
+
+    def _write_memory(self, memory_start, base_path):
+        _, peak = tracemalloc.get_traced_memory()
+        snapshot = tracemalloc.take_snapshot().filter_traces((
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, cProfile.__file__),
+            tracemalloc.Filter(False, __file__),
+            tracemalloc.Filter(False, '<frozen importlib._bootstrap>'),
+        ))
+        differences = snapshot.compare_to(memory_start, 'lineno')
+        net = sum(diff.size_diff for diff in differences)
+
+        memory_path = f"{base_path}.memory.txt"
+        with open(memory_path, 'w', encoding='utf-8') as f:
+            f.write(f"최대 추적 메모리: {peak / 1024 / 1024:.1f}MB, 단계 동안 순증가: {net / 1024 / 1024:.1f}MB\n\n")
+            for diff in differences[:_TOP_ENTRIES]:
+                f.write(f"{diff}\n")
+        return {'peak_mb': round(peak / 1024 / 1024, 1), 'net_mb': round(net / 1024 / 1024, 1)}, memory_path
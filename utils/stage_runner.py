@@ -0,0 +1,267 @@
+"""단계(stage) 그래프 실행기와 실행 기록(run ledger).
+
+각 단계는 필요한 입력(requires)과 만들어 내는 산출물(provides)을 선언하고, 실행기는
+이 선언으로 의존 관계를 계산해 선행 단계가 끝난 단계부터 스레드 풀에서 동시에
+실행한다. 단계가 끝날 때마다 결과와 산출물(JSON)을 krx_run_ledger 테이블에
+거래일 단위로 기록하므로, 실패 후 resume=True 로 다시 실행하면 완료된 단계는
+기록된 산출물로 복원하고 실패/미실행 단계부터 이어서 실행한다.
+
+실행한 단계마다 경과 시간, CPU 시간(단계 스레드 기준), 쿼리 수, 조회/변경 행 수,
+조회 바이트(추정)를 측정해 결과의 metrics 로 반환한다 (run_report 로 기록).
+run(profiler=...) 로 StageProfiler 를 넘기면 선택한 단계를 프로파일러로 감싸 실행한다.
+"""
+
+import json
+import time
+from contextlib import nullcontext
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+
+from utils.db_manager import (
+    get_db_connection,
+    track_queries,
+    ensure_run_ledger_table,
+    get_run_ledger,
+    mark_run_stage_started,
+    mark_run_stage_finished
+)
+from utils.logger_util import LoggerUtil
+
+STATUS_DONE = 'done'
+STATUS_FAILED = 'failed'
+STATUS_SKIPPED = 'skipped'
+
+
+class StageGraphError(ValueError):
+    """단계 그래프 정의 오류 (산출물 중복/누락, 순환 의존)"""
+
+
+class Stage:
+    """실행 단계 정의"""
+
+    def __init__(self, name, func, requires=(), provides=(), critical=True, checkpoint=True):
+        """
+        Args:
+            name: 단계명 (실행 기록 키)
+            func: 실행 함수 (context dict) -> {산출물명: 값} (값은 JSON 직렬화 가능해야 함)
+            requires: 필요한 산출물명
+            provides: 만들어 내는 산출물명
+            critical: False 면 실패해도 후속 단계를 계속 실행 (산출물은 None)
+            checkpoint: False 면 재개 시 기록을 복원하지 않고 다시 실행 (로그인 세션처럼
+                        프로세스 안에만 남는 결과를 만드는 단계) - 후속 단계가 모두 완료된 경우는 제외
+        """
+        self.name = name
+        self.func = func
+        self.requires = tuple(requires)
+        self.provides = tuple(provides)
+        self.critical = critical
+        self.checkpoint = checkpoint
+
+
+class RunLedger:
+    """단계별 실행 기록 저장소 (작업명 + 거래일 단위)"""
+
+    def __init__(self, job):
+        self.job = job
+        self.conn = None
+        self._table_ready = False
+
+    def open(self):
+        self.conn = get_db_connection()
+        if not self.conn:
+            raise Exception("데이터베이스 연결 실패")
+        # 상주 모드에서 같은 기록 저장소를 반복 사용할 때는 테이블 확인을 한 번만 수행
+        if not self._table_ready:
+            ensure_run_ledger_table(self.conn)
+            self._table_ready = True
+        return self
+
+    def close(self):
+        if self.conn:
+            self.conn.close()
+            self.conn = None
+
+    def load(self, trade_date):
+        """{단계명: {'status', 'outputs'}} 반환"""
+        records = {}
+        for row in get_run_ledger(self.conn, self.job, trade_date):
+            records[row['stage']] = {
+                'status': row['status'],
+                'outputs': json.loads(row['outputs']) if row['outputs'] else {},
+            }
+        return records
+
+    def started(self, trade_date, stage):
+        mark_run_stage_started(self.conn, self.job, trade_date, stage)
+
+    def finished(self, trade_date, stage, status, outputs=None, error=None, duration_ms=None):
+        outputs_json = json.dumps(outputs, ensure_ascii=False, default=str) if outputs is not None else None
+        mark_run_stage_finished(self.conn, self.job, trade_date, stage, status, outputs_json, error, duration_ms)
+
+
+class StageRunner:
+    """의존 관계에 따라 단계를 동시 실행하고 결과를 실행 기록에 남기는 실행기"""
+
+    def __init__(self, stages, ledger=None, max_workers=4):
+        self.logger = LoggerUtil().get_logger(__name__)
+        self.stages = {stage.name: stage for stage in stages}
+        if len(self.stages) != len(stages):
+            raise StageGraphError("단계명이 중복되었습니다.")
+        self.ledger = ledger
+        self.max_workers = max_workers
+        self.dependencies = self._build_dependencies()
+
+    def _build_dependencies(self):
+        """산출물 선언으로 {단계: 선행 단계 집합} 계산 후 순환 여부 검증"""
+        providers = {}
+        for stage in self.stages.values():
+            for output in stage.provides:
+                if output in providers:
+                    raise StageGraphError(f"산출물 '{output}' 을 여러 단계가 제공합니다: {providers[output]}, {stage.name}")
+                providers[output] = stage.name
+
+        dependencies = {}
+        for stage in self.stages.values():
+            missing = [name for name in stage.requires if name not in providers]
+            if missing:
+                raise StageGraphError(f"'{stage.name}' 단계의 입력을 제공하는 단계가 없습니다: {', '.join(missing)}")
+            dependencies[stage.name] = {providers[name] for name in stage.requires}
+
+        # 위상 정렬로 순환 의존 검출
+        remaining = {name: set(deps) for name, deps in dependencies.items()}
+        while remaining:
+            ready = [name for name, deps in remaining.items() if not deps]
+            if not ready:
+                raise StageGraphError(f"순환 의존이 있습니다: {', '.join(sorted(remaining))}")
+            for name in ready:
+                del remaining[name]
+            for deps in remaining.values():
+                deps.difference_update(ready)
+        return dependencies
+
+    def _execute(self, stage, context, metrics, profiler=None):
+        """단계 실행 - 실패해도 측정값은 metrics[단계명] 에 기록"""
+        inputs = {name: context.get(name) for name in stage.requires}
+        profiling = profiler.profile(stage.name) if profiler else nullcontext()
+        with profiling:
+            return self._execute_measured(stage, context, inputs, metrics)
+
+    def _execute_measured(self, stage, context, inputs, metrics):
+        started = time.perf_counter()
+        cpu_started = time.thread_time()
+        with track_queries() as query_stats:
+            try:
+                outputs = stage.func({**context, **inputs}) or {}
+            finally:
+                metrics[stage.name] = {
+                    'wall_seconds': round(time.perf_counter() - started, 4),
+                    'cpu_seconds': round(time.thread_time() - cpu_started, 4),
+                    **query_stats,
+                }
+        return {name: outputs.get(name) for name in stage.provides}, time.perf_counter() - started
+
+    def run(self, trade_date, context=None, resume=False, profiler=None):
+        """단계 그래프 실행
+
+        Args:
+            trade_date: 실행 기록 키가 되는 거래일 (YYYY-MM-DD)
+            context: 모든 단계에 전달할 초기 값
+            resume: True 면 이전 실행에서 완료된 단계를 건너뛰고 기록된 산출물을 복원
+            profiler: 단계 실행을 감쌀 StageProfiler (profile(단계명) 컨텍스트 제공, 기본 없음)
+
+        Returns:
+            dict: {'success': bool, 'statuses': {단계: 상태}, 'errors': {단계: 예외}, 'context': 산출물 포함 context,
+                   'metrics': {실행한 단계: 측정값}, 'restored': [기록에서 복원한 단계],
+                   'started_at': 시작 시각(epoch 초), 'duration_seconds': 전체 소요 시간}
+        """
+        context = dict(context or {})
+        context.setdefault('trade_date', trade_date)
+        statuses = {}
+        errors = {}
+        metrics = {}
+        restored = []
+        started_at = time.time()
+        started = time.perf_counter()
+
+        if self.ledger:
+            self.ledger.open()
+        try:
+            if resume and self.ledger:
+                records = self.ledger.load(trade_date)
+                completed = {name for name, record in records.items()
+                             if name in self.stages and record['status'] == STATUS_DONE}
+                for name in completed:
+                    dependents = [other for other, deps in self.dependencies.items() if name in deps]
+                    if not self.stages[name].checkpoint and not all(other in completed for other in dependents):
+                        continue
+                    statuses[name] = STATUS_DONE
+                    restored.append(name)
+                    context.update(records[name]['outputs'])
+                if statuses:
+                    self.logger.info(f"[단계 실행] 이전 실행에서 완료된 단계 건너뜀: {', '.join(sorted(statuses))}")
+
+            with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='stage') as executor:
+                running = {}
+                while True:
+                    # 실패한 선행 단계가 있는 단계는 건너뜀
+                    for name, deps in self.dependencies.items():
+                        if name in statuses or name in running.values():
+                            continue
+                        blocked = [dep for dep in deps if statuses.get(dep) == STATUS_SKIPPED
+                                   or (statuses.get(dep) == STATUS_FAILED and self.stages[dep].critical)]
+                        if blocked:
+                            statuses[name] = STATUS_SKIPPED
+                            self.logger.warning(f"[단계 실행] {name} 건너뜀 (선행 단계 실패: {', '.join(sorted(blocked))})")
+                            if self.ledger:
+                                self.ledger.finished(trade_date, name, STATUS_SKIPPED, error=f"선행 단계 실패: {', '.join(sorted(blocked))}")
+
+                    # 선행 단계가 모두 끝난 단계 제출
+                    for name, deps in self.dependencies.items():
+                        if name in statuses or name in running.values():
+                            continue
+                        if all(dep in statuses for dep in deps):
+                            self.logger.info(f"[단계 실행] {name} 시작")
+                            if self.ledger:
+                                self.ledger.started(trade_date, name)
+                            running[executor.submit(self._execute, self.stages[name], dict(context), metrics, profiler)] = name
+
+                    if not running:
+                        break
+
+                    done, _ = wait(running, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        name = running.pop(future)
+                        stage = self.stages[name]
+                        try:
+                            outputs, elapsed = future.result()
+                        except Exception as e:
+                            statuses[name] = STATUS_FAILED
+                            errors[name] = e
+                            context.update({output: None for output in stage.provides})
+                            self.logger.error(f"[단계 실행] {name} 실패: {e}")
+                            if self.ledger:
+                                self.ledger.finished(trade_date, name, STATUS_FAILED, error=str(e))
+                            continue
+
+                        statuses[name] = STATUS_DONE
+                        context.update(outputs)
+                        self.logger.info(f"[단계 실행] {name} 완료 ({elapsed:.2f}초)")
+                        if self.ledger:
+                            self.ledger.finished(trade_date, name, STATUS_DONE, outputs, duration_ms=int(elapsed * 1000))
+        finally:
+            if self.ledger:
+                self.ledger.close()
+
+        success = all(
+            status == STATUS_DONE or (status == STATUS_FAILED and not self.stages[name].critical)
+            for name, status in statuses.items()
+        )
+        return {
+            'success': success,
+            'statuses': statuses,
+            'errors': errors,
+            'context': context,
+            'metrics': metrics,
+            'restored': sorted(restored),
+            'started_at': started_at,
+            'duration_seconds': round(time.perf_counter() - started, 4),
+        }
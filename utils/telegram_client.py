@@ -0,0 +1,188 @@
+"""Telegram Bot API HTTP 클라이언트.
+
+프로세스 전체에서 keep-alive 연결 풀을 가진 requests.Session 하나를 공유하고,
+- 연결/응답 타임아웃,
+- 429(Too Many Requests) 응답의 retry_after 준수,
+- 5xx/네트워크 오류에 대한 지터(jitter) 포함 지수 백오프 재시도,
+- 채팅방별 최소 전송 간격(rate limit)
+을 적용한다. DeliveryDispatcher 작업 안에서 호출되면 요청 타임아웃과 재시도 대기를
+채널 마감 시각 안으로 줄인다.
+"""
+
+import os
+import random
+import threading
+import time
+
+import requests
+from utils.env_util import load_env
+from requests.adapters import HTTPAdapter
+
+from utils.delivery_dispatcher import (
+    DeliveryTimeoutError,
+    bounded_timeout,
+    remaining_time,
+    wait_before_retry
+)
+from utils.logger_util import LoggerUtil
+
+load_env()
+
+# 로컬 대체 서버(fake_services.py) 등으로 바꿀 때 TELEGRAM_API_BASE 지정
+TELEGRAM_API_BASE = os.getenv('TELEGRAM_API_BASE', 'https://api.telegram.org').rstrip('/')
+
+
+class TelegramError(Exception):
+    """Telegram API 호출 실패 (재시도 후에도 실패한 경우)"""
+
+    def __init__(self, message, error_code=None, retry_after=None):
+        self.message = message
+        self.error_code = error_code
+        self.retry_after = retry_after
+        super().__init__(message)
+
+
+class ChatRateLimiter:
+    """채팅방별 최소 전송 간격을 보장하는 리미터 (스레드 안전)"""
+
+    def __init__(self, min_interval):
+        self.min_interval = min_interval
+        self._next_allowed = {}
+        self._lock = threading.Lock()
+
+    def acquire(self, chat_id):
+        """해당 채팅방으로 보낼 수 있을 때까지 대기"""
+        if not self.min_interval or chat_id is None:
+            return
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_allowed.get(chat_id, now))
+            self._next_allowed[chat_id] = slot + self.min_interval
+        if slot > now:
+            time.sleep(slot - now)
+
+    def defer(self, chat_id, seconds):
+        """429 응답 시 해당 채팅방의 다음 전송 가능 시각을 미룸"""
+        if chat_id is None:
+            return
+        with self._lock:
+            self._next_allowed[chat_id] = max(self._next_allowed.get(chat_id, 0), time.monotonic() + seconds)
+
+
+class TelegramClient:
+    """연결 풀과 재시도/속도 제한을 갖춘 Telegram Bot API 클라이언트"""
+
+    def __init__(self, bot_token=None, connect_timeout=None, read_timeout=None,
+                 max_retries=None, backoff_base=None, backoff_max=None, chat_min_interval=None, api_base=None):
+        self.logger = LoggerUtil().get_logger(__name__)
+        self.bot_token = bot_token or os.getenv('TELEGRAM_BOT_TOKEN')
+        self.api_base = (api_base or TELEGRAM_API_BASE).rstrip('/')
+        self.timeout = (
+            connect_timeout if connect_timeout is not None else float(os.getenv('TELEGRAM_CONNECT_TIMEOUT', 5)),
+            read_timeout if read_timeout is not None else float(os.getenv('TELEGRAM_READ_TIMEOUT', 60)),
+        )
+        self.max_retries = max_retries if max_retries is not None else int(os.getenv('TELEGRAM_MAX_RETRIES', 4))
+        self.backoff_base = backoff_base if backoff_base is not None else 1.0
+        self.backoff_max = backoff_max if backoff_max is not None else 30.0
+        self.rate_limiter = ChatRateLimiter(
+            chat_min_interval if chat_min_interval is not None else float(os.getenv('TELEGRAM_CHAT_MIN_INTERVAL', 1.0))
+        )
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=8)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+
+    def _backoff(self, attempt):
+        """지수 백오프 + full jitter"""
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * (2 ** attempt)))
+
+    @staticmethod
+    def _deadline_reached():
+        remaining = remaining_time()
+        return remaining is not None and remaining <= 0
+
+    def call(self, method, data=None, files=None):
+        """Bot API 메서드 호출
+
+        Args:
+            method: API 메서드명 (sendMessage, sendPhoto, sendMediaGroup 등)
+            data: 폼 필드 dict (chat_id 포함)
+            files: {필드명: (파일명, 바이트)} - 재시도 시 그대로 재전송
+
+        Returns:
+            dict: Telegram 응답 JSON
+
+        Raises:
+            TelegramError: 재시도 후에도 실패한 경우
+            DeliveryTimeoutError: 전송 마감 시각까지 끝나지 않은 경우
+                (응답 대기 중 중단했으면 outcome_unknown=True - 이미 전송됐을 수 있음)
+        """
+        url = f"{self.api_base}/bot{self.bot_token}/{method}"
+        chat_id = (data or {}).get('chat_id')
+
+        for attempt in range(self.max_retries + 1):
+            self.rate_limiter.acquire(chat_id)
+            last_attempt = attempt >= self.max_retries
+
+            try:
+                response = self.session.post(url, data=data, files=files, timeout=bounded_timeout(self.timeout, f"Telegram {method}"))
+            except (requests.ConnectionError, requests.Timeout) as e:
+                # 요청을 보낸 뒤 응답을 기다리다 끊긴 경우는 텔레그램이 이미 처리했을 수 있음
+                sent = isinstance(e, requests.ReadTimeout)
+                if sent and self._deadline_reached():
+                    raise DeliveryTimeoutError(f"Telegram {method} 응답 대기 중 제한 시간 초과", outcome_unknown=True) from e
+                if last_attempt:
+                    raise TelegramError(f"{method} 네트워크 오류: {e}") from e
+                delay = self._backoff(attempt)
+                self.logger.warning(f"Telegram {method} 네트워크 오류, {delay:.1f}초 후 재시도 ({attempt + 1}/{self.max_retries}): {e}")
+                wait_before_retry(delay, f"Telegram {method}", outcome_unknown=sent, error=e)
+                continue
+
+            try:
+                body = response.json()
+            except ValueError:
+                body = {'ok': False, 'description': response.text[:200]}
+
+            if response.ok and body.get('ok', False):
+                return body
+
+            description = body.get('description') or f"HTTP {response.status_code}"
+            error_code = body.get('error_code', response.status_code)
+
+            if response.status_code == 429:
+                parameters = body.get('parameters') or {}
+                retry_after = parameters.get('retry_after') or response.headers.get('Retry-After') or 1
+                retry_after = float(retry_after)
+                self.rate_limiter.defer(chat_id, retry_after)
+                if last_attempt:
+                    raise TelegramError(f"{method} 요청 한도 초과: {description}", error_code, retry_after)
+                # retry_after 이전에는 재시도해도 다시 429 이므로 그만큼 기다린 뒤 약간의 지터 추가
+                delay = retry_after + random.uniform(0, self.backoff_base)
+                self.logger.warning(f"Telegram {method} 429 응답, {delay:.1f}초 후 재시도 ({attempt + 1}/{self.max_retries})")
+                wait_before_retry(delay, f"Telegram {method}")
+                continue
+
+            if response.status_code >= 500 and not last_attempt:
+                delay = self._backoff(attempt)
+                self.logger.warning(f"Telegram {method} 서버 오류({response.status_code}), {delay:.1f}초 후 재시도 ({attempt + 1}/{self.max_retries})")
+                wait_before_retry(delay, f"Telegram {method}")
+                continue
+
+            # 4xx 는 재시도해도 결과가 같으므로 즉시 실패
+            raise TelegramError(f"{method} 실패: {description}", error_code)
+
+        raise TelegramError(f"{method} 실패: 재시도 횟수 초과")
+
+
+_default_client = None
+_default_client_lock = threading.Lock()
+
+
+def get_telegram_client():
+    """프로세스 공용 TelegramClient (연결 풀 공유)"""
+    global _default_client
+    with _default_client_lock:
+        if _default_client is None:
+            _default_client = TelegramClient()
+        return _default_client